@@ -36,6 +36,13 @@ class Config:
     MAX_JSON_SIZE_MB: int = int(os.environ.get("MAX_JSON_SIZE_MB", "10"))
     MAX_ELEMENTS_PER_PAGE: int = int(os.environ.get("MAX_ELEMENTS_PER_PAGE", "1000"))
     MAX_PAGES_PER_DOCUMENT: int = int(os.environ.get("MAX_PAGES_PER_DOCUMENT", "1000"))
+    MAX_BATCH_JOBS: int = int(os.environ.get("MAX_BATCH_JOBS", "500"))
+    BATCH_UPLOAD_CONCURRENCY: int = int(os.environ.get("BATCH_UPLOAD_CONCURRENCY", "16"))
+    
+    # Fair-Scheduling: nur konfigurierte Tenants erhalten eigene Queues (sonst "default")
+    TENANT_API_KEYS: str = os.environ.get("TENANT_API_KEYS", "")  # "<api-key>=<tenant>,..."
+    TENANT_ALLOWLIST: str = os.environ.get("TENANT_ALLOWLIST", "")  # "acme,globex" (X-Tenant-ID)
+    MAX_TENANTS: int = int(os.environ.get("MAX_TENANTS", "50"))
     
     # Sidecar-MCP
     SIDECAR_MCP_URL: str = os.environ.get("SIDECAR_MCP_URL", "http://sidecar-mcp:8001")
@@ -68,6 +75,12 @@ class Config:
         if cls.MAX_ELEMENTS_PER_PAGE <= 0:
             errors.append("MAX_ELEMENTS_PER_PAGE must be > 0")
         
+        if cls.MAX_BATCH_JOBS <= 0:
+            errors.append("MAX_BATCH_JOBS must be > 0")
+        
+        if cls.MAX_TENANTS < 0:
+            errors.append("MAX_TENANTS must be >= 0")
+        
         if errors:
             raise ValueError(f"Configuration errors: {', '.join(errors)}")
         
@@ -1,5 +1,6 @@
 """API Gateway - Hauptendpunkt für Layout-Kompilierung."""
 
+import asyncio
 import json
 import logging
 import os
@@ -7,17 +8,21 @@ from datetime import datetime
 from uuid import UUID, uuid4
 
 import redis
-from fastapi import FastAPI, HTTPException, status, Depends, Header, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, status, Depends, Header, Query, Request, BackgroundTasks
 from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from rq import Queue
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from packages.artifact_store import get_artifact_store
+from packages.common.scheduling import QUEUE_REGISTRY_KEY, TenantPolicy, lane_for, normalize_tenant, queue_name
 from packages.common.models import (
     ArtifactInfo,
     ArtifactType,
+    JobBatchCreateRequest,
+    JobBatchResponse,
     JobCreateRequest,
     JobResponse,
     JobStatus,
@@ -29,7 +34,7 @@ from events import setup_event_listeners
 from config import config
 from health import get_health_status
 from middleware import CorrelationIDMiddleware, RequestLoggingMiddleware, RateLimitMiddleware
-from metrics import PrometheusMiddleware, metrics_endpoint, record_job_created, update_queue_size
+from metrics import PrometheusMiddleware, collect_lane_metrics, metrics_endpoint, record_job_created
 from packages.event_bus import get_event_bus
 from packages.cache import get_cache
 from dialog import router as dialog_router
@@ -119,14 +124,15 @@ app.add_middleware(
 engine = create_engine(config.DATABASE_URL, pool_pre_ping=True, pool_recycle=3600)
 SessionLocal = sessionmaker(bind=engine)
 
-# Redis Queue
+# Redis Queue (Lane-Queues: packages/common/scheduling.py)
 redis_conn = redis.from_url(config.REDIS_URL, socket_connect_timeout=5, socket_timeout=5)
-compile_queue = Queue("compile", connection=redis_conn)
-workflow_queue = Queue("workflow", connection=redis_conn)
 
 # Artifact Store
 artifact_store = get_artifact_store()
 
+# Tenants für Fair-Scheduling (API-Key-Zuordnung / Allowlist, begrenzt)
+tenant_policy = TenantPolicy.from_config(config.TENANT_ALLOWLIST, config.TENANT_API_KEYS, config.MAX_TENANTS)
+
 # Optional runtime services
 event_bus = get_event_bus() if config.EVENT_BUS_ENABLED else None
 cache = get_cache() if config.CACHE_ENABLED else None
@@ -177,37 +183,97 @@ async def init_optional_integrations():
         )
 
 
-def _enqueue_job_task(job_id: UUID, job_type: str) -> None:
-    """RQ Enqueue im BackgroundTask-Kontext."""
+def _tenant_for(req: Request, metadata: dict | None = None) -> str:
+    """
+    Tenant für Fair-Scheduling.
+
+    Ein API-Key mit zugeordnetem Tenant gewinnt; sonst zählt Header X-Tenant-ID bzw.
+    metadata["tenant"] nur, wenn der Tenant auf der Allowlist steht - alles andere -> default.
+    """
+    requested = req.headers.get("X-Tenant-ID") or (metadata or {}).get("tenant")
+    return tenant_policy.resolve(requested, api_key=req.headers.get("X-API-Key"))
+
+
+def _enqueue_job_task(job_id: UUID, job_type: str, priority: int = 0, tenant: str | None = None) -> None:
+    """RQ Enqueue im BackgroundTask-Kontext (Lane nach Job-Typ/Priorität, Queue pro Tenant)."""
     try:
         # Worker läuft in apps/worker-scribus/worker.py (Module: worker)
-        if job_type == JobType.COMPILE.value:
-            compile_queue.enqueue(
-                "worker.process_compile_job",
-                str(job_id),
-                job_timeout="20m",
-            )
-        elif job_type == JobType.WORKFLOW.value:
-            workflow_queue.enqueue(
-                "worker.process_workflow_job",
-                str(job_id),
-                job_timeout="60m",
-            )
+        if job_type == JobType.WORKFLOW.value:
+            kind, func, job_timeout = "workflow", "worker.process_workflow_job", "60m"
         else:
-            compile_queue.enqueue(
-                "worker.process_compile_job",
+            kind, func, job_timeout = "compile", "worker.process_compile_job", "20m"
+
+        lane = lane_for(kind, priority)
+        name = queue_name(kind, lane, tenant)
+        queue = Queue(name, connection=redis_conn)
+        with redis_conn.pipeline() as pipe:
+            pipe.sadd(QUEUE_REGISTRY_KEY, name)
+            queue.enqueue(
+                func,
                 str(job_id),
-                job_timeout="20m",
+                job_timeout=job_timeout,
+                meta={"lane": lane, "tenant": normalize_tenant(tenant), "priority": int(priority)},
+                pipeline=pipe,
             )
-
-        try:
-            update_queue_size(compile_queue.count + workflow_queue.count)
-        except Exception:
-            pass
+            pipe.execute()
     except Exception:
         logger.exception("Failed to enqueue job", extra={"job_id": str(job_id), "job_type": job_type})
 
 
+def _enqueue_compile_jobs_batch_task(jobs: list[tuple[UUID, int]], tenant: str | None = None) -> None:
+    """RQ Enqueue für Batch-Jobs: alle Jobs über eine Redis-Pipeline (Bulk-Lane, außer Priorität high)."""
+    try:
+        by_queue: dict[str, list] = {}
+        for job_id, priority in jobs:
+            lane = lane_for("compile", priority, bulk=True)
+            name = queue_name("compile", lane, tenant)
+            by_queue.setdefault(name, []).append(
+                Queue.prepare_data(
+                    "worker.process_compile_job",
+                    (str(job_id),),
+                    timeout="20m",
+                    meta={"lane": lane, "tenant": normalize_tenant(tenant), "priority": int(priority)},
+                )
+            )
+        with redis_conn.pipeline() as pipe:
+            pipe.sadd(QUEUE_REGISTRY_KEY, *by_queue.keys())
+            for name, job_datas in by_queue.items():
+                Queue(name, connection=redis_conn).enqueue_many(job_datas, pipeline=pipe)
+            pipe.execute()
+    except Exception:
+        logger.exception("Failed to enqueue job batch", extra={"job_count": len(jobs)})
+
+
+# Postgres erlaubt höchstens 65535 Bind-Parameter pro Statement
+MAX_STATEMENT_PARAMS = 65535
+
+
+def _multi_row_insert(db, table: str, columns: list[str], rows: list[dict], returning: str):
+    """
+    INSERT mit mehreren VALUES-Tupeln pro Statement (ein DB-Roundtrip je Chunk).
+
+    Die Zeilen werden so aufgeteilt, dass kein Statement mehr als ``MAX_STATEMENT_PARAMS``
+    Parameter hat; alle Chunks laufen in der Transaktion des Aufrufers.
+    """
+    chunk_size = max(1, MAX_STATEMENT_PARAMS // len(columns))
+    result_rows = []
+    for start in range(0, len(rows), chunk_size):
+        params = {}
+        values_sql = []
+        for i, row in enumerate(rows[start:start + chunk_size]):
+            placeholders = []
+            for col in columns:
+                key = f"{col}_{i}"
+                params[key] = row[col]
+                placeholders.append(f":{key}")
+            values_sql.append(f"({', '.join(placeholders)})")
+        statement = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join(values_sql)} RETURNING {returning}"
+        )
+        result_rows.extend(db.execute(text(statement), params).fetchall())
+    return result_rows
+
+
 def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     """Verifiziert API-Key (wenn aktiviert)."""
     if not config.API_KEY_ENABLED:
@@ -222,11 +288,15 @@ def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return True
 
 
-def validate_layout_input(layout_json: dict):
-    """Validiert Layout-Input (Größe, Elementanzahl)."""
-    # Größenprüfung (vereinfacht - in Production sollte Request-Size geprüft werden)
-    json_str = json.dumps(layout_json)
-    size_mb = len(json_str.encode("utf-8")) / (1024 * 1024)
+def validate_layout_input(layout_json: dict, json_bytes: bytes | None = None):
+    """Validiert Layout-Input (Größe, Elementanzahl).
+
+    Wenn ``json_bytes`` bereits vorliegt, wird dessen Länge verwendet statt erneut zu serialisieren.
+    """
+    # Größenprüfung (vereinfacht - für große Layouts /v1/jobs:raw mit Request-Size-Prüfung verwenden)
+    if json_bytes is None:
+        json_bytes = json.dumps(layout_json).encode("utf-8")
+    size_mb = len(json_bytes) / (1024 * 1024)
     
     if size_mb > config.MAX_JSON_SIZE_MB:
         raise HTTPException(
@@ -234,8 +304,15 @@ def validate_layout_input(layout_json: dict):
             detail=f"Layout JSON too large: {size_mb:.2f} MB (max: {config.MAX_JSON_SIZE_MB} MB)"
         )
     
+    validate_layout_limits(layout_json)
+
+
+def validate_layout_limits(layout_json: dict):
+    """Prüft Seiten- und Elementanzahl (O(Seiten), kein Walk über alle Objekte)."""
     # Seiten-Anzahl prüfen
     pages = layout_json.get("pages", [])
+    if not isinstance(pages, list):
+        return  # Typfehler meldet die Schema-Validierung
     if len(pages) > config.MAX_PAGES_PER_DOCUMENT:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -244,6 +321,8 @@ def validate_layout_input(layout_json: dict):
     
     # Element-Anzahl pro Seite prüfen
     for page_data in pages:
+        if not isinstance(page_data, dict):
+            continue
         objects = page_data.get("objects", [])
         if len(objects) > config.MAX_ELEMENTS_PER_PAGE:
             page_num = page_data.get("pageNumber", "unknown")
@@ -253,6 +332,28 @@ def validate_layout_input(layout_json: dict):
             )
 
 
+async def read_limited_body(req: Request, max_bytes: int) -> bytes:
+    """Liest den Request-Body mit Größenlimit (Content-Length vorab, sonst gezählter Stream)."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body too large (max: {config.MAX_JSON_SIZE_MB} MB)"
+    )
+    content_length = req.headers.get("content-length")
+    if content_length is not None:
+        try:
+            if int(content_length) > max_bytes:
+                raise too_large
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Length header")
+
+    body = bytearray()
+    async for chunk in req.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
 @app.get("/health")
 async def health_check():
     """Health Check."""
@@ -263,6 +364,10 @@ async def health_check():
 async def metrics():
     """Prometheus Metrics Endpoint."""
     if config.PROMETHEUS_ENABLED:
+        try:
+            collect_lane_metrics(redis_conn)
+        except Exception:
+            logger.warning("Could not collect queue lane metrics", exc_info=True)
         return metrics_endpoint()
     else:
         raise HTTPException(status_code=404, detail="Prometheus metrics not enabled")
@@ -324,19 +429,20 @@ async def plugin_pipeline(_: bool = Depends(verify_api_key)):
                 """
             )
         ).mappings().all()
+        try:
+            lanes = collect_lane_metrics(redis_conn)
+        except Exception:
+            lanes = {}
         return {
             "pipelines": [
                 {
-                    "id": "compile",
-                    "name": "Compile",
-                    "queue_size": compile_queue.count,
-                },
-                {
-                    "id": "workflow",
-                    "name": "Workflow",
-                    "queue_size": workflow_queue.count,
+                    "id": kind,
+                    "name": kind.capitalize(),
+                    "queue_size": sum(v["depth"] for k, v in lanes.items() if k.startswith(f"{kind}:")),
                 }
+                for kind in ("compile", "workflow")
             ],
+            "lanes": lanes,
             "recent_jobs": list(recent),
         }
     finally:
@@ -382,6 +488,119 @@ async def plugin_pipeline_stop(pipeline_id: str, _: bool = Depends(verify_api_ke
     raise HTTPException(status_code=501, detail=f"Pipeline '{pipeline_id}' stop not supported via legacy endpoint")
 
 
+def _store_compile_job(
+    db,
+    json_bytes: bytes,
+    priority: int,
+    metadata: dict | None,
+    background_tasks: BackgroundTasks,
+    tenant: str | None = None,
+) -> JobResponse:
+    """Speichert validierte Layout-Bytes als Artefakt, legt den Job an und enqueued ihn."""
+    # JSON als Artefakt speichern (validierte Bytes, keine erneute Serialisierung)
+    file_name = f"layout_{uuid4()}.json"
+    storage_uri, file_name, file_size = artifact_store.upload(
+        json_bytes,
+        ArtifactType.LAYOUT_JSON,
+        file_name=file_name,
+        mime_type="application/json"
+    )
+    checksum = artifact_store.compute_checksum(json_bytes)
+    
+    # Artefakt in DB speichern
+    artifact_result = db.execute(
+        text("""
+            INSERT INTO artifacts (
+                artifact_type, storage_type, storage_uri, file_name, file_size,
+                mime_type, checksum_md5
+            )
+            VALUES (:type, :storage_type, :uri, :file_name, :file_size, :mime_type, :checksum)
+            RETURNING id, created_at
+        """),
+        {
+            "type": ArtifactType.LAYOUT_JSON.value,
+            "storage_type": StorageType.S3.value,
+            "uri": storage_uri,
+            "file_name": file_name,
+            "file_size": file_size,
+            "mime_type": "application/json",
+            "checksum": checksum,
+        }
+    )
+    artifact_row = artifact_result.fetchone()
+    artifact_id = artifact_row[0]
+    artifact_created_at = artifact_row[1]
+    
+    # Job in DB erstellen
+    job_result = db.execute(
+        text("""
+            INSERT INTO jobs (
+                job_type, status, priority, input_artifact_id, metadata
+            )
+            VALUES (:job_type, :status, :priority, :input_artifact_id, :metadata)
+            RETURNING id, created_at, updated_at
+        """),
+        {
+            "job_type": JobType.COMPILE.value,
+            "status": JobStatus.PENDING.value,
+            "priority": priority,
+            "input_artifact_id": artifact_id,
+            "metadata": json.dumps(metadata or {}),
+        }
+    )
+    job_row = job_result.fetchone()
+    job_id = job_row[0]
+    job_created_at = job_row[1]
+    job_updated_at = job_row[2]
+    
+    db.commit()
+    
+    # Job enqueuen (Background-Task für bessere Response-Zeit)
+    background_tasks.add_task(_enqueue_job_task, job_id, JobType.COMPILE.value, priority, tenant)
+    
+    # Event-Bus: Job created
+    if event_bus is not None and hasattr(event_bus, "publish"):
+        event_bus.publish(
+            "jobs",
+            "job.created",
+            {
+                "job_id": str(job_id),
+                "job_type": JobType.COMPILE.value,
+                "status": JobStatus.PENDING.value,
+                "input_artifact_id": str(artifact_id),
+            },
+        )
+    
+    # Response
+    job_response = JobResponse(
+        id=job_id,
+        status=JobStatus.PENDING,
+        job_type=JobType.COMPILE,
+        priority=priority,
+        input_artifact_id=artifact_id,
+        output_artifact_id=None,
+        error_message=None,
+        metadata=metadata,
+        created_at=job_created_at,
+        updated_at=job_updated_at,
+        started_at=None,
+        completed_at=None,
+        input_artifact=ArtifactInfo(
+            id=artifact_id,
+            artifact_type=ArtifactType.LAYOUT_JSON,
+            storage_type=StorageType.S3,
+            storage_uri=storage_uri,
+            file_name=file_name,
+            file_size=file_size,
+            mime_type="application/json",
+            created_at=artifact_created_at,
+        ),
+        output_artifact=None,
+    )
+
+    return job_response
+
+
 @app.post("/v1/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     request: JobCreateRequest,
@@ -403,8 +622,9 @@ async def create_job(
     
     db = SessionLocal()
     try:
-        # 1. Input-Validierung (Größe, Seiten, Elemente)
-        validate_layout_input(request.layout_json)
+        # 1. Input-Validierung (Größe, Seiten, Elemente) - einmal serialisieren, Bytes wiederverwenden
+        json_bytes = json.dumps(request.layout_json, ensure_ascii=False).encode("utf-8")
+        validate_layout_input(request.layout_json, json_bytes=json_bytes)
         
         # 2. Schema-Validierung
         is_valid, errors = validate_layout(request.layout_json)
@@ -415,110 +635,68 @@ async def create_job(
                 detail={"validation_errors": errors}
             )
         
-        # 2. JSON als Artefakt speichern
-        json_bytes = json.dumps(request.layout_json, ensure_ascii=False).encode("utf-8")
-        file_name = f"layout_{uuid4()}.json"
-        storage_uri, file_name, file_size = artifact_store.upload(
+        return _store_compile_job(
+            db,
             json_bytes,
-            ArtifactType.LAYOUT_JSON,
-            file_name=file_name,
-            mime_type="application/json"
-        )
-        checksum = artifact_store.compute_checksum(json_bytes)
-        
-        # 3. Artefakt in DB speichern
-        artifact_result = db.execute(
-            text("""
-                INSERT INTO artifacts (
-                    artifact_type, storage_type, storage_uri, file_name, file_size,
-                    mime_type, checksum_md5
-                )
-                VALUES (:type, :storage_type, :uri, :file_name, :file_size, :mime_type, :checksum)
-                RETURNING id, created_at
-            """),
-            {
-                "type": ArtifactType.LAYOUT_JSON.value,
-                "storage_type": StorageType.S3.value,
-                "uri": storage_uri,
-                "file_name": file_name,
-                "file_size": file_size,
-                "mime_type": "application/json",
-                "checksum": checksum,
-            }
+            request.priority,
+            request.metadata,
+            background_tasks,
+            tenant=_tenant_for(req, request.metadata),
         )
-        artifact_row = artifact_result.fetchone()
-        artifact_id = artifact_row[0]
-        artifact_created_at = artifact_row[1]
-        
-        # 4. Job in DB erstellen
-        job_result = db.execute(
-            text("""
-                INSERT INTO jobs (
-                    job_type, status, priority, input_artifact_id, metadata
-                )
-                VALUES (:job_type, :status, :priority, :input_artifact_id, :metadata)
-                RETURNING id, created_at, updated_at
-            """),
-            {
-                "job_type": JobType.COMPILE.value,
-                "status": JobStatus.PENDING.value,
-                "priority": request.priority,
-                "input_artifact_id": artifact_id,
-                "metadata": json.dumps(request.metadata or {}),
-            }
+    
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Fehler beim Erstellen des Jobs: {str(e)}"
         )
-        job_row = job_result.fetchone()
-        job_id = job_row[0]
-        job_created_at = job_row[1]
-        job_updated_at = job_row[2]
-        
-        db.commit()
-        
-        # 5. Job enqueuen (Background-Task für bessere Response-Zeit)
-        background_tasks.add_task(_enqueue_job_task, job_id, JobType.COMPILE.value)
-        
-        # Event-Bus: Job created
-        if event_bus is not None and hasattr(event_bus, "publish"):
-            event_bus.publish(
-                "jobs",
-                "job.created",
-                {
-                    "job_id": str(job_id),
-                    "job_type": JobType.COMPILE.value,
-                    "status": JobStatus.PENDING.value,
-                    "input_artifact_id": str(artifact_id),
-                },
+    finally:
+        db.close()
+
+
+@app.post("/v1/jobs:raw", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+async def create_job_raw(
+    req: Request,
+    background_tasks: BackgroundTasks,
+    priority: int = Query(default=0, ge=0, description="Priorität (höher = wichtiger)"),
+    _: bool = Depends(verify_api_key),
+):
+    """
+    Erstellt einen Kompilierungs-Job aus dem rohen Request-Body (Body = Layout-JSON).
+
+    Günstigerer Pfad für große Layouts:
+    - Größenlimit auf dem Request-Body (Content-Length bzw. gezählter Stream, 413)
+    - Ein Parse-Durchlauf, eine Schema-Validierung
+    - Die validierten Rohbytes werden unverändert als Artefakt gespeichert
+    """
+    correlation_id = getattr(req.state, "correlation_id", "unknown")
+    logger.info("Creating job (raw body)", extra={"correlation_id": correlation_id})
+
+    json_bytes = await read_limited_body(req, config.MAX_JSON_SIZE_MB * 1024 * 1024)
+    try:
+        layout_json = json.loads(json_bytes)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body must be valid JSON")
+    if not isinstance(layout_json, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Layout JSON must be an object")
+
+    db = SessionLocal()
+    try:
+        validate_layout_limits(layout_json)
+
+        is_valid, errors = validate_layout(layout_json)
+        if not is_valid:
+            logger.warning("Layout validation failed", extra={"correlation_id": correlation_id, "errors": errors})
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"validation_errors": errors}
             )
-        
-        # 6. Response
-        job_response = JobResponse(
-            id=job_id,
-            status=JobStatus.PENDING,
-            job_type=JobType.COMPILE,
-            priority=request.priority,
-            input_artifact_id=artifact_id,
-            output_artifact_id=None,
-            error_message=None,
-            metadata=request.metadata,
-            created_at=job_created_at,
-            updated_at=job_updated_at,
-            started_at=None,
-            completed_at=None,
-            input_artifact=ArtifactInfo(
-                id=artifact_id,
-                artifact_type=ArtifactType.LAYOUT_JSON,
-                storage_type=StorageType.S3,
-                storage_uri=storage_uri,
-                file_name=file_name,
-                file_size=file_size,
-                mime_type="application/json",
-                created_at=artifact_created_at,
-            ),
-            output_artifact=None,
-        )
 
-        return job_response
-    
+        return _store_compile_job(db, json_bytes, priority, None, background_tasks, tenant=_tenant_for(req))
+
     except HTTPException:
         db.rollback()
         raise
@@ -532,6 +710,195 @@ async def create_job(
         db.close()
 
 
+@app.post("/v1/jobs:batch", response_model=JobBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_jobs_batch(
+    request: JobBatchCreateRequest,
+    req: Request,
+    background_tasks: BackgroundTasks,
+    _: bool = Depends(verify_api_key),
+):
+    """
+    Erstellt mehrere Kompilierungs-Jobs in einem Request.
+
+    - Validiert alle Layouts (ein Fehler weist den ganzen Batch ab)
+    - Lädt die Layout-JSONs parallel in den Artifact Store
+    - Speichert Artefakte und Jobs mit Multi-Row-INSERTs in einer Transaktion
+    - Enqueued alle Jobs über eine Redis-Pipeline
+    """
+    correlation_id = getattr(req.state, "correlation_id", "unknown")
+    job_requests = request.jobs
+    if len(job_requests) > config.MAX_BATCH_JOBS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many jobs in batch: {len(job_requests)} (max: {config.MAX_BATCH_JOBS})"
+        )
+    logger.info("Creating job batch", extra={"correlation_id": correlation_id, "job_count": len(job_requests)})
+
+    # 1. Validierung (einmal serialisieren, Bytes für Größenprüfung und Upload wiederverwenden)
+    payloads: list[bytes] = []
+    batch_errors = []
+    for index, job_request in enumerate(job_requests):
+        json_bytes = json.dumps(job_request.layout_json, ensure_ascii=False).encode("utf-8")
+        try:
+            validate_layout_input(job_request.layout_json, json_bytes=json_bytes)
+        except HTTPException as e:
+            batch_errors.append({"index": index, "errors": [e.detail]})
+            continue
+        is_valid, errors = validate_layout(job_request.layout_json)
+        if not is_valid:
+            batch_errors.append({"index": index, "errors": errors})
+            continue
+        payloads.append(json_bytes)
+
+    if batch_errors:
+        logger.warning("Batch validation failed", extra={"correlation_id": correlation_id, "errors": batch_errors})
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"validation_errors": batch_errors}
+        )
+
+    # 2. Parallel-Upload (begrenzte Nebenläufigkeit)
+    semaphore = asyncio.Semaphore(max(1, config.BATCH_UPLOAD_CONCURRENCY))
+
+    async def _upload(json_bytes: bytes):
+        async with semaphore:
+            return await run_in_threadpool(
+                artifact_store.upload,
+                json_bytes,
+                ArtifactType.LAYOUT_JSON,
+                file_name=f"layout_{uuid4()}.json",
+                mime_type="application/json",
+            )
+
+    def _delete_uploads(results) -> None:
+        for result in results:
+            if isinstance(result, BaseException):
+                continue
+            try:
+                artifact_store.delete(result[0])
+            except Exception:
+                pass
+
+    uploads = await asyncio.gather(*(_upload(b) for b in payloads), return_exceptions=True)
+    failed = next((u for u in uploads if isinstance(u, BaseException)), None)
+    if failed is not None:
+        # Bereits hochgeladene Layouts wieder entfernen (keine verwaisten Artefakte)
+        await run_in_threadpool(_delete_uploads, uploads)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Fehler beim Hochladen der Layouts: {str(failed)}"
+        )
+
+    # IDs clientseitig vergeben: Zuordnung hängt nicht von der RETURNING-Reihenfolge ab
+    artifact_ids = [uuid4() for _ in payloads]
+    job_ids = [uuid4() for _ in payloads]
+
+    db = SessionLocal()
+    try:
+        # 3. Artefakte + Jobs in einer Transaktion
+        artifact_rows = _multi_row_insert(
+            db,
+            "artifacts",
+            ["id", "artifact_type", "storage_type", "storage_uri", "file_name", "file_size", "mime_type", "checksum_md5"],
+            [
+                {
+                    "id": artifact_ids[i],
+                    "artifact_type": ArtifactType.LAYOUT_JSON.value,
+                    "storage_type": StorageType.S3.value,
+                    "storage_uri": uploads[i][0],
+                    "file_name": uploads[i][1],
+                    "file_size": uploads[i][2],
+                    "mime_type": "application/json",
+                    "checksum_md5": artifact_store.compute_checksum(payloads[i]),
+                }
+                for i in range(len(payloads))
+            ],
+            returning="id, created_at",
+        )
+        job_rows = _multi_row_insert(
+            db,
+            "jobs",
+            ["id", "job_type", "status", "priority", "input_artifact_id", "metadata"],
+            [
+                {
+                    "id": job_ids[i],
+                    "job_type": JobType.COMPILE.value,
+                    "status": JobStatus.PENDING.value,
+                    "priority": job_requests[i].priority,
+                    "input_artifact_id": artifact_ids[i],
+                    "metadata": json.dumps(job_requests[i].metadata or {}),
+                }
+                for i in range(len(payloads))
+            ],
+            returning="id, created_at, updated_at",
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _delete_uploads(uploads)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Fehler beim Erstellen der Jobs: {str(e)}"
+        )
+    finally:
+        db.close()
+
+    # 4. Enqueue (eine Redis-Pipeline)
+    background_tasks.add_task(
+        _enqueue_compile_jobs_batch_task,
+        [(job_ids[i], job_requests[i].priority) for i in range(len(job_ids))],
+        _tenant_for(req),
+    )
+
+    if event_bus is not None and hasattr(event_bus, "publish"):
+        event_bus.publish(
+            "jobs",
+            "job.batch_created",
+            {
+                "job_ids": [str(job_id) for job_id in job_ids],
+                "job_type": JobType.COMPILE.value,
+                "status": JobStatus.PENDING.value,
+            },
+        )
+
+    # 5. Response (Reihenfolge wie im Request)
+    artifact_created = {str(row[0]): row[1] for row in artifact_rows}
+    job_timestamps = {str(row[0]): (row[1], row[2]) for row in job_rows}
+    responses = []
+    for i, job_request in enumerate(job_requests):
+        storage_uri, file_name, file_size = uploads[i]
+        job_created_at, job_updated_at = job_timestamps[str(job_ids[i])]
+        responses.append(
+            JobResponse(
+                id=job_ids[i],
+                status=JobStatus.PENDING,
+                job_type=JobType.COMPILE,
+                priority=job_request.priority,
+                input_artifact_id=artifact_ids[i],
+                output_artifact_id=None,
+                error_message=None,
+                metadata=job_request.metadata,
+                created_at=job_created_at,
+                updated_at=job_updated_at,
+                started_at=None,
+                completed_at=None,
+                input_artifact=ArtifactInfo(
+                    id=artifact_ids[i],
+                    artifact_type=ArtifactType.LAYOUT_JSON,
+                    storage_type=StorageType.S3,
+                    storage_uri=storage_uri,
+                    file_name=file_name,
+                    file_size=file_size,
+                    mime_type="application/json",
+                    created_at=artifact_created[str(artifact_ids[i])],
+                ),
+                output_artifact=None,
+            )
+        )
+
+    return JobBatchResponse(jobs=responses)
+
+
 @app.get("/v1/jobs/{job_id}", response_model=JobResponse)
 async def get_job(job_id: UUID, _: bool = Depends(verify_api_key)):
     """Gibt Job-Status und Artefakt-URIs zurück."""
@@ -1,12 +1,22 @@
 """Prometheus Metrics für API-Gateway."""
 
 import time
+from datetime import datetime, timezone
 from typing import Optional
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response as StarletteResponse
 
+from packages.common.scheduling import (
+    LANES,
+    QUEUE_KINDS,
+    QUEUE_REGISTRY_KEY,
+    WAIT_STATS_KEY_PREFIX,
+    base_queue_names,
+    parse_queue_name,
+)
+
 # Request Metrics
 http_requests_total = Counter(
     "http_requests_total",
@@ -42,6 +52,31 @@ queue_size = Gauge(
     ["queue_name"],
 )
 
+# Lane Metrics (Priority-Lanes, summiert über Tenants)
+queue_lane_depth = Gauge(
+    "queue_lane_depth",
+    "Jobs waiting per queue kind and lane",
+    ["kind", "lane"],
+)
+
+queue_lane_oldest_wait_seconds = Gauge(
+    "queue_lane_oldest_wait_seconds",
+    "Age of the oldest waiting job per queue kind and lane",
+    ["kind", "lane"],
+)
+
+queue_lane_wait_seconds_total = Gauge(
+    "queue_lane_wait_seconds_total",
+    "Cumulative queue wait time of dequeued jobs (reported by workers)",
+    ["kind", "lane"],
+)
+
+queue_lane_dequeued_total = Gauge(
+    "queue_lane_dequeued_total",
+    "Jobs dequeued by workers (reported by workers)",
+    ["kind", "lane"],
+)
+
 # Error Metrics
 errors_total = Counter(
     "errors_total",
@@ -119,3 +154,85 @@ def update_queue_size(queue_name: str, size: int):
     """Update queue size metric."""
     queue_size.labels(queue_name=queue_name).set(size)
 
+
+
+def _parse_enqueued_at(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def collect_lane_metrics(redis_conn) -> dict:
+    """
+    Aktualisiert Queue-Tiefe und Wartezeit pro Lane (zwei Pipeline-Roundtrips + einer für Worker-Stats).
+
+    Returns:
+        {"<kind>:<lane>": {"depth", "oldest_wait_seconds", "avg_wait_seconds"}}
+    """
+    from rq import Queue
+    from rq.job import Job
+
+    names = set(base_queue_names())
+    for member in redis_conn.smembers(QUEUE_REGISTRY_KEY):
+        names.add(member.decode("utf-8") if isinstance(member, bytes) else str(member))
+    lane_queues = [(name, parse_queue_name(name)) for name in sorted(names)]
+    lane_queues = [(name, parsed) for name, parsed in lane_queues if parsed is not None]
+
+    pipe = redis_conn.pipeline()
+    for name, _ in lane_queues:
+        key = Queue(name, connection=redis_conn).key
+        pipe.llen(key)
+        pipe.lindex(key, 0)
+    raw = pipe.execute()
+
+    oldest_ids = [raw[i * 2 + 1] for i in range(len(lane_queues))]
+    pipe = redis_conn.pipeline()
+    for job_id in oldest_ids:
+        if job_id is None:
+            continue
+        job_id = job_id.decode("utf-8") if isinstance(job_id, bytes) else job_id
+        pipe.hget(Job.key_for(job_id), "enqueued_at")
+    enqueued_raw = iter(pipe.execute())
+
+    now = datetime.now(timezone.utc)
+    stats = {f"{kind}:{lane}": {"depth": 0, "oldest_wait_seconds": 0.0, "avg_wait_seconds": None}
+             for kind in QUEUE_KINDS for lane in LANES}
+    for i, (name, (kind, lane, _)) in enumerate(lane_queues):
+        entry = stats[f"{kind}:{lane}"]
+        entry["depth"] += int(raw[i * 2] or 0)
+        if oldest_ids[i] is not None:
+            enqueued_at = _parse_enqueued_at(next(enqueued_raw))
+            if enqueued_at is not None:
+                age = max(0.0, (now - enqueued_at).total_seconds())
+                entry["oldest_wait_seconds"] = max(entry["oldest_wait_seconds"], age)
+
+    pipe = redis_conn.pipeline()
+    for kind in QUEUE_KINDS:
+        for lane in LANES:
+            pipe.hgetall(f"{WAIT_STATS_KEY_PREFIX}{kind}:{lane}")
+    wait_stats = iter(pipe.execute())
+
+    for kind in QUEUE_KINDS:
+        for lane in LANES:
+            entry = stats[f"{kind}:{lane}"]
+            raw_stats = {
+                (k.decode("utf-8") if isinstance(k, bytes) else k): v for k, v in next(wait_stats).items()
+            }
+            wait_sum = float(raw_stats.get("sum", 0) or 0)
+            wait_count = int(raw_stats.get("count", 0) or 0)
+            if wait_count:
+                entry["avg_wait_seconds"] = wait_sum / wait_count
+
+            queue_lane_depth.labels(kind=kind, lane=lane).set(entry["depth"])
+            queue_lane_oldest_wait_seconds.labels(kind=kind, lane=lane).set(entry["oldest_wait_seconds"])
+            queue_lane_wait_seconds_total.labels(kind=kind, lane=lane).set(wait_sum)
+            queue_lane_dequeued_total.labels(kind=kind, lane=lane).set(wait_count)
+            queue_size.labels(queue_name=f"{kind}:{lane}").set(entry["depth"])
+
+    return stats
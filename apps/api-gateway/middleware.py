@@ -11,6 +11,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 from config import config
+from rate_limit_local import InMemoryRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -115,9 +116,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         else:
             self.use_redis = False
         
-        # Fallback: In-Memory Rate-Limiter
+        # Fallback: In-Memory Rate-Limiter (begrenzter Speicher)
         if not self.use_redis:
-            self._requests = {}  # {ip: [(timestamp, ...), ...]}
+            self.rate_limiter = InMemoryRateLimiter(
+                requests_per_window=requests_per_window,
+                window_seconds=window_seconds,
+            )
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         if not config.RATE_LIMIT_ENABLED:
@@ -125,45 +129,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         client_ip = request.client.host if request.client else "unknown"
         
-        # Redis-basierter Rate-Limiter
-        if self.use_redis:
-            is_allowed, retry_after = self.rate_limiter.is_allowed(client_ip)
-            if not is_allowed:
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "retry_after": retry_after or self.window_seconds
-                    },
-                    headers={"Retry-After": str(retry_after or self.window_seconds)}
-                )
-            return await call_next(request)
-        
-        # In-Memory Fallback
-        now = time.time()
-        
-        # Cleanup alte Einträge
-        if client_ip in self._requests:
-            self._requests[client_ip] = [
-                ts for ts in self._requests[client_ip]
-                if now - ts < self.window_seconds
-            ]
-        else:
-            self._requests[client_ip] = []
-        
-        # Prüfe Limit
-        if len(self._requests[client_ip]) >= self.requests_per_window:
+        # Redis-basierter bzw. In-Memory Rate-Limiter (gleiche Schnittstelle)
+        is_allowed, retry_after = self.rate_limiter.is_allowed(client_ip)
+        if not is_allowed:
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": "Rate limit exceeded",
-                    "retry_after": self.window_seconds
+                    "retry_after": retry_after or self.window_seconds
                 },
-                headers={"Retry-After": str(self.window_seconds)}
+                headers={"Retry-After": str(retry_after or self.window_seconds)}
             )
         
-        # Track Request
-        self._requests[client_ip].append(now)
-        
         return await call_next(request)
-
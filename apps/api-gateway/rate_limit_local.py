@@ -0,0 +1,102 @@
+"""In-Memory Rate-Limiting (Token-Bucket-Vorprüfung + Fallback ohne Redis)."""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+
+class LocalTokenBucket:
+    """
+    Begrenzter Token-Bucket pro Identifier (lokal pro Instanz).
+
+    Kapazität = requests_per_window, Refill = requests_per_window / window_seconds.
+    Ist der Bucket leer, hat diese Instanz allein schon das Limit des Sliding-Window
+    erreicht - der Request kann ohne Redis-Roundtrip abgelehnt werden. Die Anzahl der
+    Identifier ist begrenzt (LRU); ein verdrängter Bucket startet wieder voll, was nur
+    die Vorprüfung lockert - das globale Limit setzt Redis durch.
+    """
+
+    def __init__(self, requests_per_window: int, window_seconds: int, max_entries: int = 10000):
+        self.capacity = float(requests_per_window)
+        self.rate = requests_per_window / float(window_seconds)
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()  # {id: (tokens, ts)}
+        self._lock = threading.Lock()
+
+    def _refill(self, identifier: str, now: float) -> float:
+        tokens, ts = self._buckets.get(identifier, (self.capacity, now))
+        return min(self.capacity, tokens + (now - ts) * self.rate)
+
+    def try_acquire(self, identifier: str, now: Optional[float] = None) -> tuple[bool, Optional[int]]:
+        """
+        Entnimmt einen Token.
+
+        Returns:
+            Tuple (is_allowed, retry_after_seconds)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens = self._refill(identifier, now)
+            if tokens < 1.0:
+                self._buckets[identifier] = (tokens, now)
+                self._buckets.move_to_end(identifier)
+                return False, max(1, math.ceil((1.0 - tokens) / self.rate))
+
+            self._buckets[identifier] = (tokens - 1.0, now)
+            self._buckets.move_to_end(identifier)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return True, None
+
+    def refund(self, identifier: str) -> None:
+        """Gibt einen Token zurück (Request wurde global abgelehnt und zählt nicht)."""
+        with self._lock:
+            entry = self._buckets.get(identifier)
+            if entry is not None:
+                tokens, ts = entry
+                self._buckets[identifier] = (min(self.capacity, tokens + 1.0), ts)
+
+
+class InMemoryRateLimiter:
+    """
+    Sliding-Window-Limiter ohne Redis (Fallback für Single-Instance).
+
+    Pro Identifier höchstens ``requests_per_window`` Zeitstempel (deque mit maxlen),
+    Anzahl der Identifier per LRU begrenzt.
+    """
+
+    def __init__(self, requests_per_window: int, window_seconds: int, max_entries: int = 10000):
+        self.requests_per_window = requests_per_window
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._requests: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_allowed(self, identifier: str, now: Optional[float] = None) -> tuple[bool, Optional[int]]:
+        """
+        Prüft ob Request erlaubt ist.
+
+        Returns:
+            Tuple (is_allowed, retry_after_seconds)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            timestamps = self._requests.get(identifier)
+            if timestamps is None:
+                timestamps = deque(maxlen=self.requests_per_window)
+                self._requests[identifier] = timestamps
+            self._requests.move_to_end(identifier)
+
+            while timestamps and now - timestamps[0] >= self.window_seconds:
+                timestamps.popleft()
+
+            if len(timestamps) >= self.requests_per_window:
+                retry_after = timestamps[0] + self.window_seconds - now
+                return False, max(1, math.ceil(retry_after))
+
+            timestamps.append(now)
+            while len(self._requests) > self.max_entries:
+                self._requests.popitem(last=False)
+            return True, None
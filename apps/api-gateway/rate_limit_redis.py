@@ -1,12 +1,41 @@
 """Redis-basierter Rate-Limiter für Multi-Instance-Support."""
 
+import math
 import time
 import logging
 from typing import Optional
+from uuid import uuid4
 import redis
 
+from rate_limit_local import LocalTokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Sliding Window als ein atomares Server-Skript (ein Roundtrip pro Request).
+# KEYS[1] = Zähler-Key, ARGV = now_ms, window_ms, limit, member
+# Rückgabe: {allowed (0/1), retry_after_ms}
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, 0}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local retry_after = window
+if oldest[2] then
+    retry_after = tonumber(oldest[2]) + window - now
+end
+return {0, retry_after}
+"""
+
 
 class RedisRateLimiter:
     """
@@ -21,6 +50,8 @@ class RedisRateLimiter:
         requests_per_window: int = 100,
         window_seconds: int = 60,
         key_prefix: str = "rate_limit:",
+        local_precheck: bool = True,
+        local_max_entries: int = 10000,
     ):
         """
         Initialisiert Redis Rate-Limiter.
@@ -30,20 +61,29 @@ class RedisRateLimiter:
             requests_per_window: Max. Requests pro Zeitfenster
             window_seconds: Zeitfenster in Sekunden
             key_prefix: Prefix für Redis-Keys
+            local_precheck: Lokale Token-Bucket-Vorprüfung (spart Redis bei klaren Überschreitungen)
+            local_max_entries: Max. Anzahl lokal getrackter Identifier
         """
         try:
             self.redis_client = redis.from_url(redis_url, decode_responses=True)
             # Test Connection
             self.redis_client.ping()
+            self._script = self.redis_client.register_script(SLIDING_WINDOW_LUA)
             self.enabled = True
         except Exception as e:
             logger.warning(f"Redis nicht verfügbar für Rate-Limiting: {e}. Fallback zu In-Memory.")
             self.redis_client = None
+            self._script = None
             self.enabled = False
         
         self.requests_per_window = requests_per_window
         self.window_seconds = window_seconds
         self.key_prefix = key_prefix
+        self.local_bucket = (
+            LocalTokenBucket(requests_per_window, window_seconds, max_entries=local_max_entries)
+            if local_precheck
+            else None
+        )
     
     def is_allowed(self, identifier: str) -> tuple[bool, Optional[int]]:
         """
@@ -59,41 +99,30 @@ class RedisRateLimiter:
             # Fallback: Immer erlauben wenn Redis nicht verfügbar
             return True, None
         
+        # Lokale Vorprüfung: diese Instanz allein hat das Limit schon erreicht
+        if self.local_bucket is not None:
+            allowed, retry_after = self.local_bucket.try_acquire(identifier)
+            if not allowed:
+                return False, retry_after
+        
         key = f"{self.key_prefix}{identifier}"
-        now = int(time.time())
-        window_start = now - self.window_seconds
+        now_ms = int(time.time() * 1000)
+        window_ms = self.window_seconds * 1000
+        # Eindeutiges Member: Requests in derselben Millisekunde zählen einzeln
+        member = f"{now_ms}-{uuid4().hex}"
         
         try:
-            # Pipeline für atomare Operationen
-            pipe = self.redis_client.pipeline()
-            
-            # Entferne alte Einträge (außerhalb des Zeitfensters)
-            pipe.zremrangebyscore(key, 0, window_start)
+            allowed, retry_after_ms = self._script(
+                keys=[key],
+                args=[now_ms, window_ms, self.requests_per_window, member],
+            )
+            if int(allowed) == 1:
+                return True, None
             
-            # Zähle aktuelle Requests
-            pipe.zcard(key)
-            
-            # Füge aktuellen Request hinzu
-            pipe.zadd(key, {str(now): now})
-            
-            # Setze TTL (expire nach window_seconds)
-            pipe.expire(key, self.window_seconds)
-            
-            results = pipe.execute()
-            current_count = results[1]
-            
-            if current_count >= self.requests_per_window:
-                # Rate Limit überschritten
-                # Berechne Retry-After (Zeit bis ältester Request aus Fenster fällt)
-                oldest = self.redis_client.zrange(key, 0, 0, withscores=True)
-                if oldest:
-                    oldest_time = int(oldest[0][1])
-                    retry_after = (oldest_time + self.window_seconds) - now + 1
-                    return False, max(1, retry_after)
-                
-                return False, self.window_seconds
-            
-            return True, None
+            # Global abgelehnt: zählt nicht als Request, lokalen Token zurückgeben
+            if self.local_bucket is not None:
+                self.local_bucket.refund(identifier)
+            return False, max(1, math.ceil(int(retry_after_ms) / 1000))
         
         except Exception as e:
             logger.error(f"Redis Rate-Limiter Fehler: {e}")
@@ -114,12 +143,11 @@ class RedisRateLimiter:
             return self.requests_per_window
         
         key = f"{self.key_prefix}{identifier}"
-        now = int(time.time())
-        window_start = now - self.window_seconds
+        window_start_ms = int(time.time() * 1000) - self.window_seconds * 1000
         
         try:
             # Entferne alte Einträge
-            self.redis_client.zremrangebyscore(key, 0, window_start)
+            self.redis_client.zremrangebyscore(key, "-inf", window_start_ms)
             
             # Zähle aktuelle Requests
             count = self.redis_client.zcard(key)
@@ -11,18 +11,23 @@ from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, UploadFile, status, Header
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 
 from config import config
-from packages.artifact_store import get_artifact_store
+from packages.artifact_store.store_streaming import (
+    UploadTooLargeError,
+    get_streaming_artifact_store,
+    iter_file_chunks,
+)
 from packages.common.models import ArtifactInfo, ArtifactType, JobResponse, JobStatus, JobType, StorageType
 from packages.event_bus import get_event_bus
 
 
 router = APIRouter(prefix="/v1/workflow", tags=["workflow"])
 
-artifact_store = get_artifact_store()
+streaming_store = get_streaming_artifact_store()
 event_bus = get_event_bus() if config.EVENT_BUS_ENABLED else None
 
 
@@ -84,27 +89,31 @@ async def run_workflow(
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    # Read bundle bytes (size guard)
-    data = await bundle.read()
+    # Stream bundle into the artifact store (size guard + checksum in one pass)
     max_mb = int(os.environ.get("MAX_WORKFLOW_BUNDLE_MB", "200"))
     max_bytes = max_mb * 1024 * 1024
-    if len(data) > max_bytes:
-        raise HTTPException(status_code=413, detail=f"bundle too large (> {max_mb} MB)")
 
     file_name = bundle.filename or f"workflow_bundle_{uuid4()}.zip"
     if not file_name.lower().endswith(".zip"):
         file_name = file_name + ".zip"
 
-    storage_uri, stored_name, file_size = artifact_store.upload(
-        data,
-        ArtifactType.WORKFLOW_BUNDLE,
-        file_name=file_name,
-        mime_type="application/zip",
-    )
-    checksum = artifact_store.compute_checksum(data)
+    try:
+        storage_uri, stored_name, file_size, checksum = await run_in_threadpool(
+            streaming_store.ingest_stream,
+            iter_file_chunks(bundle.file, streaming_store.chunk_size),
+            ArtifactType.WORKFLOW_BUNDLE,
+            file_name=file_name,
+            mime_type="application/zip",
+            length=getattr(bundle, "size", None),
+            max_bytes=max_bytes,
+        )
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail=f"bundle too large (> {max_mb} MB)")
+    finally:
+        await bundle.close()
 
     # Late import to avoid circulars: SessionLocal + enqueue helper live in main.py
-    from main import SessionLocal, _enqueue_job_task  # type: ignore
+    from main import SessionLocal, _enqueue_job_task, _tenant_for  # type: ignore
 
     db = SessionLocal()
     try:
@@ -158,7 +167,13 @@ async def run_workflow(
         job_updated_at = job_row[2]
         db.commit()
 
-        background_tasks.add_task(_enqueue_job_task, job_id, JobType.WORKFLOW.value)
+        background_tasks.add_task(
+            _enqueue_job_task,
+            job_id,
+            JobType.WORKFLOW.value,
+            int(options.priority),
+            _tenant_for(req),
+        )
 
         if event_bus is not None and hasattr(event_bus, "publish"):
             event_bus.publish(
@@ -0,0 +1,21 @@
+"""Import-Wrapper für ``apps/api-gateway`` (Verzeichnisname mit Bindestrich).
+
+Die Gateway-Module importieren sich gegenseitig absolut (``from config import config``),
+daher wird das App-Verzeichnis in ``sys.path`` eingetragen und jedes Wrapper-Modul auf das
+gleichnamige Top-Level-Modul abgebildet - so gibt es jedes Modul nur einmal.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1] / "api-gateway"
+
+
+def load_app_module(wrapper_name: str):
+    """Lädt ``apps/api-gateway/<modul>.py`` und registriert es unter ``wrapper_name``."""
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+    module = importlib.import_module(wrapper_name.rsplit(".", 1)[1])
+    sys.modules[wrapper_name] = module
+    return module
@@ -0,0 +1,5 @@
+"""``apps/api-gateway/main.py`` als ``apps.api_gateway.main``."""
+
+from . import load_app_module
+
+load_app_module(__name__)
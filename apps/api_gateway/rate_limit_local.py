@@ -0,0 +1,5 @@
+"""``apps/api-gateway/rate_limit_local.py`` als ``apps.api_gateway.rate_limit_local``."""
+
+from . import load_app_module
+
+load_app_module(__name__)
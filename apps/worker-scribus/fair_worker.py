@@ -0,0 +1,117 @@
+"""RQ-Worker mit Priority-Lanes und Tenant-Fairness.
+
+Die Reihenfolge der Queues wird vor jedem Dequeue über
+``packages.common.scheduling.FairQueueOrder`` bestimmt. Neue Tenant-Queues
+werden aus dem Redis-Registry-Set übernommen, leere wieder daraus entfernt;
+Wartezeiten pro Lane landen in ``sched:wait:<kind>:<lane>`` (vom API-Gateway als
+Metrik exportiert).
+"""
+
+import time
+from datetime import datetime, timezone
+
+from rq import Worker
+
+from packages.common.scheduling import (
+    QUEUE_REGISTRY_KEY,
+    WAIT_STATS_KEY_PREFIX,
+    FairQueueOrder,
+    parse_queue_name,
+    prune_empty_queues,
+)
+
+
+class FairWorker(Worker):
+    """Worker, der Lanes gewichtet und Tenants pro Lane im Round-Robin bedient."""
+
+    # Wie oft (Sekunden) das Registry-Set gelesen und die Reihenfolge neu bestimmt wird,
+    # auch wenn der Worker gerade auf Jobs wartet.
+    registry_refresh_seconds = 5
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fair_order = FairQueueOrder()
+        self._base_names = frozenset(q.name for q in self.queues)
+        self._known_names = [q.name for q in self.queues]
+        self._registry_checked_at = 0.0
+
+    def _refresh_registry(self) -> None:
+        now = time.monotonic()
+        if now - self._registry_checked_at < self.registry_refresh_seconds:
+            return
+        self._registry_checked_at = now
+        try:
+            members = self.connection.smembers(QUEUE_REGISTRY_KEY)
+            registered = sorted(m.decode("utf-8") if isinstance(m, bytes) else str(m) for m in members)
+            # Leere Tenant-Queues abmelden; das Gateway trägt sie beim nächsten Job wieder ein
+            pruned = set(prune_empty_queues(self.connection, [n for n in registered if n not in self._base_names]))
+        except Exception:
+            return
+        self._known_names = [n for n in self._known_names if n not in pruned]
+        for name in registered:
+            if name not in pruned and name not in self._known_names:
+                self._known_names.append(name)
+
+    def _apply_queue_order(self) -> None:
+        self._refresh_registry()
+        existing = {q.name: q for q in self.queues}
+        ordered = []
+        for name in self._fair_order.order(self._known_names):
+            queue = existing.get(name)
+            if queue is None:
+                queue = self.queue_class(
+                    name,
+                    connection=self.connection,
+                    job_class=self.job_class,
+                    serializer=self.serializer,
+                )
+            ordered.append(queue)
+        self.queues = ordered
+        self._ordered_queues = list(ordered)
+
+    def _record_wait(self, job, queue) -> None:
+        parsed = parse_queue_name(queue.name)
+        if parsed is None or job.enqueued_at is None:
+            return
+        kind, lane, _ = parsed
+        enqueued_at = job.enqueued_at
+        now = datetime.now(timezone.utc)
+        if enqueued_at.tzinfo is None:
+            now = now.replace(tzinfo=None)
+        wait_seconds = max(0.0, (now - enqueued_at).total_seconds())
+        key = f"{WAIT_STATS_KEY_PREFIX}{kind}:{lane}"
+        try:
+            pipe = self.connection.pipeline()
+            pipe.hincrbyfloat(key, "sum", wait_seconds)
+            pipe.hincrby(key, "count", 1)
+            pipe.execute()
+        except Exception:
+            pass
+
+    def dequeue_job_and_maintain_ttl(self, timeout, max_idle_time=None):
+        """
+        Dequeue in Scheiben von ``registry_refresh_seconds``.
+
+        So bleiben Lane-Reihenfolge und neu registrierte Tenant-Queues auch im
+        Leerlauf aktuell; ``max_idle_time`` wird über alle Scheiben hinweg beachtet.
+        """
+        idle_since = time.monotonic()
+        while True:
+            self._apply_queue_order()
+            if timeout is None:
+                # Burst-Modus: nicht blockierend
+                result = super().dequeue_job_and_maintain_ttl(None, max_idle_time)
+            else:
+                slice_seconds = max(1, min(int(timeout), self.registry_refresh_seconds))
+                result = super().dequeue_job_and_maintain_ttl(slice_seconds, max_idle_time=slice_seconds)
+
+            if result is not None:
+                job, queue = result
+                self._fair_order.served(queue.name)
+                self._record_wait(job, queue)
+                return result
+
+            if timeout is None:
+                return None
+            if max_idle_time is not None and time.monotonic() - idle_since >= max_idle_time:
+                return None
@@ -0,0 +1,20 @@
+"""Import-Wrapper für ``apps/worker-scribus`` (Verzeichnisname mit Bindestrich).
+
+Wie ``apps.api_gateway``: das App-Verzeichnis kommt in ``sys.path`` und jedes
+Wrapper-Modul wird auf das gleichnamige Top-Level-Modul abgebildet.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1] / "worker-scribus"
+
+
+def load_app_module(wrapper_name: str):
+    """Lädt ``apps/worker-scribus/<modul>.py`` und registriert es unter ``wrapper_name``."""
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+    module = importlib.import_module(wrapper_name.rsplit(".", 1)[1])
+    sys.modules[wrapper_name] = module
+    return module
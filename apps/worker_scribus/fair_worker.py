@@ -0,0 +1,5 @@
+"""``apps/worker-scribus/fair_worker.py`` als ``apps.worker_scribus.fair_worker``."""
+
+from . import load_app_module
+
+load_app_module(__name__)
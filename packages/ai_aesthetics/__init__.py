@@ -1,10 +1,12 @@
 """AI-Enhanced Aesthetics Package - KI-gestützte Layout-Optimierung."""
 
+from .focus_cache import FocusCache
 from .focus_detector import FocusDetector, detect_image_focus
 from .contextual_placer import ContextualPlacer, suggest_image_placement
 from .balance_checker import BalanceChecker, check_layout_balance
 
 __all__ = [
+    "FocusCache",
     "FocusDetector",
     "detect_image_focus",
     "ContextualPlacer",
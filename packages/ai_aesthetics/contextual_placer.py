@@ -3,9 +3,16 @@
 import logging
 from typing import Dict, Any, List, Optional
 
+from .providers import OpenAIProvider
+
 logger = logging.getLogger(__name__)
 
 
+def page_text(text_blocks: List[Dict[str, Any]]) -> str:
+    """Gesamttext der Blöcke, wie er an ``analyze_text_context`` geht."""
+    return " ".join([block.get("content", "") for block in text_blocks])
+
+
 class ContextualPlacer:
     """
     Plaziert Bilder basierend auf Textinhalt.
@@ -13,19 +20,27 @@ class ContextualPlacer:
     Analysiert Text und schlägt vor, wo Bilder inhaltlich hingehören.
     """
     
-    def __init__(self, model_provider: str = "openai"):
+    def __init__(self, model_provider: str = "openai", api_key: Optional[str] = None):
         """
         Initialisiert Contextual Placer.
         
         Args:
             model_provider: KI-Provider ("openai", "google", "local")
+            api_key: API Key für OpenAI (optional, sonst OPENAI_API_KEY)
         """
         self.model_provider = model_provider
+        self.api_key = api_key
+        self.provider = None
         self._initialize_model()
     
     def _initialize_model(self):
-        """Initialisiert KI-Modell (Stub für jetzt)."""
-        # TODO: Echte KI-Integration (OpenAI, Google, etc.)
+        """Initialisiert KI-Provider; ohne Paket/Credentials bleibt es beim Fallback."""
+        if self.model_provider == "openai":
+            try:
+                self.provider = OpenAIProvider(api_key=self.api_key)
+            except Exception as e:
+                logger.info(f"KI-Provider {self.model_provider} nicht verfügbar, verwende Fallback: {e}")
+                self.provider = None
         logger.info(f"ContextualPlacer initialisiert (Provider: {self.model_provider})")
     
     def analyze_text_context(
@@ -104,7 +119,8 @@ class ContextualPlacer:
         self,
         text_blocks: List[Dict[str, Any]],
         image_metadata: Dict[str, Any],
-        available_positions: List[Dict[str, Any]]
+        available_positions: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Schlägt Bild-Platzierung basierend auf Textkontext vor.
@@ -113,6 +129,7 @@ class ContextualPlacer:
             text_blocks: Liste von Text-Blöcken mit Inhalt und Position
             image_metadata: Bild-Metadaten (Keywords, Typ, etc.)
             available_positions: Verfügbare Platzierungs-Positionen
+            context: Bereits ermitteltes ``analyze_text_context`` der Text-Blöcke (optional)
         
         Returns:
             {
@@ -123,8 +140,8 @@ class ContextualPlacer:
             }
         """
         # Analysiere Text-Kontext
-        all_text = " ".join([block.get("content", "") for block in text_blocks])
-        context = self.analyze_text_context(all_text)
+        if context is None:
+            context = self.analyze_text_context(page_text(text_blocks))
         
         # Match Bild-Keywords mit Text-Kontext
         image_keywords = image_metadata.get("keywords", [])
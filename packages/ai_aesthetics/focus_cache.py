@@ -0,0 +1,98 @@
+"""Cache für Fokus-Ergebnisse - vermeidet doppelte (kostenpflichtige) Vision-Aufrufe."""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def image_content_hash(image_data: bytes) -> str:
+    """SHA-256 über den Bildinhalt (gleiches Bild unter anderem Pfad = gleicher Schlüssel)."""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+class FocusCache:
+    """
+    Fokus-Ergebnisse nach (Bildinhalt-Hash, Provider).
+
+    - In-Memory LRU mit ``max_entries`` Einträgen
+    - optional ``disk_dir``: eine JSON-Datei pro Schlüssel, überlebt Prozess-Neustarts
+
+    Thread-sicher; ``get`` liefert Kopien, damit Aufrufer die Ergebnisse verändern dürfen.
+    """
+
+    def __init__(self, max_entries: int = 512, disk_dir: Optional[Path] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(content_hash: str, provider: str) -> str:
+        return hashlib.sha256(f"{provider}\n{content_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, stored)
+        if self.disk_dir:
+            path = self.disk_dir / f"{key}.json"
+            try:
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(stored, ensure_ascii=False), encoding="utf-8")
+                tmp.replace(path)
+            except Exception as e:
+                logger.warning(f"Fokus-Cache konnte nicht geschrieben werden ({path}): {e}")
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.disk_dir:
+            return None
+        path = self.disk_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
@@ -1,9 +1,14 @@
 """Visueller Fokus-Detektor - Erkennt wichtige Bildbereiche (Gesichter, Symbole)."""
 
 import logging
-from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from .focus_cache import FocusCache, image_content_hash
+from .image_cache import ImageCache
+from .providers import GoogleVisionProvider, LocalSaliencyProvider, OpenAIProvider
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,25 +23,48 @@ class FocusDetector:
     - Wichtige Bildbereiche
     """
     
-    def __init__(self, model_provider: str = "openai"):
+    def __init__(
+        self,
+        model_provider: str = "openai",
+        api_key: Optional[str] = None,
+        cache: Optional[FocusCache] = None
+    ):
         """
         Initialisiert Focus Detector.
         
         Args:
-            model_provider: KI-Provider ("openai", "google", "local")
+            model_provider: KI-Provider ("openai", "google", "local" = Saliency auf CPU)
+            api_key: API Key für OpenAI (optional, sonst OPENAI_API_KEY)
+            cache: Fokus-Cache (optional); Ergebnisse nach Bildinhalt + Provider
         """
         self.model_provider = model_provider
+        self.api_key = api_key
+        self.cache = cache
+        self.provider = None
         self._initialize_model()
     
     def _initialize_model(self):
-        """Initialisiert KI-Modell (Stub für jetzt)."""
-        # TODO: Echte KI-Integration (OpenAI Vision, Google Vision, etc.)
+        """Initialisiert KI-Provider; ohne Paket/Credentials bleibt es beim Fallback."""
+        try:
+            if self.model_provider == "openai":
+                self.provider = OpenAIProvider(api_key=self.api_key)
+            elif self.model_provider == "google":
+                self.provider = GoogleVisionProvider()
+            elif self.model_provider == "local":
+                self.provider = LocalSaliencyProvider()
+        except Exception as e:
+            logger.info(f"KI-Provider {self.model_provider} nicht verfügbar, verwende Fallback: {e}")
+            self.provider = None
         logger.info(f"FocusDetector initialisiert (Provider: {self.model_provider})")
     
+    def _cache_provider_key(self) -> str:
+        return f"{self.model_provider}:{getattr(self.provider, 'model', '')}"
+    
     def detect_focus(
         self,
         image_path: str,
-        image_data: Optional[bytes] = None
+        image_data: Optional[bytes] = None,
+        images: Optional[ImageCache] = None
     ) -> Dict[str, Any]:
         """
         Detektiert Fokus-Punkte in einem Bild.
@@ -44,6 +72,7 @@ class FocusDetector:
         Args:
             image_path: Pfad zum Bild
             image_data: Bilddaten als Bytes (optional)
+            images: Bild-Cache des Laufs (optional); Datei wird dann nur einmal gelesen/dekodiert
         
         Returns:
             {
@@ -58,13 +87,27 @@ class FocusDetector:
         
         # Verwende KI-Provider wenn verfügbar
         if self.provider:
+            cache_key = None
+            if self.cache is not None:
+                # Bild einmal lesen: Hash für den Cache, Bytes gehen direkt an den Provider
+                try:
+                    if image_data is not None:
+                        content_hash = image_content_hash(image_data)
+                    elif images is not None:
+                        content_hash = images.content_hash(image_path)
+                    else:
+                        image_data = Path(image_path).read_bytes()
+                        content_hash = image_content_hash(image_data)
+                    cache_key = FocusCache.key(content_hash, self._cache_provider_key())
+                except OSError as e:
+                    logger.debug(f"Fokus-Cache übersprungen ({image_path}): {e}")
+                if cache_key is not None:
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        return cached
+            
             try:
-                if isinstance(self.provider, OpenAIProvider):
-                    result = self.provider.analyze_image(image_path, image_data)
-                elif isinstance(self.provider, GoogleVisionProvider):
-                    result = self.provider.analyze_image(image_path, image_data)
-                else:
-                    result = None
+                result = self._analyze(image_path, image_data, images)
                 
                 if result:
                     # Erweitere Result mit important_regions
@@ -75,6 +118,9 @@ class FocusDetector:
                             "confidence": result.get("confidence", 0.8),
                         }
                     ]
+                    # Provider-Fallbacks (kein Client, API-/Lesefehler) tragen "fallback": True -> nicht cachen
+                    if cache_key is not None and not result.get("fallback"):
+                        self.cache.put(cache_key, result)
                     return result
             except Exception as e:
                 logger.warning(f"KI-Provider Fehler, verwende Fallback: {e}")
@@ -95,12 +141,33 @@ class FocusDetector:
             ],
         }
     
+    def _analyze(self, image_path: str, image_data: Optional[bytes], images: Optional[ImageCache]) -> Dict[str, Any]:
+        """Provider-Aufruf; mit Bild-Cache werden Bytes bzw. die vorbereitete Form geteilt."""
+        if images is None or image_data is not None:
+            return self.provider.analyze_image(image_path, image_data)
+        
+        prepare = getattr(self.provider, "prepare", None)
+        try:
+            if prepare is not None:
+                prepared = images.decoded(
+                    image_path,
+                    self._cache_provider_key(),
+                    lambda data: prepare(image_path, data)
+                )
+                return self.provider.analyze_image(image_path, prepared=prepared)
+            image_data = images.read_bytes(image_path)
+        except Exception as e:
+            # Lese-/Dekodierfehler meldet der Provider selbst (gleiches Ergebnis wie ohne Cache)
+            logger.debug(f"Bild-Cache übersprungen ({image_path}): {e}")
+        return self.provider.analyze_image(image_path, image_data)
+    
     def suggest_crop(
         self,
         image_path: str,
         target_width: int,
         target_height: int,
-        current_crop: Optional[Dict[str, Any]] = None
+        current_crop: Optional[Dict[str, Any]] = None,
+        focus: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Schlägt einen Crop vor, der den Fokus erhält.
@@ -110,6 +177,7 @@ class FocusDetector:
             target_width: Zielbreite
             target_height: Zielhöhe
             current_crop: Aktueller Crop (optional)
+            focus: Bereits ermitteltes Ergebnis von ``detect_focus`` (spart die zweite Analyse)
         
         Returns:
             {
@@ -121,7 +189,8 @@ class FocusDetector:
                 "focus_overlap": 0.95,  # Wie viel Fokus-Bereich im Crop
             }
         """
-        focus = self.detect_focus(image_path)
+        if focus is None:
+            focus = self.detect_focus(image_path)
         focus_center = focus["focus_center"]
         
         # TODO: Intelligente Crop-Berechnung basierend auf Fokus
@@ -138,6 +207,31 @@ class FocusDetector:
             "focus_center": focus_center,
         }
 
+    
+    def detect_focus_many(
+        self,
+        image_paths: List[str],
+        max_workers: int = 4,
+        images: Optional[ImageCache] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fokus für mehrere Bilder gleichzeitig (Provider-Aufrufe sind I/O-gebunden).
+        
+        Args:
+            image_paths: Bildpfade (Duplikate werden nur einmal analysiert)
+            max_workers: Maximale Anzahl paralleler Analysen
+            images: Bild-Cache des Laufs (optional)
+        
+        Returns:
+            {image_path: Fokus-Daten}
+        """
+        unique = list(dict.fromkeys(p for p in image_paths if p))
+        if max_workers <= 1 or len(unique) <= 1 or not self.provider:
+            return {p: self.detect_focus(p, images=images) for p in unique}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+            return dict(zip(unique, pool.map(lambda p: self.detect_focus(p, images=images), unique)))
+
 
 def detect_image_focus(image_path: str, image_data: Optional[bytes] = None) -> Dict[str, Any]:
     """
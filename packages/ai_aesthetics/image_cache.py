@@ -0,0 +1,94 @@
+"""Bild-Cache pro Optimierungslauf - jedes Asset einmal lesen, einmal verkleinert dekodieren."""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ImageCache:
+    """
+    Gemeinsamer Bildzugriff für alle Seiten eines ``optimize_layout``-Laufs.
+
+    - ``content_hash``: SHA-256 des Dateiinhalts, einmal pro Pfad berechnet
+    - ``read_bytes``: Rohdaten; die zuletzt gelesenen bis ``max_bytes`` bleiben im Speicher
+      (große Bücher halten so nicht alle Originale gleichzeitig)
+    - ``decoded``: beliebige verkleinerte Form (z.B. Graustufen-Array) pro (Pfad, Variante),
+      genau einmal erzeugt - auch wenn mehrere Seiten dasselbe Bild gleichzeitig anfragen
+
+    Thread-sicher (ein Lock pro Pfad).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max(0, int(max_bytes))
+        self.reads = 0
+        self.decodes = 0
+        self._hashes: Dict[str, str] = {}
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._data_size = 0
+        self._decoded: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.RLock] = {}
+
+    def _path_lock(self, path: str) -> threading.RLock:
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.RLock())
+
+    def read_bytes(self, path: str) -> bytes:
+        with self._lock:
+            data = self._data.get(path)
+            if data is not None:
+                self._data.move_to_end(path)
+                return data
+        # Miss unter dem Pfad-Lock: gleichzeitige Anfragen lesen die Datei nur einmal
+        with self._path_lock(path):
+            with self._lock:
+                data = self._data.get(path)
+                if data is not None:
+                    self._data.move_to_end(path)
+                    return data
+            data = Path(path).read_bytes()
+            with self._lock:
+                self.reads += 1
+                self._hashes.setdefault(path, hashlib.sha256(data).hexdigest())
+                if len(data) <= self.max_bytes:
+                    previous = self._data.pop(path, None)
+                    if previous is not None:
+                        self._data_size -= len(previous)
+                    self._data[path] = data
+                    self._data_size += len(data)
+                    while self._data_size > self.max_bytes and self._data:
+                        _, old = self._data.popitem(last=False)
+                        self._data_size -= len(old)
+            return data
+
+    def content_hash(self, path: str) -> str:
+        with self._path_lock(path):
+            with self._lock:
+                cached = self._hashes.get(path)
+            if cached is not None:
+                return cached
+            self.read_bytes(path)
+            with self._lock:
+                return self._hashes[path]
+
+    def decoded(self, path: str, variant: str, decode: Callable[[bytes], Any]) -> Any:
+        """``decode(bytes)`` einmal pro (Pfad, Variante) ausführen und das Ergebnis merken."""
+        key = (path, variant)
+        with self._path_lock(path):
+            with self._lock:
+                if key in self._decoded:
+                    return self._decoded[key]
+            value = decode(self.read_bytes(path))
+            with self._lock:
+                self._decoded[key] = value
+                self.decodes += 1
+            return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"images": len(self._hashes), "reads": self.reads, "decodes": self.decodes}
@@ -1,14 +1,21 @@
 """Integration von AI-Enhanced Aesthetics in Layout-Pipeline."""
 
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
+from .focus_cache import FocusCache
 from .focus_detector import FocusDetector
-from .contextual_placer import ContextualPlacer
+from .contextual_placer import ContextualPlacer, page_text
 from .balance_checker import BalanceChecker
+from .image_cache import ImageCache
 
 logger = logging.getLogger(__name__)
 
+# Stufen pro Seite (Zeiten in ``optimize_layout(...)["timings"]`` summiert über alle Seiten)
+PAGE_STAGES = ("focus", "placement", "balance")
+
 
 class AIAestheticsEngine:
     """
@@ -22,22 +29,34 @@ class AIAestheticsEngine:
         enabled: bool = True,
         focus_provider: str = "openai",
         text_provider: str = "openai",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        focus_cache: Optional[FocusCache] = None,
+        focus_workers: int = 4,
+        page_workers: int = 4
     ):
         """
         Initialisiert AI Aesthetics Engine.
         
         Args:
             enabled: Aktiviert KI-Features (default: True)
-            focus_provider: Provider für Fokus-Detektion ("openai", "google", "fallback")
+            focus_provider: Provider für Fokus-Detektion ("openai", "google", "local", "fallback")
             text_provider: Provider für Text-Analyse ("openai", "fallback")
             api_key: API Key (optional, wird aus Environment gelesen)
+            focus_cache: Fokus-Cache (default: In-Memory LRU)
+            focus_workers: Parallele Fokus-Analysen pro Seite
+            page_workers: Parallel bearbeitete Seiten (1 = seriell)
         """
         self.enabled = enabled
         self.api_key = api_key
+        self.focus_workers = focus_workers
+        self.page_workers = page_workers
         
         if enabled:
-            self.focus_detector = FocusDetector(model_provider=focus_provider, api_key=api_key)
+            self.focus_detector = FocusDetector(
+                model_provider=focus_provider,
+                api_key=api_key,
+                cache=focus_cache if focus_cache is not None else FocusCache()
+            )
             self.contextual_placer = ContextualPlacer(model_provider=text_provider, api_key=api_key)
             self.balance_checker = BalanceChecker()
         else:
@@ -75,82 +94,49 @@ class AIAestheticsEngine:
                     "contextual_placements": 1,
                     "balance_corrections": 3,
                 },
+                "timings": {
+                    "focus_s": 0.8, "placement_s": 0.01, "balance_s": 0.02,  # Summe über Seiten
+                    "apply_s": 0.0, "total_s": 0.3,  # Wanduhr
+                    "pages": 12, "images": 20, "reads": 20, "decodes": 20,
+                },
             }
+        
+        Seiten laufen in einem Thread-Pool (``page_workers``), Bilder werden über einen
+        gemeinsamen ``ImageCache`` pro Lauf nur einmal gelesen und dekodiert.
         """
         if not self.enabled:
             return {
                 "optimized_layout": layout_json,
                 "optimizations": [],
                 "summary": {},
+                "timings": {},
             }
         
-        optimizations = []
+        t_start = time.perf_counter()
+        images = ImageCache()
         pages = layout_json.get("pages", [])
         
-        for page_data in pages:
-            page_number = page_data.get("pageNumber", 1)
-            elements = page_data.get("elements", [])
-            text_blocks = [e for e in elements if e.get("type") == "text"]
-            image_elements = [e for e in elements if e.get("type") == "image"]
-            
-            # 1. Fokus-Detektion für Bilder
-            for img_element in image_elements:
-                image_path = img_element.get("asset", {}).get("uri", "")
-                if image_path and self.focus_detector:
-                    focus = self.focus_detector.detect_focus(image_path)
-                    crop_suggestion = self.focus_detector.suggest_crop(
-                        image_path,
-                        img_element.get("box", {}).get("w_px", 0),
-                        img_element.get("box", {}).get("h_px", 0)
-                    )
-                    
-                    if crop_suggestion.get("preserves_focus"):
-                        optimizations.append({
-                            "type": "focus_adjustment",
-                            "element_id": img_element.get("id"),
-                            "changes": {"crop": crop_suggestion},
-                            "reasoning": f"Fokus erhalten (Type: {focus.get('focus_type')})",
-                        })
-            
-            # 2. Kontextuelle Platzierung
-            if self.contextual_placer and text_blocks and image_elements:
-                for img_element in image_elements:
-                    image_metadata = {
-                        "keywords": img_element.get("metadata", {}).get("keywords", []),
-                        "type": img_element.get("metadata", {}).get("type", "image"),
-                    }
-                    available_positions = [img_element.get("box", {})]
-                    
-                    placement = self.contextual_placer.suggest_image_placement(
-                        text_blocks,
-                        image_metadata,
-                        available_positions
-                    )
-                    
-                    if placement.get("relevance_score", 0) > 0.7:
-                        optimizations.append({
-                            "type": "contextual_placement",
-                            "element_id": img_element.get("id"),
-                            "changes": {"position": placement.get("recommended_position")},
-                            "reasoning": placement.get("reasoning", "Kontextuelle Platzierung"),
-                        })
-            
-            # 3. Balance-Checks
-            if self.balance_checker:
-                balance_result = self.balance_checker.check_layout_balance(page_data, page_number)
-                
-                for suggestion in balance_result.get("suggestions", []):
-                    optimizations.append({
-                        "type": "balance_correction",
-                        "element_id": suggestion.get("element_id"),
-                        "changes": suggestion.get("changes", {}),
-                        "reasoning": suggestion.get("reasoning", "Balance-Verbesserung"),
-                    })
+        # Seiten parallel; Ergebnisse in Seitenreihenfolge -> gleiche Ausgabe wie seriell
+        if self.page_workers > 1 and len(pages) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.page_workers, len(pages))) as pool:
+                page_results = list(pool.map(lambda page: self._optimize_page(page, images), pages))
+        else:
+            page_results = [self._optimize_page(page, images) for page in pages]
+        
+        optimizations = []
+        timings = {stage: 0.0 for stage in PAGE_STAGES}
+        for page_optimizations, page_timings in page_results:
+            optimizations.extend(page_optimizations)
+            for stage, seconds in page_timings.items():
+                timings[stage] += seconds
         
         # Wende Korrekturen an (wenn gewünscht)
+        t_apply = time.perf_counter()
         optimized_layout = layout_json
         if apply_corrections:
             optimized_layout = self._apply_optimizations(layout_json, optimizations)
+        timings["apply"] = time.perf_counter() - t_apply
+        timings["total"] = time.perf_counter() - t_start
         
         # Zusammenfassung
         summary = {
@@ -165,8 +151,98 @@ class AIAestheticsEngine:
             "optimized_layout": optimized_layout,
             "optimizations": optimizations,
             "summary": summary,
+            "timings": {
+                **{f"{stage}_s": round(seconds, 6) for stage, seconds in timings.items()},
+                "pages": len(pages),
+                **images.stats(),
+            },
         }
     
+    def _optimize_page(
+        self,
+        page_data: Dict[str, Any],
+        images: ImageCache
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """Optimierungen einer Seite plus Zeit pro Stufe (focus/placement/balance)."""
+        optimizations = []
+        timings = {stage: 0.0 for stage in PAGE_STAGES}
+        page_number = page_data.get("pageNumber", 1)
+        elements = page_data.get("elements", [])
+        text_blocks = [e for e in elements if e.get("type") == "text"]
+        image_elements = [e for e in elements if e.get("type") == "image"]
+        
+        # 1. Fokus-Detektion für Bilder (alle Bilder der Seite parallel, jedes nur einmal)
+        t0 = time.perf_counter()
+        focus_by_path = {}
+        if self.focus_detector:
+            focus_by_path = self.focus_detector.detect_focus_many(
+                [e.get("asset", {}).get("uri", "") for e in image_elements],
+                max_workers=self.focus_workers,
+                images=images
+            )
+        for img_element in image_elements:
+            image_path = img_element.get("asset", {}).get("uri", "")
+            if image_path and self.focus_detector:
+                focus = focus_by_path[image_path]
+                crop_suggestion = self.focus_detector.suggest_crop(
+                    image_path,
+                    img_element.get("box", {}).get("w_px", 0),
+                    img_element.get("box", {}).get("h_px", 0),
+                    focus=focus
+                )
+                
+                if crop_suggestion.get("preserves_focus"):
+                    optimizations.append({
+                        "type": "focus_adjustment",
+                        "element_id": img_element.get("id"),
+                        "changes": {"crop": crop_suggestion},
+                        "reasoning": f"Fokus erhalten (Type: {focus.get('focus_type')})",
+                    })
+        timings["focus"] = time.perf_counter() - t0
+        
+        # 2. Kontextuelle Platzierung (Text-Kontext einmal pro Seite)
+        t0 = time.perf_counter()
+        if self.contextual_placer and text_blocks and image_elements:
+            context = self.contextual_placer.analyze_text_context(page_text(text_blocks))
+            for img_element in image_elements:
+                image_metadata = {
+                    "keywords": img_element.get("metadata", {}).get("keywords", []),
+                    "type": img_element.get("metadata", {}).get("type", "image"),
+                }
+                available_positions = [img_element.get("box", {})]
+                
+                placement = self.contextual_placer.suggest_image_placement(
+                    text_blocks,
+                    image_metadata,
+                    available_positions,
+                    context=context
+                )
+                
+                if placement.get("relevance_score", 0) > 0.7:
+                    optimizations.append({
+                        "type": "contextual_placement",
+                        "element_id": img_element.get("id"),
+                        "changes": {"position": placement.get("recommended_position")},
+                        "reasoning": placement.get("reasoning", "Kontextuelle Platzierung"),
+                    })
+        timings["placement"] = time.perf_counter() - t0
+        
+        # 3. Balance-Checks
+        t0 = time.perf_counter()
+        if self.balance_checker:
+            balance_result = self.balance_checker.check_layout_balance(page_data, page_number)
+            
+            for suggestion in balance_result.get("suggestions", []):
+                optimizations.append({
+                    "type": "balance_correction",
+                    "element_id": suggestion.get("element_id"),
+                    "changes": suggestion.get("changes", {}),
+                    "reasoning": suggestion.get("reasoning", "Balance-Verbesserung"),
+                })
+        timings["balance"] = time.perf_counter() - t0
+        
+        return optimizations, timings
+    
     def _apply_optimizations(
         self,
         layout_json: Dict[str, Any],
@@ -219,8 +295,9 @@ def get_ai_aesthetics_engine(
     
     Environment Variables:
         AI_AESTHETICS_ENABLED: 'true' zum Aktivieren (default: 'true')
-        AI_FOCUS_PROVIDER: 'openai', 'google', 'fallback' (default: 'openai')
+        AI_FOCUS_PROVIDER: 'openai', 'google', 'local', 'fallback' (default: 'openai')
         AI_TEXT_PROVIDER: 'openai', 'fallback' (default: 'openai')
+        AI_FOCUS_CACHE_DIR: Verzeichnis für persistenten Fokus-Cache (optional)
         OPENAI_API_KEY: OpenAI API Key
         GOOGLE_APPLICATION_CREDENTIALS: Pfad zu Google Service Account JSON
     """
@@ -230,11 +307,13 @@ def get_ai_aesthetics_engine(
     focus_provider = focus_provider or os.environ.get("AI_FOCUS_PROVIDER", "openai")
     text_provider = text_provider or os.environ.get("AI_TEXT_PROVIDER", "openai")
     api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    cache_dir = os.environ.get("AI_FOCUS_CACHE_DIR")
     
     return AIAestheticsEngine(
         enabled=enabled,
         focus_provider=focus_provider,
         text_provider=text_provider,
-        api_key=api_key
+        api_key=api_key,
+        focus_cache=FocusCache(disk_dir=cache_dir) if cache_dir else None
     )
 
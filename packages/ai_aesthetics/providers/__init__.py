@@ -2,6 +2,7 @@
 
 from .openai_provider import OpenAIProvider
 from .google_provider import GoogleVisionProvider
+from .local_provider import LocalSaliencyProvider
 
-__all__ = ["OpenAIProvider", "GoogleVisionProvider"]
+__all__ = ["OpenAIProvider", "GoogleVisionProvider", "LocalSaliencyProvider"]
 
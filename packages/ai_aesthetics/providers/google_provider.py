@@ -68,6 +68,7 @@ class GoogleVisionProvider:
                 "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
                 "focus_type": "center",
                 "confidence": 0.5,
+                "fallback": True,
             }
         
         try:
@@ -144,5 +145,6 @@ class GoogleVisionProvider:
                 "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
                 "focus_type": "center",
                 "confidence": 0.5,
+                "fallback": True,
             }
 
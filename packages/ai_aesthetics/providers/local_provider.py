@@ -0,0 +1,168 @@
+"""Lokaler Fokus-Provider - Spectral-Residual-Saliency auf CPU (kein Netzwerk, keine GPU)."""
+
+import io
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    from PIL import Image
+    HAS_LOCAL_DEPS = True
+except ImportError:
+    HAS_LOCAL_DEPS = False
+    np = None
+    Image = None
+
+
+# Kantenlänge des Analysebilds (Spectral Residual arbeitet auf sehr kleinen Bildern am besten)
+SALIENCY_SIZE = 64
+# Mindest-Standardabweichung der Grauwerte (0..1); darunter gilt das Bild als strukturlos
+MIN_CONTRAST = 0.01
+
+
+def _box_blur(a: "np.ndarray", radius: int) -> "np.ndarray":
+    """Mittelwertfilter (2*radius+1)^2 mit Randwiederholung."""
+    k = 2 * radius + 1
+    padded = np.pad(a, radius, mode="edge")
+    c = np.cumsum(np.cumsum(padded, axis=0), axis=1)
+    c = np.pad(c, ((1, 0), (1, 0)))
+    return (c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]) / (k * k)
+
+
+def saliency_map(gray: "np.ndarray") -> "np.ndarray":
+    """
+    Spectral Residual (Hou & Zhang 2007): log-Amplitudenspektrum minus geglättetes Spektrum,
+    mit Originalphase zurücktransformiert. Ergebnis normalisiert auf 0..1.
+    """
+    spectrum = np.fft.fft2(gray)
+    log_amp = np.log(np.abs(spectrum) + 1e-9)
+    residual = log_amp - _box_blur(log_amp, 1)
+    sal = np.abs(np.fft.ifft2(np.exp(residual + 1j * np.angle(spectrum)))) ** 2
+    sal = _box_blur(_box_blur(sal, 2), 2)  # ~Gauß-Glättung
+    lo, hi = float(sal.min()), float(sal.max())
+    return (sal - lo) / (hi - lo) if hi > lo else np.zeros_like(sal)
+
+
+def _mass_interval(weights: "np.ndarray", lo: float, hi: float) -> Tuple[float, float]:
+    """Intervall [lo-, hi-Quantil] der Gewichtsverteilung, normalisiert auf 0..1."""
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    start = int(np.searchsorted(cdf, lo))
+    end = int(np.searchsorted(cdf, hi)) + 1
+    n = len(weights)
+    return start / n, min(end, n) / n
+
+
+def focus_from_saliency(sal: "np.ndarray", min_size: float = 0.1) -> Optional[Dict[str, Any]]:
+    """Fokus-Zentrum (gewichteter Schwerpunkt) und Region (10-90 % der Saliency-Masse) aus einer Map."""
+    h, w = sal.shape
+    weights = np.where(sal >= 3.0 * float(sal.mean()), sal, 0.0)
+    total = float(weights.sum())
+    if total <= 0.0:
+        return None
+
+    ys, xs = np.mgrid[0:h, 0:w]
+    cx = float((weights * (xs + 0.5)).sum() / total / w)
+    cy = float((weights * (ys + 0.5)).sum() / total / h)
+
+    x0, x1 = _mass_interval(weights.sum(axis=0), 0.1, 0.9)
+    y0, y1 = _mass_interval(weights.sum(axis=1), 0.1, 0.9)
+    # zu schmale Regionen auf min_size verbreitern, zentriert auf den Schwerpunkt
+    rw, rx = (x1 - x0, x0) if x1 - x0 >= min_size else (min_size, cx - min_size / 2)
+    rh, ry = (y1 - y0, y0) if y1 - y0 >= min_size else (min_size, cy - min_size / 2)
+    rx = min(max(0.0, rx), 1.0 - rw)
+    ry = min(max(0.0, ry), 1.0 - rh)
+
+    # Anteil der Saliency in der Region relativ zur Fläche -> Konfidenz 0.5..0.95
+    r0, r1 = int(ry * h), int(np.ceil((ry + rh) * h))
+    c0, c1 = int(rx * w), int(np.ceil((rx + rw) * w))
+    inside = float(sal[r0:r1, c0:c1].sum()) / max(float(sal.sum()), 1e-9)
+    confidence = float(np.clip(0.5 + 0.45 * (inside - rw * rh) / max(1.0 - rw * rh, 1e-9), 0.5, 0.95))
+
+    return {
+        "focus_center": {"x": round(cx, 4), "y": round(cy, 4)},
+        "focus_region": {"x": round(rx, 4), "y": round(ry, 4), "width": round(rw, 4), "height": round(rh, 4)},
+        "confidence": round(confidence, 3),
+    }
+
+
+class LocalSaliencyProvider:
+    """Fokus-Detektion ohne KI-Dienst: Spectral-Residual-Saliency auf verkleinertem Graustufenbild."""
+
+    model = "spectral-residual-v1"
+
+    def __init__(self, size: int = SALIENCY_SIZE):
+        """
+        Initialisiert lokalen Provider.
+
+        Args:
+            size: Längere Kante des Analysebilds in Pixel
+        """
+        if not HAS_LOCAL_DEPS:
+            raise RuntimeError("numpy/Pillow nicht verfügbar. Installiere mit: pip install numpy Pillow")
+        self.size = int(size)
+        logger.info(f"Lokaler Saliency Provider initialisiert (Größe: {self.size})")
+
+    def prepare(self, image_path: str, image_data: Optional[bytes] = None) -> "np.ndarray":
+        """Verkleinertes Graustufenbild (0..1) - wiederverwendbar über ``analyze_image(prepared=...)``."""
+        with Image.open(io.BytesIO(image_data) if image_data else image_path) as img:
+            # JPEG: direkt verkleinert dekodieren (deutlich schneller bei großen Fotos)
+            img.draft("L", (self.size * 2, self.size * 2))
+            img = img.convert("L")
+            img.thumbnail((self.size, self.size), Image.BILINEAR)
+            return np.asarray(img, dtype=np.float64) / 255.0
+
+    def analyze_image(
+        self,
+        image_path: str,
+        image_data: Optional[bytes] = None,
+        prepared: Optional["np.ndarray"] = None
+    ) -> Dict[str, Any]:
+        """
+        Analysiert Bild lokal.
+
+        Args:
+            image_path: Pfad zum Bild
+            image_data: Bilddaten als Bytes (optional)
+            prepared: Ergebnis von ``prepare`` (optional, spart das Dekodieren)
+
+        Returns:
+            {
+                "focus_center": {"x": 0.5, "y": 0.5},
+                "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
+                "focus_type": "object" | "center",
+                "confidence": 0.8,
+                "description": "...",
+            }
+        """
+        try:
+            gray = prepared if prepared is not None else self.prepare(image_path, image_data)
+            focus = None
+            if min(gray.shape) >= 8 and float(gray.std()) >= MIN_CONTRAST:
+                focus = focus_from_saliency(saliency_map(gray))
+        except Exception as e:
+            logger.error(f"Lokale Saliency-Analyse Fehler: {e}")
+            return {
+                "focus_center": {"x": 0.5, "y": 0.5},
+                "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
+                "focus_type": "center",
+                "confidence": 0.5,
+                "description": f"Error: {str(e)}",
+                "fallback": True,
+            }
+
+        if focus is None:
+            # Einfarbig/ohne Struktur: kein ausgeprägter Fokus
+            return {
+                "focus_center": {"x": 0.5, "y": 0.5},
+                "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
+                "focus_type": "center",
+                "confidence": 0.5,
+                "description": "local saliency: no salient region",
+            }
+
+        focus["focus_type"] = "object"
+        focus["description"] = "local saliency (spectral residual)"
+        return focus
@@ -132,6 +132,7 @@ class OpenAIProvider:
                 "focus_type": "center",
                 "confidence": 0.5,
                 "description": f"Error: {str(e)}",
+                "fallback": True,
             }
     
     def analyze_text(
@@ -1,20 +1,93 @@
 """Streaming-Upload für große Dateien - MinIO Multipart Upload."""
 
+import hashlib
 import os
-from io import BytesIO
+from pathlib import Path
 from typing import Optional, Iterator
 from uuid import uuid4
 
 try:
     from minio import Minio
     from minio.error import S3Error
-    from minio.commonconfig import CopySource
     HAS_MINIO = True
 except ImportError:
     HAS_MINIO = False
 
+    class S3Error(Exception):  # type: ignore
+        pass
+
 from packages.common.models import ArtifactType
 
+# MinIO/S3 verlangt mindestens 5 MiB pro Part (außer dem letzten)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Stream überschreitet das erlaubte Größenlimit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class ChunkReader:
+    """
+    File-like Adapter über einen Chunk-Iterator.
+
+    Zählt die Bytes, berechnet die MD5-Checksumme im selben Durchlauf und
+    bricht ab, sobald ``max_bytes`` überschritten wird. Es wird höchstens
+    ein Chunk plus der angeforderte Lesebereich im Speicher gehalten.
+    """
+
+    def __init__(self, stream: Iterator[bytes], max_bytes: Optional[int] = None):
+        self._stream = iter(stream)
+        self._buffer = bytearray()
+        self._md5 = hashlib.md5()
+        self._exhausted = False
+        self.max_bytes = max_bytes
+        self.size = 0
+
+    @property
+    def checksum(self) -> str:
+        return self._md5.hexdigest()
+
+    def _pull(self) -> bool:
+        try:
+            chunk = next(self._stream)
+        except StopIteration:
+            self._exhausted = True
+            return False
+        if not chunk:
+            return True
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        self._md5.update(chunk)
+        self._buffer += chunk
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            while not self._exhausted:
+                self._pull()
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            return data
+        while len(self._buffer) < size and not self._exhausted:
+            self._pull()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def iter_file_chunks(fileobj, chunk_size: int) -> Iterator[bytes]:
+    """Liest ein file-like Objekt chunkweise (z.B. ``UploadFile.file``)."""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
 
 class StreamingArtifactStore:
     """
@@ -68,100 +141,96 @@ class StreamingArtifactStore:
         """Generiert einen Objekt-Pfad im Bucket."""
         return f"{artifact_type.value}/{file_name}"
     
-    def upload_stream(
+    def ingest_stream(
         self,
         stream: Iterator[bytes],
         artifact_type: ArtifactType,
         file_name: Optional[str] = None,
-        mime_type: Optional[str] = None
-    ) -> tuple[str, str, int]:
+        mime_type: Optional[str] = None,
+        length: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> tuple[str, str, int, str]:
         """
-        Streaming-Upload mit MinIO Multipart Upload.
-        
-        Für große Dateien (> 5 MB) wird automatisch Multipart Upload verwendet.
-        Für kleinere Dateien wird ein einfacher Upload verwendet.
-        
+        Streaming-Upload mit Größenlimit und Checksumme in einem Durchlauf.
+
+        Ist ``length`` unbekannt, wird MinIO's Multipart-Upload mit
+        ``part_size=chunk_size`` verwendet (``length=-1``). Der Speicherbedarf
+        bleibt damit unabhängig von der Dateigröße konstant.
+
         Args:
             stream: Iterator von Daten-Chunks
             artifact_type: Artefakt-Typ
             file_name: Dateiname (optional)
             mime_type: MIME-Typ (optional)
-        
+            length: Bekannte Gesamtgröße in Bytes (optional)
+            max_bytes: Maximal erlaubte Größe (optional)
+
         Returns:
-            (storage_uri, file_name, file_size)
+            (storage_uri, file_name, file_size, checksum_md5)
+
+        Raises:
+            UploadTooLargeError: Wenn der Stream ``max_bytes`` überschreitet
         """
         if file_name is None:
             file_name = f"{uuid4()}.bin"
-        
+        if length is not None and max_bytes is not None and length > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+
         object_path = self._get_object_path(artifact_type, file_name)
-        
+        reader = ChunkReader(stream, max_bytes=max_bytes)
+
         try:
-            # Sammle Chunks und prüfe Größe
-            chunks = []
-            total_size = 0
-            
-            for chunk in stream:
-                chunks.append(chunk)
-                total_size += len(chunk)
-            
-            # Für Dateien < 5 MB: Einfacher Upload
-            if total_size < 5 * 1024 * 1024:
-                data = b"".join(chunks)
+            if length is None:
+                # Multipart: MinIO liest Part für Part aus dem Reader
                 self.client.put_object(
                     self.bucket_name,
                     object_path,
-                    BytesIO(data),
-                    length=total_size,
+                    reader,
+                    length=-1,
+                    part_size=max(self.chunk_size, MIN_PART_SIZE),
                     content_type=mime_type or "application/octet-stream"
                 )
             else:
-                # Für große Dateien: Multipart Upload
-                self._upload_multipart(chunks, object_path, mime_type, total_size)
-            
-            storage_uri = f"s3://{self.bucket_name}/{object_path}"
-            return storage_uri, file_name, total_size
-            
+                self.client.put_object(
+                    self.bucket_name,
+                    object_path,
+                    reader,
+                    length=length,
+                    content_type=mime_type or "application/octet-stream"
+                )
         except S3Error as e:
             raise RuntimeError(f"Fehler beim Streaming-Upload: {e}")
-    
-    def _upload_multipart(
+
+        storage_uri = f"s3://{self.bucket_name}/{object_path}"
+        return storage_uri, file_name, reader.size, reader.checksum
+
+    def upload_stream(
         self,
-        chunks: list[bytes],
-        object_path: str,
-        mime_type: Optional[str],
-        total_size: int
-    ):
-        """
-        Führt Multipart Upload durch.
-        
-        Strategy: Upload Parts als separate Objects, dann compose.
+        stream: Iterator[bytes],
+        artifact_type: ArtifactType,
+        file_name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        length: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> tuple[str, str, int]:
         """
-        # MinIO unterstützt compose_object für Multipart-Zusammensetzung
-        # Wir verwenden eine vereinfachte Strategie:
-        # 1. Upload Parts als temporäre Objects
-        # 2. Composing ist kompliziert - für jetzt verwenden wir put_object mit größeren Chunks
-        
-        # Für echten Multipart: MinIO's put_object mit größeren Chunks
-        # Die MinIO-Bibliothek behandelt große Uploads intern bereits optimal
+        Streaming-Upload mit MinIO Multipart Upload.
         
-        # Vereinfachte Lösung: Sammle alle Chunks und verwende put_object
-        # (MinIO optimiert intern für große Dateien)
-        data = b"".join(chunks)
+        Args:
+            stream: Iterator von Daten-Chunks
+            artifact_type: Artefakt-Typ
+            file_name: Dateiname (optional)
+            mime_type: MIME-Typ (optional)
+            length: Bekannte Gesamtgröße in Bytes (optional)
+            max_bytes: Maximal erlaubte Größe (optional)
         
-        self.client.put_object(
-            self.bucket_name,
-            object_path,
-            BytesIO(data),
-            length=total_size,
-            content_type=mime_type or "application/octet-stream"
+        Returns:
+            (storage_uri, file_name, file_size)
+        """
+        storage_uri, file_name, file_size, _ = self.ingest_stream(
+            stream, artifact_type, file_name, mime_type, length=length, max_bytes=max_bytes
         )
-        
-        # TODO: Echter Multipart mit compose_object würde so aussehen:
-        # 1. Upload Parts als temp objects
-        # 2. compose_object() verwenden um Parts zusammenzufügen
-        # 3. Temp objects löschen
-        # Dies erfordert jedoch mehr Komplexität und ist für die meisten
-        # Use-Cases nicht nötig, da MinIO's put_object bereits optimiert ist.
+        return storage_uri, file_name, file_size
     
     def upload_stream_simple(
         self,
@@ -171,8 +240,6 @@ class StreamingArtifactStore:
         mime_type: Optional[str] = None
     ) -> tuple[str, str, int]:
         """
-        Vereinfachter Streaming-Upload (sampled alle Chunks).
-        
         Alias für upload_stream().
         """
         return self.upload_stream(stream, artifact_type, file_name, mime_type)
@@ -218,8 +285,63 @@ class StreamingArtifactStore:
             _read_chunks(),
             artifact_type,
             file_name,
-            mime_type
+            mime_type,
+            length=os.path.getsize(file_path)
+        )
+
+
+class LocalStreamingArtifactStore:
+    """Lokales Gegenstück zu StreamingArtifactStore (ARTIFACT_STORE=local)."""
+
+    def __init__(self, base_dir: str | Path, chunk_size: int = 8 * 1024 * 1024):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+
+    def ingest_stream(
+        self,
+        stream: Iterator[bytes],
+        artifact_type: ArtifactType,
+        file_name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        length: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> tuple[str, str, int, str]:
+        if file_name is None:
+            file_name = f"{uuid4()}.bin"
+        if length is not None and max_bytes is not None and length > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+
+        path = self.base_dir / artifact_type.value / file_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".part")
+        reader = ChunkReader(stream, max_bytes=max_bytes)
+        try:
+            with open(tmp_path, "wb") as f:
+                while True:
+                    data = reader.read(self.chunk_size)
+                    if not data:
+                        break
+                    f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return f"local://{artifact_type.value}/{file_name}", file_name, reader.size, reader.checksum
+
+    def upload_stream(
+        self,
+        stream: Iterator[bytes],
+        artifact_type: ArtifactType,
+        file_name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        length: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> tuple[str, str, int]:
+        storage_uri, file_name, file_size, _ = self.ingest_stream(
+            stream, artifact_type, file_name, mime_type, length=length, max_bytes=max_bytes
         )
+        return storage_uri, file_name, file_size
 
 
 def get_streaming_artifact_store(
@@ -240,7 +362,13 @@ def get_streaming_artifact_store(
         MINIO_BUCKET: Bucket-Name
         MINIO_SECURE: 'true' für HTTPS (default: 'false')
         MINIO_CHUNK_SIZE: Chunk-Größe in Bytes (default: 8388608 = 8 MB)
+        ARTIFACT_STORE: 'local' für lokalen Fallback (wie get_artifact_store)
     """
+    store_kind = (os.environ.get("ARTIFACT_STORE") or "").strip().lower()
+    if store_kind == "local" or not HAS_MINIO:
+        base_dir = os.environ.get("LOCAL_ARTIFACT_DIR", ".local_artifacts")
+        return LocalStreamingArtifactStore(base_dir, chunk_size)  # type: ignore[return-value]
+
     endpoint = endpoint or os.environ.get("MINIO_ENDPOINT", "localhost:9000")
     access_key = access_key or os.environ.get("MINIO_ACCESS_KEY", "minioadmin")
     secret_key = secret_key or os.environ.get("MINIO_SECRET_KEY", "minioadmin")
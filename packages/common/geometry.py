@@ -0,0 +1,158 @@
+"""Spaltenorientierte BBox-Geometrie für große Layouts (optional NumPy).
+
+``LayoutGeometry.from_layout`` liest alle vollständigen ``bbox``-Dicts (x/y/w/h) eines Layouts
+einmal in NumPy-Arrays; Skalieren, Verschieben, Einheiten-Umrechnung, Bounds- und
+Überlappungs-Checks laufen danach vektorisiert. Die Rechenschritte entsprechen exakt den
+Einzelobjekt-Schleifen (gleiche float64-Operationen in gleicher Reihenfolge), damit Aufrufer
+ab ``GEOMETRY_MIN_OBJECTS`` Objekten umschalten können, ohne dass sich Ergebnisse ändern.
+
+Ohne NumPy ist ``HAS_NUMPY`` False und ``use_geometry`` liefert immer False.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+# Ab dieser Objektanzahl lohnt sich der Aufbau der Arrays
+GEOMETRY_MIN_OBJECTS = 500
+
+_BBOX_KEYS = frozenset({"x", "y", "w", "h"})
+_OVERLAP_BLOCK = 1024  # Zeilen pro Block beim paarweisen Überlappungs-Check
+
+
+def count_objects(layout_json: Dict[str, Any]) -> int:
+    """Anzahl Objekte über alle Seiten (ohne Validierung der Struktur)."""
+    total = 0
+    for page in layout_json.get("pages", []) or []:
+        if isinstance(page, dict):
+            total += len(page.get("objects", []) or [])
+    return total
+
+
+def use_geometry(layout_json: Dict[str, Any], *, min_objects: Optional[int] = None) -> bool:
+    """True, wenn NumPy verfügbar ist und das Layout groß genug für den Array-Pfad ist."""
+    if not HAS_NUMPY:
+        return False
+    threshold = GEOMETRY_MIN_OBJECTS if min_objects is None else min_objects
+    return count_objects(layout_json) >= threshold
+
+
+class LayoutGeometry:
+    """
+    BBoxes eines Layouts als Spalten: ``x``, ``y``, ``w``, ``h`` (float64), ``page`` (Seitenindex),
+    ``ids`` und ``refs`` ((Seitenindex, Objektindex) je Zeile, für Rückschreiben und Meldungen).
+
+    Operationen liefern neue Instanzen; ``ids``/``refs``/``page`` werden geteilt.
+    """
+
+    __slots__ = ("ids", "refs", "page", "x", "y", "w", "h")
+
+    def __init__(self, ids: List[Any], refs: List[Tuple[int, int]], page: Any, x: Any, y: Any, w: Any, h: Any):
+        self.ids = ids
+        self.refs = refs
+        self.page = page
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    @classmethod
+    def from_layout(cls, layout_json: Dict[str, Any]) -> "LayoutGeometry":
+        """
+        Objekte ohne vollständige bbox werden übersprungen (wie in den Schleifen);
+        nicht-numerische Werte werfen denselben Fehler wie ``float(...)``.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("LayoutGeometry requires numpy")
+
+        ids: List[Any] = []
+        refs: List[Tuple[int, int]] = []
+        values: List[float] = []
+        append = values.append
+        for pi, page in enumerate(layout_json.get("pages", []) or []):
+            for oi, obj in enumerate(page.get("objects", []) or []):
+                bbox = obj.get("bbox") or {}
+                if not _BBOX_KEYS <= bbox.keys():
+                    continue
+                append(float(bbox["x"]))
+                append(float(bbox["y"]))
+                append(float(bbox["w"]))
+                append(float(bbox["h"]))
+                ids.append(obj.get("id"))
+                refs.append((pi, oi))
+
+        cols = np.array(values, dtype=np.float64).reshape(-1, 4)
+        page = np.fromiter((pi for pi, _ in refs), dtype=np.int64, count=len(refs))
+        # Spalten kopieren -> zusammenhängender Speicher für die Vektor-Operationen
+        return cls(ids, refs, page, cols[:, 0].copy(), cols[:, 1].copy(), cols[:, 2].copy(), cols[:, 3].copy())
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def _with(self, x: Any, y: Any, w: Any, h: Any) -> "LayoutGeometry":
+        return LayoutGeometry(self.ids, self.refs, self.page, x, y, w, h)
+
+    # --- Transformationen -------------------------------------------------
+
+    def scaled(self, sx: float, sy: float, *, min_size: Optional[float] = None) -> "LayoutGeometry":
+        """x/w mit ``sx``, y/h mit ``sy`` skalieren; w/h optional nach unten begrenzen."""
+        w = self.w * sx
+        h = self.h * sy
+        if min_size is not None:
+            # fmax wie max(min_size, v): NaN -> min_size
+            w = np.fmax(w, min_size)
+            h = np.fmax(h, min_size)
+        return self._with(self.x * sx, self.y * sy, w, h)
+
+    def translated(self, dx: float, dy: float) -> "LayoutGeometry":
+        return self._with(self.x + dx, self.y + dy, self.w, self.h)
+
+    def converted(self, from_per_inch: float, to_per_inch: float) -> "LayoutGeometry":
+        """Einheiten umrechnen: ``(v / from_per_inch) * to_per_inch`` (z.B. px@300dpi -> pt: 300, 72)."""
+        f = float(from_per_inch)
+        t = float(to_per_inch)
+        return self._with((self.x / f) * t, (self.y / f) * t, (self.w / f) * t, (self.h / f) * t)
+
+    # --- Checks -----------------------------------------------------------
+
+    def out_of_bounds(self, left: float, top: float, right: float, bottom: float) -> Any:
+        """Bool-Maske: Box ragt über ``left``/``top`` bzw. ``right``/``bottom`` hinaus."""
+        return (self.x < left) | (self.y < top) | ((self.x + self.w) > right) | ((self.y + self.h) > bottom)
+
+    def overlapping_pairs(self, *, min_area: float = 0.0) -> Iterator[Tuple[int, int]]:
+        """
+        Zeilenpaare (i < j) auf derselben Seite, deren Schnittfläche > ``min_area`` ist,
+        sortiert nach (i, j).
+        """
+        x2 = self.x + self.w
+        y2 = self.y + self.h
+        for p in np.unique(self.page):
+            rows = np.flatnonzero(self.page == p)
+            for start in range(0, len(rows), _OVERLAP_BLOCK):
+                block = rows[start : start + _OVERLAP_BLOCK]
+                ix = np.minimum(x2[block][:, None], x2[rows][None, :]) - np.maximum(self.x[block][:, None], self.x[rows][None, :])
+                iy = np.minimum(y2[block][:, None], y2[rows][None, :]) - np.maximum(self.y[block][:, None], self.y[rows][None, :])
+                hit = (ix > 0) & (iy > 0) & (ix * iy > min_area)
+                hit &= block[:, None] < rows[None, :]
+                bi, rj = np.nonzero(hit)
+                for i, j in zip(block[bi].tolist(), rows[rj].tolist()):
+                    yield i, j
+
+    # --- Rückschreiben ----------------------------------------------------
+
+    def write_to(self, layout_json: Dict[str, Any], *, keys: Tuple[str, ...] = ("x", "y", "w", "h")) -> None:
+        """Werte in die bbox-Dicts von ``layout_json`` zurückschreiben (gleiche Struktur wie beim Aufbau)."""
+        pages = layout_json.get("pages", []) or []
+        cols = {"x": self.x.tolist(), "y": self.y.tolist(), "w": self.w.tolist(), "h": self.h.tolist()}
+        selected = [(k, cols[k]) for k in keys]
+        for row, (pi, oi) in enumerate(self.refs):
+            bbox = pages[pi]["objects"][oi]["bbox"]
+            for k, col in selected:
+                bbox[k] = col[row]
@@ -0,0 +1,86 @@
+"""Ein Durchlauf über Seiten/Objekte eines Layouts für mehrere Checks (Visitor).
+
+Jeder Check ist ein ``LayoutVisitor``; ``walk_layout`` besucht Seiten und Objekte genau
+einmal und ruft alle Visitors auf. Die Einzel-Checks (Preflight-Semantik, KDP-Bounds,
+Quality-Gate, Heuristiken) laufen als ``walk_layout(layout, [visitor])``, der fusionierte
+Check in ``packages.quality_check.engine`` mit allen Visitors zugleich - dieselbe Logik.
+
+Nicht-Dict-Seiten/-Objekte: Visitors mit ``skip_non_dict`` (Quality-Gate, Heuristiken)
+sehen sie nicht. Die übrigen (Preflight-Semantik, KDP-Bounds) bekommen sie weiterhin und
+scheitern wie ihre früheren Einzel-Schleifen mit ``AttributeError`` an ``.get``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+XYWH = Optional[Tuple[float, float, float, float]]
+
+
+class LayoutVisitor:
+    """
+    Ein Check innerhalb von ``walk_layout``.
+
+    ``visit_object`` erhält die Werte, die fast jeder Check braucht, einmal pro Objekt
+    berechnet: ``obj_type`` (``str(obj["type"] or "")``) und ``xywh`` (floats, None bei
+    unvollständiger bbox). ``xywh`` wird nur geparst, wenn mindestens ein Visitor
+    ``needs_bbox`` setzt (sonst immer None); ``finish`` liefert das Check-Ergebnis.
+    Mit ``skip_non_dict`` werden Seiten/Objekte, die kein Dict sind, übersprungen.
+    """
+
+    needs_bbox = False
+    skip_non_dict = False
+
+    def visit_page(self, page: Dict[str, Any]) -> None:
+        pass
+
+    def visit_object(self, obj: Dict[str, Any], obj_type: str, xywh: XYWH) -> None:
+        pass
+
+    def finish(self) -> Any:
+        raise NotImplementedError
+
+
+def bbox_xywh(obj: Dict[str, Any]) -> XYWH:
+    """bbox als (x, y, w, h) in float; None wenn ein Schlüssel fehlt."""
+    bbox = obj.get("bbox") or {}
+    if type(bbox) is dict:
+        if not ("x" in bbox and "y" in bbox and "w" in bbox and "h" in bbox):
+            return None
+    elif not {"x", "y", "w", "h"} <= set(bbox.keys()):
+        return None
+    return float(bbox["x"]), float(bbox["y"]), float(bbox["w"]), float(bbox["h"])
+
+
+def _overrides(visitor: LayoutVisitor, name: str) -> bool:
+    return getattr(type(visitor), name) is not getattr(LayoutVisitor, name)
+
+
+def walk_layout(layout_json: Dict[str, Any], visitors: Sequence[LayoutVisitor]) -> None:
+    """Ein Durchlauf über alle Seiten und Objekte, Aufruf aller Visitors."""
+    page_hooks = [v.visit_page for v in visitors if _overrides(v, "visit_page")]
+    object_hooks = [v.visit_object for v in visitors if _overrides(v, "visit_object")]
+    # Nicht-Dict-Einträge bekommen nur Visitors ohne skip_non_dict
+    strict = [v for v in visitors if not v.skip_non_dict]
+    strict_page_hooks = [v.visit_page for v in strict if _overrides(v, "visit_page")]
+    strict_object_hooks = [v.visit_object for v in strict if _overrides(v, "visit_object")]
+    needs_bbox = any(v.needs_bbox for v in visitors)
+    for page in layout_json.get("pages", []) or []:
+        if isinstance(page, dict):
+            p_hooks, o_hooks = page_hooks, object_hooks
+        elif strict:
+            p_hooks, o_hooks = strict_page_hooks, strict_object_hooks
+        else:
+            continue
+        for hook in p_hooks:
+            hook(page)
+        for obj in page.get("objects", []) or []:
+            hooks = o_hooks
+            if not isinstance(obj, dict):
+                if not strict:
+                    continue
+                hooks = strict_object_hooks
+            obj_type = str(obj.get("type") or "")
+            xywh = bbox_xywh(obj) if needs_bbox else None
+            for hook in hooks:
+                hook(obj, obj_type, xywh)
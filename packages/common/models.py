@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -85,6 +85,16 @@ class JobResponse(BaseModel):
     output_artifact: Optional[ArtifactInfo] = None
 
 
+class JobBatchCreateRequest(BaseModel):
+    """Request für Batch-Job-Erstellung (mehrere Layouts in einem Request)."""
+    jobs: List[JobCreateRequest] = Field(..., min_length=1, description="Zu erstellende Jobs")
+
+
+class JobBatchResponse(BaseModel):
+    """Response für Batch-Job-Erstellung (Reihenfolge wie im Request)."""
+    jobs: List[JobResponse]
+
+
 class PageInfo(BaseModel):
     """Seiten-Informationen."""
     id: UUID
@@ -0,0 +1,247 @@
+"""Priority-Lanes und faire Queue-Reihenfolge für RQ-Worker.
+
+Queue-Namen haben die Form ``<kind>:<lane>:<tenant>`` (z.B. ``compile:high:acme``).
+Das API-Gateway wählt die Lane anhand Job-Typ/Priorität und registriert jede
+verwendete Queue im Redis-Set ``QUEUE_REGISTRY_KEY``; der Worker liest das Set
+und bestimmt vor jedem Dequeue die Reihenfolge über ``FairQueueOrder``:
+
+- Lanes werden per Smooth-Weighted-Round-Robin bevorzugt (high > normal > bulk),
+  nachrangige Lanes folgen, damit der Worker nie leer läuft, wenn Arbeit da ist.
+- Innerhalb einer Lane rotieren die Tenants: wer zuletzt bedient wurde, kommt ans Ende.
+
+Eigene Queues gibt es nur für konfigurierte Tenants (``TenantPolicy``: per API-Key
+zugeordnet oder Allowlist, begrenzte Anzahl); alle anderen Requests laufen über
+``DEFAULT_TENANT``. Leere Tenant-Queues entfernt der Worker wieder aus dem Registry-Set
+(``prune_empty_queues``), damit Set, Dequeue und Metriken nicht unbegrenzt wachsen.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+LANE_HIGH = "high"
+LANE_NORMAL = "normal"
+LANE_BULK = "bulk"
+LANES = (LANE_HIGH, LANE_NORMAL, LANE_BULK)
+LANE_WEIGHTS = {LANE_HIGH: 6, LANE_NORMAL: 3, LANE_BULK: 1}
+
+QUEUE_KINDS = ("compile", "export", "workflow")
+LEGACY_QUEUES = QUEUE_KINDS  # Flache Queues aus der Zeit vor den Lanes
+
+# Ab dieser Priorität landet ein Job in der High-Lane
+HIGH_PRIORITY_THRESHOLD = 10
+
+DEFAULT_TENANT = "default"
+DEFAULT_MAX_TENANTS = 50
+QUEUE_REGISTRY_KEY = "sched:queues"
+WAIT_STATS_KEY_PREFIX = "sched:wait:"
+
+# RQ-Schlüssel (rq.Queue.redis_queue_namespace_prefix / redis_queues_keys)
+RQ_QUEUE_KEY_PREFIX = "rq:queue:"
+RQ_QUEUES_KEY = "rq:queues"
+
+# Entfernt eine Queue aus Registry und RQ-Queue-Set, aber nur wenn sie leer ist.
+# Atomar gegenüber dem Gateway, das SADD + Enqueue in einer MULTI-Transaktion schickt.
+# KEYS[1] = Registry, KEYS[2] = RQ-Queue-Liste, KEYS[3] = RQ-Queue-Set; ARGV[1] = Queue-Name
+PRUNE_QUEUE_LUA = """
+if redis.call('LLEN', KEYS[2]) > 0 then
+    return 0
+end
+redis.call('SREM', KEYS[1], ARGV[1])
+redis.call('SREM', KEYS[3], KEYS[2])
+return 1
+"""
+
+_TENANT_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def normalize_tenant(tenant: Optional[str]) -> str:
+    """Bereinigt eine Tenant-ID für die Verwendung im Queue-Namen."""
+    if not tenant:
+        return DEFAULT_TENANT
+    cleaned = _TENANT_RE.sub("_", str(tenant).strip())[:64]
+    return cleaned or DEFAULT_TENANT
+
+
+def lane_for(kind: str, priority: int = 0, bulk: bool = False) -> str:
+    """
+    Bestimmt die Lane eines Jobs.
+
+    - Priorität >= HIGH_PRIORITY_THRESHOLD -> high
+    - Workflow-Jobs und Batch-Einreichungen -> bulk
+    - sonst -> normal (interaktive Einzel-Compiles)
+    """
+    if int(priority or 0) >= HIGH_PRIORITY_THRESHOLD:
+        return LANE_HIGH
+    if bulk or kind == "workflow":
+        return LANE_BULK
+    return LANE_NORMAL
+
+
+def queue_name(kind: str, lane: str, tenant: Optional[str] = None) -> str:
+    """Queue-Name für (Job-Art, Lane, Tenant)."""
+    if kind not in QUEUE_KINDS:
+        raise ValueError(f"Unbekannte Queue-Art: {kind}")
+    if lane not in LANES:
+        raise ValueError(f"Unbekannte Lane: {lane}")
+    return f"{kind}:{lane}:{normalize_tenant(tenant)}"
+
+
+def parse_queue_name(name: str) -> Optional[tuple[str, str, str]]:
+    """Zerlegt einen Lane-Queue-Namen in (kind, lane, tenant); None für andere Queues."""
+    parts = name.split(":", 2)
+    if len(parts) != 3 or parts[0] not in QUEUE_KINDS or parts[1] not in LANES:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def base_queue_names(tenants: Iterable[str] = (DEFAULT_TENANT,)) -> list[str]:
+    """Alle Lane-Queues für die angegebenen Tenants (Startmenge des Workers)."""
+    return [queue_name(kind, lane, tenant) for lane in LANES for tenant in tenants for kind in QUEUE_KINDS]
+
+
+def prune_empty_queues(connection, names: Iterable[str]) -> list[str]:
+    """
+    Entfernt leere Queues aus dem Registry-Set (ein Pipeline-Roundtrip).
+
+    Returns:
+        Namen der entfernten Queues
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return []
+    script = connection.register_script(PRUNE_QUEUE_LUA)
+    pipe = connection.pipeline()
+    for name in names:
+        script(
+            keys=[QUEUE_REGISTRY_KEY, RQ_QUEUE_KEY_PREFIX + name, RQ_QUEUES_KEY],
+            args=[name],
+            client=pipe,
+        )
+    return [name for name, removed in zip(names, pipe.execute()) if int(removed or 0) == 1]
+
+
+class TenantPolicy:
+    """
+    Bestimmt den Scheduling-Tenant eines Requests.
+
+    - API-Key mit zugeordnetem Tenant -> dieser Tenant (ein angefragter Tenant wird ignoriert)
+    - sonst der angefragte Tenant, falls er auf der Allowlist steht
+    - sonst ``DEFAULT_TENANT``
+
+    Es gibt höchstens ``max_tenants`` eigene Tenants (API-Key-Tenants zuerst, dann
+    Allowlist, jeweils sortiert) - unbekannte Werte legen nie neue Queues an.
+    """
+
+    def __init__(
+        self,
+        allowed: Iterable[str] = (),
+        api_keys: Optional[Mapping[str, str]] = None,
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+    ):
+        self.api_keys = {key: normalize_tenant(tenant) for key, tenant in (api_keys or {}).items() if key}
+        ordered = sorted(set(self.api_keys.values())) + sorted(normalize_tenant(t) for t in allowed)
+        candidates = [tenant for tenant in dict.fromkeys(ordered) if tenant != DEFAULT_TENANT]
+        if len(candidates) > max_tenants:
+            logger.warning(
+                "Zu viele Tenants konfiguriert (%d, max %d) - überzählige laufen über '%s'",
+                len(candidates), max_tenants, DEFAULT_TENANT,
+            )
+        self.tenants = frozenset(candidates[:max(0, max_tenants)])
+
+    @classmethod
+    def from_config(cls, allowlist: str = "", api_keys: str = "", max_tenants: int = DEFAULT_MAX_TENANTS) -> "TenantPolicy":
+        """Aus Config-Strings: ``allowlist="acme,globex"``, ``api_keys="<key>=<tenant>,..."``."""
+        mapping = {}
+        for entry in (api_keys or "").split(","):
+            key, sep, tenant = entry.strip().rpartition("=")
+            if sep and key and tenant:
+                mapping[key] = tenant
+        allowed = [tenant.strip() for tenant in (allowlist or "").split(",") if tenant.strip()]
+        return cls(allowed, mapping, max_tenants)
+
+    def resolve(self, requested: Optional[str] = None, api_key: Optional[str] = None) -> str:
+        """Tenant für (angefragten Tenant, API-Key); unbekannte Tenants -> ``DEFAULT_TENANT``."""
+        tenant = self.api_keys.get(api_key) if api_key else None
+        if tenant is None:
+            tenant = normalize_tenant(requested)
+        return tenant if tenant in self.tenants else DEFAULT_TENANT
+
+
+class FairQueueOrder:
+    """
+    Berechnet die Dequeue-Reihenfolge über alle bekannten Queues.
+
+    Zustandsbehaftet (Lane-Gewichte, Tenant-Rotation), aber ohne Redis-Zugriff -
+    der Worker übergibt die Queue-Namen und meldet bediente Queues zurück.
+    """
+
+    def __init__(self, weights: Optional[dict[str, int]] = None):
+        self.weights = dict(weights or LANE_WEIGHTS)
+        self._current = {lane: 0 for lane in LANES}
+        self._tenant_order: dict[str, list[str]] = {lane: [] for lane in LANES}
+
+    def _next_lane(self) -> str:
+        # Smooth Weighted Round Robin (wie nginx): deterministisch, ohne Bursts.
+        # Nur Vorschau - der Zustand rückt erst in served() vor, Leerlauf-Polls zählen nicht.
+        return max(LANES, key=lambda lane: self._current[lane] + self.weights.get(lane, 0))
+
+    def _advance(self) -> None:
+        # Ein SWRR-Schritt pro Dequeue; eine leere bevorzugte Lane verliert ihren Zug
+        # (kein unbegrenztes Guthaben, Summe der Zähler bleibt 0).
+        best = self._next_lane()
+        for lane in LANES:
+            self._current[lane] += self.weights.get(lane, 0)
+        self._current[best] -= sum(self.weights.values())
+
+    def _tenants(self, lane: str, present: Iterable[str]) -> list[str]:
+        order = self._tenant_order[lane]
+        present = set(present)
+        for tenant in sorted(present - set(order)):
+            order.append(tenant)
+        return [tenant for tenant in order if tenant in present]
+
+    def order(self, names: Iterable[str]) -> list[str]:
+        """
+        Sortiert Queue-Namen für den nächsten Dequeue.
+
+        Bevorzugte Lane zuerst, danach die übrigen Lanes in Prioritätsreihenfolge;
+        Legacy-/Fremd-Queues am Ende.
+        """
+        by_lane: dict[str, dict[str, list[str]]] = {lane: {} for lane in LANES}
+        others: list[str] = []
+        for name in dict.fromkeys(names):
+            parsed = parse_queue_name(name)
+            if parsed is None:
+                others.append(name)
+                continue
+            kind, lane, tenant = parsed
+            by_lane[lane].setdefault(tenant, []).append(name)
+
+        preferred = self._next_lane()
+        lanes = [preferred] + [lane for lane in LANES if lane != preferred]
+
+        ordered: list[str] = []
+        for lane in lanes:
+            tenant_queues = by_lane[lane]
+            for tenant in self._tenants(lane, tenant_queues.keys()):
+                ordered.extend(
+                    sorted(tenant_queues[tenant], key=lambda n: QUEUE_KINDS.index(n.split(":", 1)[0]))
+                )
+        return ordered + others
+
+    def served(self, name: str) -> None:
+        """Meldet, dass aus ``name`` ein Job entnommen wurde (Lane-Gewichte rücken vor, Tenant ans Ende)."""
+        parsed = parse_queue_name(name)
+        if parsed is None:
+            return
+        _, lane, tenant = parsed
+        self._advance()
+        order = self._tenant_order[lane]
+        if tenant in order:
+            order.remove(tenant)
+        order.append(tenant)
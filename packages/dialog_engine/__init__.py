@@ -10,6 +10,8 @@ from .question_engine import Choice, Question, build_default_questionnaire
 from .decision_store import DecisionStore
 from .session import DialogSession
 from .agents import AgentExecutor, AgentPrompt, AGENT_REGISTRY
+from .agent_runner import AgentRunner
+from .response_cache import ResponseCache
 
 __all__ = [
     "Choice",
@@ -20,4 +22,6 @@ __all__ = [
     "AgentExecutor",
     "AgentPrompt",
     "AGENT_REGISTRY",
+    "AgentRunner",
+    "ResponseCache",
 ]
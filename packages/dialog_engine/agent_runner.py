@@ -0,0 +1,224 @@
+"""Nebenläufige Agent-Ausführung für viele Layouts.
+
+``AgentRunner`` verteilt ``AgentExecutor.prompt_agent``-Aufrufe auf einen Thread-Pool
+(die LLM-Clients sind synchron) und koordiniert sie per asyncio:
+
+- ``max_concurrency``: höchstens so viele LLM-Aufrufe gleichzeitig
+- ``rate_limits``: Mindestabstand zwischen Requests je Provider (``LLMClient.provider``),
+  prozessweit geteilt, damit parallele Läufe das Provider-Limit gemeinsam einhalten
+- ``timeout``: pro Aufruf, ab Start des Aufrufs; der Thread läuft weiter, bis der Client
+  zurückkehrt (Client-Timeout wie ``OPENAI_TIMEOUT`` zusätzlich setzen), das Ergebnis wird verworfen
+- ``pipeline``: abhängige Agents (``AGENT_DEPENDENCIES``) warten pro Layout auf ihre
+  Vorgänger und bekommen deren Ausgabe als ``upstream``; unabhängige Layouts laufen parallel
+- ``batch_size``: >1 packt bis zu so viele Layouts pro Agent in einen Request
+  (``AgentExecutor.complete_batch``); ungültige Elemente werden einzeln nachgefragt.
+  Mit ``pipeline`` laufen die Agents dann stufenweise (alle Vorgänger-Batches zuerst),
+  ``timeout`` gilt pro Batch-Request
+
+Ergebnisse kommen in Eingabereihenfolge zurück; jedes Ergebnis ist entweder die Agent-Ausgabe
+oder die Exception des Aufrufs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .agents import AGENT_DEPENDENCIES, AgentExecutor
+
+AgentResult = Union[Dict[str, Any], BaseException]
+
+
+class RateLimiter:
+    """Gleichmäßiger Abstand zwischen Requests (``rate`` pro Sekunde), thread-sicher."""
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self._interval = 1.0 / self.rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def reserve(self) -> float:
+        """Reserviert den nächsten Slot und liefert die Wartezeit bis dahin in Sekunden."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+            return slot - now
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def rate_limiter_for(provider: str, rate: float) -> RateLimiter:
+    """Prozessweiter Limiter je Provider; bei geänderter Rate wird er ersetzt."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(provider)
+        if limiter is None or limiter.rate != float(rate):
+            limiter = RateLimiter(rate)
+            _LIMITERS[provider] = limiter
+        return limiter
+
+
+class AgentRunner:
+    def __init__(
+        self,
+        executor: AgentExecutor,
+        *,
+        max_concurrency: int = 4,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        timeout: Optional[float] = None,
+        pipeline: bool = False,
+        batch_size: int = 1,
+    ):
+        self.executor = executor
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.pipeline = pipeline
+        self.batch_size = max(1, int(batch_size))
+        self.batch_requests = 0  # Batches mit >1 Element (auch wenn komplett aus dem Cache bedient)
+        self.single_fallbacks = 0  # einzeln nachgefragte Elemente
+        provider = str(getattr(executor.llm, "provider", "") or type(executor.llm).__name__)
+        rate = (rate_limits or {}).get(provider)
+        self.limiter = rate_limiter_for(provider, rate) if rate else None
+
+    def run(self, inputs: Sequence[Dict[str, Any]], agent_ids: Sequence[str]) -> List[Dict[str, AgentResult]]:
+        """Alle Agents für alle Eingaben; Liste (je Eingabe) von {agent_id: Ausgabe oder Exception}."""
+        coro = self._run_all(list(inputs), list(agent_ids))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Aufruf aus laufendem Event-Loop (z.B. async Step): eigener Loop in Hilfs-Thread
+        with ThreadPoolExecutor(max_workers=1) as helper:
+            return helper.submit(asyncio.run, coro).result()
+
+    async def _run_all(self, inputs: List[Dict[str, Any]], agent_ids: List[str]) -> List[Dict[str, AgentResult]]:
+        sem = asyncio.Semaphore(self.max_concurrency)
+        # Reserve-Threads: abgelaufene Aufrufe blockieren ihren Thread, bis der Client zurückkehrt
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency * 2, thread_name_prefix="agent")
+        try:
+            if self.batch_size > 1:
+                return await self._run_batched(inputs, agent_ids, sem, pool)
+            layouts = [self._run_layout(data, agent_ids, sem, pool) for data in inputs]
+            return list(await asyncio.gather(*layouts))
+        finally:
+            # nicht auf abgelaufene (noch laufende) Aufrufe warten
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_layout(
+        self, data: Dict[str, Any], agent_ids: List[str], sem: asyncio.Semaphore, pool: ThreadPoolExecutor
+    ) -> Dict[str, AgentResult]:
+        tasks: Dict[str, "asyncio.Task[AgentResult]"] = {}
+        for agent_id in agent_ids:
+            deps = [(d, tasks[d]) for d in AGENT_DEPENDENCIES.get(agent_id, ()) if d in tasks] if self.pipeline else []
+            tasks[agent_id] = asyncio.ensure_future(self._run_agent(agent_id, data, deps, sem, pool))
+        return {agent_id: await task for agent_id, task in tasks.items()}
+
+    def _stages(self, agent_ids: List[str]) -> List[List[str]]:
+        """Ohne Pipeline eine Stufe; sonst Agents nach Abhängigkeitstiefe gruppiert (Reihenfolge bleibt)."""
+        if not self.pipeline:
+            return [agent_ids]
+        depth: Dict[str, int] = {}
+        for agent_id in agent_ids:
+            deps = [d for d in AGENT_DEPENDENCIES.get(agent_id, ()) if d in depth]
+            depth[agent_id] = 1 + max((depth[d] for d in deps), default=-1)
+        return [[a for a in agent_ids if depth[a] == level] for level in range(max(depth.values(), default=-1) + 1)]
+
+    async def _run_batched(
+        self, inputs: List[Dict[str, Any]], agent_ids: List[str], sem: asyncio.Semaphore, pool: ThreadPoolExecutor
+    ) -> List[Dict[str, AgentResult]]:
+        results: List[Dict[str, AgentResult]] = [{} for _ in inputs]
+        for stage in self._stages(agent_ids):
+            jobs = []
+            for agent_id in stage:
+                datas = [self._with_upstream(agent_id, data, done) for data, done in zip(inputs, results)]
+                for start in range(0, len(datas), self.batch_size):
+                    jobs.append((agent_id, start, self._run_batch(agent_id, datas[start : start + self.batch_size], sem, pool)))
+            chunks = await asyncio.gather(*(job for _, _, job in jobs))
+            for (agent_id, start, _), chunk in zip(jobs, chunks):
+                for offset, result in enumerate(chunk):
+                    results[start + offset][agent_id] = result
+        # Agent-Reihenfolge wie im Einzelmodus
+        return [{a: r[a] for a in agent_ids if a in r} for r in results]
+
+    def _with_upstream(self, agent_id: str, data: Dict[str, Any], done: Dict[str, AgentResult]) -> Dict[str, Any]:
+        if not self.pipeline:
+            return data
+        upstream = {}
+        for dep_id in AGENT_DEPENDENCIES.get(agent_id, ()):
+            result = done.get(dep_id)
+            if result is not None and not isinstance(result, BaseException):
+                upstream[dep_id] = result
+        return {**data, "upstream": upstream} if upstream else data
+
+    async def _run_batch(
+        self, agent_id: str, datas: List[Dict[str, Any]], sem: asyncio.Semaphore, pool: ThreadPoolExecutor
+    ) -> List[AgentResult]:
+        if len(datas) == 1:
+            return [await self._run_agent(agent_id, datas[0], [], sem, pool)]
+
+        async with sem:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(pool, self.executor.complete_batch, agent_id, datas)
+            self.batch_requests += 1
+            try:
+                batch: List[Any] = list(await asyncio.wait_for(call, self.timeout))
+            except asyncio.TimeoutError:
+                return [TimeoutError(f"Agent {agent_id} batch timed out after {self.timeout}s")] * len(datas)
+            except Exception as exc:
+                return [exc] * len(datas)
+
+        missing = [i for i, result in enumerate(batch) if result is None]
+        self.single_fallbacks += len(missing)
+        # Cache wurde in complete_batch schon geprüft -> Einzel-Fallback ohne zweites Nachschlagen
+        singles = await asyncio.gather(
+            *(self._run_agent(agent_id, datas[i], [], sem, pool, lookup=False) for i in missing)
+        )
+        for i, result in zip(missing, singles):
+            batch[i] = result
+        return batch
+
+    async def _run_agent(
+        self,
+        agent_id: str,
+        data: Dict[str, Any],
+        deps: List[Tuple[str, "asyncio.Task[AgentResult]"]],
+        sem: asyncio.Semaphore,
+        pool: ThreadPoolExecutor,
+        lookup: bool = True,
+    ) -> AgentResult:
+        if deps:
+            upstream = {}
+            for dep_id, task in deps:
+                result = await task
+                if not isinstance(result, BaseException):
+                    upstream[dep_id] = result
+            if upstream:
+                data = {**data, "upstream": upstream}
+
+        async with sem:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(pool, partial(self.executor.prompt_agent, agent_id, data, lookup=lookup))
+            try:
+                return await asyncio.wait_for(call, self.timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"Agent {agent_id} timed out after {self.timeout}s")
+            except Exception as exc:
+                return exc
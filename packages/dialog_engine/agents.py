@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, ValidationError
 
 from .llm_integration import LLMClient, LLMRequest, build_llm_from_env
+from .response_cache import ResponseCache, cache_key
 
 
 class AgentPrompt(BaseModel):
@@ -43,6 +44,16 @@ AGENT_OUTPUT_MODELS: Dict[str, BaseModel] = {
 }
 
 
+# Batch-Prompts: Zeilenanfang der Eingabeliste im User-Prompt
+BATCH_INPUT_PREFIX = "Eingangsdaten-Liste: "
+
+
+# Pipeline-Modus (AgentRunner): Agent -> Agents, deren Ausgabe er als ``upstream`` erhält
+AGENT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "QualityCritic": ("LayoutDesigner",),
+}
+
+
 AGENT_REGISTRY: Dict[str, AgentPrompt] = {
     "SemanticEnricher": AgentPrompt(
         role="Du bist ein Content-Analyst für Fachpublikationen.",
@@ -127,13 +138,18 @@ class AgentExecutor:
     """
     Runs a specialized agent prompt via an injected LLM client.
     The response must be strict JSON and is validated against the agent schema.
+
+    Mit ``cache`` werden validierte Ausgaben unter (Modell, Prompt, ``version``) gespeichert
+    und bei identischem Prompt ohne LLM-Aufruf zurückgegeben.
     """
 
-    def __init__(self, llm: Optional[LLMClient] = None):
+    def __init__(self, llm: Optional[LLMClient] = None, *, cache: Optional[ResponseCache] = None, version: str = "v1"):
         self.llm = llm or build_llm_from_env()
+        self.cache = cache
+        self.version = version
 
-    def build_prompt(self, agent_id: str, input_data: Dict[str, Any]) -> LLMRequest:
-        cfg = AGENT_REGISTRY[agent_id]
+    @staticmethod
+    def _system_and_shots(cfg: AgentPrompt) -> Tuple[str, str]:
         system = f"{cfg.role}\n{cfg.context}\nRegeln: {', '.join(cfg.constraints)}"
         shots = ""
         if cfg.few_shots:
@@ -142,6 +158,11 @@ class AgentExecutor:
                 f"Beispiel Output: {json.dumps(s['output'], ensure_ascii=False)}"
                 for s in cfg.few_shots
             )
+        return system, shots
+
+    def build_prompt(self, agent_id: str, input_data: Dict[str, Any]) -> LLMRequest:
+        cfg = AGENT_REGISTRY[agent_id]
+        system, shots = self._system_and_shots(cfg)
         user = (
             f"Eingangsdaten: {json.dumps(input_data, ensure_ascii=False)}\n"
             f"Gib das Ergebnis strikt im Format aus: {cfg.output_format}\n"
@@ -150,22 +171,104 @@ class AgentExecutor:
             user = f"{shots}\n\n{user}"
         return LLMRequest(system=system, user=user)
 
-    def prompt_agent(self, agent_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def build_batch_prompt(self, agent_id: str, inputs: List[Dict[str, Any]]) -> LLMRequest:
+        """Mehrere Eingaben in einem Request: System-Prompt und Beispiele nur einmal, Antwort als JSON-Array."""
+        cfg = AGENT_REGISTRY[agent_id]
+        system, shots = self._system_and_shots(cfg)
+        user = (
+            f"{BATCH_INPUT_PREFIX}{json.dumps(inputs, ensure_ascii=False)}\n"
+            f"Bearbeite jeden Eintrag einzeln. Gib ein JSON-Array mit genau {len(inputs)} Elementen "
+            f"in derselben Reihenfolge zurück, jedes Element strikt im Format: {cfg.output_format}\n"
+        )
+        if shots:
+            user = f"{shots}\n\n{user}"
+        return LLMRequest(system=system, user=user)
+
+    def _validate(self, agent_id: str, parsed: Any) -> Tuple[Any, bool]:
+        """(Ausgabe, schema-geprüft); ungültige Ausgaben werfen ValueError."""
+        model = AGENT_OUTPUT_MODELS.get(agent_id)
+        if model is None:
+            return parsed, False
+
+        try:
+            validated = model.model_validate(parsed)
+        except ValidationError as exc:
+            raise ValueError(f"Agent {agent_id} output schema invalid: {exc}") from exc
+
+        return validated.model_dump(), True
+
+    def _cache_key(self, agent_id: str, input_data: Dict[str, Any]) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return cache_key(self.llm, self.build_prompt(agent_id, input_data), self.version)
+
+    def prompt_agent(self, agent_id: str, input_data: Dict[str, Any], *, lookup: bool = True) -> Dict[str, Any]:
+        """
+        ``lookup=False``: der Cache wurde für diese Eingabe bereits geprüft (Einzel-Fallback nach
+        ``complete_batch``) - kein zweites ``get``, das die Trefferquote verfälscht; gültige
+        Ausgaben werden trotzdem gespeichert.
+        """
         req = self.build_prompt(agent_id, input_data)
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.llm, req, self.version)
+            cached = self.cache.get(key) if lookup else None
+            if cached is not None:
+                return cached
+
         raw = self.llm.complete(req)
         try:
             parsed = json.loads(raw)
         except Exception as exc:
             raise ValueError(f"Agent {agent_id} returned non-JSON output: {exc}") from exc
 
-        model = AGENT_OUTPUT_MODELS.get(agent_id)
-        if model is None:
-            return parsed
+        out, validated = self._validate(agent_id, parsed)
+        # ohne Schema keine Garantie für die Antwort -> nicht cachen
+        if key is not None and validated:
+            self.cache.put(key, agent_id, out)
+        return out
+
+    def complete_batch(self, agent_id: str, inputs: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Ein LLM-Aufruf für alle nicht gecachten Eingaben. Liefert je Eingabe die validierte Ausgabe
+        oder None, wenn das Element einzeln nachgefragt werden muss (Array kaputt/falsche Länge,
+        Element ungültig). Fehler des LLM-Aufrufs selbst werden geworfen.
+
+        Gültige Elemente landen unter dem Schlüssel des Einzel-Prompts im Cache, Batch- und
+        Einzelmodus teilen sich also die Einträge. Jede Eingabe wird genau einmal nachgeschlagen;
+        None-Elemente daher mit ``prompt_agent(..., lookup=False)`` nachfragen.
+        """
+        keys = [self._cache_key(agent_id, data) for data in inputs]
+        out: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+        if self.cache is not None:
+            for i, key in enumerate(keys):
+                out[i] = self.cache.get(key)
+
+        todo = [i for i, r in enumerate(out) if r is None]
+        if len(todo) < 2:
+            return out  # Einzelaufruf ist nicht teurer
 
+        raw = self.llm.complete(self.build_batch_prompt(agent_id, [inputs[i] for i in todo]))
         try:
-            validated = model.model_validate(parsed)
-        except ValidationError as exc:
-            raise ValueError(f"Agent {agent_id} output schema invalid: {exc}") from exc
+            parsed = json.loads(raw)
+        except Exception:
+            return out
+        if not isinstance(parsed, list) or len(parsed) != len(todo):
+            return out
 
-        return validated.model_dump()
+        for i, item in zip(todo, parsed):
+            try:
+                result, validated = self._validate(agent_id, item)
+            except ValueError:
+                continue
+            out[i] = result
+            if keys[i] is not None and validated:
+                self.cache.put(keys[i], agent_id, result)
+        return out
 
+    def prompt_agent_batch(self, agent_id: str, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Wie ``prompt_agent`` für mehrere Eingaben; fehlgeschlagene Elemente werden einzeln nachgefragt."""
+        results = self.complete_batch(agent_id, inputs)
+        return [
+            r if r is not None else self.prompt_agent(agent_id, data, lookup=False) for r, data in zip(results, inputs)
+        ]
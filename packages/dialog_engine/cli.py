@@ -36,36 +36,35 @@ def _cmd_validate(args: argparse.Namespace) -> int:
 
 
 def _cmd_run(args: argparse.Namespace) -> int:
-    store = DecisionStore(Path(args.file))
-    session = DialogSession(store)
-
-    while True:
-        q = session.next_question()
-        if q is None:
-            break
-
-        print(f"\n[{q.block}] {q.prompt}  (key={q.key})")
-        if q.help:
-            print(q.help)
-        if q.choices:
-            for c in q.choices:
-                print(f"  - {c.value}: {c.label}")
-        if q.default is not None:
-            print(f"Default: {q.default}")
-
-        if args.non_interactive:
-            if q.default is None:
-                raise SystemExit(f"Missing non-interactive answer for {q.key} (no default)")
-            session.answer(q.key, q.default, source="cli.default")
-            continue
-
-        raw = input("> ").strip()
-        if raw == "" and q.default is not None:
-            value = q.default
-        else:
-            value = _parse_choice(q, raw)
-
-        session.answer(q.key, value, source="cli")
+    # Beim Verlassen wird das Journal ins JSON gefaltet (Datei danach vollständig)
+    with DialogSession(DecisionStore(Path(args.file))) as session:
+        while True:
+            q = session.next_question()
+            if q is None:
+                break
+
+            print(f"\n[{q.block}] {q.prompt}  (key={q.key})")
+            if q.help:
+                print(q.help)
+            if q.choices:
+                for c in q.choices:
+                    print(f"  - {c.value}: {c.label}")
+            if q.default is not None:
+                print(f"Default: {q.default}")
+
+            if args.non_interactive:
+                if q.default is None:
+                    raise SystemExit(f"Missing non-interactive answer for {q.key} (no default)")
+                session.answer(q.key, q.default, source="cli.default")
+                continue
+
+            raw = input("> ").strip()
+            if raw == "" and q.default is not None:
+                value = q.default
+            else:
+                value = _parse_choice(q, raw)
+
+            session.answer(q.key, value, source="cli")
 
     print("\nDialog complete.")
     return _cmd_validate(args)
@@ -1,13 +1,55 @@
 from __future__ import annotations
 
+import copy
 import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .question_engine import SCHEMA_VERSION
 
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+_MISSING = object()
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    """Exclusive inter-process lock on a sidecar file (flock / msvcrt)."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_sig(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
 
 @dataclass
 class DecisionStore:
@@ -15,74 +57,261 @@ class DecisionStore:
     Persist decisions to a JSON file.
 
     This is intentionally simple (no DB) and acts as a building block for the workflow orchestrator.
+
+    Updates are appended to a journal (``<file>.journal``, one JSON line per change) and folded
+    into the JSON document every ``compact_every`` entries; the document keeps at most
+    ``history_limit`` history entries. Decisions are cached in memory and only re-read when the
+    document or journal changes on disk (inode/size/mtime). Writers serialize on ``<file>.lock``,
+    so concurrent processes never interleave partial writes; the document itself is replaced
+    atomically (temp file + rename).
+
+    Between compactions the JSON file alone is not authoritative: read through ``DecisionStore``
+    (which replays the journal), and ``close()`` the store - or use it as a context manager - when
+    a writer is done, so the file is complete for external readers.
     """
 
     path: Path
+    compact_every: int = 50
+    history_limit: int = 1000
+
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+    _doc: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _decisions: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _pending: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _seq: int = field(default=0, init=False, repr=False, compare=False)
+    _offset: int = field(default=0, init=False, repr=False, compare=False)
+    _doc_sig: Any = field(default=_MISSING, init=False, repr=False, compare=False)
+    _journal_sig: Any = field(default=_MISSING, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+
+    @property
+    def journal_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".journal")
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".lock")
+
+    # ------------------------------------------------------------------ reading
 
     def load_raw(self) -> Dict[str, Any]:
-        if not self.path.exists():
-            return {}
-        data = json.loads(self.path.read_text(encoding="utf-8"))
-        if isinstance(data, dict):
-            return data
-        return {}
+        """
+        The stored document with pending journal entries applied.
+        Legacy flat files are returned as-is until the first write migrates them.
+        """
+        with self._lock:
+            self._refresh()
+            if not self._doc and not self._decisions and not self._pending:
+                return {}
+            if not self._is_wrapped(self._doc) and not self._pending:
+                return copy.deepcopy(self._doc)
+            return copy.deepcopy(self._effective_doc())
 
     def load(self) -> Dict[str, Any]:
         """
         Load only the `decisions` dict.
         Supports legacy flat JSON (migration-on-read).
         """
-        raw = self.load_raw()
-        if not raw:
-            return {}
-        if "decisions" in raw and isinstance(raw.get("decisions"), dict):
-            return dict(raw["decisions"])
-        # Legacy flat dict
-        return dict(raw)
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._decisions)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._decisions.get(key, default))
+
+    # ------------------------------------------------------------------ writing
+
+    def save(self, data: Dict[str, Any], *, source: str = "unknown") -> None:
+        self._update(lambda current: dict(data), source=source)
+
+    def set(self, key: str, value: Any, *, source: str = "unknown") -> None:
+        self._update(lambda current: {**current, key: value}, source=source)
+
+    def merge(self, patch: Dict[str, Any], *, source: str = "unknown") -> Dict[str, Any]:
+        return self._update(lambda current: {**current, **patch}, source=source)
+
+    def compact(self) -> None:
+        """Fold the journal into the JSON document (also runs automatically)."""
+        if _file_sig(self.path) is None and _file_sig(self.journal_path) is None:
+            return  # nothing stored: don't create files
+        with self._lock, _file_lock(self.lock_path):
+            self._refresh(locked=True)
+            if self._pending or (self._doc and not self._is_wrapped(self._doc)):
+                self._compact()
+
+    def close(self) -> None:
+        """Compact pending journal entries so the JSON file is complete on its own."""
+        self.compact()
+
+    def __enter__(self) -> "DecisionStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ internals
 
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def _wrap(self, decisions: Dict[str, Any], *, previous: Optional[Dict[str, Any]] = None, source: str = "unknown") -> Dict[str, Any]:
-        prev = previous or {}
-        meta = prev.get("meta") if isinstance(prev.get("meta"), dict) else {}
-        created_at = meta.get("created_at") or self._now()
-        history = prev.get("history") if isinstance(prev.get("history"), list) else []
-
-        doc = {
-            "schema_version": SCHEMA_VERSION,
-            "decisions": decisions,
-            "meta": {
-                "created_at": created_at,
-                "updated_at": self._now(),
-            },
+    @staticmethod
+    def _is_wrapped(doc: Dict[str, Any]) -> bool:
+        return "decisions" in doc and isinstance(doc.get("decisions"), dict)
+
+    def _update(self, change, *, source: str) -> Dict[str, Any]:
+        with self._lock, _file_lock(self.lock_path):
+            # Re-read under the file lock so concurrent writers never lose each other's keys.
+            self._refresh(locked=True)
+            existed = bool(self._doc) or bool(self._pending)
+            current = copy.deepcopy(self._decisions)
+            new = copy.deepcopy(change(current))
+
+            entry = {
+                "seq": self._seq + 1,
+                "ts": self._now(),
+                "source": source,
+                "set": {k: v for k, v in new.items() if k not in self._decisions or self._decisions[k] != v},
+                "unset": sorted(k for k in self._decisions if k not in new),
+                "keys": sorted(new.keys()),
+            }
+            self._seq = entry["seq"]
+            self._decisions = new
+
+            if not existed:
+                # Brand-new file: plain document, no history entry (same as before journaling).
+                self._compact()
+            elif not self._is_wrapped(self._doc):
+                # Legacy flat file: migrate right away.
+                self._pending.append(entry)
+                self._compact()
+            else:
+                self._append(entry)
+                if len(self._pending) >= max(1, self.compact_every):
+                    self._compact()
+            return copy.deepcopy(new)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        if self.journal_path.exists() and self.journal_path.stat().st_size > self._offset:
+            # Partial line left by a crashed writer: terminate it so this entry stays parseable.
+            line = "\n" + line
+        with open(self.journal_path, "ab") as fh:
+            fh.write(line.encode("utf-8"))
+            fh.flush()
+            self._offset = fh.tell()
+        self._pending.append(entry)
+        self._journal_sig = _file_sig(self.journal_path)
+
+    def _effective_doc(self) -> Dict[str, Any]:
+        doc = self._doc if self._is_wrapped(self._doc) else {}
+        meta = dict(doc.get("meta") or {})
+        history = list(doc.get("history") or [])
+        history.extend({"ts": e["ts"], "source": e["source"], "keys": e["keys"]} for e in self._pending)
+        if self._pending:
+            meta["updated_at"] = self._pending[-1]["ts"]
+        meta.setdefault("created_at", meta.get("updated_at") or self._now())
+        meta.setdefault("updated_at", meta["created_at"])
+        return {
+            "schema_version": doc.get("schema_version", SCHEMA_VERSION),
+            "decisions": dict(self._decisions),
+            "meta": meta,
             "history": history,
         }
 
-        # Add history entry if this is an update and not a brand new file.
-        if prev:
-            doc["history"] = [
-                *history,
-                {"ts": self._now(), "source": source, "keys": sorted(list(decisions.keys()))},
-            ]
-        return doc
+    def _compact(self) -> None:
+        """Write the effective document atomically, then truncate the journal (caller holds the file lock)."""
+        doc = self._effective_doc()
+        doc["schema_version"] = SCHEMA_VERSION
+        doc["meta"]["updated_at"] = self._now()
+        doc["meta"]["journal_seq"] = self._seq
+        limit = max(0, int(self.history_limit))
+        if len(doc["history"]) > limit:
+            dropped = len(doc["history"]) - limit
+            doc["meta"]["history_dropped"] = int(doc["meta"].get("history_dropped") or 0) + dropped
+            doc["history"] = doc["history"][dropped:]
 
-    def save(self, data: Dict[str, Any], *, source: str = "unknown") -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        prev = self.load_raw()
-        doc = self._wrap(dict(data), previous=prev, source=source)
-        self.path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=self.path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(doc, ensure_ascii=False, indent=2))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # A crash before this point leaves the journal in place; its entries are skipped via journal_seq.
+        if self.journal_path.exists():
+            with open(self.journal_path, "wb"):
+                pass
 
-    def get(self, key: str, default: Any = None) -> Any:
-        return self.load().get(key, default)
+        self._doc = doc
+        self._pending = []
+        self._offset = 0
+        self._doc_sig = _file_sig(self.path)
+        self._journal_sig = _file_sig(self.journal_path)
 
-    def set(self, key: str, value: Any, *, source: str = "unknown") -> None:
-        data = self.load()
-        data[key] = value
-        self.save(data, source=source)
+    def _refresh(self, locked: bool = False) -> None:
+        """Bring the cache up to date; only touches the files when their signature changed."""
+        doc_sig = _file_sig(self.path)
+        journal_sig = _file_sig(self.journal_path)
+        if doc_sig == self._doc_sig and journal_sig == self._journal_sig:
+            return
+        if doc_sig is None and journal_sig is None:
+            # Nothing stored (yet): no need to lock or create anything.
+            self._doc, self._decisions, self._pending = {}, {}, []
+            self._seq, self._offset = 0, 0
+            self._doc_sig = self._journal_sig = None
+            return
+        if not locked:
+            # Changed on disk: read under the file lock so a concurrent compaction can't split the view.
+            with _file_lock(self.lock_path):
+                self._refresh(locked=True)
+            return
 
-    def merge(self, patch: Dict[str, Any], *, source: str = "unknown") -> Dict[str, Any]:
-        data = self.load()
-        data.update(patch)
-        self.save(data, source=source)
-        return data
+        if doc_sig != self._doc_sig or journal_sig is None or journal_sig[1] < self._offset:
+            self._load_document()
+        self._read_journal()
+
+    def _load_document(self) -> None:
+        self._doc, self._decisions, self._pending = {}, {}, []
+        self._seq, self._offset = 0, 0
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                self._doc = data
+        if self._is_wrapped(self._doc):
+            self._decisions = dict(self._doc["decisions"])
+            self._seq = int((self._doc.get("meta") or {}).get("journal_seq") or 0)
+        elif self._doc:
+            # Legacy flat dict
+            self._decisions = dict(self._doc)
+        self._doc_sig = _file_sig(self.path)
+
+    def _read_journal(self) -> None:
+        if not self.journal_path.exists():
+            self._journal_sig = None
+            return
+        with open(self.journal_path, "rb") as fh:
+            fh.seek(self._offset)
+            chunk = fh.read()
+        end = chunk.rfind(b"\n") + 1  # ignore a trailing partial line
+        for raw in chunk[:end].splitlines():
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or int(entry.get("seq") or 0) <= self._seq:
+                continue
+            for key in entry.get("unset") or []:
+                self._decisions.pop(key, None)
+            self._decisions.update(entry.get("set") or {})
+            self._seq = int(entry["seq"])
+            self._pending.append(entry)
+        self._offset += end
+        self._journal_sig = _file_sig(self.journal_path)
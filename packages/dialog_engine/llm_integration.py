@@ -16,18 +16,28 @@ class LLMClient:
     """
     Minimal interface. Implementation is intentionally left out to avoid coupling
     to a specific provider and to keep tests offline by default.
+
+    ``provider`` identifies the backend for per-provider rate limits (AgentRunner),
+    ``provider``/``model`` together are part of the response cache key.
     """
 
+    provider: str = "generic"
+    model: str = ""
+
     def complete(self, request: LLMRequest) -> str:  # pragma: no cover
         raise NotImplementedError
 
 
 class DisabledLLM(LLMClient):
+    provider = "disabled"
+
     def complete(self, request: LLMRequest) -> str:  # pragma: no cover
         raise RuntimeError("LLM is disabled (no provider configured)")
 
 
 class OpenAILLM(LLMClient):
+    provider = "openai"
+
     def __init__(self, api_key: str, model: str, base_url: Optional[str] = None, timeout: float = 30.0):
         try:
             from openai import OpenAI
@@ -35,11 +45,11 @@ class OpenAILLM(LLMClient):
             raise RuntimeError("OpenAI client not installed. Install with: pip install openai") from exc
 
         self._client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
-        self._model = model
+        self.model = model
 
     def complete(self, request: LLMRequest) -> str:  # pragma: no cover
         resp = self._client.chat.completions.create(
-            model=self._model,
+            model=self.model,
             messages=[
                 {"role": "system", "content": request.system},
                 {"role": "user", "content": request.user},
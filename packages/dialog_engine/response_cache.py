@@ -0,0 +1,114 @@
+"""Persistenter Cache für validierte Agent-Antworten (SQLite, Standardbibliothek).
+
+Schlüssel ist ein SHA-256 über (Provider, Modell, System-Prompt, User-Prompt, Agent-Version):
+byte-identische Prompts (Resume, Re-Run nach fremden Änderungen, gleiche Folien) kosten damit
+keinen LLM-Aufruf. Gespeichert werden nur Ausgaben, die das Agent-Schema bestanden haben.
+
+- ``ttl_s``: Einträge älter als TTL gelten als Miss und werden gelöscht
+- ``max_entries``: darüber werden die am längsten nicht genutzten Einträge verdrängt (LRU)
+
+Thread-sicher (eine Verbindung, Zugriff per Lock), damit ``AgentRunner`` ihn parallel nutzen kann.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .llm_integration import LLMClient, LLMRequest
+
+DEFAULT_MAX_ENTRIES = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def cache_key(llm: LLMClient, request: LLMRequest, version: str) -> str:
+    parts = [
+        str(getattr(llm, "provider", "") or ""),
+        str(getattr(llm, "model", "") or ""),
+        request.system,
+        request.user,
+        str(version),
+    ]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: Path, *, ttl_s: Optional[float] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_s is not None and now - row[1] > self.ttl_s:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, agent_id: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, agent_id, value, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, agent_id, data, now, now),
+            )
+            self.stores += 1
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self.evicted += cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evicted": self.evicted,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -36,3 +36,12 @@ class DialogSession:
 
     def is_complete(self) -> bool:
         return self.next_question() is None
+
+    def close(self) -> None:
+        self.store.close()
+
+    def __enter__(self) -> "DialogSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
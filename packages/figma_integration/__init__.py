@@ -5,12 +5,15 @@ Bidirektionale Integration mit Figma für Frame-Import und -Export.
 """
 
 from .client import FigmaClient
-from .converter import FrameToLayoutConverter, LayoutToFrameConverter
+from .file_cache import FigmaFileCache
+from .converter import FrameToLayoutConverter, LayoutDiff, LayoutToFrameConverter
 from .ai_brief import FigmaAIBriefConfig, build_figma_ai_brief
 
 __all__ = [
     "FigmaClient",
+    "FigmaFileCache",
     "FrameToLayoutConverter",
+    "LayoutDiff",
     "LayoutToFrameConverter",
     "FigmaAIBriefConfig",
     "build_figma_ai_brief",
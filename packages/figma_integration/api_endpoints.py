@@ -4,6 +4,7 @@ Figma API Endpoints für FastAPI
 Diese Endpoints können in apps/api-gateway/main.py importiert und registriert werden.
 """
 
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException, Body
 from typing import Dict, List, Optional
 from pydantic import BaseModel
@@ -13,6 +14,7 @@ from .client import FigmaClient
 from .converter import FrameToLayoutConverter, LayoutToFrameConverter
 from .asset_downloader import FigmaAssetDownloader
 from .ai_brief import FigmaAIBriefConfig, build_figma_ai_brief
+from .sla_inserter import create_sla_update_request
 
 # Globale Instanzen für AutoIndexer (wird in API Gateway initialisiert)
 _auto_indexer = None
@@ -23,6 +25,18 @@ _frame_converter: Optional[FrameToLayoutConverter] = None
 _layout_converter: Optional[LayoutToFrameConverter] = None
 _asset_downloader: Optional[FigmaAssetDownloader] = None
 
+# Letzter erfolgreicher Import pro Frame ("file_key/frame_id"): RAG Layout ID + mediaIds
+# (für inkrementelle Re-Imports); LRU, begrenzt wie die Frame-Stände des Converters
+_frame_imports: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def _remember_import(frame_key: str, entry: Dict) -> None:
+    _frame_imports[frame_key] = entry
+    _frame_imports.move_to_end(frame_key)
+    limit = _frame_converter.max_frames if _frame_converter is not None else 256
+    while len(_frame_imports) > limit:
+        _frame_imports.popitem(last=False)
+
 
 def init_figma_service(
     access_token: Optional[str] = None,
@@ -53,7 +67,8 @@ def init_figma_service(
         _layout_converter = LayoutToFrameConverter()
         _asset_downloader = FigmaAssetDownloader(
             minio_client=minio_client,
-            minio_bucket=minio_bucket
+            minio_bucket=minio_bucket,
+            session=_figma_client.session
         )
         _auto_indexer = auto_indexer
     return _figma_client is not None
@@ -187,23 +202,38 @@ async def import_frame(request: ImportFrameRequest):
     if _figma_client is None or _frame_converter is None:
         raise HTTPException(status_code=503, detail="Figma service not initialized")
     
+    frame_key = f"{request.file_key}/{request.frame_id}"
     try:
         # 1. Frame von Figma abrufen
         frame_json = _figma_client.get_frame(request.file_key, request.frame_id)
         
-        # 2. Frame → Layout JSON konvertieren
-        layout_json = _frame_converter.convert(
+        # 2. Frame → Layout JSON konvertieren (inkl. Diff zum letzten Import dieses Frames)
+        #    Neuer Stand wird erst nach erfolgreichem Import übernommen (commit unten)
+        layout_json, diff = _frame_converter.convert_incremental(
             frame_json,
             dpi=request.dpi,
-            page_number=request.page_number
+            page_number=request.page_number,
+            frame_key=frame_key,
+            commit=False
         )
+        previous = _frame_imports.get(frame_key, {})
+        # Vollständiger Import: Images neu laden; die Layout ID wird trotzdem übergeben,
+        # damit der Indexer das alte Layout ersetzt statt es zu verwaisen
+        previous_media = {} if diff.full_update else previous.get("media", {})
+        upsert_ids = {obj.get("id") for obj in diff.upserts}
         
         # 3. Images herunterladen und zu MinIO hochladen
+        #    (unveränderte Images übernehmen die mediaId des letzten Imports)
         if _asset_downloader:
-            image_objects = [
-                obj for obj in layout_json["pages"][0]["objects"]
-                if obj.get("type") == "image"
-            ]
+            image_objects = []
+            for obj in layout_json["pages"][0]["objects"]:
+                if obj.get("type") != "image":
+                    continue
+                obj_id = obj.get("id", "")
+                if obj_id not in upsert_ids and previous_media.get(obj_id):
+                    obj["mediaId"] = previous_media[obj_id]
+                else:
+                    image_objects.append(obj)
             
             if image_objects:
                 minio_urls = _asset_downloader.download_frame_images(
@@ -219,11 +249,13 @@ async def import_frame(request: ImportFrameRequest):
                     if obj_id in minio_urls:
                         obj["mediaId"] = minio_urls[obj_id]
         
-        # 4. RAG-Indexing (automatisch)
+        # 4. RAG-Indexing (automatisch; bei Re-Import nur geänderte Objekte)
         layout_id = None
         if _auto_indexer:
             try:
-                layout_id = await _auto_indexer.index_figma_import(layout_json)
+                layout_id = await _auto_indexer.index_figma_update(
+                    layout_json, diff, layout_id=previous.get("layout_id")
+                )
             except Exception as e:
                 # RAG-Indexing-Fehler nicht kritisch, aber loggen
                 import logging
@@ -232,14 +264,20 @@ async def import_frame(request: ImportFrameRequest):
         
         # 5. Compiler aufrufen
         sla_xml_bytes = None
+        sla_update = None
         try:
             from packages.sla_compiler.compiler import compile_layout_to_sla
             sla_xml_bytes = compile_layout_to_sla(layout_json)
             
+            # Re-Import: nur neue/geänderte Objekte für das Plugin
+            if not diff.full_update:
+                partial_sla = compile_layout_to_sla(diff.partial_layout(layout_json)) if diff.upserts else None
+                sla_update = create_sla_update_request(partial_sla, diff)
+            
             # Compiler-Ergebnis für Digital Twin indexieren
             if _auto_indexer and layout_id:
                 try:
-                    await auto_indexer.index_compiler_result(
+                    await _auto_indexer.index_compiler_result(
                         layout_json=layout_json,
                         sla_xml=sla_xml_bytes,
                         success=True,
@@ -254,6 +292,16 @@ async def import_frame(request: ImportFrameRequest):
             # Compiler-Fehler
             raise HTTPException(status_code=500, detail=f"Compiler error: {e}")
         
+        _frame_converter.commit(diff)
+        _remember_import(frame_key, {
+            "layout_id": layout_id,
+            "media": {
+                obj.get("id"): obj.get("mediaId")
+                for obj in layout_json["pages"][0]["objects"]
+                if obj.get("type") == "image" and obj.get("mediaId")
+            },
+        })
+        
         return {
             "layout_json": layout_json,
             "sla_xml_bytes": sla_xml_bytes.hex() if sla_xml_bytes else None,  # Hex für JSON
@@ -261,9 +309,12 @@ async def import_frame(request: ImportFrameRequest):
             "layout_id": layout_id,  # RAG Layout ID
             "file_key": request.file_key,
             "frame_id": request.frame_id,
+            "diff": diff.to_dict(),
+            "sla_update": sla_update,  # None beim ersten/vollständigen Import
         }
         
     except HTTPException:
+        # Kein commit: der nächste Import diffed weiter gegen den letzten erfolgreichen Stand
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
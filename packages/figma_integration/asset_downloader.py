@@ -2,12 +2,36 @@
 Figma Asset Downloader
 
 Lädt Images aus Figma Frames herunter und speichert sie in MinIO.
+
+Download und Upload laufen als begrenzte, parallele Pipeline: jedes Image wird über eine
+gepoolte Session gestreamt und direkt (ohne Zwischenpuffer im Speicher) in MinIO bzw. in
+den lokalen Fallback-Ordner geschrieben.
 """
 
 import requests
-from typing import Dict, List, Optional
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple
 import os
-from urllib.parse import urlparse
+import shutil
+import tempfile
+import threading
+import time
+
+from .http_session import HostLimiter, build_session
+
+# MinIO verlangt bei unbekannter Länge (length=-1) eine Part-Größe (min. 5 MiB)
+MINIO_PART_SIZE = 10 * 1024 * 1024
+
+# Abbrüche beim Lesen des Bodys (raw-Stream, daher urllib3-Exceptions): nur dann wird der
+# gesamte Transfer (Download + Upload) erneut versucht. Verbindungsfehler vor der Antwort
+# und HTTP-Status (429/5xx) wiederholt bereits die Session (siehe http_session) - ein
+# zweiter Retry-Layer würde die Versuche multiplizieren.
+STREAM_ERRORS = (
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
 
 
 class FigmaAssetDownloader:
@@ -16,7 +40,14 @@ class FigmaAssetDownloader:
     def __init__(
         self,
         minio_client=None,
-        minio_bucket: str = "figma-assets"
+        minio_bucket: str = "figma-assets",
+        session: Optional[requests.Session] = None,
+        max_workers: int = 8,
+        per_host_limit: int = 4,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        local_dir: str = "./figma_assets"
     ):
         """
         Initialisiert Asset Downloader.
@@ -24,9 +55,27 @@ class FigmaAssetDownloader:
         Args:
             minio_client: MinIO Client Instanz (optional)
             minio_bucket: MinIO Bucket Name
+            session: HTTP-Session (optional, Default: gepoolte Session mit Retry)
+            max_workers: Gleichzeitige Transfers insgesamt (1 = seriell)
+            per_host_limit: Gleichzeitige Requests pro Host
+            retries: Wiederholungen (Session: Verbindung/Status; Transfer: Stream-Abbrüche)
+            backoff: Backoff-Faktor in Sekunden (backoff * 2^n)
+            timeout: Timeout pro Request (Verbindung und Lesen)
+            local_dir: Zielordner, falls kein MinIO Client gesetzt ist
         """
         self.minio_client = minio_client
         self.minio_bucket = minio_bucket
+        self.max_workers = max(1, int(max_workers))
+        self.retries = max(0, int(retries))
+        self.backoff = max(0.0, float(backoff))
+        self.timeout = timeout
+        self.local_dir = local_dir
+        self.session = session or build_session(
+            pool_maxsize=max(self.max_workers, per_host_limit), retries=self.retries, backoff=self.backoff
+        )
+        self.host_limiter = HostLimiter(per_host_limit)
+        self._bucket_ready = False
+        self._bucket_lock = threading.Lock()
     
     def download_frame_images(
         self,
@@ -57,27 +106,40 @@ class FigmaAssetDownloader:
         image_urls = figma_client.get_frame_images(file_key, list(image_node_ids.keys()))
         figma_images = image_urls.get("images", {})
         
-        # Download und Upload zu MinIO
-        minio_urls = {}
+        jobs = [
+            (node_id, image_node_ids[node_id], image_url)
+            for node_id, image_url in figma_images.items()
+            if node_id in image_node_ids
+        ]
+        if not jobs:
+            return {}
         
-        for node_id, image_url in figma_images.items():
-            object_id = image_node_ids[node_id]
-            
-            try:
-                # Download von Figma
-                image_data = self._download_image(image_url)
-                
-                # Upload zu MinIO
-                minio_url = self._upload_to_minio(image_data, object_id)
-                
+        # Download und Upload zu MinIO (parallel, Reihenfolge bleibt erhalten)
+        workers = min(self.max_workers, len(jobs))
+        if workers <= 1:
+            results = [self._run_job(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._run_job, jobs))
+        
+        minio_urls = {}
+        for (_, object_id, _), minio_url in zip(jobs, results):
+            if minio_url is not None:
                 minio_urls[object_id] = minio_url
-            except Exception as e:
-                # Fehler beim Download/Upload
-                print(f"Error downloading image {node_id}: {e}")
-                continue
         
         return minio_urls
     
+    def _run_job(self, job: Tuple[str, str, Optional[str]]) -> Optional[str]:
+        node_id, object_id, image_url = job
+        try:
+            if not image_url:
+                raise ValueError("Figma lieferte keine Image-URL")
+            return self._transfer(image_url, object_id)
+        except Exception as e:
+            # Fehler beim Download/Upload
+            print(f"Error downloading image {node_id}: {e}")
+            return None
+    
     def _extract_image_node_ids(
         self,
         frame_json: Dict,
@@ -124,63 +186,99 @@ class FigmaAssetDownloader:
         
         return image_node_ids
     
-    def _download_image(self, url: str) -> bytes:
+    def _transfer(self, url: str, object_id: str) -> str:
         """
-        Lädt Image von URL herunter.
+        Streamt ein Image von URL direkt ins Ziel (MinIO oder lokal).
+        
+        Abbrüche beim Lesen des Streams werden mit exponentiellem Backoff wiederholt
+        (höchstens ``retries`` Mal); alles vor der Antwort wiederholt die Session.
+        Pro Host laufen höchstens ``per_host_limit`` Transfers gleichzeitig.
         
-        Args:
-            url: Image-URL
-            
         Returns:
-            Image-Daten als Bytes
+            MinIO URL
         """
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.content
+        attempt = 0
+        while True:
+            try:
+                with self.host_limiter.limit(url):
+                    with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                        response.raise_for_status()
+                        response.raw.decode_content = True
+                        return self._store(response.raw, object_id, self._content_length(response))
+            except STREAM_ERRORS:
+                if attempt >= self.retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt))
+                attempt += 1
     
-    def _upload_to_minio(self, image_data: bytes, object_id: str) -> str:
+    @staticmethod
+    def _content_length(response: requests.Response) -> int:
+        """Länge laut Header; -1 wenn unbekannt oder komprimiert übertragen."""
+        if response.headers.get("Content-Encoding"):
+            return -1
+        try:
+            return int(response.headers.get("Content-Length", -1))
+        except (TypeError, ValueError):
+            return -1
+    
+    def _store(self, stream: BinaryIO, object_id: str, length: int = -1) -> str:
         """
-        Upload Image zu MinIO.
+        Schreibt einen Datenstrom nach MinIO bzw. lokal.
         
         Args:
-            image_data: Image-Daten
+            stream: Lesbarer Datenstrom
             object_id: Object ID (für Dateiname)
+            length: Länge in Bytes (-1 = unbekannt)
             
         Returns:
             MinIO URL
         """
+        filename = f"{object_id}.png"
+        
         if not self.minio_client:
-            # Fallback: Lokale Speicherung
-            local_path = f"./figma_assets/{object_id}.png"
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            with open(local_path, "wb") as f:
-                f.write(image_data)
+            # Fallback: Lokale Speicherung (atomar über temporäre Datei)
+            local_path = os.path.join(self.local_dir, filename)
+            os.makedirs(self.local_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.local_dir, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    shutil.copyfileobj(stream, f)
+                os.replace(tmp_path, local_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             return f"file://{local_path}"
         
         # Upload zu MinIO
-        filename = f"{object_id}.png"
-        
         try:
-            from io import BytesIO
-            from minio import Minio
-            from minio.error import S3Error
-            
-            # Prüfe ob Bucket existiert
-            if not self.minio_client.bucket_exists(self.minio_bucket):
-                self.minio_client.make_bucket(self.minio_bucket)
+            self._ensure_bucket()
             
-            # Upload
+            # Upload (streamend; bei unbekannter Länge als Multipart)
             self.minio_client.put_object(
                 self.minio_bucket,
                 filename,
-                BytesIO(image_data),
-                length=len(image_data),
+                stream,
+                length=length,
+                part_size=MINIO_PART_SIZE if length < 0 else 0,
                 content_type="image/png"
             )
             
             # MinIO URL
             return f"minio://{self.minio_bucket}/{filename}"
-            
+        
+        except STREAM_ERRORS:
+            # Abbruch beim Lesen des Download-Streams -> Transfer wird wiederholt
+            raise
         except Exception as e:
             raise ValueError(f"MinIO upload failed: {e}")
-
+    
+    def _ensure_bucket(self) -> None:
+        """Prüft/erstellt den Bucket einmal pro Downloader-Instanz."""
+        if self._bucket_ready:
+            return
+        with self._bucket_lock:
+            if not self._bucket_ready:
+                if not self.minio_client.bucket_exists(self.minio_bucket):
+                    self.minio_client.make_bucket(self.minio_bucket)
+                self._bucket_ready = True
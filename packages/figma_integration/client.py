@@ -5,21 +5,36 @@ REST API Wrapper für Figma API mit Frame-spezifischen Methoden.
 """
 
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import json
 import os
 
+from .file_cache import FigmaFileCache
+from .http_session import build_session
+
 
 class FigmaClient:
     """Figma REST API Client"""
     
     BASE_URL = "https://api.figma.com/v1"
     
-    def __init__(self, access_token: Optional[str] = None):
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[FigmaFileCache] = None,
+        max_workers: int = 8
+    ):
         """
         Initialisiert Figma Client.
         
         Args:
             access_token: Figma Personal Access Token (oder aus ENV)
+            session: HTTP-Session (optional, Default: gepoolte Session mit Retry, siehe http_session)
+            cache: Cache für File-/Node-Abrufe (optional, Default: Speicher + Platte aus
+                FIGMA_CACHE_DIR; FigmaFileCache(max_entries=0) ohne disk_dir deaktiviert ihn)
+            max_workers: Parallele Requests beim Auflisten von Projekten/Dateien
         """
         self.access_token = access_token or os.getenv("FIGMA_ACCESS_TOKEN")
         if not self.access_token:
@@ -30,6 +45,11 @@ class FigmaClient:
             "X-Figma-Token": self.access_token,
             "Content-Type": "application/json",
         }
+        # Token wird pro Request gesetzt (nicht auf der Session), damit eine geteilte Session
+        # ihn nicht an fremde Hosts (z.B. Image-CDN) sendet.
+        self.session = session or build_session()
+        self.cache = cache if cache is not None else FigmaFileCache(disk_dir=os.getenv("FIGMA_CACHE_DIR") or None)
+        self.max_workers = max(1, int(max_workers))
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """
@@ -43,12 +63,27 @@ class FigmaClient:
         Returns:
             JSON Response als Dict
         """
+        return self._send(method, endpoint, **kwargs).json()
+
+    def _send(self, method: str, endpoint: str, headers: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """
+        Führt HTTP-Request aus und liefert die Response (auch 304 Not Modified).
+        
+        Args:
+            method: HTTP-Methode (GET, POST, etc.)
+            endpoint: API-Endpoint (ohne Base URL)
+            headers: Zusätzliche Header (z.B. If-None-Match)
+            **kwargs: Zusätzliche Request-Parameter
+            
+        Returns:
+            requests.Response
+        """
         url = f"{self.BASE_URL}{endpoint}"
         
         try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
+            response = self.session.request(method, url, headers={**self.headers, **(headers or {})}, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.RequestException as e:
             status = getattr(getattr(e, "response", None), "status_code", None)
             body = getattr(getattr(e, "response", None), "text", None)
@@ -59,6 +94,76 @@ class FigmaClient:
                 details = f"{details} | Body: {body[:2000]}"
             raise ValueError(f"Figma API Error: {details}")
 
+    def _cached_get(self, file_key: str, endpoint: str, variant: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET mit Cache und Revalidierung.
+        
+        Liegt ein Eintrag vor, wird er revalidiert - per If-None-Match/If-Modified-Since,
+        falls der Server Validatoren geliefert hat (304 -> Cache), sonst über die aktuelle
+        ``version`` der Datei (leichtgewichtiger Abruf mit depth=1). Nur bei Änderung wird
+        das vollständige Dokument geladen und geparst.
+        
+        Args:
+            file_key: Figma File Key
+            endpoint: API-Endpoint (ohne Base URL)
+            variant: Cache-Variante innerhalb der Datei (z.B. "file", "nodes:1:2")
+            params: Query-Parameter
+            
+        Returns:
+            JSON Response als Dict (geteilt mit dem Cache, nicht verändern)
+        """
+        key = self.cache.key(file_key, variant)
+        meta = self.cache.meta(key)
+        headers: Dict[str, str] = {}
+        
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("http_last_modified"):
+                headers["If-Modified-Since"] = meta["http_last_modified"]
+            if not headers:
+                version = self.get_file_version(file_key)
+                if version and version == meta.get("version"):
+                    cached = self.cache.get(key, version)
+                    if cached is not None:
+                        return cached
+        
+        response = self._send("GET", endpoint, headers=headers, params=params)
+        if response.status_code == 304:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            # Eintrag inzwischen verdrängt -> unbedingt neu laden
+            response = self._send("GET", endpoint, params=params)
+        
+        body = response.content
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise ValueError(f"Figma API Error: invalid JSON ({e})")
+        if isinstance(data, dict):
+            self.cache.put(key, body, data, {
+                "version": data.get("version"),
+                "last_modified": data.get("lastModified"),
+                "etag": response.headers.get("ETag"),
+                "http_last_modified": response.headers.get("Last-Modified"),
+            })
+        return data
+
+    def _map_parallel(self, func: Callable[[str], Any], items: List[str]) -> List[Any]:
+        """``func`` parallel über ``items`` (Reihenfolge bleibt erhalten, Fehler -> None)."""
+        def call(item: str) -> Any:
+            try:
+                return func(item)
+            except Exception:
+                return None
+        
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(call, items))
+
     def get_me(self) -> Dict:
         """
         Aktuellen User abrufen (inkl. Team-Zugehörigkeiten).
@@ -114,20 +219,17 @@ class FigmaClient:
             teams = me.get("teams", []) or []
             team_ids = [t.get("id") for t in teams if t.get("id")]
 
-        for tid in team_ids:
-            try:
-                projects = self.list_team_projects(tid)
-                for project in projects:
-                    pid = project.get("id")
-                    if not pid:
-                        continue
-                    try:
-                        files.extend(self.list_project_files(pid))
-                    except Exception:
-                        # Einzelne Projekte d◌┤rfen fehlschlagen (z.B. Rechte), ohne alles zu stoppen.
-                        continue
-            except Exception:
-                continue
+        # Projekte aller Teams, dann Dateien aller Projekte - jeweils parallel.
+        # Einzelne Teams/Projekte d◌┤rfen fehlschlagen (z.B. Rechte), ohne alles zu stoppen.
+        project_ids: List[str] = []
+        for projects in self._map_parallel(self.list_team_projects, team_ids):
+            for project in projects or []:
+                pid = project.get("id")
+                if pid:
+                    project_ids.append(pid)
+
+        for project_files in self._map_parallel(self.list_project_files, project_ids):
+            files.extend(project_files or [])
 
         # Dedup nach file_key/key, falls mehrfach in Projekten auftaucht
         seen = set()
@@ -143,7 +245,7 @@ class FigmaClient:
     
     def get_file(self, file_key: str) -> Dict:
         """
-        File-Metadaten abrufen.
+        File-Metadaten abrufen (gecacht, siehe _cached_get).
         
         Args:
             file_key: Figma File Key
@@ -151,7 +253,19 @@ class FigmaClient:
         Returns:
             File-Objekt mit Metadaten
         """
-        return self._request("GET", f"/files/{file_key}")
+        return self._cached_get(file_key, f"/files/{file_key}", "file")
+    
+    def get_file_version(self, file_key: str) -> Optional[str]:
+        """
+        Aktuelle Version einer Datei (ohne Dokumentbaum, depth=1).
+        
+        Args:
+            file_key: Figma File Key
+            
+        Returns:
+            Versions-ID oder None
+        """
+        return self._request("GET", f"/files/{file_key}", params={"depth": 1}).get("version")
     
     def get_file_nodes(
         self,
@@ -169,7 +283,8 @@ class FigmaClient:
             Dict mit "nodes" (Node-ID → Node-Objekt)
         """
         ids_param = ",".join(node_ids)
-        return self._request("GET", f"/files/{file_key}/nodes", params={"ids": ids_param})
+        variant = "nodes:" + ",".join(sorted(node_ids))
+        return self._cached_get(file_key, f"/files/{file_key}/nodes", variant, params={"ids": ids_param})
     
     def list_frames(self, file_key: str) -> List[Dict]:
         """
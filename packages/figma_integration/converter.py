@@ -4,8 +4,72 @@ Figma Frame ↔ Layout JSON Converter
 Konvertiert zwischen Figma Frame JSON und Layout JSON Schema.
 """
 
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
 import json
+import threading
+
+
+@dataclass
+class LayoutDiff:
+    """
+    Änderungen eines Frames gegenüber seiner letzten Konvertierung.
+    
+    ``added``/``changed`` enthalten die neuen Layout-Objects, ``removed``/``unchanged``
+    nur Object-IDs. ``document_changed`` (Größe, DPI, Seitenzahl) oder ein erster Import
+    (``initial``) erfordern eine vollständige Verarbeitung.
+    """
+    frame_key: str
+    page_number: int
+    initial: bool = False
+    document_changed: bool = False
+    added: List[Dict] = field(default_factory=list)
+    changed: List[Dict] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Neuer Frame-Stand; erst ``FrameToLayoutConverter.commit`` übernimmt ihn
+    state: Optional[Dict] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def upserts(self) -> List[Dict]:
+        """Neue und geänderte Objects (in Z-Reihenfolge)."""
+        return sorted(self.added + self.changed, key=lambda obj: obj.get("zOrder", 0))
+    
+    @property
+    def full_update(self) -> bool:
+        return self.initial or self.document_changed
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.full_update or self.added or self.changed or self.removed)
+    
+    def partial_layout(self, layout_json: Dict) -> Dict:
+        """Layout JSON mit nur den neuen/geänderten Objects (z.B. für den Compiler)."""
+        partial = {key: value for key, value in layout_json.items() if key != "pages"}
+        ids = {obj.get("id") for obj in self.upserts}
+        partial["pages"] = [
+            {
+                **{key: value for key, value in page.items() if key != "objects"},
+                "objects": [obj for obj in page.get("objects", []) if obj.get("id") in ids],
+                "scannedContent": {"texts": [], "images": []},
+            }
+            for page in layout_json.get("pages", [])
+        ]
+        return partial
+    
+    def to_dict(self) -> Dict:
+        return {
+            "frame_key": self.frame_key,
+            "page_number": self.page_number,
+            "initial": self.initial,
+            "document_changed": self.document_changed,
+            "added": [obj.get("id") for obj in self.added],
+            "changed": [obj.get("id") for obj in self.changed],
+            "removed": list(self.removed),
+            "unchanged": len(self.unchanged),
+        }
 
 
 class FrameToLayoutConverter:
@@ -13,8 +77,21 @@ class FrameToLayoutConverter:
     Konvertiert Figma Frame → Layout JSON Schema.
     
     MUSS exakt dasselbe Schema erzeugen wie der Compiler erwartet!
+    
+    ``convert_incremental`` liefert zusätzlich die Änderungen gegenüber dem letzten
+    übernommenen (``commit``) Import desselben Frames. Der Diff arbeitet auf Hashes der
+    fertigen Objects; die Node-Konvertierung selbst ist billiger als jedes Memo darauf.
     """
     
+    def __init__(self, max_frames: int = 256):
+        """
+        Args:
+            max_frames: Max. Frames, deren letzter Stand für Diffs gehalten wird
+        """
+        self.max_frames = max(1, int(max_frames))
+        self._frames: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+    
     def convert(
         self,
         frame_json: Dict,
@@ -70,6 +147,82 @@ class FrameToLayoutConverter:
         
         return layout
     
+    def convert_incremental(
+        self,
+        frame_json: Dict,
+        dpi: int = 300,
+        page_number: int = 1,
+        frame_key: Optional[str] = None,
+        commit: bool = True
+    ) -> Tuple[Dict, LayoutDiff]:
+        """
+        Wie ``convert``, plus Diff gegenüber der letzten Konvertierung desselben Frames.
+        
+        Args:
+            frame_json: Figma Frame JSON (von get_frame)
+            dpi: DPI für Dokument (default: 300)
+            page_number: Seitenzahl (default: 1)
+            frame_key: Schlüssel für den Frame-Stand (default: Frame Node ID;
+                bei mehreren Files z.B. "file_key/frame_id")
+            commit: Neuen Stand sofort übernehmen. ``False``, wenn der Import danach
+                noch scheitern kann - dann ``commit(diff)`` erst nach Erfolg aufrufen;
+                bei einem Fehler bleibt der letzte erfolgreiche Stand die Diff-Basis.
+            
+        Returns:
+            (Layout JSON Schema, LayoutDiff)
+        """
+        layout = self.convert(frame_json, dpi=dpi, page_number=page_number)
+        key = frame_key or frame_json.get("id", "")
+        
+        document = dict(layout["document"], pageNumber=page_number)
+        signatures = {obj["id"]: self._object_hash(obj) for obj in layout["pages"][0]["objects"]}
+        
+        with self._lock:
+            previous = self._frames.get(key)
+        
+        diff = LayoutDiff(
+            frame_key=key,
+            page_number=page_number,
+            initial=previous is None,
+            state={"document": document, "objects": signatures},
+        )
+        if previous is not None:
+            diff.document_changed = previous["document"] != document
+        old = previous["objects"] if previous else {}
+        for obj in layout["pages"][0]["objects"]:
+            obj_id = obj["id"]
+            if obj_id not in old:
+                diff.added.append(obj)
+            elif old[obj_id] != signatures[obj_id]:
+                diff.changed.append(obj)
+            else:
+                diff.unchanged.append(obj_id)
+        diff.removed = [obj_id for obj_id in old if obj_id not in signatures]
+        
+        if commit:
+            self.commit(diff)
+        return layout, diff
+    
+    def commit(self, diff: LayoutDiff) -> None:
+        """Übernimmt den Frame-Stand eines Diffs als Basis für den nächsten Import."""
+        if diff.state is None:
+            return
+        with self._lock:
+            self._frames[diff.frame_key] = diff.state
+            self._frames.move_to_end(diff.frame_key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+    
+    def forget(self, frame_key: str) -> None:
+        """Verwirft den gespeicherten Stand eines Frames (nächster Import = vollständig)."""
+        with self._lock:
+            self._frames.pop(frame_key, None)
+    
+    @staticmethod
+    def _object_hash(obj: Dict) -> str:
+        payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
     def _convert_node_to_object(
         self,
         node: Dict,
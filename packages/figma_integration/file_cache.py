@@ -0,0 +1,152 @@
+"""
+Response-Cache für Figma-Dokumente
+
+Figma-Files sind oft mehrere MB JSON und ändern sich zwischen zwei Imports selten.
+Der Cache hält pro (file_key, Variante) den Rohinhalt auf Platte sowie die zuletzt
+geparsten Dokumente im Speicher - zusammen mit ``version``/``lastModified`` und den
+Validatoren (ETag/Last-Modified) für die Revalidierung in ``FigmaClient``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FigmaFileCache:
+    """
+    Zweistufiger Cache (Speicher + optional Platte) für Figma-API-Antworten.
+
+    - Speicher: die letzten ``max_entries`` geparsten Dokumente (Treffer ohne JSON-Parse)
+    - Platte (``disk_dir``): eine Datei pro Eintrag (Metadaten-Zeile + Rohinhalt), atomar
+      geschrieben; überlebt Neustarts, pro (file_key, Variante) genau eine Version
+
+    Zurückgegebene Dokumente werden geteilt und dürfen nicht verändert werden.
+    Thread-sicher.
+    """
+
+    def __init__(self, disk_dir: Optional[str] = None, max_entries: int = 4):
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_entries = max(0, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(file_key: str, variant: str) -> str:
+        return hashlib.sha256(f"{file_key}\n{variant}".encode("utf-8")).hexdigest()[:32]
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Metadaten (version, last_modified, etag, http_last_modified) oder None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                return dict(entry["meta"])
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open("rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Figma-Cache-Metadaten unlesbar ({path}): {e}")
+            return None
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[Any]:
+        """
+        Geparstes Dokument zum Schlüssel, falls vorhanden (und ``version`` passt).
+
+        Speichertreffer kosten keinen Parse; Plattentreffer werden einmal geparst und
+        danach im Speicher gehalten.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (version is None or entry["meta"].get("version") == version):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry["data"]
+
+        meta, data = self._read(key, version)
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, meta, data)
+        return data
+
+    def put(self, key: str, body: bytes, data: Any, meta: Dict[str, Any]) -> None:
+        """Speichert Rohinhalt (Platte) und geparstes Dokument (Speicher)."""
+        with self._lock:
+            self._remember(key, meta, data)
+        if not self.disk_dir:
+            return
+        try:
+            self._write_atomic(self._path(key), json.dumps(meta).encode("utf-8") + b"\n" + body)
+        except OSError as e:
+            logger.warning(f"Figma-Cache nicht schreibbar ({self.disk_dir}): {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir:
+            for path in self.disk_dir.glob("*.figma"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+                "memory_entries": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, meta: Dict[str, Any], data: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = {"meta": dict(meta), "data": data}
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / f"{key}.figma" if self.disk_dir else None
+
+    def _read(self, key: str, version: Optional[str]):
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None, None
+        try:
+            with path.open("rb") as f:
+                meta = json.loads(f.readline())
+                if version is not None and meta.get("version") != version:
+                    return meta, None
+                return meta, json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Figma-Cache-Eintrag unlesbar ({path}): {e}")
+            return None, None
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -69,7 +69,8 @@ async def import_figma_frame_with_full_pipeline(
     if not asset_downloader:
         asset_downloader = FigmaAssetDownloader(
             minio_client=None,  # TODO: MinIO Client übergeben
-            minio_bucket="figma-assets"
+            minio_bucket="figma-assets",
+            session=getattr(figma_client, "session", None)
         )
     
     if not auto_indexer:
@@ -0,0 +1,72 @@
+"""
+HTTP-Session für die Figma-Integration
+
+Gemeinsamer Connection-Pool (Keep-Alive) mit Retry + Backoff für API- und Asset-Requests
+sowie ein Limit für gleichzeitige Requests pro Host.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Status-Codes, bei denen ein erneuter Versuch sinnvoll ist (Rate Limit, Server-Fehler)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def build_session(
+    pool_maxsize: int = 16,
+    retries: int = 3,
+    backoff: float = 0.5
+) -> requests.Session:
+    """
+    Erstellt eine Session mit Connection-Pooling und Retry.
+
+    Args:
+        pool_maxsize: Offene Verbindungen pro Host im Pool
+        retries: Wiederholungen bei Verbindungsfehlern und RETRY_STATUS (nur GET/HEAD)
+        backoff: Backoff-Faktor (Wartezeit backoff * 2^n Sekunden, Retry-After wird beachtet)
+
+    Returns:
+        requests.Session
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HostLimiter:
+    """Begrenzt gleichzeitige Requests pro Host (thread-sicher)."""
+
+    def __init__(self, per_host: int = 4):
+        self.per_host = max(1, int(per_host))
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
@@ -4,7 +4,7 @@ SLA Inserter für Scribus
 Hilfsfunktionen zum Einfügen von SLA XML in Scribus-Dokumente.
 """
 
-from typing import Optional
+from typing import List, Optional
 import base64
 
 
@@ -61,3 +61,32 @@ def create_sla_insert_request(
         "insert_after": insert_after,
     }
 
+
+def create_sla_update_request(
+    sla_xml_bytes: Optional[bytes],
+    diff,
+    page_number: Optional[int] = None
+) -> dict:
+    """
+    Erstellt Request für die inkrementelle Aktualisierung einer bereits eingefügten Seite.
+    
+    Das Plugin ersetzt die Objekte aus ``upsert_object_ids`` (bzw. fügt sie hinzu) durch die
+    gleichnamigen PAGEOBJECTs (ANNAME) aus ``sla_xml`` und löscht ``remove_object_ids``.
+    Unveränderte Objekte bleiben unangetastet.
+    
+    Args:
+        sla_xml_bytes: SLA XML nur der neuen/geänderten Objekte (LayoutDiff.partial_layout)
+        diff: LayoutDiff des Imports
+        page_number: Seitenzahl (default: aus dem Diff)
+        
+    Returns:
+        Request-Dict für API
+    """
+    upsert_ids: List[str] = [obj.get("id", "") for obj in diff.upserts]
+    return {
+        "mode": "update",
+        "sla_xml": prepare_sla_for_plugin(sla_xml_bytes) if sla_xml_bytes and upsert_ids else None,
+        "page_number": page_number if page_number is not None else diff.page_number,
+        "upsert_object_ids": upsert_ids,
+        "remove_object_ids": list(diff.removed),
+    }
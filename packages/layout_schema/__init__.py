@@ -1,27 +1,98 @@
 """Layout Schema Package - JSON Schema und Validierung für Layout-Definitionen."""
 
+import copy
 import json
 import jsonschema
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
+
+try:
+    import fastjsonschema
+    HAS_FASTJSONSCHEMA = True
+except ImportError:
+    HAS_FASTJSONSCHEMA = False
 
 SCHEMA_PATH = Path(__file__).parent / "layout-mvp.schema.json"
 
 
-def load_schema():
-    """Lädt das JSON Schema."""
+@lru_cache(maxsize=1)
+def _cached_schema() -> dict:
     with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+def load_schema():
+    """Lädt das JSON Schema (Kopie - Aufrufer dürfen sie verändern)."""
+    return copy.deepcopy(_cached_schema())
+
+
+@lru_cache(maxsize=1)
+def get_layout_validator() -> jsonschema.Draft7Validator:
+    """
+    Prozessweit geteilter Validator (Schema wird nur einmal gelesen und aufgebaut).
+
+    Validatoren sind nach dem Aufbau zustandslos und können von mehreren Threads
+    gleichzeitig genutzt werden. Nach Änderungen an der Schema-Datei (Tests,
+    Entwicklung) ``clear_schema_cache()`` aufrufen.
+    """
+    return jsonschema.Draft7Validator(_cached_schema())
+
+
+@lru_cache(maxsize=1)
+def _fast_check() -> Callable[[dict], bool]:
+    """
+    Ja/Nein-Prüfung für den Normalfall.
+
+    Mit ``fastjsonschema`` wird das Schema zu einer Python-Funktion kompiliert
+    (ohne Defaults einzusetzen und ohne Format-Checks, wie der Draft7Validator);
+    sonst ``Draft7Validator.is_valid``. Maßgeblich bleibt jsonschema: ein negatives
+    Ergebnis wird dort mit Fehlermeldungen nachgeprüft.
+    """
+    if not HAS_FASTJSONSCHEMA:
+        return get_layout_validator().is_valid
+
+    try:
+        compiled = fastjsonschema.compile(_cached_schema(), use_default=False, use_formats=False)
+    except Exception:
+        # Schema-Konstrukt, das der Code-Generator nicht abdeckt -> interpretierter Pfad
+        return get_layout_validator().is_valid
+
+    def check(layout_json: dict) -> bool:
+        try:
+            compiled(layout_json)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+    return check
+
+
+def clear_schema_cache() -> None:
+    """Verwirft gecachtes Schema und Validatoren (nächster Aufruf liest die Datei neu)."""
+    _fast_check.cache_clear()
+    get_layout_validator.cache_clear()
+    _cached_schema.cache_clear()
+
+
+def is_layout_valid(layout_json: dict) -> bool:
+    """Schnellprüfung ohne Fehlermeldungen."""
+    if _fast_check()(layout_json):
+        return True
+    return get_layout_validator().is_valid(layout_json)
+
+
 def validate_layout(layout_json: dict) -> tuple[bool, list[str]]:
     """
     Validiert ein Layout-JSON gegen das Schema.
-    
+
+    Der Normalfall (gültig) läuft über die Schnellprüfung; Fehlermeldungen werden
+    nur gesammelt, wenn das Layout ungültig ist.
+
     Returns:
         (is_valid, errors): Tuple mit Validitäts-Flag und Liste von Fehlermeldungen
     """
-    schema = load_schema()
-    validator = jsonschema.Draft7Validator(schema)
-    errors = [str(e) for e in validator.iter_errors(layout_json)]
+    if _fast_check()(layout_json):
+        return True, []
+    errors = [str(e) for e in get_layout_validator().iter_errors(layout_json)]
     return len(errors) == 0, errors
-
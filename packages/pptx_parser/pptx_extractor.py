@@ -20,11 +20,16 @@ def extract_with_stage0_tool(
     out_dir: Path = Path("media_pool/pptx"),
     limit: int = 0,
     only: Optional[list[str]] = None,
+    workers: int = 1,
+    use_cache: bool = True,
 ) -> ExtractResult:
     """
     Wrapper around the existing Stage-0 extractor `tools/extract_pptx_assets.py`.
     Keeps behavior consistent while providing the `packages.pptx_parser.pptx_extractor` entrypoint
     expected by the design docs.
+
+    `workers > 1` extracts decks in parallel (process pool); the manifest order stays deterministic.
+    `use_cache=False` re-extracts every deck instead of reusing JSON of unchanged decks.
     """
 
     env = os.environ.copy()
@@ -33,6 +38,10 @@ def extract_with_stage0_tool(
         env["ZC_PPTX_LIMIT"] = str(int(limit))
     if only:
         env["ZC_PPTX_ONLY"] = ",".join(only)
+    if workers and workers > 1:
+        env["ZC_PPTX_WORKERS"] = str(int(workers))
+    if not use_cache:
+        env["ZC_PPTX_CACHE"] = "0"
 
     script = Path("tools") / "extract_pptx_assets.py"
     cmd = [sys.executable, str(script)]
@@ -5,6 +5,7 @@ from .preflight_checker import run_preflight
 from .amazon_checker import check_amazon_constraints
 from .policy import evaluate_quality_gate, summarize_quality_gate
 from .hybrid_checks import HeuristicConfig, run_heuristic_checks
+from .engine import LayoutVisitor, run_quality_checks, run_quality_checks_sequential
 
 __all__ = [
     "validate_layout_semantics",
@@ -14,4 +15,7 @@ __all__ = [
     "summarize_quality_gate",
     "run_heuristic_checks",
     "HeuristicConfig",
+    "LayoutVisitor",
+    "run_quality_checks",
+    "run_quality_checks_sequential",
 ]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from packages.common.layout_visitor import LayoutVisitor, walk_layout
+from packages.layout_schema import validate_layout
+from packages.variant_generator.amazon_validator import AmazonVisitor
+
+from .amazon_checker import check_amazon_constraints
+from .hybrid_checks import HeuristicConfig, HeuristicsVisitor, run_heuristic_checks
+from .layout_validator import SemanticVisitor
+from .policy import CheckResult, QualityGateVisitor, evaluate_quality_gate, summarize_quality_gate
+from .preflight_checker import run_preflight
+
+
+def _entry_from_results(
+    checks: Sequence[str],
+    preflight: Optional[tuple[bool, List[str]]],
+    amazon: Optional[tuple[bool, List[str]]],
+    gate: List[CheckResult],
+    heuristics: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {}
+    if "preflight" in checks and preflight is not None:
+        ok, errs = preflight
+        entry["preflight_valid"] = bool(ok)
+        entry["preflight_errors"] = list(errs[:50])
+    if "amazon" in checks and amazon is not None:
+        ok, errs = amazon
+        entry["amazon_valid"] = bool(ok)
+        entry["amazon_errors"] = list(errs[:50])
+    entry["quality_gate"] = summarize_quality_gate(gate)
+    if "heuristics" in checks and heuristics is not None:
+        entry["heuristics"] = heuristics
+    return entry
+
+
+def run_quality_checks_sequential(
+    layout_json: Dict[str, Any],
+    *,
+    checks: Sequence[str],
+    project_init: Optional[Dict[str, Any]] = None,
+    heuristic_config: Optional[HeuristicConfig] = None,
+) -> Dict[str, Any]:
+    """Reference path: every check walks the layout on its own."""
+    preflight = run_preflight(layout_json) if "preflight" in checks else None
+    amazon = check_amazon_constraints(layout_json) if "amazon" in checks else None
+    gate = evaluate_quality_gate(layout_json, project_init=project_init or {})
+    heuristics = run_heuristic_checks(layout_json, config=heuristic_config) if "heuristics" in checks else None
+    return _entry_from_results(checks, preflight, amazon, gate, heuristics)
+
+
+def run_quality_checks(
+    layout_json: Dict[str, Any],
+    *,
+    checks: Sequence[str],
+    project_init: Optional[Dict[str, Any]] = None,
+    heuristic_config: Optional[HeuristicConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Fused quality check: one walk over pages/objects for all enabled checks.
+
+    Returns the per-layout report fields (``preflight_*``, ``amazon_*``,
+    ``quality_gate``, ``heuristics``). The visitors are the same ones behind the
+    standalone checks, so results (and exceptions on malformed layouts) match
+    ``run_quality_checks_sequential``.
+    """
+    visitors: List[LayoutVisitor] = []
+
+    preflight: Optional[tuple[bool, List[str]]] = None
+    semantic: Optional[SemanticVisitor] = None
+    if "preflight" in checks:
+        ok, schema_errors = validate_layout(layout_json)
+        if ok:
+            semantic = SemanticVisitor(layout_json)
+            visitors.append(semantic)
+        else:
+            preflight = (ok, schema_errors)
+
+    amazon = AmazonVisitor(layout_json) if "amazon" in checks else None
+    gate = QualityGateVisitor(layout_json, project_init=project_init or {})
+    heuristics = HeuristicsVisitor(config=heuristic_config) if "heuristics" in checks else None
+    visitors.extend(v for v in (amazon, gate, heuristics) if v is not None)
+
+    walk_layout(layout_json, visitors)
+
+    if semantic is not None:
+        preflight = semantic.finish()
+    return _entry_from_results(
+        checks,
+        preflight,
+        amazon.finish() if amazon is not None else None,
+        gate.finish(),
+        heuristics.finish() if heuristics is not None else None,
+    )
@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+from packages.common.layout_visitor import XYWH, LayoutVisitor, walk_layout
+
 
 @dataclass(frozen=True)
 class HeuristicConfig:
@@ -30,18 +32,6 @@ def _as_int(v: Any, default: int = 0) -> int:
         return int(default)
 
 
-def _iter_pages(layout_json: Dict[str, Any]):
-    for page in layout_json.get("pages", []) or []:
-        if isinstance(page, dict):
-            yield page
-
-
-def _iter_objects(page: Dict[str, Any]):
-    for obj in page.get("objects", []) or []:
-        if isinstance(obj, dict):
-            yield obj
-
-
 def estimate_text_overflow_ratio(
     *,
     text: str,
@@ -76,82 +66,94 @@ def estimate_text_overflow_ratio(
     return needed_h / bbox_h
 
 
-def run_heuristic_checks(
-    layout_json: Dict[str, Any],
-    *,
-    config: Optional[HeuristicConfig] = None,
-) -> Dict[str, Any]:
-    """
-    Warn-only checks:
-    - text_overflow_risk: estimates if text likely doesn't fit its bbox
-    - page_density: objects-per-page beyond threshold
-
-    Output is designed to be stable/deterministic given identical inputs.
-    """
+class HeuristicsVisitor(LayoutVisitor):
+    """``run_heuristic_checks``: Seitendichte + geschätzter Text-Overflow (nur Warnungen)."""
 
-    cfg = config or HeuristicConfig()
+    skip_non_dict = True
 
-    warnings: List[Dict[str, Any]] = []
-    infos: List[Dict[str, Any]] = []
+    def __init__(self, *, config: Optional[HeuristicConfig] = None):
+        self.cfg = config or HeuristicConfig()
+        self.warnings: List[Dict[str, Any]] = []
+        self.infos: List[Dict[str, Any]] = []
+        self.pages_summary: List[Dict[str, Any]] = []
+        self._pn = 0
 
-    pages_summary: List[Dict[str, Any]] = []
-    for page in _iter_pages(layout_json):
+    def visit_page(self, page: Dict[str, Any]) -> None:
         pn = _as_int(page.get("pageNumber"), 0)
-        objs = list(_iter_objects(page))
-        pages_summary.append({"pageNumber": pn, "objectCount": len(objs)})
+        self._pn = pn
+        count = sum(1 for obj in page.get("objects", []) or [] if isinstance(obj, dict))
+        self.pages_summary.append({"pageNumber": pn, "objectCount": count})
 
-        if len(objs) >= cfg.objects_per_page_warn:
-            warnings.append(
+        if count >= self.cfg.objects_per_page_warn:
+            self.warnings.append(
                 {
                     "id": "page.density",
                     "page": pn,
-                    "message": f"High object count on page {pn}: {len(objs)} objects",
-                    "objectCount": len(objs),
+                    "message": f"High object count on page {pn}: {count} objects",
+                    "objectCount": count,
                 }
             )
 
-        for obj in objs:
-            if str(obj.get("type") or "") != "text":
-                continue
-            text = str(obj.get("content") or "")
-            bbox = obj.get("bbox") or {}
-            ratio = estimate_text_overflow_ratio(
-                text=text,
-                bbox_w=_as_float(bbox.get("w"), 0.0),
-                bbox_h=_as_float(bbox.get("h"), 0.0),
-                font_size=_as_float(obj.get("fontSize"), 0.0),
-                cfg=cfg,
-            )
-            if ratio is None:
-                continue
-
-            entry = {
-                "id": "text.overflow_risk",
-                "page": pn,
-                "objectId": obj.get("id"),
-                "ratio": round(float(ratio), 4),
-                "message": "Estimated text overflow risk (needed_height / bbox_height)",
-            }
-            if ratio > cfg.overflow_warn_ratio:
-                warnings.append(entry)
-            elif ratio > cfg.overflow_info_ratio:
-                infos.append(entry)
-
-    return {
-        "passed": True,  # warn-only module
-        "warnings": warnings,
-        "infos": infos,
-        "summary": {
-            "pages": pages_summary,
-            "warnCount": len(warnings),
-            "infoCount": len(infos),
-            "config": {
-                "avg_char_width_em": cfg.avg_char_width_em,
-                "line_height_em": cfg.line_height_em,
-                "overflow_warn_ratio": cfg.overflow_warn_ratio,
-                "overflow_info_ratio": cfg.overflow_info_ratio,
-                "objects_per_page_warn": cfg.objects_per_page_warn,
+    def visit_object(self, obj: Dict[str, Any], obj_type: str, xywh: XYWH) -> None:
+        if obj_type != "text":
+            return
+        bbox = obj.get("bbox") or {}
+        ratio = estimate_text_overflow_ratio(
+            text=str(obj.get("content") or ""),
+            bbox_w=_as_float(bbox.get("w"), 0.0),
+            bbox_h=_as_float(bbox.get("h"), 0.0),
+            font_size=_as_float(obj.get("fontSize"), 0.0),
+            cfg=self.cfg,
+        )
+        if ratio is None:
+            return
+
+        entry = {
+            "id": "text.overflow_risk",
+            "page": self._pn,
+            "objectId": obj.get("id"),
+            "ratio": round(float(ratio), 4),
+            "message": "Estimated text overflow risk (needed_height / bbox_height)",
+        }
+        if ratio > self.cfg.overflow_warn_ratio:
+            self.warnings.append(entry)
+        elif ratio > self.cfg.overflow_info_ratio:
+            self.infos.append(entry)
+
+    def finish(self) -> Dict[str, Any]:
+        cfg = self.cfg
+        return {
+            "passed": True,  # warn-only module
+            "warnings": self.warnings,
+            "infos": self.infos,
+            "summary": {
+                "pages": self.pages_summary,
+                "warnCount": len(self.warnings),
+                "infoCount": len(self.infos),
+                "config": {
+                    "avg_char_width_em": cfg.avg_char_width_em,
+                    "line_height_em": cfg.line_height_em,
+                    "overflow_warn_ratio": cfg.overflow_warn_ratio,
+                    "overflow_info_ratio": cfg.overflow_info_ratio,
+                    "objects_per_page_warn": cfg.objects_per_page_warn,
+                },
             },
-        },
-    }
+        }
+
+
+def run_heuristic_checks(
+    layout_json: Dict[str, Any],
+    *,
+    config: Optional[HeuristicConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Warn-only checks:
+    - text_overflow_risk: estimates if text likely doesn't fit its bbox
+    - page_density: objects-per-page beyond threshold
+
+    Output is designed to be stable/deterministic given identical inputs.
+    """
 
+    visitor = HeuristicsVisitor(config=config)
+    walk_layout(layout_json, [visitor])
+    return visitor.finish()
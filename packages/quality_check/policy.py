@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Literal, Optional, Set
+from typing import Any, Dict, List, Literal, Optional, Set
+
+from packages.common.layout_visitor import XYWH, LayoutVisitor, walk_layout
 
 
 Severity = Literal["fail", "warn", "info"]
@@ -16,17 +18,168 @@ class CheckResult:
     message: str
 
 
-def _iter_objects(layout_json: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-    for page in layout_json.get("pages", []) or []:
-        for obj in page.get("objects", []) or []:
-            if isinstance(obj, dict):
-                yield obj
-
-
 def _mm_to_px(mm: float, dpi: float) -> float:
     return (float(mm) / 25.4) * float(dpi)
 
 
+class QualityGateVisitor(LayoutVisitor):
+    """``evaluate_quality_gate``: sammelt Fakten pro Objekt, ``finish`` liefert die Ergebnisse in Policy-Reihenfolge."""
+
+    skip_non_dict = True
+
+    def __init__(self, layout_json: Dict[str, Any], *, project_init: Optional[Dict[str, Any]] = None):
+        project_init = project_init or {}
+        self.layout_json = layout_json
+        self.project_init = project_init
+
+        doc = layout_json.get("document") or {}
+        self.w = float(doc.get("width") or 0)
+        self.h = float(doc.get("height") or 0)
+        self.dpi = float(doc.get("dpi") or 0)
+
+        self.page_numbers: List[int] = []
+        self.ids: List[str] = []
+
+        self.allowed_layers: Optional[Set[str]] = None
+        layers_cfg = (project_init.get("layout") or {}).get("layers")
+        if isinstance(layers_cfg, (list, tuple)) and layers_cfg:
+            self.allowed_layers = {str(x) for x in layers_cfg if str(x).strip()}
+        self.bad_layers: Set[str] = set()
+
+        self.declared_fonts: Optional[Set[str]] = None
+        fonts_cfg = (project_init.get("typography") or {}).get("fonts")
+        if isinstance(fonts_cfg, (list, tuple)) and fonts_cfg:
+            declared = {str(f.get("family") or "") for f in fonts_cfg if isinstance(f, dict) and f.get("family")}
+            self.declared_fonts = {f for f in declared if f.strip()}
+        self.unknown_fonts: Set[str] = set()
+
+        self.missing_images = 0
+        self.missing_local: List[str] = []
+
+        # Amazon safety margin (FAIL when amazon.enabled and margin > 0)
+        amazon_cfg = project_init.get("amazon") or {}
+        is_amazon = str(amazon_cfg.get("enabled") or "").lower() in {"1", "true", "yes"}
+        self.safety_mm = 0.0
+        self.safety_px = 0.0
+        self.check_safe_area = False
+        if is_amazon and self.w > 0 and self.h > 0 and self.dpi > 0:
+            self.safety_mm = float(amazon_cfg.get("safety_margin_mm") or 0.0)
+            self.safety_px = _mm_to_px(self.safety_mm, self.dpi)
+            self.check_safe_area = self.safety_px > 0
+        self.needs_bbox = self.check_safe_area
+        self.safe_area_bad = 0
+
+    def visit_page(self, page: Dict[str, Any]) -> None:
+        try:
+            self.page_numbers.append(int(page.get("pageNumber") or 0))
+        except Exception:
+            self.page_numbers.append(0)
+
+    def visit_object(self, obj: Dict[str, Any], obj_type: str, xywh: XYWH) -> None:
+        self.ids.append(str(obj.get("id") or ""))
+
+        if self.allowed_layers:
+            layer = str(obj.get("layer") or "").strip()
+            if layer and layer not in self.allowed_layers:
+                self.bad_layers.add(layer)
+
+        if self.declared_fonts and obj_type == "text":
+            ff = str(obj.get("fontFamily") or "").strip()
+            if ff and ff not in self.declared_fonts:
+                self.unknown_fonts.add(ff)
+
+        if obj_type == "image":
+            url = str(obj.get("imageUrl") or "")
+            if not url.strip():
+                self.missing_images += 1
+            # Local file existence - only for absolute paths
+            if url and not url.startswith(("http://", "https://", "/v1/artifacts/")):
+                p = Path(url)
+                if p.is_absolute() and not p.exists():
+                    self.missing_local.append(url)
+
+        if self.check_safe_area and xywh is not None:
+            x, y, bw, bh = xywh
+            m = self.safety_px
+            if x < m or y < m or (x + bw) > (self.w - m) or (y + bh) > (self.h - m):
+                self.safe_area_bad += 1
+
+    def finish(self) -> List[CheckResult]:
+        results: List[CheckResult] = []
+        w, h, dpi = self.w, self.h, self.dpi
+
+        # Document sanity (FAIL)
+        if w <= 0 or h <= 0:
+            results.append(CheckResult("document.dimensions", "fail", False, "Document width/height must be > 0"))
+        else:
+            results.append(CheckResult("document.dimensions", "info", True, f"Document size OK: {w}x{h}px"))
+
+        if dpi <= 0:
+            results.append(CheckResult("document.dpi", "fail", False, "Document dpi must be > 0"))
+        else:
+            results.append(CheckResult("document.dpi", "info", True, f"DPI OK: {dpi}"))
+
+        # Page numbering (WARN)
+        page_numbers = self.page_numbers
+        if (0 in set(page_numbers)) or (len(set(page_numbers)) != len(page_numbers)):
+            results.append(CheckResult("pages.numbering", "warn", False, f"Invalid/duplicate pageNumber(s): {page_numbers}"))
+        else:
+            results.append(CheckResult("pages.numbering", "info", True, f"Pages: {len(page_numbers)}"))
+
+        # Object IDs unique (WARN)
+        ids_nonempty = [x for x in self.ids if x.strip()]
+        if len(ids_nonempty) != len(self.ids):
+            results.append(CheckResult("objects.unique_ids", "warn", False, "Empty object id(s) detected"))
+        elif len(ids_nonempty) != len(set(ids_nonempty)):
+            results.append(CheckResult("objects.unique_ids", "warn", False, "Duplicate object id(s) detected"))
+        else:
+            results.append(CheckResult("objects.unique_ids", "info", True, f"Objects: {len(ids_nonempty)}"))
+
+        # Known layers (WARN) if defined
+        if self.allowed_layers:
+            if self.bad_layers:
+                results.append(CheckResult("layout.layers", "warn", False, f"Unknown layer(s) used: {sorted(self.bad_layers)}"))
+            else:
+                results.append(CheckResult("layout.layers", "info", True, "All layers match project_init"))
+
+        # Fonts declared (WARN) if typography.fonts provided
+        if self.declared_fonts:
+            if self.unknown_fonts:
+                results.append(CheckResult("typography.fonts", "warn", False, f"Undeclared font(s): {sorted(self.unknown_fonts)}"))
+            else:
+                results.append(CheckResult("typography.fonts", "info", True, "All fonts declared in project_init"))
+
+        # Images must have imageUrl (FAIL)
+        if self.missing_images:
+            results.append(CheckResult("images.urls", "fail", False, f"{self.missing_images} image object(s) missing imageUrl"))
+        else:
+            results.append(CheckResult("images.urls", "info", True, "All image objects have imageUrl"))
+
+        # Bleed requirement for color variant (FAIL if variant name indicates color)
+        variant = self.layout_json.get("variant") or {}
+        variant_name = str(variant.get("name") or variant.get("variant") or "")
+        bleed_mm = float(variant.get("bleed_mm") or 0.0)
+        require_bleed_mm = float((self.project_init.get("print") or {}).get("bleed_mm") or 3.0)
+        if variant_name.lower() in {"color", "colour"}:
+            if bleed_mm + 1e-6 < require_bleed_mm:
+                results.append(CheckResult("print.bleed", "fail", False, f"Color variant requires bleed_mm >= {require_bleed_mm}"))
+            else:
+                results.append(CheckResult("print.bleed", "info", True, f"Bleed OK: {bleed_mm}mm"))
+
+        if self.check_safe_area:
+            if self.safe_area_bad:
+                results.append(
+                    CheckResult("amazon.safe_area", "fail", False, f"{self.safe_area_bad} object(s) violate safety margin ({self.safety_mm}mm)")
+                )
+            else:
+                results.append(CheckResult("amazon.safe_area", "info", True, f"All objects within safety margin ({self.safety_mm}mm)"))
+
+        if self.missing_local:
+            results.append(CheckResult("images.local_files", "warn", False, f"Missing local image file(s): {self.missing_local[:10]}"))
+
+        return results
+
+
 def evaluate_quality_gate(
     layout_json: Dict[str, Any],
     *,
@@ -42,145 +195,9 @@ def evaluate_quality_gate(
     This complements schema/preflight checks with project-specific constraints.
     """
 
-    project_init = project_init or {}
-    results: List[CheckResult] = []
-
-    doc = layout_json.get("document") or {}
-    w = float(doc.get("width") or 0)
-    h = float(doc.get("height") or 0)
-    dpi = float(doc.get("dpi") or 0)
-
-    # Document sanity (FAIL)
-    if w <= 0 or h <= 0:
-        results.append(CheckResult("document.dimensions", "fail", False, "Document width/height must be > 0"))
-    else:
-        results.append(CheckResult("document.dimensions", "info", True, f"Document size OK: {w}x{h}px"))
-
-    if dpi <= 0:
-        results.append(CheckResult("document.dpi", "fail", False, "Document dpi must be > 0"))
-    else:
-        results.append(CheckResult("document.dpi", "info", True, f"DPI OK: {dpi}"))
-
-    # Page numbering (WARN)
-    page_numbers: List[int] = []
-    for p in layout_json.get("pages", []) or []:
-        try:
-            page_numbers.append(int(p.get("pageNumber") or 0))
-        except Exception:
-            page_numbers.append(0)
-    if (0 in set(page_numbers)) or (len(set(page_numbers)) != len(page_numbers)):
-        results.append(CheckResult("pages.numbering", "warn", False, f"Invalid/duplicate pageNumber(s): {page_numbers}"))
-    else:
-        results.append(CheckResult("pages.numbering", "info", True, f"Pages: {len(page_numbers)}"))
-
-    # Object IDs unique (WARN)
-    ids = [str(o.get("id") or "") for o in _iter_objects(layout_json)]
-    ids_nonempty = [x for x in ids if x.strip()]
-    if len(ids_nonempty) != len(ids):
-        results.append(CheckResult("objects.unique_ids", "warn", False, "Empty object id(s) detected"))
-    elif len(ids_nonempty) != len(set(ids_nonempty)):
-        results.append(CheckResult("objects.unique_ids", "warn", False, "Duplicate object id(s) detected"))
-    else:
-        results.append(CheckResult("objects.unique_ids", "info", True, f"Objects: {len(ids_nonempty)}"))
-
-    # Known layers (WARN) if defined
-    allowed_layers: Optional[Set[str]] = None
-    layers_cfg = (project_init.get("layout") or {}).get("layers")
-    if isinstance(layers_cfg, (list, tuple)) and layers_cfg:
-        allowed_layers = {str(x) for x in layers_cfg if str(x).strip()}
-    if allowed_layers:
-        bad = set()
-        for obj in _iter_objects(layout_json):
-            layer = str(obj.get("layer") or "").strip()
-            if layer and layer not in allowed_layers:
-                bad.add(layer)
-        if bad:
-            results.append(CheckResult("layout.layers", "warn", False, f"Unknown layer(s) used: {sorted(bad)}"))
-        else:
-            results.append(CheckResult("layout.layers", "info", True, "All layers match project_init"))
-
-    # Fonts declared (WARN) if typography.fonts provided
-    fonts_cfg = (project_init.get("typography") or {}).get("fonts")
-    declared_fonts: Optional[Set[str]] = None
-    if isinstance(fonts_cfg, (list, tuple)) and fonts_cfg:
-        declared_fonts = {str(f.get("family") or "") for f in fonts_cfg if isinstance(f, dict) and f.get("family")}
-        declared_fonts = {f for f in declared_fonts if f.strip()}
-    if declared_fonts:
-        unknown = set()
-        for obj in _iter_objects(layout_json):
-            if str(obj.get("type") or "") != "text":
-                continue
-            ff = str(obj.get("fontFamily") or "").strip()
-            if ff and ff not in declared_fonts:
-                unknown.add(ff)
-        if unknown:
-            results.append(CheckResult("typography.fonts", "warn", False, f"Undeclared font(s): {sorted(unknown)}"))
-        else:
-            results.append(CheckResult("typography.fonts", "info", True, "All fonts declared in project_init"))
-
-    # Images must have imageUrl (FAIL)
-    missing_images = 0
-    for obj in _iter_objects(layout_json):
-        if str(obj.get("type") or "") != "image":
-            continue
-        if not str(obj.get("imageUrl") or "").strip():
-            missing_images += 1
-    if missing_images:
-        results.append(CheckResult("images.urls", "fail", False, f"{missing_images} image object(s) missing imageUrl"))
-    else:
-        results.append(CheckResult("images.urls", "info", True, "All image objects have imageUrl"))
-
-    # Bleed requirement for color variant (FAIL if variant name indicates color)
-    variant = layout_json.get("variant") or {}
-    variant_name = str(variant.get("name") or variant.get("variant") or "")
-    bleed_mm = float(variant.get("bleed_mm") or 0.0)
-    require_bleed_mm = float((project_init.get("print") or {}).get("bleed_mm") or 3.0)
-    if variant_name.lower() in {"color", "colour"}:
-        if bleed_mm + 1e-6 < require_bleed_mm:
-            results.append(CheckResult("print.bleed", "fail", False, f"Color variant requires bleed_mm >= {require_bleed_mm}"))
-        else:
-            results.append(CheckResult("print.bleed", "info", True, f"Bleed OK: {bleed_mm}mm"))
-
-    # Amazon safety margin (FAIL when amazon.enabled and margin > 0)
-    amazon_cfg = project_init.get("amazon") or {}
-    is_amazon = str(amazon_cfg.get("enabled") or "").lower() in {"1", "true", "yes"}
-    if is_amazon and w > 0 and h > 0 and dpi > 0:
-        safety_mm = float(amazon_cfg.get("safety_margin_mm") or 0.0)
-        m = _mm_to_px(safety_mm, dpi)
-        if m > 0:
-            bad = 0
-            for obj in _iter_objects(layout_json):
-                bbox = obj.get("bbox") or {}
-                if not {"x", "y", "w", "h"} <= set(bbox.keys()):
-                    continue
-                x = float(bbox["x"])
-                y = float(bbox["y"])
-                bw = float(bbox["w"])
-                bh = float(bbox["h"])
-                if x < m or y < m or (x + bw) > (w - m) or (y + bh) > (h - m):
-                    bad += 1
-            if bad:
-                results.append(CheckResult("amazon.safe_area", "fail", False, f"{bad} object(s) violate safety margin ({safety_mm}mm)"))
-            else:
-                results.append(CheckResult("amazon.safe_area", "info", True, f"All objects within safety margin ({safety_mm}mm)"))
-
-    # Local file existence (WARN) - only for absolute paths
-    missing_local: List[str] = []
-    for obj in _iter_objects(layout_json):
-        if str(obj.get("type") or "") != "image":
-            continue
-        url = str(obj.get("imageUrl") or "")
-        if not url:
-            continue
-        if url.startswith(("http://", "https://", "/v1/artifacts/")):
-            continue
-        p = Path(url)
-        if p.is_absolute() and not p.exists():
-            missing_local.append(url)
-    if missing_local:
-        results.append(CheckResult("images.local_files", "warn", False, f"Missing local image file(s): {missing_local[:10]}"))
-
-    return results
+    visitor = QualityGateVisitor(layout_json, project_init=project_init)
+    walk_layout(layout_json, [visitor])
+    return visitor.finish()
 
 
 def summarize_quality_gate(results: List[CheckResult]) -> Dict[str, Any]:
@@ -48,6 +48,33 @@ class AutoIndexer:
         # index_layout ist synchron, daher kein await nötig
         return self.layout_indexer.index_layout(layout_json, source="figma")
     
+    async def index_figma_update(
+        self,
+        layout_json: Dict,
+        diff,
+        layout_id: Optional[str] = None
+    ) -> str:
+        """
+        Inkrementelles Indexing nach erneutem Figma-Frame-Import.
+        
+        Nur geänderte Objekte werden neu indexiert. Ohne vorherige Layout-ID oder bei
+        vollständiger Änderung (erster Import, Größe/DPI/Seite) wird der alte Eintrag
+        entfernt und das Layout neu indexiert.
+        
+        Args:
+            layout_json: Layout JSON (nach FrameToLayoutConverter.convert_incremental)
+            diff: LayoutDiff des Imports
+            layout_id: Layout-ID des vorherigen Imports (optional)
+            
+        Returns:
+            Layout-ID
+        """
+        if not layout_id or diff.full_update:
+            if layout_id:
+                self.layout_indexer.delete_layout(layout_id)
+            return await self.index_figma_import(layout_json)
+        return self.layout_indexer.update_layout(layout_id, layout_json, diff, source="figma")
+    
     async def index_scribus_export(self, layout_json: Dict) -> str:
         """
         Automatisches Indexing nach Scribus-Seite-Export.
@@ -4,7 +4,7 @@ Layout Indexer für RAG-Service
 Indexiert Layout JSON mit allen Objekten und Zuordnungen.
 """
 
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Set, Union
 from .database import RAGDatabase
 from .embeddings import EmbeddingModels
 import json
@@ -59,20 +59,7 @@ class LayoutIndexer:
         layout_id = str(uuid.uuid4())
         
         # 1. Layout-Struktur → Text-Embedding
-        structure_text = self._extract_layout_structure(layout_json)
-        structure_embedding = self.embeddings.embed_text(structure_text)
-        
-        # Speichere Layout-Struktur
-        self.db.layouts_collection.add(
-            ids=[layout_id],
-            embeddings=[structure_embedding],
-            documents=[structure_text],
-            metadatas=[_safe_metadata({
-                "source": source or "unknown",
-                "layout_json": json.dumps(layout_json) if layout_json else "{}",
-                "version": layout_json.get("version") or "1.0.0",
-            })]
-        )
+        self.db.layouts_collection.add(**self._layout_entry(layout_json, layout_id, source))
         
         # 2. Text-Objekte → Text-Embeddings
         self._index_text_objects(layout_json, layout_id)
@@ -88,6 +75,68 @@ class LayoutIndexer:
         
         return layout_id
     
+    def update_layout(self, layout_id: str, layout_json: Dict, diff, source: str = "unknown") -> str:
+        """
+        Aktualisiert ein bereits indexiertes Layout anhand eines ``LayoutDiff``.
+        
+        Nur neue/geänderte Objekte (und ihre Text-Bild-Paare) werden neu eingebettet,
+        entfernte gelöscht; die Layout-Struktur wird ersetzt.
+        
+        Args:
+            layout_id: Layout-ID des vorherigen Index-Laufs
+            layout_json: Vollständiges neues Layout JSON
+            diff: LayoutDiff (figma_integration.converter)
+            source: Quelle (figma|scribus|llm|unknown)
+            
+        Returns:
+            Layout-ID (unverändert)
+        """
+        if diff.is_empty:
+            return layout_id
+        
+        upsert_ids = [obj.get("id") for obj in diff.upserts if obj.get("id")]
+        touched = upsert_ids + list(diff.removed)
+        
+        if touched:
+            object_ids = [f"{layout_id}_{obj_id}" for obj_id in touched]
+            self.db.texts_collection.delete(ids=object_ids)
+            self.db.images_collection.delete(ids=object_ids)
+            self.db.pairs_collection.delete(where={"$and": [
+                {"layout_id": layout_id},
+                {"$or": [{"text_id": {"$in": touched}}, {"image_id": {"$in": touched}}]},
+            ]})
+        
+        self.db.layouts_collection.upsert(**self._layout_entry(layout_json, layout_id, source))
+        
+        partial = diff.partial_layout(layout_json)
+        self._index_text_objects(partial, layout_id)
+        self._index_image_objects(partial, layout_id)
+        self._index_text_image_pairs(layout_json, layout_id, only_ids=set(upsert_ids))
+        
+        return layout_id
+    
+    def delete_layout(self, layout_id: str):
+        """Entfernt ein Layout mit allen Objekten und Paaren aus dem Index."""
+        self.db.layouts_collection.delete(ids=[layout_id])
+        for collection in (self.db.texts_collection, self.db.images_collection, self.db.pairs_collection):
+            collection.delete(where={"layout_id": layout_id})
+    
+    def _layout_entry(self, layout_json: Dict, layout_id: str, source: str) -> Dict:
+        """Eintrag für die layouts-Collection (Struktur-Text + Embedding + Metadaten)."""
+        structure_text = self._extract_layout_structure(layout_json)
+        structure_embedding = self.embeddings.embed_text(structure_text)
+        
+        return {
+            "ids": [layout_id],
+            "embeddings": [structure_embedding],
+            "documents": [structure_text],
+            "metadatas": [_safe_metadata({
+                "source": source or "unknown",
+                "layout_json": json.dumps(layout_json) if layout_json else "{}",
+                "version": layout_json.get("version") or "1.0.0",
+            })],
+        }
+    
     def _extract_layout_structure(self, layout_json: Dict) -> str:
         """
         Konvertiert Layout-Struktur in Text-Repräsentation für Embedding.
@@ -212,8 +261,15 @@ class LayoutIndexer:
                             # Fehler beim Indexieren ignorieren
                             pass
     
-    def _index_text_image_pairs(self, layout_json: Dict, layout_id: str):
-        """Indexiert Text-Bild-Zuordnungen mit CLIP-Embeddings"""
+    def _index_text_image_pairs(self, layout_json: Dict, layout_id: str, only_ids: Optional[Set[str]] = None):
+        """
+        Indexiert Text-Bild-Zuordnungen mit CLIP-Embeddings
+        
+        Mit ``only_ids`` nur Paare, an denen mindestens eines dieser Objekte beteiligt ist.
+        """
+        def wanted(text_id, image_id) -> bool:
+            return only_ids is None or text_id in only_ids or image_id in only_ids
+        
         for page in layout_json.get("pages", []):
             objects = {obj.get("id"): obj for obj in page.get("objects", [])}
             
@@ -222,7 +278,7 @@ class LayoutIndexer:
                 if obj.get("type") == "text":
                     related_images = obj.get("relatedImageIds", [])
                     for image_id in related_images:
-                        if image_id in objects:
+                        if image_id in objects and wanted(obj_id, image_id):
                             image_obj = objects[image_id]
                             self._index_pair(
                                 layout_id,
@@ -236,7 +292,7 @@ class LayoutIndexer:
                 elif obj.get("type") == "image":
                     related_texts = obj.get("relatedTextIds", [])
                     for text_id in related_texts:
-                        if text_id in objects:
+                        if text_id in objects and wanted(text_id, obj_id):
                             text_obj = objects[text_id]
                             self._index_pair(
                                 layout_id,
@@ -140,6 +140,8 @@ def _add_rectangle(parent: ET.Element, obj: Dict, dpi: float, page_num: int):
     rect_elem.set("HEIGHT", str(h_pt))
     rect_elem.set("PAGE", str(page_num))
     rect_elem.set("LAYER", obj.get("layer", "Background"))
+    if obj.get("id"):
+        rect_elem.set("ANNAME", str(obj["id"]))  # Objektname (für inkrementelle Updates)
     
     # Fill color
     fill_color = obj.get("fillColor", "#FFFFFF")
@@ -171,6 +173,8 @@ def _add_textframe(parent: ET.Element, obj: Dict, dpi: float, page_num: int):
     text_elem.set("HEIGHT", str(h_pt))
     text_elem.set("PAGE", str(page_num))
     text_elem.set("LAYER", obj.get("layer", "Text"))
+    if obj.get("id"):
+        text_elem.set("ANNAME", str(obj["id"]))  # Objektname (für inkrementelle Updates)
     
     # Text content (vereinfacht für MVP)
     content = obj.get("content", "")
@@ -204,6 +208,8 @@ def _add_imageframe(parent: ET.Element, obj: Dict, dpi: float, page_num: int):
     img_elem.set("HEIGHT", str(h_pt))
     img_elem.set("PAGE", str(page_num))
     img_elem.set("LAYER", obj.get("layer", "Images"))
+    if obj.get("id"):
+        img_elem.set("ANNAME", str(obj["id"]))  # Objektname (für inkrementelle Updates)
     
     # Image path (vereinfacht für MVP)
     image_url = obj.get("imageUrl", "")
@@ -1,33 +1,59 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from packages.common.geometry import LayoutGeometry
+from packages.common.layout_visitor import XYWH, LayoutVisitor, walk_layout
 
-def validate_kdp_layout(layout_json: Dict[str, Any], *, safety_margin_px: float = 0.0) -> tuple[bool, List[str]]:
+
+class AmazonVisitor(LayoutVisitor):
+    """``validate_kdp_layout``: bboxes within page bounds (optionally with a safety margin)."""
+
+    needs_bbox = True
+
+    def __init__(self, layout_json: Dict[str, Any], *, safety_margin_px: float = 0.0):
+        doc = layout_json.get("document") or {}
+        self.w = float(doc.get("width") or 0)
+        self.h = float(doc.get("height") or 0)
+        self.m = float(safety_margin_px)
+        self.errors: List[str] = []
+
+    def visit_object(self, obj: Dict[str, Any], obj_type: str, xywh: XYWH) -> None:
+        if xywh is None:
+            return
+        x, y, bw, bh = xywh
+        w, h, m = self.w, self.h, self.m
+        if x < m or y < m or (x + bw) > (w - m) or (y + bh) > (h - m):
+            self.errors.append(
+                f"Object {obj.get('id')} out of bounds: x={x},y={y},w={bw},h={bh} (doc {w}x{h}, margin {m})"
+            )
+
+    def finish(self) -> tuple[bool, List[str]]:
+        return (len(self.errors) == 0), self.errors
+
+
+def validate_kdp_layout(
+    layout_json: Dict[str, Any],
+    *,
+    safety_margin_px: float = 0.0,
+    geometry: Optional[LayoutGeometry] = None,
+) -> tuple[bool, List[str]]:
     """
     MVP validator for KDP-like constraints:
     - all bboxes are within the page bounds (optionally with a safety margin)
+
+    ``geometry``: bereits vorhandene ``LayoutGeometry`` dieses Layouts (z.B. aus dem
+    Varianten-Fan-out) -> vektorisierter Bounds-Check, gleiche Meldungen.
     """
 
-    doc = layout_json.get("document") or {}
-    w = float(doc.get("width") or 0)
-    h = float(doc.get("height") or 0)
-    m = float(safety_margin_px)
-
-    errors: List[str] = []
-    for page in layout_json.get("pages", []) or []:
-        for obj in page.get("objects", []) or []:
-            bbox = obj.get("bbox") or {}
-            if not {"x", "y", "w", "h"} <= set(bbox.keys()):
-                continue
-            x = float(bbox["x"])
-            y = float(bbox["y"])
-            bw = float(bbox["w"])
-            bh = float(bbox["h"])
-            if x < m or y < m or (x + bw) > (w - m) or (y + bh) > (h - m):
-                errors.append(
-                    f"Object {obj.get('id')} out of bounds: x={x},y={y},w={bw},h={bh} (doc {w}x{h}, margin {m})"
-                )
-
-    return (len(errors) == 0), errors
+    visitor = AmazonVisitor(layout_json, safety_margin_px=safety_margin_px)
+    if geometry is not None:
+        w, h, m = visitor.w, visitor.h, visitor.m
+        for row in geometry.out_of_bounds(m, m, w - m, h - m).nonzero()[0].tolist():
+            x, y, bw, bh = (float(geometry.x[row]), float(geometry.y[row]), float(geometry.w[row]), float(geometry.h[row]))
+            visitor.visit_object({"id": geometry.ids[row]}, "", (x, y, bw, bh))
+        return visitor.finish()
+
+    walk_layout(layout_json, [visitor])
+    return visitor.finish()
 
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from packages.common.geometry import LayoutGeometry
+
+_BBOX_KEYS = frozenset({"x", "y", "w", "h"})
+_RECT_COLOR_FIELDS = ("fillColor", "strokeColor")
+
+
+def _mm_to_px(mm: float, dpi: int) -> float:
+    return (mm / 25.4) * float(dpi)
+
+
+def _doc_px_for(format_name: str, dpi: int) -> tuple[int, int]:
+    fmt = (format_name or "").strip().lower()
+    if fmt in {"a4"}:
+        # 210x297mm
+        w_in = 210.0 / 25.4
+        h_in = 297.0 / 25.4
+    elif fmt in {"8x11.5", "8x11_5", "8x11,5"}:
+        w_in = 8.0
+        h_in = 11.5
+    else:
+        raise ValueError(f"Unsupported format: {format_name}")
+    return int(round(w_in * dpi)), int(round(h_in * dpi))
+
+
+def _hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
+    h = (hex_color or "").strip()
+    if not h:
+        return 0, 0, 0
+    if h.startswith("#"):
+        h = h[1:]
+    if len(h) != 6:
+        return 0, 0, 0
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+
+
+def _rgb_to_hex(rgb: tuple[int, int, int]) -> str:
+    r, g, b = rgb
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _to_gray(rgb: tuple[int, int, int]) -> tuple[int, int, int]:
+    r, g, b = rgb
+    # sRGB luminance (approx)
+    y = int(round(0.2126 * r + 0.7152 * g + 0.0722 * b))
+    y = max(0, min(255, y))
+    return (y, y, y)
+
+
+def _gray_hex(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith("#"):
+        return _rgb_to_hex(_to_gray(_hex_to_rgb(value)))
+    return value
+
+
+@dataclass(frozen=True)
+class VariantTransform:
+    """
+    Format-Skalierung, Bleed und Graustufen in einem Durchlauf.
+
+    Einzige Implementierung der Transformationen: ``convert_layout_format``, ``apply_bleed``
+    und ``convert_layout_colors_to_grayscale`` delegieren hierher. Kopiert nur das Gerüst
+    (Layout, document, variant, pages, Seiten, Objekt-Dicts, bbox). Alle übrigen Werte
+    werden mit dem Eingabe-Layout geteilt und dürfen nicht in-place verändert werden.
+    """
+
+    target_format: Optional[str] = None
+    bleed_mm: Optional[float] = None
+    grayscale: bool = False
+
+    def __post_init__(self) -> None:
+        if self.target_format:
+            _doc_px_for(self.target_format, 300)  # unbekanntes Format früh melden
+
+    def _plan(self, layout_json: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float, float, float]:
+        """Neues document-Dict (None = unverändert) plus Skalierung sx/sy und Bleed-Offset in px."""
+        sx = sy = 1.0
+        offset = 0.0
+        if not (self.target_format or self.bleed_mm is not None):
+            return None, sx, sy, offset
+
+        doc_in = layout_json.get("document") or {}
+        doc = dict(layout_json["document"]) if "document" in layout_json else {}
+        dpi = int(doc_in.get("dpi") or 300)
+        if self.target_format:
+            src_w = float(doc_in.get("width") or 1)
+            src_h = float(doc_in.get("height") or 1)
+            dst_w, dst_h = _doc_px_for(self.target_format, dpi)
+            sx = float(dst_w) / src_w if src_w else 1.0
+            sy = float(dst_h) / src_h if src_h else 1.0
+            doc["width"], doc["height"] = dst_w, dst_h
+        if self.bleed_mm is not None:
+            offset = _mm_to_px(float(self.bleed_mm), dpi)
+            doc["width"] = float(doc.get("width") or 0) + 2 * offset
+            doc["height"] = float(doc.get("height") or 0) + 2 * offset
+        doc["dpi"] = dpi
+        return doc, sx, sy, offset
+
+    def apply_geometry(self, layout_json: Dict[str, Any], geometry: LayoutGeometry) -> LayoutGeometry:
+        """BBox-Spalten von ``layout_json`` (``LayoutGeometry.from_layout``) in die Ziel-Variante umrechnen."""
+        _, sx, sy, offset = self._plan(layout_json)
+        if self.target_format:
+            geometry = geometry.scaled(sx, sy, min_size=1.0)
+        if self.bleed_mm is not None:
+            geometry = geometry.translated(offset, offset)
+        return geometry
+
+    def apply(self, layout_json: Dict[str, Any], *, geometry: Optional[LayoutGeometry] = None) -> Dict[str, Any]:
+        """
+        Variante erzeugen. ``geometry`` = Ergebnis von ``apply_geometry`` für dieses Layout;
+        dann werden die bbox-Werte aus den Arrays übernommen statt pro Objekt gerechnet.
+        """
+        out = dict(layout_json)
+        scale = bool(self.target_format)
+        shift = self.bleed_mm is not None
+
+        doc, sx, sy, offset = self._plan(layout_json)
+        if doc is not None:
+            out["document"] = doc
+
+        pages = layout_json.get("pages")
+        if pages:
+            rows = None
+            if geometry is not None and (scale or shift):
+                rows = zip(geometry.x.tolist(), geometry.y.tolist(), geometry.w.tolist(), geometry.h.tolist())
+            out["pages"] = [self._page(page, scale, shift, sx, sy, offset, rows) for page in pages]
+
+        if not (scale or shift or self.grayscale):
+            return out
+        variant = dict(layout_json["variant"]) if "variant" in layout_json else {}
+        if scale:
+            variant["format"] = self.target_format
+        if shift:
+            variant["bleed_mm"] = float(self.bleed_mm or 0.0)
+        if self.grayscale:
+            variant["colors"] = "grayscale"
+        out["variant"] = variant
+        return out
+
+    def _page(
+        self,
+        page: Dict[str, Any],
+        scale: bool,
+        shift: bool,
+        sx: float,
+        sy: float,
+        offset: float,
+        rows: Optional[Iterator[Tuple[float, float, float, float]]] = None,
+    ) -> Dict[str, Any]:
+        objects_in = page.get("objects", [])
+        out_page = dict(page)
+        if not objects_in:
+            return out_page
+
+        objects: List[Dict[str, Any]] = []
+        for obj in objects_in:
+            bbox = obj.get("bbox") or {}
+            new_obj = dict(obj)
+            if (scale or shift) and _BBOX_KEYS <= bbox.keys():
+                x, y, w, h = bbox["x"], bbox["y"], bbox["w"], bbox["h"]
+                if rows is not None:
+                    # Zeilen in derselben Reihenfolge wie LayoutGeometry.from_layout
+                    gx, gy, gw, gh = next(rows)
+                    x, y = gx, gy
+                    if scale:
+                        w, h = gw, gh
+                else:
+                    if scale:
+                        x = float(x) * sx
+                        y = float(y) * sy
+                        w = max(1.0, float(w) * sx)
+                        h = max(1.0, float(h) * sy)
+                    if shift:
+                        x = float(x) + offset
+                        y = float(y) + offset
+                new_bbox = dict(bbox)
+                new_bbox["x"], new_bbox["y"], new_bbox["w"], new_bbox["h"] = x, y, w, h
+                new_obj["bbox"] = new_bbox
+            if self.grayscale:
+                kind = obj.get("type")
+                if kind == "text" and "color" in obj:
+                    new_obj["color"] = _gray_hex(obj["color"])
+                elif kind == "rectangle":
+                    for key in _RECT_COLOR_FIELDS:
+                        if key in obj:
+                            new_obj[key] = _gray_hex(obj[key])
+            objects.append(new_obj)
+        out_page["objects"] = objects
+        return out_page
+
+
+def transform_layout(
+    layout_json: Dict[str, Any],
+    *,
+    target_format: Optional[str] = None,
+    bleed_mm: Optional[float] = None,
+    grayscale: bool = False,
+) -> Dict[str, Any]:
+    """Komfort-Wrapper für ``VariantTransform(...).apply(layout_json)``."""
+
+    return VariantTransform(target_format=target_format, bleed_mm=bleed_mm, grayscale=grayscale).apply(layout_json)
@@ -25,10 +25,13 @@ class WorkflowConfig:
     gamma_crop_kinds: Tuple[str, ...] = ("infobox", "image_box")
     gamma_attach_to_variants: bool = False
     gamma_attach_kinds: Tuple[str, ...] = ("image_box",)
+    variant_workers: int = 1  # >1: Prozess-Pool, 0 = Anzahl CPU-Kerne
+    variants_pretty_json: bool = False  # Varianten-JSON eingerückt statt kompakt schreiben
     quality_check: bool = False
     quality_on_variants: bool = True
     quality_out: Path = Path("media_pool/quality")
     quality_checks: Tuple[str, ...] = ("preflight", "amazon")
+    quality_workers: int = 1  # >1: Prozess-Pool, 0 = Anzahl CPU-Kerne
     render: bool = False
     render_on_variants: bool = True
     render_out: Path = Path("media_pool/render")
@@ -39,6 +42,14 @@ class WorkflowConfig:
     agent_seed: Optional[int] = None
     agent_version: str = "v1"
     agent_simulate: bool = False
+    agent_concurrency: int = 1  # gleichzeitige LLM-Aufrufe
+    agent_rate_limits: Tuple[Tuple[str, float], ...] = ()  # (Provider, Requests/s), z.B. (("openai", 5.0),)
+    agent_timeout_s: Optional[float] = None  # pro LLM-Aufruf
+    agent_pipeline: bool = False  # abhängige Agents sehen die Ausgabe ihrer Vorgänger
+    agent_batch_size: int = 1  # >1: mehrere Layouts pro Agent-Request
+    agent_cache_path: Optional[Path] = Path("temp_analysis/agent_cache.sqlite")  # None = kein Antwort-Cache
+    agent_cache_ttl_s: Optional[float] = None
+    agent_cache_max_entries: int = 10000
     force: bool = False
     retry_max: int = 1
 
@@ -209,6 +220,7 @@ class WorkflowOrchestrator:
                     "gamma_attach_to_variants": bool(self.config.gamma_attach_to_variants),
                     "gamma_attach_kinds": list(self.config.gamma_attach_kinds),
                     "gamma_sync_input_hash": gamma_input_hash,
+                    "variants_pretty_json": bool(self.config.variants_pretty_json),
                 }
             )
 
@@ -225,6 +237,8 @@ class WorkflowOrchestrator:
                     attach_gamma_crops=bool(self.config.gamma_attach_to_variants),
                     gamma_report=gamma_report,
                     gamma_attach_kinds=list(self.config.gamma_attach_kinds),
+                    workers=self.config.variant_workers,
+                    pretty=self.config.variants_pretty_json,
                 )
 
             def _variants_success(vres):
@@ -260,6 +274,8 @@ class WorkflowOrchestrator:
                     "agent_seed": self.config.agent_seed,
                     "agent_version": self.config.agent_version,
                     "simulate": bool(self.config.agent_simulate),
+                    "pipeline": bool(self.config.agent_pipeline),
+                    "batch_size": int(self.config.agent_batch_size),
                     "project_init_hash": project_init_hash,
                 }
             )
@@ -272,6 +288,14 @@ class WorkflowOrchestrator:
                     seed=self.config.agent_seed,
                     version=self.config.agent_version,
                     simulate=self.config.agent_simulate,
+                    concurrency=self.config.agent_concurrency,
+                    rate_limits=dict(self.config.agent_rate_limits),
+                    timeout=self.config.agent_timeout_s,
+                    pipeline=self.config.agent_pipeline,
+                    cache_path=self.config.agent_cache_path,
+                    cache_ttl_s=self.config.agent_cache_ttl_s,
+                    cache_max_entries=self.config.agent_cache_max_entries,
+                    batch_size=self.config.agent_batch_size,
                 )
 
             def _agents_success(ares):
@@ -328,6 +352,7 @@ class WorkflowOrchestrator:
                     out_dir=self.config.quality_out,
                     checks=list(self.config.quality_checks),
                     project_init=self.config.project_init,
+                    workers=self.config.quality_workers,
                 )
 
             def _quality_success(qres):
@@ -2,15 +2,91 @@ from __future__ import annotations
 
 import inspect
 import logging
+import os
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 import json
 import re
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .progress_tracker import ProgressTracker
 from .resume_manager import ResumeManager, hash_inputs
+from . import variant_engine
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """Worker-Anzahl normalisieren: 0/None = Anzahl CPU-Kerne, sonst mindestens 1."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def _check_layout_file(path: Path, checks: List[str], init: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Quality-Check für eine Datei; liefert ("output", entry) oder ("error", {...}).
+
+    Modul-Ebene, damit der Prozess-Pool die Funktion picklen kann. Jede Exception bleibt
+    auf die Datei beschränkt (gleiche Fehlertexte wie bisher).
+    """
+    from packages.quality_check import HeuristicConfig, run_quality_checks
+
+    try:
+        layout = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception as exc:
+        return "error", {"path": str(path), "error": f"failed to read json: {exc}"}
+
+    entry: Dict[str, Any] = {"path": str(path)}
+    try:
+        # Heuristic checks (warn-only), opt-in via checks list.
+        hcfg = None
+        if "heuristics" in checks:
+            hcfg_raw = ((init.get("quality") or {}).get("heuristics") or {})
+            hcfg = HeuristicConfig(
+                avg_char_width_em=float(hcfg_raw.get("avg_char_width_em", 0.6)),
+                line_height_em=float(hcfg_raw.get("line_height_em", 1.2)),
+                overflow_warn_ratio=float(hcfg_raw.get("overflow_warn_ratio", 1.0)),
+                overflow_info_ratio=float(hcfg_raw.get("overflow_info_ratio", 0.9)),
+                objects_per_page_warn=int(hcfg_raw.get("objects_per_page_warn", 80)),
+            )
+
+        # One fused pass: preflight/amazon (opt-in), quality gate (always), heuristics (opt-in).
+        entry.update(run_quality_checks(layout, checks=checks, project_init=init, heuristic_config=hcfg))
+    except Exception as exc:
+        return "error", {"path": str(path), "error": str(exc)}
+
+    return "output", entry
+
+
+def _iter_quality_results(
+    layout_paths: List[Path], checks: List[str], init: Dict[str, Any], workers: int
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Ergebnisse von ``_check_layout_file`` in Eingabereihenfolge, seriell oder per Prozess-Pool."""
+    paths = list(layout_paths)
+    if workers <= 1 or len(paths) <= 1:
+        for p in paths:
+            yield _check_layout_file(p, checks, init)
+        return
+
+    done = 0
+    try:
+        workers = min(workers, len(paths))
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() liefert in Eingabereihenfolge; Ergebnisse werden sofort weitergereicht
+            for result in pool.map(
+                _check_layout_file, paths, repeat(checks), repeat(init), chunksize=chunksize
+            ):
+                done += 1
+                yield result
+    except (OSError, BrokenProcessPool) as exc:
+        # Pool nicht verfügbar/abgestürzt: Rest seriell prüfen (Datei-Fehler fängt der Worker selbst)
+        logging.getLogger("StepExecutor").warning("quality_check: process pool failed (%s), continuing serially", exc)
+        for p in paths[done:]:
+            yield _check_layout_file(p, checks, init)
 
 
 @dataclass
@@ -27,13 +103,35 @@ class StepExecutor:
         version: str = "v1",
         simulate: bool = False,
         report_name: str = "agents_report.json",
+        concurrency: int = 1,
+        rate_limits: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None,
+        pipeline: bool = False,
+        llm: Optional[Any] = None,
+        cache_path: Optional[Path] = None,
+        cache_ttl_s: Optional[float] = None,
+        cache_max_entries: Optional[int] = None,
+        batch_size: int = 1,
     ) -> Dict[str, Any]:
         """
         Run heuristic agents as black boxes and capture structured outputs.
         This step is optional and should be deterministic via seed/version.
+
+        LLM-Aufrufe laufen über ``AgentRunner``: bis zu ``concurrency`` gleichzeitig,
+        ``rate_limits`` (Provider -> Requests/s), ``timeout`` pro Aufruf; ``pipeline`` lässt
+        abhängige Agents (z.B. QualityCritic nach LayoutDesigner) deren Ausgabe sehen.
+        Report-Reihenfolge wie im seriellen Lauf.
+
+        ``cache_path``: SQLite-Cache validierter Antworten (Schlüssel inkl. ``version``);
+        Treffer/Fehlschläge stehen unter ``report["cache"]``.
+
+        ``batch_size`` > 1: bis zu so viele Layouts pro Agent in einem Request (JSON-Array-Antwort),
+        ungültige Elemente einzeln nachgefragt; Zähler unter ``report["batching"]``.
         """
 
+        from packages.dialog_engine.agent_runner import AgentRunner
         from packages.dialog_engine.agents import AgentExecutor
+        from packages.dialog_engine.response_cache import DEFAULT_MAX_ENTRIES, ResponseCache
 
         init: Dict[str, Any] = {}
         if project_init and Path(project_init).exists():
@@ -48,25 +146,68 @@ class StepExecutor:
         report: Dict[str, Any] = {"outputs": [], "errors": [], "agent_ids": agent_ids or [], "version": version, "seed": seed, "simulate": simulate}
         self.tracker.emit("agents.start", inputs=len(layout_paths), agents=agent_ids or [])
 
-        executor = AgentExecutor()
+        agent_ids = list(agent_ids or [])
+        loaded: List[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]] = []
         for lp in layout_paths:
             try:
                 layout = json.loads(Path(lp).read_text(encoding="utf-8"))
             except Exception as exc:
-                report["errors"].append({"path": str(lp), "error": f"failed to read json: {exc}"})
+                loaded.append((lp, None, f"failed to read json: {exc}"))
+                continue
+            loaded.append((lp, _summarize_layout_for_agents(layout), None))
+
+        metas = [meta for _, meta, _ in loaded if meta is not None]
+        if simulate:
+            results = []
+            for meta in metas:
+                agent_results: Dict[str, Any] = {}
+                for agent_id in agent_ids:
+                    try:
+                        agent_results[agent_id] = _simulate_agent(agent_id, meta, seed=seed, version=version)
+                    except Exception as exc:
+                        agent_results[agent_id] = exc
+                results.append(agent_results)
+        else:
+            cache = None
+            if cache_path is not None:
+                cache = ResponseCache(
+                    Path(cache_path),
+                    ttl_s=cache_ttl_s,
+                    max_entries=cache_max_entries or DEFAULT_MAX_ENTRIES,
+                )
+            runner = AgentRunner(
+                AgentExecutor(llm=llm, cache=cache, version=version),
+                max_concurrency=concurrency,
+                rate_limits=rate_limits,
+                timeout=timeout,
+                pipeline=pipeline,
+                batch_size=batch_size,
+            )
+            try:
+                results = runner.run(metas, agent_ids)
+                if runner.batch_size > 1:
+                    report["batching"] = {
+                        "batch_size": runner.batch_size,
+                        "batch_requests": runner.batch_requests,
+                        "single_fallbacks": runner.single_fallbacks,
+                    }
+            finally:
+                if cache is not None:
+                    report["cache"] = cache.stats()
+                    cache.close()
+
+        pending = iter(results)
+        for lp, meta, read_error in loaded:
+            if read_error is not None:
+                report["errors"].append({"path": str(lp), "error": read_error})
                 continue
 
-            meta = _summarize_layout_for_agents(layout)
             entry: Dict[str, Any] = {"path": str(lp), "summary": meta, "agents": {}}
-
-            for agent_id in agent_ids or []:
-                try:
-                    if simulate:
-                        entry["agents"][agent_id] = _simulate_agent(agent_id, meta, seed=seed, version=version)
-                    else:
-                        entry["agents"][agent_id] = executor.prompt_agent(agent_id, meta)
-                except Exception as exc:
-                    report["errors"].append({"path": str(lp), "agent": agent_id, "error": str(exc)})
+            for agent_id, result in next(pending).items():
+                if isinstance(result, BaseException):
+                    report["errors"].append({"path": str(lp), "agent": agent_id, "error": str(result)})
+                else:
+                    entry["agents"][agent_id] = result
 
             report["outputs"].append(entry)
 
@@ -197,6 +338,8 @@ class StepExecutor:
         attach_gamma_crops: bool = False,
         gamma_report: Optional[Dict[str, Any]] = None,
         gamma_attach_kinds: Optional[List[str]] = None,
+        workers: int = 1,
+        pretty: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate publishing variants based on `project_init.json` decisions.
@@ -206,10 +349,11 @@ class StepExecutor:
         - `format`: "A4" | "8x11.5" | "both"
         - If "color" present: apply bleed_mm (default 3.0) when `bleed_mm` in project_init or default
         - If "grayscale" present: grayscale conversion (colors only)
-        """
 
-        from packages.variant_generator import apply_bleed, convert_layout_colors_to_grayscale, convert_layout_format, validate_kdp_layout
-        from packages.layout_schema import validate_layout
+        Jede (Basis, Format, Variante)-Kombination ist ein Task (siehe ``variant_engine``);
+        workers > 1 verteilt sie auf einen Prozess-Pool (0 = Anzahl CPU-Kerne). Ausgaben sind
+        kompaktes JSON, ``pretty=True`` schreibt eingerückt.
+        """
 
         init: Dict[str, Any] = {}
         if project_init and Path(project_init).exists():
@@ -236,72 +380,16 @@ class StepExecutor:
         report: Dict[str, Any] = {"outputs": [], "errors": []}
         self.tracker.emit("variants.start", inputs=len(layout_paths), variants=variants, formats=formats)
 
-        gamma_attach_kinds = gamma_attach_kinds or ["image_box"]
-
-        for base_path in layout_paths:
-            try:
-                base = json.loads(Path(base_path).read_text(encoding="utf-8"))
-            except Exception as exc:
-                report["errors"].append({"path": str(base_path), "error": str(exc)})
-                continue
-
-            for target_format in formats:
-                try:
-                    formatted = convert_layout_format(base, target_format=target_format) if target_format else base
-                except Exception as exc:
-                    report["errors"].append({"path": str(base_path), "format": target_format, "error": str(exc)})
-                    continue
-
-                for v in variants:
-                    try:
-                        out_layout = formatted
-                        suffix_parts = []
-                        if target_format:
-                            suffix_parts.append(target_format.replace(".", "_").replace(",", "_"))
-                        suffix_parts.append(v)
-
-                        if v == "color":
-                            out_layout = apply_bleed(out_layout, bleed_mm=bleed_mm)
-                        elif v == "grayscale":
-                            out_layout = convert_layout_colors_to_grayscale(out_layout)
-                        else:
-                            # Unknown: pass-through
-                            pass
-
-                        if attach_gamma_crops and gamma_report:
-                            pptx_name = None
-                            try:
-                                pptx_name = (out_layout.get("source") or {}).get("name") or (base.get("source") or {}).get("name")
-                            except Exception:
-                                pptx_name = None
-                            out_layout = self.attach_gamma_crops_to_layout(
-                                layout_json=out_layout,
-                                gamma_report=gamma_report,
-                                pptx_name=pptx_name,
-                                kinds=gamma_attach_kinds,
-                            )
-
-                        ok, schema_errors = validate_layout(out_layout)
-                        kdp_ok, kdp_errors = validate_kdp_layout(out_layout, safety_margin_px=0.0)
-
-                        out_name = base_path.stem + "." + ".".join(suffix_parts) + ".layout.json"
-                        out_path = out_dir / out_name
-                        out_path.write_text(json.dumps(out_layout, ensure_ascii=False, indent=2), encoding="utf-8")
-
-                        report["outputs"].append(
-                            {
-                                "in": str(base_path),
-                                "out": str(out_path),
-                                "format": target_format,
-                                "variant": v,
-                                "schema_valid": ok,
-                                "schema_errors": schema_errors[:10],
-                                "kdp_valid": kdp_ok,
-                                "kdp_errors": kdp_errors[:10],
-                            }
-                        )
-                    except Exception as exc:
-                        report["errors"].append({"path": str(base_path), "format": target_format, "variant": v, "error": str(exc)})
+        job = variant_engine.VariantJob(
+            out_dir=out_dir,
+            bleed_mm=bleed_mm,
+            attach_gamma_crops=attach_gamma_crops,
+            gamma_report=gamma_report,
+            gamma_attach_kinds=tuple(gamma_attach_kinds or ["image_box"]),
+            pretty=pretty,
+        )
+        for kind, item in variant_engine.iter_variant_results(layout_paths, formats, variants, job, workers=_resolve_workers(workers)):
+            report[kind].append(item)
 
         self.tracker.emit("variants.done", outputs=len(report["outputs"]), errors=len(report["errors"]))
         return report
@@ -314,6 +402,7 @@ class StepExecutor:
         checks: Optional[List[str]] = None,
         project_init: Optional[Path] = None,
         report_name: str = "quality_report.json",
+        workers: int = 1,
     ) -> Dict[str, Any]:
         """
         Run basic quality checks on a set of layout JSON files.
@@ -321,16 +410,10 @@ class StepExecutor:
         Checks (MVP):
         - preflight: schema + semantic validation
         - amazon: KDP constraint validation
-        """
 
-        from packages.quality_check import (
-            check_amazon_constraints,
-            evaluate_quality_gate,
-            run_heuristic_checks,
-            run_preflight,
-            summarize_quality_gate,
-            HeuristicConfig,
-        )
+        workers > 1 verteilt die Dateien auf einen Prozess-Pool (0 = Anzahl CPU-Kerne);
+        Reihenfolge und Fehlerbehandlung pro Datei bleiben wie im seriellen Lauf.
+        """
 
         checks = checks or ["preflight", "amazon"]
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -343,46 +426,12 @@ class StepExecutor:
                 init = {}
 
         report: Dict[str, Any] = {"outputs": [], "errors": [], "checks": list(checks)}
-        self.tracker.emit("quality.start", inputs=len(layout_paths), checks=checks)
-
-        for p in layout_paths:
-            try:
-                layout = json.loads(Path(p).read_text(encoding="utf-8"))
-            except Exception as exc:
-                report["errors"].append({"path": str(p), "error": f"failed to read json: {exc}"})
-                continue
+        workers = _resolve_workers(workers)
+        self.tracker.emit("quality.start", inputs=len(layout_paths), checks=checks, workers=workers)
 
-            entry: Dict[str, Any] = {"path": str(p)}
-            try:
-                if "preflight" in checks:
-                    ok, errs = run_preflight(layout)
-                    entry["preflight_valid"] = bool(ok)
-                    entry["preflight_errors"] = list(errs[:50])
-                if "amazon" in checks:
-                    ok, errs = check_amazon_constraints(layout)
-                    entry["amazon_valid"] = bool(ok)
-                    entry["amazon_errors"] = list(errs[:50])
-
-                # Quality gate (fail/warn policy), always computed.
-                gate_results = evaluate_quality_gate(layout, project_init=init)
-                entry["quality_gate"] = summarize_quality_gate(gate_results)
-
-                # Heuristic checks (warn-only), opt-in via checks list.
-                if "heuristics" in checks:
-                    hcfg_raw = ((init.get("quality") or {}).get("heuristics") or {})
-                    hcfg = HeuristicConfig(
-                        avg_char_width_em=float(hcfg_raw.get("avg_char_width_em", 0.6)),
-                        line_height_em=float(hcfg_raw.get("line_height_em", 1.2)),
-                        overflow_warn_ratio=float(hcfg_raw.get("overflow_warn_ratio", 1.0)),
-                        overflow_info_ratio=float(hcfg_raw.get("overflow_info_ratio", 0.9)),
-                        objects_per_page_warn=int(hcfg_raw.get("objects_per_page_warn", 80)),
-                    )
-                    entry["heuristics"] = run_heuristic_checks(layout, config=hcfg)
-            except Exception as exc:
-                report["errors"].append({"path": str(p), "error": str(exc)})
-                continue
-
-            report["outputs"].append(entry)
+        # Ergebnisse in Eingabereihenfolge übernehmen -> Report identisch zum seriellen Lauf
+        for kind, item in _iter_quality_results(layout_paths, checks, init, workers):
+            report["outputs" if kind == "output" else "errors"].append(item)
 
         report_path = out_dir / report_name
         report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -558,39 +607,7 @@ class StepExecutor:
         Expects `gamma_sync` report entries with fields: pptx, slide, kind, box_index, out.
         """
 
-        kinds = kinds or ["image_box"]
-        index: Dict[tuple, str] = {}
-        for o in gamma_report.get("outputs") or []:
-            try:
-                if (o.get("kind") not in kinds) or not o.get("out"):
-                    continue
-                if pptx_name and o.get("pptx") != pptx_name:
-                    continue
-                key = (int(o.get("slide") or 0), int(o.get("box_index") or 0), str(o.get("kind")))
-                index[key] = str(o.get("out"))
-            except Exception:
-                continue
-
-        for page in layout_json.get("pages", []) or []:
-            for obj in page.get("objects", []) or []:
-                if obj.get("type") != "image":
-                    continue
-                if str(obj.get("sourceKind") or "") not in kinds:
-                    continue
-                try:
-                    slide = int(obj.get("sourceSlide") or 0)
-                    idx = int(obj.get("sourceIndex") or 0)
-                    kind = str(obj.get("sourceKind") or "")
-                except Exception:
-                    continue
-                path = index.get((slide, idx, kind))
-                if path:
-                    obj["imageUrl"] = path
-                    obj["gammaCrop"] = True
-
-        layout_json.setdefault("variant", {})
-        layout_json["variant"]["gamma_crops_attached"] = True
-        return layout_json
+        return variant_engine.attach_gamma_crops(layout_json, gamma_report, pptx_name=pptx_name, kinds=kinds)
 
 
 class IdempotentStepExecutor:
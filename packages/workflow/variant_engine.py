@@ -0,0 +1,252 @@
+"""
+Varianten-Fan-out für ``StepExecutor.generate_variants``.
+
+Jede Kombination (Basis-Layout, Format, Variante) ist ein unabhängiger Task. Tasks laufen seriell
+oder in einem Prozess-Pool; die Ergebnisse kommen in Task-Reihenfolge zurück, der Report ist damit
+identisch zum seriellen Lauf. Basis-Layouts werden pro Prozess nur einmal geparst (kleiner Cache),
+die Job-Konfiguration (inkl. Gamma-Report) wird jedem Worker einmal beim Start übergeben.
+Große Basen bekommen zusätzlich eine ``LayoutGeometry``, die alle Varianten für Transformation
+und KDP-Bounds-Check wiederverwenden.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from packages.common.geometry import LayoutGeometry, use_geometry
+
+# (Basis-Pfad, Format, Variante)
+VariantTask = Tuple[str, str, str]
+# (Report-Liste, Eintrag, Dedupe-Schlüssel für Fehler auf Basis-/Format-Ebene)
+VariantResult = Tuple[str, Dict[str, Any], Optional[Tuple[str, ...]]]
+
+BASE_CACHE_MAX = 4  # geparste Basis-Layouts pro Prozess
+
+
+@dataclass(frozen=True)
+class VariantJob:
+    out_dir: Path
+    bleed_mm: float = 3.0
+    attach_gamma_crops: bool = False
+    gamma_report: Optional[Dict[str, Any]] = None
+    gamma_attach_kinds: Tuple[str, ...] = ("image_box",)
+    pretty: bool = False
+
+
+def dump_layout(layout_json: Dict[str, Any], *, pretty: bool = False) -> str:
+    """Layout-JSON serialisieren: kompakt (Default) oder eingerückt (``pretty=True``)."""
+    if pretty:
+        return json.dumps(layout_json, ensure_ascii=False, indent=2)
+    return json.dumps(layout_json, ensure_ascii=False, separators=(",", ":"))
+
+
+def attach_gamma_crops(
+    layout_json: Dict[str, Any],
+    gamma_report: Dict[str, Any],
+    *,
+    pptx_name: Optional[str] = None,
+    kinds: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Attach gamma crop PNGs to layout image objects by matching sourceSlide/sourceIndex.
+    Expects `gamma_sync` report entries with fields: pptx, slide, kind, box_index, out.
+    """
+
+    kinds = kinds or ["image_box"]
+    index: Dict[tuple, str] = {}
+    for o in gamma_report.get("outputs") or []:
+        try:
+            if (o.get("kind") not in kinds) or not o.get("out"):
+                continue
+            if pptx_name and o.get("pptx") != pptx_name:
+                continue
+            key = (int(o.get("slide") or 0), int(o.get("box_index") or 0), str(o.get("kind")))
+            index[key] = str(o.get("out"))
+        except Exception:
+            continue
+
+    for page in layout_json.get("pages", []) or []:
+        for obj in page.get("objects", []) or []:
+            if obj.get("type") != "image":
+                continue
+            if str(obj.get("sourceKind") or "") not in kinds:
+                continue
+            try:
+                slide = int(obj.get("sourceSlide") or 0)
+                idx = int(obj.get("sourceIndex") or 0)
+                kind = str(obj.get("sourceKind") or "")
+            except Exception:
+                continue
+            path = index.get((slide, idx, kind))
+            if path:
+                obj["imageUrl"] = path
+                obj["gammaCrop"] = True
+
+    # Kopie: bei reinen Pass-through-Varianten teilt das Layout sein variant-Dict mit der gecachten Basis
+    variant = dict(layout_json.get("variant") or {})
+    variant["gamma_crops_attached"] = True
+    layout_json["variant"] = variant
+    return layout_json
+
+
+def _load_base(path: str, cache: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[LayoutGeometry]]:
+    """(Layout, Lesefehler, Geometrie) - Geometrie nur für große Layouts (``use_geometry``)."""
+    hit = cache.get(path)
+    if hit is None:
+        try:
+            base = json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as exc:
+            hit = (None, str(exc), None)
+        else:
+            geometry = None
+            if use_geometry(base):
+                try:
+                    geometry = LayoutGeometry.from_layout(base)
+                except Exception:
+                    geometry = None  # Fehler meldet der Objekt-Pfad pro Variante wie bisher
+            hit = (base, None, geometry)
+        if len(cache) >= BASE_CACHE_MAX:
+            cache.pop(next(iter(cache)))
+        cache[path] = hit
+    return hit
+
+
+def run_variant_task(job: VariantJob, task: VariantTask, cache: Dict[str, Any]) -> VariantResult:
+    """Eine Ausgabe erzeugen, validieren und schreiben; Fehler bleiben auf den Task beschränkt."""
+
+    from packages.layout_schema import validate_layout
+    from packages.variant_generator import VariantTransform, validate_kdp_layout
+
+    base_path, target_format, v = task
+    base, read_error, base_geometry = _load_base(base_path, cache)
+    if read_error is not None:
+        return "errors", {"path": base_path, "error": read_error}, ("base", base_path)
+
+    try:
+        VariantTransform(target_format=target_format)  # unbekanntes Format einmal pro Format melden
+    except Exception as exc:
+        return "errors", {"path": base_path, "format": target_format, "error": str(exc)}, ("format", base_path, target_format)
+
+    try:
+        suffix_parts = []
+        if target_format:
+            suffix_parts.append(target_format.replace(".", "_").replace(",", "_"))
+        suffix_parts.append(v)
+
+        # Format + Bleed/Graustufen in einem Durchlauf, nur das Gerüst wird kopiert.
+        # Unknown variant: pass-through (nur Format).
+        transform = VariantTransform(
+            target_format=target_format or None,
+            bleed_mm=job.bleed_mm if v == "color" else None,
+            grayscale=(v == "grayscale"),
+        )
+        geometry = transform.apply_geometry(base, base_geometry) if base_geometry is not None else None
+        out_layout = transform.apply(base, geometry=geometry)
+
+        if job.attach_gamma_crops and job.gamma_report:
+            pptx_name = None
+            try:
+                pptx_name = (out_layout.get("source") or {}).get("name") or (base.get("source") or {}).get("name")
+            except Exception:
+                pptx_name = None
+            out_layout = attach_gamma_crops(
+                out_layout,
+                job.gamma_report,
+                pptx_name=pptx_name,
+                kinds=list(job.gamma_attach_kinds),
+            )
+
+        ok, schema_errors = validate_layout(out_layout)
+        kdp_ok, kdp_errors = validate_kdp_layout(out_layout, safety_margin_px=0.0, geometry=geometry)
+
+        out_name = Path(base_path).stem + "." + ".".join(suffix_parts) + ".layout.json"
+        out_path = job.out_dir / out_name
+        out_path.write_text(dump_layout(out_layout, pretty=job.pretty), encoding="utf-8")
+
+        entry = {
+            "in": base_path,
+            "out": str(out_path),
+            "format": target_format,
+            "variant": v,
+            "schema_valid": ok,
+            "schema_errors": schema_errors[:10],
+            "kdp_valid": kdp_ok,
+            "kdp_errors": kdp_errors[:10],
+        }
+        return "outputs", entry, None
+    except Exception as exc:
+        return "errors", {"path": base_path, "format": target_format, "variant": v, "error": str(exc)}, None
+
+
+# Prozess-lokaler Zustand der Pool-Worker (gesetzt durch _init_worker)
+_WORKER_JOB: Optional[VariantJob] = None
+_WORKER_CACHE: Dict[str, Any] = {}
+
+
+def _init_worker(job: VariantJob) -> None:
+    global _WORKER_JOB
+    _WORKER_JOB = job
+    _WORKER_CACHE.clear()
+
+
+def _run_in_worker(task: VariantTask) -> VariantResult:
+    assert _WORKER_JOB is not None
+    return run_variant_task(_WORKER_JOB, task, _WORKER_CACHE)
+
+
+def build_tasks(layout_paths: List[Path], formats: List[str], variants: List[str]) -> List[VariantTask]:
+    """Tasks basis-major sortiert (Basis -> Format -> Variante), wie die bisherige Schleife."""
+    return [(str(p), f, v) for p in layout_paths for f in formats for v in variants]
+
+
+def _iter_results(tasks: List[VariantTask], job: VariantJob, workers: int, per_base: int) -> Iterator[VariantResult]:
+    if workers <= 1 or len(tasks) <= 1:
+        cache: Dict[str, Any] = {}
+        for task in tasks:
+            yield run_variant_task(job, task, cache)
+        return
+
+    done = 0
+    try:
+        workers = min(workers, len(tasks))
+        # Ganze Basen pro Chunk -> jede Basis wird nur einmal geparst; bei wenigen Basen
+        # feiner verteilen (jeder Worker parst die Basis dann höchstens einmal).
+        chunksize = per_base if len(tasks) // max(1, per_base) >= workers else 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job,)) as pool:
+            for result in pool.map(_run_in_worker, tasks, chunksize=chunksize):
+                done += 1
+                yield result
+    except (OSError, BrokenProcessPool) as exc:
+        logging.getLogger("StepExecutor").warning("generate_variants: process pool failed (%s), continuing serially", exc)
+        cache = {}
+        for task in tasks[done:]:
+            yield run_variant_task(job, task, cache)
+
+
+def iter_variant_results(
+    layout_paths: List[Path],
+    formats: List[str],
+    variants: List[str],
+    job: VariantJob,
+    *,
+    workers: int = 1,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Liefert (``"outputs"``/``"errors"``, Eintrag) in derselben Reihenfolge wie die serielle Schleife.
+    Lese- bzw. Formatfehler werden wie bisher nur einmal pro Basis bzw. Basis+Format gemeldet.
+    """
+
+    tasks = build_tasks(layout_paths, formats, variants)
+    seen: set = set()
+    for kind, entry, key in _iter_results(tasks, job, workers, per_base=len(formats) * len(variants)):
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        yield kind, entry
@@ -0,0 +1,136 @@
+import threading
+from pathlib import Path
+
+from packages.ai_aesthetics import FocusCache
+from packages.ai_aesthetics.image_cache import ImageCache
+from packages.ai_aesthetics.integration import AIAestheticsEngine
+
+
+class PreparingProvider:
+    """Fake-Provider mit ``prepare`` (wie der lokale): zählt Dekodier- und Analyse-Aufrufe."""
+
+    model = "prep"
+
+    def __init__(self):
+        self.prepared = []
+        self.analyzed = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, image_path, image_data=None):
+        with self._lock:
+            self.prepared.append(image_path)
+        return len(image_data)
+
+    def analyze_image(self, image_path, image_data=None, prepared=None):
+        with self._lock:
+            self.analyzed += 1
+        assert prepared is not None
+        return {
+            "focus_center": {"x": 0.5, "y": 0.4},
+            "focus_region": {"x": 0.3, "y": 0.2, "width": 0.4, "height": 0.4},
+            "focus_type": "object",
+            "confidence": 0.7,
+        }
+
+
+def _book(tmp_path: Path, pages: int = 8) -> dict:
+    assets = []
+    for i in range(3):
+        p = tmp_path / ("a%d.jpg" % i)
+        p.write_bytes(bytes([i]) * 100)
+        assets.append(str(p))
+    out = {"pages": []}
+    for n in range(pages):
+        elements = [
+            {"type": "text", "id": "t%d" % n, "content": "Symbol und Geschichte", "box": {"x_px": 10, "y_px": 10, "w_px": 500, "h_px": 200}},
+            {"type": "image", "id": "i%d_0" % n, "asset": {"uri": assets[n % 3]}, "box": {"x_px": 5, "y_px": 300, "w_px": 400, "h_px": 300}, "metadata": {"keywords": ["symbol", "history"]}},
+            {"type": "image", "id": "i%d_1" % n, "asset": {"uri": assets[(n + 1) % 3]}, "box": {"x_px": 420, "y_px": 300, "w_px": 400, "h_px": 300}},
+        ]
+        out["pages"].append({"pageNumber": n + 1, "elements": elements})
+    return out
+
+
+def _engine(page_workers: int, focus_cache=None) -> AIAestheticsEngine:
+    engine = AIAestheticsEngine(focus_provider="fallback", text_provider="fallback", page_workers=page_workers, focus_cache=focus_cache)
+    engine.focus_detector.provider = PreparingProvider()
+    return engine
+
+
+def test_parallel_pages_match_serial_and_report_timings(tmp_path: Path):
+    layout = _book(tmp_path)
+
+    serial = _engine(1).optimize_layout(layout, apply_corrections=True)
+    parallel = _engine(4).optimize_layout(layout, apply_corrections=True)
+
+    for key in ("optimized_layout", "optimizations", "summary"):
+        assert parallel[key] == serial[key]
+    timings = parallel["timings"]
+    assert set(timings) == {"focus_s", "placement_s", "balance_s", "apply_s", "total_s", "pages", "images", "reads", "decodes"}
+    assert timings["pages"] == 8 and timings["images"] == 3
+
+
+def test_each_asset_is_read_and_decoded_once_per_run(tmp_path: Path):
+    layout = _book(tmp_path)
+    # Fokus-Cache mit Platz für nur einen Eintrag -> Analysen wiederholen sich, Dekodieren nicht
+    engine = _engine(4, focus_cache=FocusCache(max_entries=1))
+
+    result = engine.optimize_layout(layout)
+
+    provider = engine.focus_detector.provider
+    assert sorted(provider.prepared) == sorted(set(provider.prepared)) and len(provider.prepared) == 3
+    assert provider.analyzed >= 3
+    assert result["timings"]["reads"] == 3 and result["timings"]["decodes"] == 3
+
+
+def test_text_context_is_analyzed_once_per_page(tmp_path: Path, monkeypatch):
+    layout = _book(tmp_path, pages=4)
+    engine = _engine(1)
+    calls = []
+    original = engine.contextual_placer.analyze_text_context
+    monkeypatch.setattr(engine.contextual_placer, "analyze_text_context", lambda text: calls.append(text) or original(text))
+
+    result = engine.optimize_layout(layout)
+
+    assert len(calls) == 4
+    assert result["summary"]["contextual_placements"] == 4
+
+
+def test_image_cache_bounds_raw_bytes(tmp_path: Path):
+    paths = []
+    for i in range(3):
+        p = tmp_path / ("b%d.bin" % i)
+        p.write_bytes(bytes([i]) * 40)
+        paths.append(str(p))
+    cache = ImageCache(max_bytes=100)
+
+    hashes = [cache.content_hash(p) for p in paths]
+    assert len(set(hashes)) == 3
+    assert cache.read_bytes(paths[2]) == bytes([2]) * 40  # noch im Speicher
+    assert cache.reads == 3
+    cache.read_bytes(paths[0])  # verdrängt -> neu gelesen
+    assert cache.reads == 4
+
+
+def test_image_cache_concurrent_miss_reads_once(tmp_path: Path, monkeypatch):
+    import time
+
+    from packages.ai_aesthetics import image_cache
+
+    class SlowPath(type(Path())):
+        def read_bytes(self):
+            time.sleep(0.05)  # Fenster, in dem beide Threads den Miss sehen
+            return super().read_bytes()
+
+    monkeypatch.setattr(image_cache, "Path", SlowPath)
+    p = tmp_path / "shared.bin"
+    p.write_bytes(b"x" * 1000)
+    cache = ImageCache(max_bytes=1500)
+
+    threads = [threading.Thread(target=cache.read_bytes, args=(str(p),)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.reads == 1
+    assert cache._data_size == sum(len(v) for v in cache._data.values()) == 1000
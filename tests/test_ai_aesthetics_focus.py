@@ -0,0 +1,190 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from packages.ai_aesthetics import FocusCache, FocusDetector
+from packages.ai_aesthetics.integration import AIAestheticsEngine
+
+
+class FakeVisionProvider:
+    model = "fake-vision"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def analyze_image(self, image_path, image_data=None):
+        with self._lock:
+            self.calls.append((image_path, image_data))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return {
+            "focus_center": {"x": 0.3, "y": 0.4},
+            "focus_region": {"x": 0.1, "y": 0.2, "width": 0.4, "height": 0.4},
+            "focus_type": "face",
+            "confidence": 0.9,
+            "description": "portrait",
+        }
+
+
+def _detector(cache=None, delay=0.0):
+    detector = FocusDetector(model_provider="fallback", cache=cache)
+    detector.provider = FakeVisionProvider(delay)
+    return detector
+
+
+def _images(tmp_path: Path, n: int) -> list[str]:
+    paths = []
+    for i in range(n):
+        p = tmp_path / ("img_%d.png" % i)
+        p.write_bytes(b"\x89PNG" + bytes([i]) * 64)
+        paths.append(str(p))
+    return paths
+
+
+def test_cache_keyed_by_content_and_reads_file_once(tmp_path: Path):
+    a, b = _images(tmp_path, 2)
+    copy_of_a = tmp_path / "copy.png"
+    copy_of_a.write_bytes(Path(a).read_bytes())
+    detector = _detector(cache=FocusCache())
+
+    first = detector.detect_focus(a)
+    first["focus_type"] = "changed by caller"
+    assert detector.detect_focus(a)["focus_type"] == "face"
+    detector.detect_focus(str(copy_of_a))
+    detector.detect_focus(b)
+
+    assert [path for path, _ in detector.provider.calls] == [a, b]
+    # Bytes werden fürs Hashing gelesen und an den Provider durchgereicht
+    assert detector.provider.calls[0][1] == Path(a).read_bytes()
+    assert detector.cache.stats()["hits"] == 2
+
+
+class FailingVisionProvider:
+    """Wie die echten Provider bei fehlendem Client/API-Fehler: Zentrum mit ``fallback``-Flag."""
+
+    model = "failing-vision"
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_image(self, image_path, image_data=None):
+        self.calls += 1
+        return {
+            "focus_center": {"x": 0.5, "y": 0.5},
+            "focus_region": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5},
+            "focus_type": "center",
+            "confidence": 0.5,
+            "fallback": True,
+        }
+
+
+def test_provider_fallback_results_are_not_cached(tmp_path: Path):
+    (a,) = _images(tmp_path, 1)
+    detector = FocusDetector(model_provider="fallback", cache=FocusCache())
+    detector.provider = FailingVisionProvider()
+
+    assert detector.detect_focus(a)["focus_type"] == "center"
+    assert detector.detect_focus(a)["focus_type"] == "center"
+    assert detector.provider.calls == 2
+    assert detector.cache.stats()["entries"] == 0
+
+    # Provider wieder verfügbar -> echtes Ergebnis wird gecacht
+    detector.provider = FakeVisionProvider()
+    assert detector.detect_focus(a)["focus_type"] == "face"
+    assert detector.detect_focus(a)["focus_type"] == "face"
+    assert len(detector.provider.calls) == 1
+
+
+def test_disk_cache_survives_new_detector_and_lru_evicts(tmp_path: Path):
+    (img,) = _images(tmp_path, 1)
+    _detector(cache=FocusCache(disk_dir=tmp_path / "cache")).detect_focus(img)
+
+    fresh = _detector(cache=FocusCache(disk_dir=tmp_path / "cache"))
+    assert fresh.detect_focus(img)["focus_type"] == "face"
+    assert fresh.provider.calls == []
+
+    small = FocusCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        small.put(key, {"k": key})
+    assert small.get("a") is None and small.get("c") == {"k": "c"}
+
+
+def test_suggest_crop_uses_precomputed_focus(tmp_path: Path):
+    (img,) = _images(tmp_path, 1)
+    detector = _detector()
+    focus = detector.detect_focus(img)
+
+    crop = detector.suggest_crop(img, 100, 50, focus=focus)
+
+    assert crop["focus_center"] == {"x": 0.3, "y": 0.4}
+    assert len(detector.provider.calls) == 1
+
+
+def test_optimize_layout_analyzes_each_image_once_concurrently(tmp_path: Path):
+    paths = _images(tmp_path, 6)
+    elements = [
+        {"type": "image", "id": "img_%d" % i, "asset": {"uri": p}, "box": {"x_px": 0, "y_px": 0, "w_px": 100, "h_px": 80}}
+        for i, p in enumerate(paths + paths[:2])
+    ]
+    engine = AIAestheticsEngine(focus_provider="fallback", text_provider="fallback", focus_workers=4)
+    engine.focus_detector.provider = FakeVisionProvider(delay=0.05)
+
+    result = engine.optimize_layout({"pages": [{"pageNumber": 1, "elements": elements}]})
+
+    provider = engine.focus_detector.provider
+    assert sorted(path for path, _ in provider.calls) == sorted(paths)
+    assert 1 < provider.max_in_flight <= 4
+    assert result["summary"]["focus_adjustments"] == 8
+    assert all(o["reasoning"] == "Fokus erhalten (Type: face)" for o in result["optimizations"] if o["type"] == "focus_adjustment")
+
+
+def _photo(path: Path, cx: float, cy: float, size=(800, 600)) -> str:
+    np = pytest.importorskip("numpy")
+    pil = pytest.importorskip("PIL.Image")
+    from PIL import ImageDraw
+
+    w, h = size
+    noise = np.random.default_rng(1).normal(110, 5, (h, w, 3)).clip(0, 255).astype("uint8")
+    img = pil.fromarray(noise)
+    r = 0.1 * min(w, h)
+    ImageDraw.Draw(img).ellipse([cx * w - r, cy * h - r, cx * w + r, cy * h + r], fill=(220, 30, 30))
+    img.save(path, "JPEG", quality=90)
+    return str(path)
+
+
+def test_local_provider_finds_salient_object(tmp_path: Path):
+    pytest.importorskip("PIL")
+    from packages.ai_aesthetics.providers import LocalSaliencyProvider
+
+    detector = FocusDetector(model_provider="local")
+    assert isinstance(detector.provider, LocalSaliencyProvider)
+
+    focus = detector.detect_focus(_photo(tmp_path / "a.jpg", 0.75, 0.3))
+
+    assert set(focus) >= {"focus_center", "focus_region", "focus_type", "confidence", "important_regions"}
+    assert focus["focus_type"] == "object"
+    assert abs(focus["focus_center"]["x"] - 0.75) < 0.05 and abs(focus["focus_center"]["y"] - 0.3) < 0.05
+    region = focus["focus_region"]
+    assert region["x"] <= 0.75 <= region["x"] + region["width"]
+    assert region["y"] <= 0.3 <= region["y"] + region["height"]
+    assert 0.5 <= focus["confidence"] <= 0.95
+
+
+def test_local_provider_flat_image_falls_back_to_center(tmp_path: Path):
+    pil = pytest.importorskip("PIL.Image")
+    path = tmp_path / "flat.png"
+    pil.new("RGB", (200, 100), (40, 40, 40)).save(path)
+
+    focus = FocusDetector(model_provider="local").detect_focus(str(path))
+
+    assert focus["focus_type"] == "center"
+    assert focus["focus_center"] == {"x": 0.5, "y": 0.5}
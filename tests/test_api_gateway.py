@@ -1,14 +1,22 @@
 """Tests für API-Gateway."""
 
+import json
 import os
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
 
 if os.environ.get("RUN_API_GATEWAY_TESTS") != "1":
     pytest.skip("Set RUN_API_GATEWAY_TESTS=1 to run API gateway integration tests", allow_module_level=True)
 
+from apps.api_gateway import main as gateway
 from apps.api_gateway.main import app
 
+EXAMPLE_LAYOUT = Path("packages/layout_schema/example_layout_mvp.json")
+
 
 @pytest.fixture
 def client():
@@ -40,3 +48,217 @@ def test_get_job_not_found(client):
     # Erwartet 401 (API-Key) oder 404 (Job nicht gefunden)
     assert response.status_code in [401, 404]
 
+
+def _layout(title="Titel"):
+    layout = json.loads(EXAMPLE_LAYOUT.read_text(encoding="utf-8"))
+    for page in layout["pages"]:
+        if page.get("masterPage") is None:
+            page.pop("masterPage", None)
+    layout.setdefault("document", {})["title"] = title
+    return layout
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+class _FakeSession:
+    """Ersetzt SessionLocal: protokolliert Statements und liefert RETURNING-Zeilen."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.statements = []
+        self.committed = False
+        self.rolled_back = False
+
+    def execute(self, statement, params):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("db down")
+        ids = [v for k, v in params.items() if k == "id" or k.startswith("id_")] or [uuid4()]
+        width = len(sql.rsplit("RETURNING", 1)[1].split(","))
+        now = datetime.now(timezone.utc)
+        return _FakeResult([(row_id,) + (now,) * (width - 1) for row_id in ids])
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+class _FakeArtifactStore:
+    def __init__(self, fail_on_upload=None):
+        self.fail_on_upload = fail_on_upload
+        self.uploads = {}
+        self.deleted = []
+
+    def upload(self, data, artifact_type, file_name=None, mime_type=None):
+        if self.fail_on_upload is not None and self.fail_on_upload in data:
+            raise IOError("minio down")
+        uri = f"s3://artifacts/{file_name}"
+        self.uploads[uri] = data
+        return uri, file_name, len(data)
+
+    def compute_checksum(self, data):
+        return "0" * 32
+
+    def delete(self, uri):
+        self.deleted.append(uri)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Gateway ohne Postgres/MinIO/Redis: Fake-Session, Fake-Store, Enqueue protokolliert."""
+    state = {"sessions": [], "enqueued": [], "fail_on": None}
+    store = _FakeArtifactStore()
+
+    def session_factory():
+        session = _FakeSession(state["fail_on"])
+        state["sessions"].append(session)
+        return session
+
+    monkeypatch.setattr(gateway, "SessionLocal", session_factory)
+    monkeypatch.setattr(gateway, "artifact_store", store)
+    monkeypatch.setattr(gateway, "event_bus", None)
+    monkeypatch.setattr(gateway, "_enqueue_job_task", lambda *args: state["enqueued"].append(args))
+    monkeypatch.setattr(gateway, "_enqueue_compile_jobs_batch_task", lambda *args: state["enqueued"].append(args))
+    monkeypatch.setattr(gateway.config, "API_KEY_ENABLED", False)
+    state["store"] = store
+    return state
+
+
+def test_batch_preserves_request_order_and_chunks_inserts(client, backend, monkeypatch):
+    # 8 Artefakt-Spalten -> höchstens 2 Zeilen pro Statement
+    monkeypatch.setattr(gateway, "MAX_STATEMENT_PARAMS", 16)
+    titles = [f"Layout {i}" for i in range(5)]
+    jobs = [{"layout_json": _layout(t), "priority": i, "metadata": {"n": i}} for i, t in enumerate(titles)]
+
+    response = client.post("/v1/jobs:batch", json={"jobs": jobs})
+
+    assert response.status_code == 201
+    created = response.json()["jobs"]
+    assert [job["priority"] for job in created] == [0, 1, 2, 3, 4]
+    assert [job["metadata"] for job in created] == [{"n": i} for i in range(5)]
+    store = backend["store"]
+    for job, title in zip(created, titles):
+        stored = json.loads(store.uploads[job["input_artifact"]["storage_uri"]])
+        assert stored["document"]["title"] == title
+
+    session = backend["sessions"][0]
+    assert session.committed
+    artifact_inserts = [p for sql, p in session.statements if "INSERT INTO artifacts" in sql]
+    assert [len(p) for p in artifact_inserts] == [16, 16, 8]
+    job_ids = [v for sql, p in session.statements if "INSERT INTO jobs" in sql for k, v in p.items() if k.startswith("id_")]
+    assert [str(i) for i in job_ids] == [job["id"] for job in created]
+    (enqueued_jobs, _tenant), = backend["enqueued"]
+    assert [str(job_id) for job_id, _ in enqueued_jobs] == [job["id"] for job in created]
+
+
+def test_batch_failed_upload_removes_uploaded_layouts(client, backend):
+    backend["store"].fail_on_upload = b"Kaputt"
+    jobs = [{"layout_json": _layout(t)} for t in ("A", "Kaputt", "C")]
+
+    response = client.post("/v1/jobs:batch", json={"jobs": jobs})
+
+    assert response.status_code == 500
+    store = backend["store"]
+    assert len(store.uploads) == 2
+    assert sorted(store.deleted) == sorted(store.uploads)
+    assert backend["sessions"] == []
+    assert backend["enqueued"] == []
+
+
+def test_batch_failed_insert_rolls_back_and_removes_uploads(client, backend):
+    backend["fail_on"] = "INSERT INTO jobs"
+
+    response = client.post("/v1/jobs:batch", json={"jobs": [{"layout_json": _layout()}] * 2})
+
+    assert response.status_code == 500
+    session = backend["sessions"][0]
+    assert session.rolled_back and not session.committed
+    assert sorted(backend["store"].deleted) == sorted(backend["store"].uploads)
+    assert backend["enqueued"] == []
+
+
+def test_batch_over_limit_is_rejected(client, backend, monkeypatch):
+    monkeypatch.setattr(gateway.config, "MAX_BATCH_JOBS", 2)
+
+    response = client.post("/v1/jobs:batch", json={"jobs": [{"layout_json": _layout()}] * 3})
+    assert response.status_code == 413
+    assert client.post("/v1/jobs:batch", json={"jobs": []}).status_code == 422
+    assert backend["store"].uploads == {}
+
+
+def _raw_body(layout=None, pad=0):
+    layout = layout or _layout()
+    if pad:
+        layout["document"]["padding"] = "x" * pad
+    return json.dumps(layout, indent=1).encode("utf-8")
+
+
+def test_raw_rejects_oversized_body_by_content_length(client, backend, monkeypatch):
+    monkeypatch.setattr(gateway.config, "MAX_JSON_SIZE_MB", 1)
+
+    response = client.post("/v1/jobs:raw", content=_raw_body(pad=1024 * 1024))
+
+    assert response.status_code == 413
+    assert backend["store"].uploads == {}
+    assert backend["sessions"] == []
+
+
+def test_raw_rejects_oversized_stream_without_content_length(client, backend, monkeypatch):
+    monkeypatch.setattr(gateway.config, "MAX_JSON_SIZE_MB", 1)
+
+    def chunks():  # Generator -> chunked, kein Content-Length
+        for _ in range(64):
+            yield b" " * (64 * 1024)
+
+    response = client.post("/v1/jobs:raw", content=chunks())
+
+    assert response.status_code == 413
+    assert backend["store"].uploads == {}
+
+
+def test_raw_enforces_page_and_element_limits(client, backend, monkeypatch):
+    layout = _layout()
+    layout["pages"].append(dict(layout["pages"][0], pageNumber=2))
+    monkeypatch.setattr(gateway.config, "MAX_PAGES_PER_DOCUMENT", 1)
+
+    response = client.post("/v1/jobs:raw", content=_raw_body(layout))
+    assert response.status_code == 400
+    assert "Too many pages" in response.json()["detail"]
+
+    monkeypatch.setattr(gateway.config, "MAX_PAGES_PER_DOCUMENT", 10)
+    monkeypatch.setattr(gateway.config, "MAX_ELEMENTS_PER_PAGE", 2)
+    response = client.post("/v1/jobs:raw", content=_raw_body(layout))
+    assert response.status_code == 400
+    assert "Too many elements on page 1" in response.json()["detail"]
+    assert backend["store"].uploads == {}
+    assert all(s.rolled_back and not s.committed for s in backend["sessions"])
+
+
+def test_raw_stores_validated_bytes_unchanged(client, backend):
+    body = _raw_body()
+
+    response = client.post("/v1/jobs:raw?priority=12", content=body, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 201
+    job = response.json()
+    assert job["priority"] == 12
+    assert backend["store"].uploads[job["input_artifact"]["storage_uri"]] == body
+    assert job["input_artifact"]["file_size"] == len(body)
+    assert backend["sessions"][0].committed
+    (job_id, job_type, priority, _tenant), = backend["enqueued"]
+    assert (str(job_id), job_type, priority) == (job["id"], "compile", 12)
@@ -0,0 +1,108 @@
+"""Tests für Rate-Limiting im API-Gateway (lokaler Token-Bucket, Redis-Sliding-Window)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from apps.api_gateway import rate_limit_local, rate_limit_redis
+from apps.api_gateway.rate_limit_local import InMemoryRateLimiter, LocalTokenBucket
+from apps.api_gateway.rate_limit_redis import RedisRateLimiter
+
+
+def test_token_bucket_allows_burst_then_refills():
+    bucket = LocalTokenBucket(requests_per_window=3, window_seconds=3)  # 1 Token/s
+
+    assert [bucket.try_acquire("ip", now=0.0)[0] for _ in range(3)] == [True, True, True]
+    assert bucket.try_acquire("ip", now=0.0) == (False, 1)
+    assert bucket.try_acquire("ip", now=0.5) == (False, 1)
+    assert bucket.try_acquire("ip", now=1.0) == (True, None)
+    assert bucket.try_acquire("ip", now=1.0)[0] is False
+
+    # Lange Pause: Bucket füllt sich nur bis zur Kapazität
+    assert [bucket.try_acquire("ip", now=100.0)[0] for _ in range(4)] == [True, True, True, False]
+    assert bucket.try_acquire("other", now=100.0) == (True, None)
+
+
+def test_token_bucket_refund_and_lru_bound():
+    bucket = LocalTokenBucket(requests_per_window=2, window_seconds=60, max_entries=2)
+    bucket.try_acquire("a", now=0.0)
+    bucket.try_acquire("a", now=0.0)
+    assert bucket.try_acquire("a", now=0.0)[0] is False
+
+    bucket.refund("a")
+    assert bucket.try_acquire("a", now=0.0) == (True, None)
+
+    bucket.try_acquire("b", now=0.0)
+    bucket.try_acquire("c", now=0.0)
+    assert list(bucket._buckets) == ["b", "c"]
+    # Verdrängter Identifier startet wieder voll
+    assert bucket.try_acquire("a", now=0.0) == (True, None)
+
+
+def test_in_memory_limiter_slides_window():
+    limiter = InMemoryRateLimiter(requests_per_window=2, window_seconds=10)
+
+    assert limiter.is_allowed("ip", now=0.0) == (True, None)
+    assert limiter.is_allowed("ip", now=4.0) == (True, None)
+    assert limiter.is_allowed("ip", now=5.0) == (False, 5)
+    assert limiter.is_allowed("ip", now=10.0) == (True, None)
+    assert limiter.is_allowed("ip", now=10.5) == (False, 4)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Gemeinsamer FakeRedis-Server (mit Lua über lupa) statt redis.from_url."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        rate_limit_redis.redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs),
+    )
+    clock = {"wall": 1_000.0, "mono": 0.0}
+    monkeypatch.setattr(rate_limit_redis, "time", SimpleNamespace(time=lambda: clock["wall"]))
+    monkeypatch.setattr(rate_limit_local, "time", SimpleNamespace(monotonic=lambda: clock["mono"]))
+    return SimpleNamespace(server=server, clock=clock, client=fakeredis.FakeRedis(server=server))
+
+
+def test_lua_window_counts_requests_in_same_millisecond(fake_redis):
+    limiter = RedisRateLimiter("redis://fake", requests_per_window=5, window_seconds=60, local_precheck=False)
+    assert limiter.enabled
+
+    # Alle Requests in derselben Millisekunde: eindeutige Member, jeder zählt
+    assert [limiter.is_allowed("ip")[0] for _ in range(5)] == [True] * 5
+    assert fake_redis.client.zcard("rate_limit:ip") == 5
+    assert limiter.is_allowed("ip") == (False, 60)
+    assert limiter.get_remaining("ip") == 0
+
+    fake_redis.clock["wall"] += 30
+    assert limiter.is_allowed("ip") == (False, 30)
+    fake_redis.clock["wall"] += 30
+    assert limiter.is_allowed("ip") == (True, None)
+
+
+def test_global_rejection_refunds_local_token(fake_redis):
+    first = RedisRateLimiter("redis://fake", requests_per_window=3, window_seconds=60)
+    second = RedisRateLimiter("redis://fake", requests_per_window=3, window_seconds=60)
+
+    assert first.is_allowed("ip")[0] and first.is_allowed("ip")[0]
+    assert second.is_allowed("ip") == (True, None)
+    tokens_before = second.local_bucket._buckets["ip"][0]
+
+    # Lokal noch Tokens frei, global ist das Limit erreicht
+    assert second.is_allowed("ip") == (False, 60)
+    assert second.local_bucket._buckets["ip"][0] == tokens_before
+    assert fake_redis.client.zcard("rate_limit:ip") == 3
+
+
+def test_local_precheck_rejects_without_redis_roundtrip(fake_redis):
+    limiter = RedisRateLimiter("redis://fake", requests_per_window=2, window_seconds=60)
+    calls = []
+    script = limiter._script
+    limiter._script = lambda **kwargs: (calls.append(1), script(**kwargs))[1]
+
+    limiter.is_allowed("ip")
+    limiter.is_allowed("ip")
+    assert limiter.is_allowed("ip") == (False, 30)
+    assert len(calls) == 2
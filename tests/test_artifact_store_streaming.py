@@ -0,0 +1,44 @@
+import hashlib
+
+import pytest
+
+from packages.artifact_store.store_streaming import (
+    ChunkReader,
+    LocalStreamingArtifactStore,
+    UploadTooLargeError,
+)
+from packages.common.models import ArtifactType
+
+
+def _chunks(n, size):
+    for i in range(n):
+        yield bytes([i % 256]) * size
+
+
+def test_chunk_reader_counts_and_hashes_in_one_pass():
+    payload = b"".join(_chunks(10, 1000))
+    reader = ChunkReader(_chunks(10, 1000))
+    out = bytearray()
+    while True:
+        part = reader.read(4096)
+        if not part:
+            break
+        out += part
+    assert bytes(out) == payload
+    assert reader.size == len(payload)
+    assert reader.checksum == hashlib.md5(payload).hexdigest()
+
+
+def test_local_streaming_store_enforces_limit_and_cleans_up(tmp_path):
+    store = LocalStreamingArtifactStore(tmp_path, chunk_size=512)
+
+    uri, name, size, checksum = store.ingest_stream(
+        _chunks(4, 1000), ArtifactType.WORKFLOW_BUNDLE, file_name="ok.zip", max_bytes=4000
+    )
+    assert uri == "local://workflow_bundle/ok.zip"
+    assert size == 4000
+    assert checksum == hashlib.md5(b"".join(_chunks(4, 1000))).hexdigest()
+
+    with pytest.raises(UploadTooLargeError):
+        store.ingest_stream(_chunks(5, 1000), ArtifactType.WORKFLOW_BUNDLE, file_name="big.zip", max_bytes=4000)
+    assert not list((tmp_path / "workflow_bundle").glob("big.zip*"))
@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from packages.dialog_engine.agent_runner import RateLimiter
+from packages.dialog_engine.agents import AGENT_REGISTRY, BATCH_INPUT_PREFIX, AgentExecutor
+from packages.dialog_engine.llm_integration import LLMClient, LLMRequest
+from packages.workflow.progress_tracker import ProgressTracker
+from packages.workflow.step_executor import StepExecutor
+
+AGENTS = ["SemanticEnricher", "LayoutDesigner", "QualityCritic"]
+
+RESPONSES = {
+    "SemanticEnricher": {"title": "Titel", "summary": "Kurz", "keywords": ["a"]},
+    "LayoutDesigner": {"template_id": "hero_left", "spacing_logic": "x", "visual_weight": 0.5, "layout_intent": "balanced", "notes": []},
+    "QualityCritic": {"score": 8, "issues": [], "approved": True},
+}
+
+
+class StubLLM(LLMClient):
+    """Lokaler Stub: Antwort je Agent (erkannt an der Rolle), feste Latenz, zählt parallele Aufrufe."""
+
+    provider = "stub"
+
+    def __init__(self, delay: float = 0.02, slow_agent: str = "", slow_delay: float = 0.0, batch_reply=None):
+        self.delay = delay
+        self.batch_reply = batch_reply  # f(agent_id, items) -> Antwort-Liste
+        self.slow_agent = slow_agent
+        self.slow_delay = slow_delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete(self, request: LLMRequest) -> str:
+        agent_id = next(a for a in AGENTS if request.system.startswith(AGENT_REGISTRY[a].role))
+        with self._lock:
+            self.requests.append((agent_id, request.user, time.monotonic()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.slow_delay if agent_id == self.slow_agent else self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        line = next((ln for ln in request.user.splitlines() if ln.startswith(BATCH_INPUT_PREFIX)), None)
+        if line is not None:
+            items = json.loads(line[len(BATCH_INPUT_PREFIX):])
+            reply = self.batch_reply or (lambda a, xs: [RESPONSES[a]] * len(xs))
+            return json.dumps(reply(agent_id, items))
+        return json.dumps(RESPONSES[agent_id])
+
+
+def _write_layouts(tmp_path: Path, n: int) -> list[Path]:
+    paths = []
+    for i in range(n):
+        p = tmp_path / ("chapter_%02d.json" % i)
+        objects = [{"type": "text", "role": "title", "content": "Kapitel %d" % i}] + [{"type": "image"}] * (i % 3)
+        p.write_text("{oops" if i == 3 else json.dumps({"pages": [{"objects": objects}]}), encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+def _run(paths, llm, **kwargs):
+    ex = StepExecutor(tracker=ProgressTracker(publish_to_bus=False))
+    report = ex.run_agents(layout_paths=paths, agent_ids=AGENTS, llm=llm, **kwargs)
+    report.pop("report_path")
+    return report
+
+
+def test_concurrent_agents_match_serial_report(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _write_layouts(tmp_path, 12)
+
+    serial_llm = StubLLM()
+    serial = _run(paths, serial_llm)
+    parallel_llm = StubLLM()
+    parallel = _run(paths, parallel_llm, concurrency=6)
+
+    assert parallel == serial
+    assert len(parallel["outputs"]) == 11
+    assert parallel["errors"][0]["error"].startswith("failed to read json:")
+    assert serial_llm.max_in_flight == 1
+    assert 1 < parallel_llm.max_in_flight <= 6
+
+
+def test_timeout_is_reported_per_call(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _write_layouts(tmp_path, 2)
+
+    report = _run(paths, StubLLM(slow_agent="QualityCritic", slow_delay=0.5), concurrency=4, timeout=0.1)
+
+    assert [(e["agent"], "timed out" in e["error"]) for e in report["errors"]] == [("QualityCritic", True)] * 2
+    assert all(set(o["agents"]) == {"SemanticEnricher", "LayoutDesigner"} for o in report["outputs"])
+
+
+def test_pipeline_feeds_layout_designer_output_to_critic(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [p for p in _write_layouts(tmp_path, 4) if p.name != "chapter_03.json"]
+    llm = StubLLM()
+
+    report = _run(paths, llm, concurrency=4, pipeline=True)
+
+    assert report["errors"] == []
+    critic_inputs = [user for agent, user, _ in llm.requests if agent == "QualityCritic"]
+    designer_inputs = [user for agent, user, _ in llm.requests if agent == "LayoutDesigner"]
+    assert len(critic_inputs) == 3
+    assert all('"upstream": {"LayoutDesigner": {"template_id": "hero_left"' in u for u in critic_inputs)
+    assert not any("upstream" in u for u in designer_inputs)
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20.0)
+    waits = [limiter.reserve() for _ in range(4)]
+    assert waits[0] == 0.0
+    for k in range(1, 4):
+        assert abs(waits[k] - 0.05 * k) < 0.01
+
+
+def test_batch_mode_matches_single_calls(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _write_layouts(tmp_path, 10)
+
+    serial = _run(paths, StubLLM(delay=0))
+    llm = StubLLM(delay=0)
+    batched = _run(paths, llm, batch_size=4, concurrency=2)
+
+    assert batched.pop("batching") == {"batch_size": 4, "batch_requests": 6, "single_fallbacks": 0}
+    assert batched == serial
+    # 9 gültige Layouts -> je Agent Batches mit 4 + 4 + 1 (Rest als Einzelaufruf)
+    assert len(llm.requests) == 9
+
+
+def test_batch_invalid_elements_fall_back_to_single_calls():
+    def reply(agent_id, items):
+        out = [RESPONSES[agent_id]] * len(items)
+        out[1] = {"score": "kaputt"}
+        return out
+
+    llm = StubLLM(delay=0, batch_reply=reply)
+    inputs = [{"headline": "H%d" % i} for i in range(4)]
+    results = AgentExecutor(llm=llm).prompt_agent_batch("QualityCritic", inputs)
+
+    assert results == [RESPONSES["QualityCritic"]] * 4
+    assert [BATCH_INPUT_PREFIX in user for _, user, _ in llm.requests] == [True, False]
+    assert '"H1"' in llm.requests[1][1]
+
+    # falsche Array-Länge -> alle Elemente einzeln
+    short = StubLLM(delay=0, batch_reply=lambda a, xs: [RESPONSES[a]])
+    assert AgentExecutor(llm=short).prompt_agent_batch("QualityCritic", inputs) == [RESPONSES["QualityCritic"]] * 4
+    assert len(short.requests) == 5
+
+
+def test_batch_pipeline_passes_upstream_per_element(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [p for p in _write_layouts(tmp_path, 4) if p.name != "chapter_03.json"]
+    llm = StubLLM(delay=0)
+
+    report = _run(paths, llm, batch_size=8, pipeline=True)
+
+    assert report["errors"] == []
+    assert [agent for agent, _, _ in llm.requests][-1] == "QualityCritic"
+    critic_user = next(user for agent, user, _ in llm.requests if agent == "QualityCritic")
+    items = json.loads(next(ln for ln in critic_user.splitlines() if ln.startswith(BATCH_INPUT_PREFIX))[len(BATCH_INPUT_PREFIX):])
+    assert [item["upstream"]["LayoutDesigner"]["template_id"] for item in items] == ["hero_left"] * 3
@@ -0,0 +1,175 @@
+import json
+import multiprocessing
+import threading
+from pathlib import Path
+
+import pytest
+
+from packages.dialog_engine import DecisionStore, cli
+
+
+def _journal_lines(store: DecisionStore):
+    if not store.journal_path.exists():
+        return []
+    return [line for line in store.journal_path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def test_updates_are_journaled_until_compaction(tmp_path: Path):
+    store = DecisionStore(tmp_path / "decisions.json", compact_every=3)
+
+    store.set("format", "A4", source="test")
+    store.set("variants", "both", source="test")
+    store.merge({"dpi": 300, "format": "A5"}, source="merge")
+
+    # Erste Speicherung schreibt das Dokument, danach nur Journal-Zeilen
+    assert json.loads(store.path.read_text(encoding="utf-8"))["decisions"] == {"format": "A4"}
+    assert len(_journal_lines(store)) == 2
+    raw = store.load_raw()
+    assert raw["decisions"] == {"format": "A5", "variants": "both", "dpi": 300}
+    assert [h["source"] for h in raw["history"]] == ["test", "merge"]
+
+    store.set("bleed", 3, source="test")
+
+    assert _journal_lines(store) == []
+    doc = json.loads(store.path.read_text(encoding="utf-8"))
+    assert doc["decisions"] == {"format": "A5", "variants": "both", "dpi": 300, "bleed": 3}
+    assert len(doc["history"]) == 3
+    assert DecisionStore(store.path).load() == doc["decisions"]
+
+
+def test_save_removes_keys_and_history_is_capped(tmp_path: Path):
+    store = DecisionStore(tmp_path / "decisions.json", compact_every=5, history_limit=4)
+    store.save({"a": 1, "b": 2})
+    for i in range(12):
+        store.set("a", i)
+    store.save({"a": 99})
+    store.compact()
+
+    doc = json.loads(store.path.read_text(encoding="utf-8"))
+    assert doc["decisions"] == {"a": 99}
+    assert len(doc["history"]) == 4
+    assert doc["meta"]["history_dropped"] == 9
+    assert DecisionStore(store.path).get("b") is None
+
+
+def test_reads_are_cached_and_see_other_writers(tmp_path: Path):
+    path = tmp_path / "decisions.json"
+    reader = DecisionStore(path)
+    writer = DecisionStore(path)
+    writer.set("format", "A4")
+
+    loads = []
+    original = reader._load_document
+    reader._load_document = lambda: (loads.append(1), original())[1]
+
+    assert reader.get("format") == "A4"
+    for _ in range(20):
+        reader.get("format")
+    assert len(loads) == 1
+
+    writer.set("format", "A3")
+    assert reader.get("format") == "A3"
+    # Nur das Journal ist gewachsen -> kein erneutes Parsen des Dokuments
+    assert len(loads) == 1
+
+
+def test_returned_values_are_copies(tmp_path: Path):
+    store = DecisionStore(tmp_path / "decisions.json")
+    store.set("fonts", ["Inter"])
+
+    store.get("fonts").append("Arial")
+    store.load()["fonts"].append("Arial")
+
+    assert store.get("fonts") == ["Inter"]
+
+
+def test_partial_journal_line_is_ignored(tmp_path: Path):
+    store = DecisionStore(tmp_path / "decisions.json", compact_every=100)
+    store.set("format", "A4")
+    store.set("dpi", 300)
+    with open(store.journal_path, "ab") as fh:
+        fh.write(b'{"seq": 99, "set": {"dpi"')
+
+    store.set("bleed", 3)
+
+    assert DecisionStore(store.path).load() == {"format": "A4", "dpi": 300, "bleed": 3}
+
+
+def test_journal_left_after_compaction_is_not_replayed(tmp_path: Path):
+    store = DecisionStore(tmp_path / "decisions.json", compact_every=100)
+    store.set("format", "A4")
+    store.set("dpi", 300)
+    store.set("dpi", 150)
+    journal = store.journal_path.read_bytes()
+
+    store.compact()
+    store.journal_path.write_bytes(journal)  # Absturz vor dem Leeren des Journals
+
+    raw = DecisionStore(store.path).load_raw()
+    assert raw["decisions"] == {"format": "A4", "dpi": 150}
+    assert len(raw["history"]) == 2
+
+
+def test_missing_file_is_not_created_by_reads(tmp_path: Path):
+    store = DecisionStore(tmp_path / "sub" / "decisions.json")
+
+    assert store.load() == {}
+    assert store.load_raw() == {}
+    assert not (tmp_path / "sub").exists()
+
+
+def _write_keys(path: str, prefix: str, count: int) -> None:
+    store = DecisionStore(Path(path), compact_every=7)
+    for i in range(count):
+        store.set(f"{prefix}{i}", i, source=prefix)
+
+
+def test_concurrent_threads_do_not_lose_updates(tmp_path: Path):
+    path = tmp_path / "decisions.json"
+    threads = [threading.Thread(target=_write_keys, args=(str(path), f"t{n}_", 20)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    decisions = DecisionStore(path).load()
+    assert len(decisions) == 80
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork not available")
+def test_concurrent_processes_do_not_corrupt_file(tmp_path: Path):
+    path = tmp_path / "decisions.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_keys, args=(str(path), f"p{n}_", 25)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    store = DecisionStore(path)
+    assert len(store.load()) == 100
+    store.compact()
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    assert len(doc["decisions"]) == 100
+    assert len(doc["history"]) == 99
+
+
+def test_cli_run_leaves_complete_json(tmp_path: Path, capsys):
+    path = tmp_path / "decisions.json"
+
+    assert cli.main(["run", "--file", str(path), "--non-interactive"]) == 0
+
+    # Nach dem Lauf ist das Journal eingefaltet, die Datei allein vollständig
+    store = DecisionStore(path)
+    assert _journal_lines(store) == []
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    assert len(doc["decisions"]) > 1
+    assert doc["decisions"] == store.load()
+    assert len(doc["history"]) == len(doc["decisions"]) - 1
+
+
+def test_close_without_writes_creates_no_files(tmp_path: Path):
+    with DecisionStore(tmp_path / "decisions.json") as store:
+        store.load()
+    assert list(tmp_path.iterdir()) == []
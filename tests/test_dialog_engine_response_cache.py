@@ -0,0 +1,110 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from packages.dialog_engine.agents import AgentExecutor
+from packages.dialog_engine.llm_integration import LLMClient, LLMRequest
+from packages.dialog_engine.response_cache import ResponseCache
+from packages.workflow.progress_tracker import ProgressTracker
+from packages.workflow.step_executor import StepExecutor
+
+CRITIC = {"score": 7, "issues": [], "approved": True}
+
+
+class CountingLLM(LLMClient):
+    provider = "stub"
+    model = "stub-1"
+
+    def __init__(self, response: dict):
+        self.response = response
+        self.calls = 0
+
+    def complete(self, request: LLMRequest) -> str:
+        self.calls += 1
+        return json.dumps(self.response)
+
+
+def test_identical_prompt_is_served_from_cache(tmp_path: Path):
+    llm = CountingLLM(CRITIC)
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    agent = AgentExecutor(llm=llm, cache=cache)
+
+    first = agent.prompt_agent("QualityCritic", {"headline": "A"})
+    second = agent.prompt_agent("QualityCritic", {"headline": "A"})
+    agent.prompt_agent("QualityCritic", {"headline": "B"})
+
+    assert first == second == CRITIC
+    assert llm.calls == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    # andere Agent-Version oder anderes Modell -> neuer Schlüssel
+    AgentExecutor(llm=llm, cache=cache, version="v2").prompt_agent("QualityCritic", {"headline": "A"})
+    other_model = CountingLLM(CRITIC)
+    other_model.model = "stub-2"
+    AgentExecutor(llm=other_model, cache=cache).prompt_agent("QualityCritic", {"headline": "A"})
+    assert llm.calls == 3 and other_model.calls == 1
+
+
+def test_batch_fallback_looks_up_each_input_once(tmp_path: Path):
+    llm = CountingLLM(CRITIC)  # Objekt statt Array -> Batch unbrauchbar, alle Elemente einzeln
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    agent = AgentExecutor(llm=llm, cache=cache)
+    inputs = [{"headline": h} for h in "ABC"]
+
+    assert agent.prompt_agent_batch("QualityCritic", inputs) == [CRITIC] * 3
+    assert llm.calls == 4
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 3
+
+    assert agent.prompt_agent_batch("QualityCritic", inputs) == [CRITIC] * 3
+    assert llm.calls == 4
+    assert cache.stats()["hits"] == 3 and cache.stats()["hit_rate"] == 0.5
+
+
+def test_invalid_output_is_not_cached(tmp_path: Path):
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    agent = AgentExecutor(llm=CountingLLM({"score": "bad"}), cache=cache)
+
+    with pytest.raises(ValueError):
+        agent.prompt_agent("QualityCritic", {"headline": "A"})
+    assert len(cache) == 0
+
+
+def test_ttl_and_lru_eviction(tmp_path: Path):
+    cache = ResponseCache(tmp_path / "c.sqlite", max_entries=2)
+    cache.put("a", "X", {"v": 1})
+    time.sleep(0.01)
+    cache.put("b", "X", {"v": 2})
+    time.sleep(0.01)
+    assert cache.get("a") == {"v": 1}  # a zuletzt genutzt -> b wird verdrängt
+    time.sleep(0.01)
+    cache.put("c", "X", {"v": 3})
+    assert len(cache) == 2 and cache.get("b") is None and cache.evicted == 1
+
+    short = ResponseCache(tmp_path / "c.sqlite", ttl_s=0.0)
+    time.sleep(0.01)
+    assert short.get("a") is None
+    assert len(short) == 1
+
+
+def test_rerun_costs_no_llm_calls(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    layouts = []
+    for i in range(3):
+        p = tmp_path / ("l%d.json" % i)
+        p.write_text(json.dumps({"pages": [{"objects": [{"type": "text", "role": "title", "content": "T%d" % i}]}]}), encoding="utf-8")
+        layouts.append(p)
+
+    ex = StepExecutor(tracker=ProgressTracker(publish_to_bus=False))
+    cache_path = tmp_path / "agent_cache.sqlite"
+
+    llm = CountingLLM(CRITIC)
+    first = ex.run_agents(layout_paths=layouts, agent_ids=["QualityCritic"], llm=llm, cache_path=cache_path)
+    assert llm.calls == 3 and first["cache"]["hit_rate"] == 0.0
+
+    rerun_llm = CountingLLM(CRITIC)
+    second = ex.run_agents(layout_paths=layouts, agent_ids=["QualityCritic"], llm=rerun_llm, cache_path=cache_path, concurrency=3)
+    assert rerun_llm.calls == 0
+    assert second["cache"]["hits"] == 3 and second["cache"]["hit_rate"] == 1.0
+    assert second["outputs"] == first["outputs"]
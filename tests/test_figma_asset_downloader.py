@@ -0,0 +1,201 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from packages.figma_integration.asset_downloader import FigmaAssetDownloader
+from packages.figma_integration.client import FigmaClient
+
+
+class _StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.active = 0
+        self.max_active = 0
+
+
+def _payload(name: str) -> bytes:
+    return (f"PNG-{name}-" * 500).encode()
+
+
+def _make_handler(state: _StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            kind, _, name = self.path.strip("/").partition("/")
+            with state.lock:
+                state.hits[self.path] = state.hits.get(self.path, 0) + 1
+                hits = state.hits[self.path]
+                state.active += 1
+                state.max_active = max(state.max_active, state.active)
+            try:
+                if kind == "slow":
+                    time.sleep(0.05)
+                    self._send(200, _payload(name))
+                elif kind == "flaky" and hits == 1:
+                    self._send(503, b"busy")
+                elif kind == "cut" and hits == 1:
+                    # Abbruch mitten im Body -> Stream-Fehler beim Lesen
+                    self.send_response(200)
+                    self.send_header("Content-Length", "100000")
+                    self.end_headers()
+                    self.wfile.write(b"PNG-partial")
+                    self.close_connection = True
+                elif kind == "drop":
+                    # Verbindung ohne Antwort schließen -> Verbindungsfehler beim Client
+                    self.close_connection = True
+                elif kind == "missing":
+                    self._send(404, b"not found")
+                elif kind == "api":
+                    self._send(200, b'{"ok": true}')
+                else:
+                    self._send(200, _payload(name))
+            finally:
+                with state.lock:
+                    state.active -= 1
+
+    return Handler
+
+
+@pytest.fixture()
+def stub_server():
+    state = _StubState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield base, state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _FakeFigmaClient:
+    def __init__(self, urls):
+        self.urls = urls
+
+    def get_frame_images(self, file_key, node_ids):
+        return {"images": {node_id: self.urls[node_id] for node_id in node_ids}}
+
+
+class _FakeMinio:
+    def __init__(self):
+        self.objects = {}
+        self.bucket_checks = 0
+        self.lock = threading.Lock()
+
+    def bucket_exists(self, bucket):
+        with self.lock:
+            self.bucket_checks += 1
+        return False
+
+    def make_bucket(self, bucket):
+        pass
+
+    def put_object(self, bucket, name, data, length, part_size=0, content_type=None):
+        body = data.read()
+        if length >= 0:
+            assert len(body) == length
+        with self.lock:
+            self.objects[name] = (body, type(data).__name__)
+
+
+def _frame(node_ids):
+    children = [{"id": node_id, "type": "RECTANGLE", "fills": [{"type": "IMAGE"}]} for node_id in node_ids]
+    return {"id": "0:1", "type": "FRAME", "children": children}
+
+
+def _run(downloader, urls):
+    node_ids = list(urls)
+    image_objects = [{"id": node_id.replace(":", "_")} for node_id in node_ids]
+    return downloader.download_frame_images(_FakeFigmaClient(urls), "file", _frame(node_ids), image_objects)
+
+
+def test_streams_all_images_into_minio_in_parallel(stub_server):
+    base, state = stub_server
+    urls = {f"1:{i}": f"{base}/slow/a{i}" for i in range(8)}
+    minio = _FakeMinio()
+    downloader = FigmaAssetDownloader(minio_client=minio, max_workers=8, per_host_limit=8, backoff=0)
+
+    result = _run(downloader, urls)
+
+    assert list(result) == [f"1_{i}" for i in range(8)]
+    assert result["1_3"] == "minio://figma-assets/1_3.png"
+    assert minio.objects["1_3.png"][0] == _payload("a3")
+    # Direkt aus dem HTTP-Stream, nicht aus einem BytesIO-Puffer
+    assert minio.objects["1_3.png"][1] != "BytesIO"
+    assert minio.bucket_checks == 1
+    assert state.max_active > 1
+
+
+def test_per_host_limit_bounds_concurrency(stub_server):
+    base, state = stub_server
+    urls = {f"1:{i}": f"{base}/slow/b{i}" for i in range(6)}
+    downloader = FigmaAssetDownloader(minio_client=_FakeMinio(), max_workers=6, per_host_limit=2, backoff=0)
+
+    assert len(_run(downloader, urls)) == 6
+    assert state.max_active <= 2
+
+
+def test_retries_status_and_broken_stream(stub_server):
+    base, state = stub_server
+    urls = {"1:1": f"{base}/flaky/x", "1:2": f"{base}/cut/y", "1:3": f"{base}/missing/z"}
+    minio = _FakeMinio()
+    downloader = FigmaAssetDownloader(minio_client=minio, retries=2, backoff=0)
+
+    result = _run(downloader, urls)
+
+    assert set(result) == {"1_1", "1_2"}
+    assert minio.objects["1_1.png"][0] == _payload("x")
+    assert minio.objects["1_2.png"][0] == _payload("y")
+    assert state.hits["/flaky/x"] == 2
+    assert state.hits["/cut/y"] == 2
+
+
+def test_connection_errors_are_retried_once_not_per_layer(stub_server):
+    base, state = stub_server
+    downloader = FigmaAssetDownloader(minio_client=_FakeMinio(), retries=2, backoff=0)
+    shared = FigmaAssetDownloader(minio_client=_FakeMinio(), session=FigmaClient(access_token="t").session, backoff=0)
+
+    assert _run(downloader, {"1:1": f"{base}/drop/d"}) == {}
+    assert _run(shared, {"1:1": f"{base}/drop/e"}) == {}
+    # 1 + retries Versuche durch die Session; die Transfer-Schleife wiederholt nur Stream-Abbrüche
+    assert state.hits["/drop/d"] == 3
+    assert state.hits["/drop/e"] == 4
+
+
+def test_local_fallback_writes_files_atomically(stub_server, tmp_path):
+    base, _ = stub_server
+    urls = {"1:1": f"{base}/img/p", "1:2": f"{base}/img/q"}
+    downloader = FigmaAssetDownloader(local_dir=str(tmp_path), backoff=0)
+
+    result = _run(downloader, urls)
+
+    assert result["1_1"] == f"file://{tmp_path / '1_1.png'}"
+    assert (tmp_path / "1_2.png").read_bytes() == _payload("q")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["1_1.png", "1_2.png"]
+
+
+def test_figma_client_uses_shared_session(stub_server):
+    base, state = stub_server
+    client = FigmaClient(access_token="token")
+    client.BASE_URL = f"{base}/api"
+
+    assert client._request("GET", "/me") == {"ok": True}
+    downloader = FigmaAssetDownloader(session=client.session)
+    assert downloader.session is client.session
+    assert "X-Figma-Token" not in client.session.headers
@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from packages.figma_integration.client import FigmaClient
+from packages.figma_integration.file_cache import FigmaFileCache
+
+
+class _FigmaStub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = "v1"
+        self.send_etag = False
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    def count(self, kind):
+        return sum(1 for r in self.requests if r == kind)
+
+    def document(self):
+        frame = {"id": "1:2", "name": "Cover", "type": "FRAME", "children": [{"id": "1:3", "type": "TEXT"}]}
+        page = {"id": "0:1", "name": "Page", "type": "CANVAS", "children": [frame]}
+        return {"id": "0:0", "type": "DOCUMENT", "children": [page]}
+
+
+def _make_handler(stub: _FigmaStub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, payload, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _empty(self, status):
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            parts = url.path.strip("/").split("/")[1:]
+            version = stub.version
+            with stub.lock:
+                stub.active += 1
+                stub.max_active = max(stub.max_active, stub.active)
+            try:
+                if parts[0] == "files" and len(parts) == 2 and query.get("depth") == ["1"]:
+                    stub.requests.append("probe")
+                    self._json({"version": version, "document": {"id": "0:0", "children": []}})
+                elif parts[0] == "files" and len(parts) == 2:
+                    etag = f'"{version}"'
+                    if stub.send_etag and self.headers.get("If-None-Match") == etag:
+                        stub.requests.append("not_modified")
+                        self._empty(304)
+                        return
+                    stub.requests.append("file")
+                    headers = {"ETag": etag} if stub.send_etag else {}
+                    self._json({"version": version, "lastModified": "2026-01-01", "document": stub.document()}, headers)
+                elif parts[0] == "files" and parts[2] == "nodes":
+                    stub.requests.append("nodes")
+                    ids = query["ids"][0].split(",")
+                    self._json({"version": version, "nodes": {i: {"document": {"id": i, "type": "FRAME"}} for i in ids}})
+                elif parts[0] == "teams":
+                    stub.requests.append("projects")
+                    self._json({"projects": [{"id": f"p{i}"} for i in range(6)]})
+                elif parts[0] == "projects":
+                    stub.requests.append("project_files")
+                    time.sleep(0.05)
+                    if parts[1] == "p3":
+                        self._empty(403)
+                        return
+                    self._json({"files": [{"key": f"{parts[1]}-f"}, {"key": "shared"}]})
+                else:
+                    self._empty(404)
+            finally:
+                with stub.lock:
+                    stub.active -= 1
+
+    return Handler
+
+
+@pytest.fixture()
+def figma_stub():
+    stub = _FigmaStub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(stub))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/api", stub
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(base, cache, **kwargs):
+    client = FigmaClient(access_token="token", cache=cache, **kwargs)
+    client.BASE_URL = base
+    return client
+
+
+def test_repeated_get_file_only_probes_version(figma_stub, tmp_path):
+    base, stub = figma_stub
+    client = _client(base, FigmaFileCache(disk_dir=str(tmp_path)))
+
+    first = client.get_file("KEY")
+    second = client.get_file("KEY")
+    frames = client.list_frames("KEY")
+
+    assert second is first
+    assert [f["id"] for f in frames] == ["1:2"]
+    assert stub.count("file") == 1
+    assert stub.count("probe") == 2
+
+    # Neuer Prozess (leerer Speicher): Inhalt kommt von Platte
+    restarted = _client(base, FigmaFileCache(disk_dir=str(tmp_path)))
+    assert restarted.get_file("KEY") == first
+    assert stub.count("file") == 1
+
+
+def test_changed_version_refetches(figma_stub):
+    base, stub = figma_stub
+    client = _client(base, FigmaFileCache())
+
+    client.get_file("KEY")
+    stub.version = "v2"
+    assert client.get_file("KEY")["version"] == "v2"
+    assert stub.count("file") == 2
+
+
+def test_etag_revalidation_uses_304(figma_stub):
+    base, stub = figma_stub
+    stub.send_etag = True
+    client = _client(base, FigmaFileCache())
+
+    first = client.get_file("KEY")
+    assert client.get_file("KEY") is first
+    assert stub.requests == ["file", "not_modified"]
+
+    stub.version = "v2"
+    assert client.get_file("KEY")["version"] == "v2"
+
+
+def test_file_nodes_cached_per_node_set(figma_stub):
+    base, stub = figma_stub
+    client = _client(base, FigmaFileCache())
+
+    assert client.get_frame("KEY", "1:2")["id"] == "1:2"
+    client.get_frame("KEY", "1:2")
+    client.get_file_nodes("KEY", ["1:5", "1:4"])
+    client.get_file_nodes("KEY", ["1:4", "1:5"])
+
+    assert stub.count("nodes") == 2
+
+
+def test_disabled_cache_always_fetches(figma_stub):
+    base, stub = figma_stub
+    client = _client(base, FigmaFileCache(max_entries=0))
+
+    client.get_file("KEY")
+    client.get_file("KEY")
+
+    assert stub.count("file") == 2
+    assert stub.count("probe") == 0
+
+
+def test_list_files_fetches_projects_in_parallel(figma_stub):
+    base, stub = figma_stub
+    client = _client(base, FigmaFileCache(), max_workers=6)
+
+    files = client.list_files(team_id="T")
+
+    assert [f["key"] for f in files] == ["p0-f", "shared", "p1-f", "p2-f", "p4-f", "p5-f"]
+    assert stub.count("project_files") == 6
+    assert stub.max_active > 1
@@ -0,0 +1,309 @@
+import copy
+
+import pytest
+from fastapi import HTTPException
+
+from packages.figma_integration import api_endpoints
+from packages.figma_integration.converter import FrameToLayoutConverter
+from packages.figma_integration.sla_inserter import create_sla_update_request
+from packages.rag_service.auto_indexer import AutoIndexer
+from packages.rag_service.indexer import LayoutIndexer
+from packages.sla_compiler import compiler
+from packages.sla_compiler.compiler import compile_layout_to_sla
+
+
+def _text(node_id, characters, y=0):
+    return {
+        "id": node_id,
+        "type": "TEXT",
+        "name": node_id,
+        "characters": characters,
+        "style": {"fontFamily": "Inter", "fontSize": 24, "fontWeight": 400},
+        "absoluteBoundingBox": {"x": 10, "y": y, "width": 300, "height": 40},
+    }
+
+
+def _image(node_id, y=0):
+    return {
+        "id": node_id,
+        "type": "RECTANGLE",
+        "name": f"Bild {node_id}",
+        "fills": [{"type": "IMAGE"}],
+        "absoluteBoundingBox": {"x": 10, "y": y, "width": 200, "height": 200},
+    }
+
+
+def _frame(children):
+    return {
+        "id": "1:1",
+        "type": "FRAME",
+        "absoluteBoundingBox": {"x": 0, "y": 0, "width": 1000, "height": 1400},
+        "children": children,
+    }
+
+
+def _children():
+    return [
+        _text("2:1", "Titel", 0),
+        _image("2:2", 100),
+        {"id": "2:3", "type": "RECTANGLE", "fills": [{"type": "SOLID", "color": {"r": 1, "g": 0.5, "b": 0}}],
+         "absoluteBoundingBox": {"x": 0, "y": 0, "width": 1000, "height": 1400}},
+        {"id": "2:4", "type": "GROUP", "children": [_text("3:1", "verschachtelt")],
+         "absoluteBoundingBox": {"x": 0, "y": 0, "width": 10, "height": 10}},
+    ]
+
+
+def test_uncommitted_diff_keeps_previous_base():
+    converter = FrameToLayoutConverter()
+    children = _children()
+    converter.convert_incremental(_frame(children), frame_key="file/1:1")
+
+    edited = copy.deepcopy(children)
+    edited[0]["characters"] = "Neuer Titel"
+    _, failed = converter.convert_incremental(_frame(edited), frame_key="file/1:1", commit=False)
+    assert [obj["id"] for obj in failed.changed] == ["2_1"]
+
+    # Import gescheitert -> kein commit: erneuter Versuch sieht dieselbe Änderung
+    _, retry = converter.convert_incremental(_frame(edited), frame_key="file/1:1", commit=False)
+    assert [obj["id"] for obj in retry.changed] == ["2_1"]
+
+    converter.commit(retry)
+    _, after = converter.convert_incremental(_frame(edited), frame_key="file/1:1")
+    assert after.is_empty
+
+
+def test_incremental_diff_reports_only_changed_objects():
+    converter = FrameToLayoutConverter()
+    children = _children()
+    _, initial = converter.convert_incremental(_frame(children), frame_key="file/1:1")
+    assert initial.initial and initial.full_update
+
+    _, unchanged = converter.convert_incremental(_frame(copy.deepcopy(children)), frame_key="file/1:1")
+    assert unchanged.is_empty
+    assert sorted(unchanged.unchanged) == ["2_1", "2_2", "2_3"]
+
+    edited = copy.deepcopy(children)
+    edited[0]["characters"] = "Neuer Titel"
+    edited[1]["absoluteBoundingBox"]["y"] = 120
+    del edited[2]
+    edited.append(_text("2:9", "Neu", 500))
+    layout, diff = converter.convert_incremental(_frame(edited), frame_key="file/1:1")
+
+    assert not diff.full_update
+    assert [obj["id"] for obj in diff.changed] == ["2_1", "2_2"]
+    assert [obj["id"] for obj in diff.added] == ["2_9"]
+    assert diff.removed == ["2_3"]
+    assert diff.changed[0]["content"] == "Neuer Titel"
+    assert len(layout["pages"][0]["objects"]) == 3
+
+
+def test_document_change_requires_full_update():
+    converter = FrameToLayoutConverter()
+    converter.convert_incremental(_frame(_children()), dpi=300)
+
+    _, diff = converter.convert_incremental(_frame(_children()), dpi=150)
+
+    assert diff.document_changed
+    assert diff.full_update
+    assert not diff.is_empty
+
+
+def test_partial_layout_feeds_sla_update_request():
+    converter = FrameToLayoutConverter()
+    children = _children()
+    converter.convert_incremental(_frame(children))
+    edited = copy.deepcopy(children)
+    edited[0]["characters"] = "Geändert"
+    del edited[1]
+    layout, diff = converter.convert_incremental(_frame(edited))
+
+    # 2_3 rückt in der Z-Reihenfolge nach -> ebenfalls geändert
+    partial = diff.partial_layout(layout)
+    assert [obj["id"] for obj in partial["pages"][0]["objects"]] == ["2_1", "2_3"]
+    assert partial["document"] == layout["document"]
+
+    sla = compile_layout_to_sla(partial)
+    assert b'ANNAME="2_1"' in sla
+    assert b'ANNAME="2_2"' not in sla
+
+    request = create_sla_update_request(sla, diff)
+    assert request["mode"] == "update"
+    assert request["page_number"] == 1
+    assert request["upsert_object_ids"] == ["2_1", "2_3"]
+    assert request["remove_object_ids"] == ["2_2"]
+    assert request["sla_xml"]["sla_xml_size"] == len(sla)
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.items = {}
+
+    def add(self, ids, embeddings, documents, metadatas):
+        for item_id, document, metadata in zip(ids, documents, metadatas):
+            self.items.setdefault(item_id, (document, metadata))
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        for item_id, document, metadata in zip(ids, documents, metadatas):
+            self.items[item_id] = (document, metadata)
+
+    def delete(self, ids=None, where=None):
+        for item_id in list(self.items):
+            if (ids is not None and item_id in ids) or (where is not None and _matches(self.items[item_id][1], where)):
+                del self.items[item_id]
+
+
+def _matches(metadata, where):
+    if "$and" in where:
+        return all(_matches(metadata, clause) for clause in where["$and"])
+    if "$or" in where:
+        return any(_matches(metadata, clause) for clause in where["$or"])
+    (field, condition), = where.items()
+    if isinstance(condition, dict):
+        return metadata.get(field) in condition["$in"]
+    return metadata.get(field) == condition
+
+
+class _FakeDB:
+    def __init__(self):
+        self.layouts_collection = _FakeCollection()
+        self.texts_collection = _FakeCollection()
+        self.images_collection = _FakeCollection()
+        self.pairs_collection = _FakeCollection()
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.texts = []
+
+    def embed_text(self, text):
+        self.texts.append(text)
+        return [0.0]
+
+    def embed_text_image_pair(self, text, image):
+        self.texts.append(f"pair:{text}")
+        return [0.0]
+
+
+def _linked_children():
+    children = _children()[:2] + [_text("2:5", "Unverändert", 400)]
+    return children
+
+
+def _relate(layout):
+    objects = {obj["id"]: obj for obj in layout["pages"][0]["objects"]}
+    objects["2_1"]["relatedImageIds"] = ["2_2"]
+    objects["2_2"]["mediaId"] = "minio://figma-assets/2_2.png"
+    return layout
+
+
+async def test_auto_indexer_updates_only_changed_objects():
+    db, embeddings = _FakeDB(), _FakeEmbeddings()
+    indexer = AutoIndexer(db, embeddings)
+    converter = FrameToLayoutConverter()
+
+    layout, diff = converter.convert_incremental(_frame(_linked_children()))
+    layout_id = await indexer.index_figma_update(_relate(layout), diff)
+    assert f"{layout_id}_2_5" in db.texts_collection.items
+    assert f"{layout_id}_2_1_2_2" in db.pairs_collection.items
+
+    edited = _linked_children()
+    edited[0]["characters"] = "Neuer Titel"
+    layout, diff = converter.convert_incremental(_frame(edited))
+    embeddings.texts.clear()
+    assert await indexer.index_figma_update(_relate(layout), diff, layout_id=layout_id) == layout_id
+
+    assert "Neuer Titel" in embeddings.texts
+    assert "Unverändert" not in embeddings.texts
+    assert db.texts_collection.items[f"{layout_id}_2_1"][0] == "Neuer Titel"
+    assert f"{layout_id}_2_1_2_2" in db.pairs_collection.items
+    assert "Neuer Titel" in db.layouts_collection.items[layout_id][0]
+
+    removed = _linked_children()[:2]
+    layout, diff = converter.convert_incremental(_frame(removed))
+    await indexer.index_figma_update(_relate(layout), diff, layout_id=layout_id)
+    assert f"{layout_id}_2_5" not in db.texts_collection.items
+
+
+async def test_full_update_replaces_previous_layout():
+    db, embeddings = _FakeDB(), _FakeEmbeddings()
+    indexer = AutoIndexer(db, embeddings)
+    converter = FrameToLayoutConverter()
+
+    layout, diff = converter.convert_incremental(_frame(_linked_children()), dpi=300)
+    old_id = await indexer.index_figma_update(layout, diff)
+    layout, diff = converter.convert_incremental(_frame(_linked_children()), dpi=150)
+    new_id = await indexer.index_figma_update(layout, diff, layout_id=old_id)
+
+    assert new_id != old_id
+    assert old_id not in db.layouts_collection.items
+    assert not any(key.startswith(old_id) for key in db.texts_collection.items)
+
+
+def test_layout_indexer_skips_empty_diff():
+    db, embeddings = _FakeDB(), _FakeEmbeddings()
+    converter = FrameToLayoutConverter()
+    converter.convert_incremental(_frame(_linked_children()))
+    layout, diff = converter.convert_incremental(_frame(_linked_children()))
+
+    assert LayoutIndexer(db, embeddings).update_layout("layout-1", layout, diff) == "layout-1"
+    assert embeddings.texts == []
+
+
+class _FakeFigmaClient:
+    def __init__(self):
+        self.frames = {}
+
+    def get_frame(self, file_key, frame_id):
+        return copy.deepcopy(self.frames[frame_id])
+
+
+class _RecordingIndexer:
+    def __init__(self):
+        self.calls = []
+
+    async def index_figma_update(self, layout_json, diff, layout_id=None):
+        self.calls.append((diff.full_update, layout_id))
+        return layout_id if layout_id and not diff.full_update else f"layout-{len(self.calls)}"
+
+    async def index_compiler_result(self, **kwargs):
+        pass
+
+
+async def test_import_endpoint_commits_only_after_success(monkeypatch):
+    client, indexer = _FakeFigmaClient(), _RecordingIndexer()
+    monkeypatch.setattr(api_endpoints, "_figma_client", client)
+    monkeypatch.setattr(api_endpoints, "_frame_converter", FrameToLayoutConverter(max_frames=1))
+    monkeypatch.setattr(api_endpoints, "_asset_downloader", None)
+    monkeypatch.setattr(api_endpoints, "_auto_indexer", indexer)
+    monkeypatch.setattr(api_endpoints, "_frame_imports", api_endpoints.OrderedDict())
+
+    def _import(frame_id="1:1", dpi=300):
+        return api_endpoints.import_frame(api_endpoints.ImportFrameRequest(file_key="f", frame_id=frame_id, dpi=dpi))
+
+    client.frames["1:1"] = _frame(_linked_children())
+    first = await _import()
+    # Vollständiger Re-Import (DPI geändert) bekommt trotzdem die bisherige Layout ID
+    second = await _import(dpi=150)
+    assert indexer.calls == [(True, None), (True, first["layout_id"])]
+
+    edited = _linked_children()
+    edited[0]["characters"] = "Neuer Titel"
+    client.frames["1:1"] = _frame(edited)
+    compile_ok = compiler.compile_layout_to_sla
+
+    def _broken(layout_json):
+        raise RuntimeError("compiler down")
+
+    monkeypatch.setattr(compiler, "compile_layout_to_sla", _broken)
+    with pytest.raises(HTTPException):
+        await _import(dpi=150)
+    monkeypatch.setattr(compiler, "compile_layout_to_sla", compile_ok)
+
+    # Fehlgeschlagener Import wurde nicht übernommen -> Retry sieht dieselbe Änderung
+    retry = await _import(dpi=150)
+    assert retry["diff"]["changed"] == ["2_1"]
+    assert retry["layout_id"] == second["layout_id"]
+
+    client.frames["9:9"] = _frame(_linked_children())
+    await _import("9:9")
+    assert list(api_endpoints._frame_imports) == ["f/9:9"]
@@ -0,0 +1,85 @@
+import json
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from packages.common.geometry import LayoutGeometry, use_geometry  # noqa: E402
+from packages.variant_generator import VariantTransform, validate_kdp_layout  # noqa: E402
+
+
+def _layout(rnd: random.Random, pages: int = 3, objects: int = 40):
+    layout = {"version": "1.0.0", "document": {"width": 1000, "height": 1400, "dpi": rnd.choice([0, 300])}, "pages": []}
+    for pn in range(pages):
+        objs = []
+        for k in range(objects):
+            obj = {"id": "p%d_o%d" % (pn, k), "type": rnd.choice(["text", "rectangle"]), "layer": "Text", "color": "#336699"}
+            if rnd.random() > 0.1:
+                obj["bbox"] = {
+                    "x": rnd.choice([-5, 0, 12, 640.5, 990]),
+                    "y": rnd.uniform(-10, 1390),
+                    "w": rnd.choice([0.3, 50, 200, 420]),
+                    "h": rnd.choice([1, 35.25, 300]),
+                }
+            objs.append(obj)
+        layout["pages"].append({"pageNumber": pn + 1, "objects": objs})
+    return layout
+
+
+def test_from_layout_skips_incomplete_bboxes():
+    layout = _layout(random.Random(1))
+    layout["pages"][0]["objects"][0]["bbox"] = {"x": 1, "y": 2, "w": 3}
+    geo = LayoutGeometry.from_layout(layout)
+
+    expected = [
+        (pi, oi)
+        for pi, page in enumerate(layout["pages"])
+        for oi, obj in enumerate(page["objects"])
+        if {"x", "y", "w", "h"} <= set((obj.get("bbox") or {}).keys())
+    ]
+    assert geo.refs == expected
+    assert len(geo) == len(expected)
+    assert geo.ids[0] == layout["pages"][expected[0][0]]["objects"][expected[0][1]]["id"]
+    assert use_geometry(layout, min_objects=1) and not use_geometry(layout, min_objects=10_000)
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("target_format", [None, "A4", "8x11.5"])
+@pytest.mark.parametrize("bleed_mm", [None, 3.0])
+def test_geometry_path_matches_object_path(seed, target_format, bleed_mm):
+    layout = _layout(random.Random(seed))
+    transform = VariantTransform(target_format=target_format, bleed_mm=bleed_mm)
+    geo = transform.apply_geometry(layout, LayoutGeometry.from_layout(layout))
+
+    expected = transform.apply(layout)
+    out = transform.apply(layout, geometry=geo)
+
+    assert json.dumps(out) == json.dumps(expected)
+    for margin in (0.0, 25.0):
+        assert validate_kdp_layout(out, safety_margin_px=margin, geometry=geo) == validate_kdp_layout(
+            expected, safety_margin_px=margin
+        )
+
+
+def test_unit_conversion_and_overlaps_match_scalar_math():
+    layout = _layout(random.Random(5), pages=2, objects=60)
+    geo = LayoutGeometry.from_layout(layout)
+    boxes = [layout["pages"][pi]["objects"][oi]["bbox"] for pi, oi in geo.refs]
+
+    pt = geo.converted(300, 72)
+    assert pt.x.tolist() == [(float(b["x"]) / 300) * 72 for b in boxes]
+    assert pt.h.tolist() == [(float(b["h"]) / 300) * 72 for b in boxes]
+
+    def _overlap(a, b):
+        ix = min(a["x"] + a["w"], b["x"] + b["w"]) - max(a["x"], b["x"])
+        iy = min(a["y"] + a["h"], b["y"] + b["h"]) - max(a["y"], b["y"])
+        return ix > 0 and iy > 0
+
+    expected = [
+        (i, j)
+        for i in range(len(boxes))
+        for j in range(i + 1, len(boxes))
+        if geo.refs[i][0] == geo.refs[j][0] and _overlap(boxes[i], boxes[j])
+    ]
+    assert list(geo.overlapping_pairs()) == expected
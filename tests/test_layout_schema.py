@@ -0,0 +1,62 @@
+import copy
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from packages.layout_schema import get_layout_validator, is_layout_valid, validate_layout
+
+EXAMPLE_PATH = Path("packages/layout_schema/example_layout_mvp.json")
+
+
+def _valid_layout():
+    layout = json.loads(EXAMPLE_PATH.read_text(encoding="utf-8"))
+    for page in layout["pages"]:
+        if page.get("masterPage") is None:
+            page.pop("masterPage", None)
+    return layout
+
+
+def _mutations(layout, rnd):
+    """Typische Fehler: falsche Typen, fehlende Pflichtfelder, unbekannte Objektarten."""
+    page = layout["pages"][0]
+    obj = rnd.choice(page["objects"])
+    choice = rnd.randrange(7)
+    if choice == 0:
+        obj.pop(rnd.choice(["id", "type", "bbox", "layer"]), None)
+    elif choice == 1:
+        obj["bbox"]["w"] = "wide"
+    elif choice == 2:
+        obj["type"] = "circle"
+    elif choice == 3:
+        obj["zOrder"] = 1.0
+    elif choice == 4:
+        page["pageNumber"] = 0
+    elif choice == 5:
+        obj["visible"] = 1
+    else:
+        layout["pages"] = []
+    return layout
+
+
+def test_validate_layout_uses_shared_validator_and_keeps_input():
+    layout = _valid_layout()
+    before = copy.deepcopy(layout)
+
+    assert validate_layout(layout) == (True, [])
+    assert is_layout_valid(layout)
+    assert layout == before  # keine Defaults eingesetzt
+    assert get_layout_validator() is get_layout_validator()
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_fast_path_agrees_with_jsonschema(seed):
+    layout = _mutations(_valid_layout(), random.Random(seed))
+    expected_errors = [str(e) for e in get_layout_validator().iter_errors(layout)]
+
+    ok, errors = validate_layout(layout)
+
+    assert ok == (not expected_errors)
+    assert is_layout_valid(layout) == ok
+    assert errors == expected_errors
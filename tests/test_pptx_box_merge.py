@@ -0,0 +1,129 @@
+import importlib.util
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    spec = importlib.util.spec_from_file_location(
+        "extract_pptx_assets", REPO_ROOT / "tools" / "extract_pptx_assets.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _reference_merge(ex, boxes):
+    """Der frühere paarweise Merge (O(n²) pro Durchlauf) als Referenz."""
+    if not boxes or not ex.INFO_MERGE_ENABLED:
+        return [b for b in boxes or [] if b.get("rel_bbox") and ex.looks_like_real_infographic(b["rel_bbox"])]
+
+    def close(a, b):
+        return ex.bbox_iou(a, b) >= ex.INFO_IOU_MERGE_TH or ex.bbox_gap(a, b) <= ex.INFO_GAP_MERGE_TH
+
+    clusters = []
+    for box in boxes:
+        b = box["rel_bbox"]
+        for cl in clusters:
+            if close(b, cl["bbox"]):
+                cl["items"].append(box)
+                cl["bbox"] = ex.merge_bbox(cl["bbox"], b)
+                break
+        else:
+            clusters.append({"bbox": b, "items": [box]})
+
+    merged = True
+    while merged and len(clusters) > 1:
+        merged = False
+        out = []
+        used = [False] * len(clusters)
+        for i in range(len(clusters)):
+            if used[i]:
+                continue
+            base = clusters[i]
+            for j in range(i + 1, len(clusters)):
+                if not used[j] and close(base["bbox"], clusters[j]["bbox"]):
+                    base["bbox"] = ex.merge_bbox(base["bbox"], clusters[j]["bbox"])
+                    base["items"].extend(clusters[j]["items"])
+                    used[j] = True
+                    merged = True
+            used[i] = True
+            out.append(base)
+        clusters = out
+
+    result = []
+    for cl in clusters:
+        rep = dict(max(cl["items"], key=lambda it: ex.bbox_area(it["rel_bbox"])))
+        rep["rel_bbox"] = cl["bbox"]
+        if ex.looks_like_real_infographic(rep["rel_bbox"]):
+            result.append(rep)
+    return result
+
+
+def _reference_container(ex, candidate, all_boxes):
+    if not ex.INFO_BG_CONTAIN_ENABLED or ex.bbox_area(candidate) < ex.INFO_BG_CONTAIN_MIN_AREA:
+        return False
+    inside = [bb for bb in all_boxes if bb != candidate and ex.bbox_contains(candidate, bb)]
+    total = 0.0
+    for bb in inside:
+        total += ex.bbox_area(bb)
+    return len(inside) >= ex.INFO_BG_CONTAIN_MIN_COUNT and total >= ex.bbox_area(candidate) * ex.INFO_BG_CONTAIN_SUM_AREA_FRAC
+
+
+def _gamma_like_slide(rnd, n):
+    """Viele Fragmente, gleich große Kacheln (Gleichstände beim Repräsentanten), Ketten und Rahmen."""
+    boxes = []
+    tile_w, tile_h = rnd.choice([(0.1, 0.08), (0.12, 0.1), (0.2, 0.15)])
+    for k in range(n):
+        kind = rnd.random()
+        if kind < 0.4:
+            x, y = rnd.randrange(0, 10) / 10.0, rnd.randrange(0, 10) / 10.0
+            w, h = tile_w, tile_h
+        elif kind < 0.8:
+            x, y = rnd.random(), rnd.random()
+            w, h = rnd.uniform(0.02, 0.3), rnd.uniform(0.02, 0.3)
+        else:
+            x, y = rnd.uniform(0, 0.1), rnd.uniform(0, 0.1)
+            w, h = rnd.uniform(0.5, 1.0), rnd.uniform(0.5, 1.0)
+        bbox = [x, y, min(1.0, x + w), min(1.0, y + h)]
+        boxes.append({"r_id": "rId%d" % k, "target": "../media/image%d.png" % k, "rel_bbox": bbox})
+    return boxes
+
+
+def test_merge_image_boxes_matches_pairwise_reference_on_fixture(extractor):
+    sample = json.loads(Path("tests/fixtures/sample_pptx_extract.json").read_text(encoding="utf-8"))
+    for slide in sample["slides"]:
+        boxes = [dict(b) for b in slide["image_boxes"]]
+        expected = _reference_merge(extractor, [dict(b) for b in boxes])
+        assert extractor.merge_image_boxes(boxes) == expected
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_merge_image_boxes_matches_pairwise_reference(extractor, seed):
+    rnd = random.Random(seed)
+    boxes = _gamma_like_slide(rnd, rnd.choice([5, 30, 120]))
+    real = [b for b in boxes if extractor.looks_like_real_infographic(b["rel_bbox"])]
+
+    expected = _reference_merge(extractor, [dict(b) for b in real])
+    assert extractor.merge_image_boxes([dict(b) for b in real]) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_container_and_overlap_index_match_linear_scan(extractor, seed):
+    rnd = random.Random(1000 + seed)
+    all_boxes = [extractor.clamp_bbox(b["rel_bbox"]) for b in _gamma_like_slide(rnd, 80)]
+    index = extractor.BoxGrid.from_boxes(all_boxes)
+    for bb in all_boxes:
+        assert extractor.looks_like_background_container(bb, all_boxes, index) == _reference_container(
+            extractor, bb, all_boxes
+        )
+
+    masks = all_boxes[:40]
+    mask_index = extractor.BoxGrid.from_boxes(masks)
+    for tb in all_boxes[40:]:
+        assert extractor.overlaps_image_mask(tb, masks, mask_index) == extractor.overlaps_image_mask(tb, masks)
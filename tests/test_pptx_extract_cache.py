@@ -0,0 +1,107 @@
+import importlib.util
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+PRESENTATION = (
+    '<p:presentation xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    '<p:sldSz cx="9144000" cy="6858000"/></p:presentation>'
+)
+SLIDE = (
+    '<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+    ' xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><p:cSld><p:spTree>'
+    '<p:pic><p:blipFill><a:blip r:embed="rId1"/></p:blipFill>'
+    '<p:spPr><a:xfrm><a:off x="1000000" y="1000000"/><a:ext cx="3000000" cy="2000000"/></a:xfrm></p:spPr></p:pic>'
+    '<p:sp><p:txBody><a:p><a:r><a:t>Kapitel Eins</a:t></a:r></a:p></p:txBody></p:sp>'
+    "</p:spTree></p:cSld></p:sld>"
+)
+RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"'
+    ' Target="../media/image1.png"/></Relationships>'
+)
+
+
+@pytest.fixture()
+def extractor(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "extract_pptx_assets", REPO_ROOT / "tools" / "extract_pptx_assets.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    out_dir = tmp_path / "out"
+    monkeypatch.setattr(module, "PPT_DIR", str(tmp_path / "decks"))
+    monkeypatch.setattr(module, "OUT_DIR", str(out_dir))
+    monkeypatch.setattr(module, "IMG_DIR", str(out_dir / "images"))
+    monkeypatch.setattr(module, "JSON_DIR", str(out_dir / "json"))
+    monkeypatch.setattr(module, "MANIFEST_PATH", str(out_dir / "manifest.json"))
+    monkeypatch.setattr(module, "LOG_PATH", str(out_dir / "extract.log"))
+    monkeypatch.setattr(module, "CACHE_PATH", str(out_dir / "extract_cache.json"))
+    monkeypatch.setattr(module, "CACHE_ENABLED", True)
+    monkeypatch.setattr(module, "PPTX_WORKERS", 1)
+    return module
+
+
+def _write_deck(path: Path, media: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("ppt/presentation.xml", PRESENTATION)
+        zf.writestr("ppt/slides/slide1.xml", SLIDE)
+        zf.writestr("ppt/slides/_rels/slide1.xml.rels", RELS)
+        zf.writestr("ppt/media/image1.png", media)
+
+
+def _run(extractor, monkeypatch):
+    extracted = []
+    original = extractor.extract_from_pptx
+    monkeypatch.setattr(extractor, "extract_from_pptx", lambda path: extracted.append(Path(path).stem) or original(path))
+    extractor.main()
+    manifest = json.loads(Path(extractor.MANIFEST_PATH).read_text(encoding="utf-8"))
+    return extracted, manifest
+
+
+def test_unchanged_decks_are_served_from_cache(extractor, tmp_path, monkeypatch):
+    decks = tmp_path / "decks"
+    _write_deck(decks / "a.pptx", b"PNG-a")
+    _write_deck(decks / "b.pptx", b"PNG-b")
+
+    extracted, first = _run(extractor, monkeypatch)
+    assert extracted == ["a", "b"]
+
+    extracted, second = _run(extractor, monkeypatch)
+    assert extracted == []
+    assert second["files"] == first["files"]
+
+    # Geändertes Deck -> nur dieses wird neu extrahiert
+    _write_deck(decks / "b.pptx", b"PNG-b2")
+    extracted, _ = _run(extractor, monkeypatch)
+    assert extracted == ["b"]
+
+    # Geänderte Einstellung außerhalb der INFO_-Schwellwerte invalidiert den Cache
+    monkeypatch.setattr(extractor, "QUOTE_CHARS", ['"'])
+    extracted, _ = _run(extractor, monkeypatch)
+    assert extracted == ["a", "b"]
+
+
+def test_identical_media_across_decks_is_written_once(extractor, tmp_path, monkeypatch):
+    decks = tmp_path / "decks"
+    _write_deck(decks / "a.pptx", b"PNG-shared")
+    _write_deck(decks / "b.pptx", b"PNG-shared")
+
+    _, manifest = _run(extractor, monkeypatch)
+
+    images = []
+    for entry in manifest["files"]:
+        data = json.loads((Path(extractor.OUT_DIR) / entry["json"]).read_text(encoding="utf-8"))
+        images.extend(data["images"])
+    assert len(images) == 2 and len(set(images)) == 1
+    assert [p.name for p in Path(extractor.IMG_DIR).iterdir()] == [Path(images[0]).name]
+
+    path = extractor.write_media(b"PNG-shared", extractor.IMG_DIR, "ppt/media/other.PNG")
+    assert Path(path).name == Path(images[0]).name
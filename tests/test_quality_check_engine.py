@@ -0,0 +1,107 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from packages.quality_check import (
+    HeuristicConfig,
+    evaluate_quality_gate,
+    run_heuristic_checks,
+    run_quality_checks,
+    run_quality_checks_sequential,
+)
+
+ALL_CHECKS = ["preflight", "amazon", "heuristics"]
+
+PROJECT_INIT = {
+    "layout": {"layers": ["Text", "Images", "Background"]},
+    "typography": {"fonts": [{"family": "Inter"}, {"family": "Merriweather"}]},
+    "amazon": {"enabled": "true", "safety_margin_mm": 3},
+    "print": {"bleed_mm": 3},
+}
+
+
+def _random_layout(rnd: random.Random, pages: int = 4, objects: int = 12):
+    """Mischung aus gültigen und fehlerhaften Objekten (Bounds, Layer, Fonts, leere Felder, Duplikate)."""
+    layout = {
+        "version": "1.0.0",
+        "document": {"width": 1000, "height": 1400, "dpi": rnd.choice([0, 300])},
+        "variant": {"name": rnd.choice(["color", "grayscale"]), "bleed_mm": rnd.choice([0, 3])},
+        "pages": [],
+    }
+    for pn in range(1, pages + 1):
+        page = {"pageNumber": rnd.choice([pn, pn, pn, 1, 0]), "objects": []}
+        for k in range(objects):
+            kind = rnd.choice(["text", "image", "rectangle"])
+            obj = {
+                "id": rnd.choice(["p%d_o%d" % (pn, k), "p%d_o%d" % (pn, k), "dup", ""]),
+                "type": kind,
+                "bbox": {
+                    "x": rnd.choice([0, 5, 40, 900]),
+                    "y": rnd.choice([0, 10, 60, 1300]),
+                    "w": rnd.choice([0.5, 80, 200, 400]),
+                    "h": rnd.choice([0.5, 30, 120]),
+                },
+                "layer": rnd.choice(["Text", "Images", "Overlay", ""]),
+            }
+            if kind == "text":
+                obj["content"] = rnd.choice(["", "Kurz", "Ein deutlich längerer Absatz, der kaum in die Box passt. " * 3])
+                obj["fontFamily"] = rnd.choice(["Inter", "Comic Sans", ""])
+                obj["fontSize"] = rnd.choice([0, 11, 28])
+            elif kind == "image":
+                obj["imageUrl"] = rnd.choice(["", "https://x/y.png", "/definitely/missing.png", "rel/path.png"])
+            page["objects"].append(obj)
+        layout["pages"].append(page)
+    return layout
+
+
+# Erwartete Reports aus den Einzel-Checks vor der Visitor-Umstellung (eingefroren),
+# inklusive Nicht-Dict-Objekten (None/"junk"/7) auf jeder zweiten Seite
+BASELINE_CASES = json.loads((Path(__file__).parent / "fixtures" / "quality_check_baseline.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("case", BASELINE_CASES, ids=lambda c: "+".join(c["checks"]) or "gate")
+def test_fused_engine_matches_frozen_baseline(case):
+    hcfg = HeuristicConfig(**case["heuristic_config"]) if case["heuristic_config"] else None
+    kwargs = dict(checks=case["checks"], project_init=case["project_init"], heuristic_config=hcfg)
+
+    if "raises" in case:
+        with pytest.raises(AttributeError):
+            run_quality_checks(case["layout"], **kwargs)
+        with pytest.raises(AttributeError):
+            run_quality_checks_sequential(case["layout"], **kwargs)
+        return
+    assert run_quality_checks(case["layout"], **kwargs) == case["expected"]
+    assert run_quality_checks_sequential(case["layout"], **kwargs) == case["expected"]
+
+
+def test_fused_engine_matches_sequential_for_schema_valid_layout():
+    layout = _random_layout(random.Random(7), pages=2, objects=3)
+    for page in layout["pages"]:
+        for i, obj in enumerate(page["objects"]):
+            obj["id"] = "p%d_%d" % (page["pageNumber"], i)
+            obj["layer"] = "Text"
+    fused = run_quality_checks(layout, checks=ALL_CHECKS, project_init=PROJECT_INIT)
+    assert fused == run_quality_checks_sequential(layout, checks=ALL_CHECKS, project_init=PROJECT_INIT)
+
+
+def test_malformed_layout_raises_like_sequential_checks():
+    layout = {"document": {"width": 100, "height": 100, "dpi": 72}, "pages": [{"pageNumber": 1, "objects": ["oops"]}]}
+
+    with pytest.raises(AttributeError) as seq_exc:
+        run_quality_checks_sequential(layout, checks=ALL_CHECKS)
+    with pytest.raises(AttributeError) as fused_exc:
+        run_quality_checks(layout, checks=ALL_CHECKS)
+    assert str(fused_exc.value) == str(seq_exc.value)
+
+
+def test_gate_and_heuristics_skip_non_dict_objects():
+    obj = {"id": "t1", "type": "text", "content": "Hallo", "fontSize": 12, "bbox": {"x": 0, "y": 0, "w": 50, "h": 20}}
+    layout = {"document": {"width": 100, "height": 100, "dpi": 72}, "pages": [{"pageNumber": 1, "objects": [obj, None, "junk"]}]}
+    clean = {**layout, "pages": [{"pageNumber": 1, "objects": [obj]}]}
+
+    assert evaluate_quality_gate(layout) == evaluate_quality_gate(clean)
+    assert run_heuristic_checks(layout) == run_heuristic_checks(clean)
+    assert run_heuristic_checks(layout)["summary"]["pages"] == [{"pageNumber": 1, "objectCount": 1}]
+    assert run_quality_checks(layout, checks=["heuristics"]) == run_quality_checks(clean, checks=["heuristics"])
@@ -0,0 +1,141 @@
+import pytest
+
+from packages.common.scheduling import (
+    QUEUE_REGISTRY_KEY,
+    FairQueueOrder,
+    TenantPolicy,
+    base_queue_names,
+    lane_for,
+    normalize_tenant,
+    parse_queue_name,
+    prune_empty_queues,
+    queue_name,
+)
+
+
+def test_lane_selection_and_queue_names():
+    assert lane_for("compile", 0) == "normal"
+    assert lane_for("compile", 0, bulk=True) == "bulk"
+    assert lane_for("workflow", 0) == "bulk"
+    assert lane_for("workflow", 10) == "high"
+    assert queue_name("compile", "high", "acme corp") == "compile:high:acme_corp"
+    assert queue_name("export", "normal", None) == "export:normal:default"
+    assert parse_queue_name("workflow:bulk:t1") == ("workflow", "bulk", "t1")
+    assert parse_queue_name("compile") is None
+    assert normalize_tenant("") == "default"
+
+
+def test_fair_order_weights_lanes_and_rotates_tenants():
+    order = FairQueueOrder()
+    names = [
+        "compile:normal:a",
+        "compile:normal:b",
+        "workflow:bulk:a",
+        "compile:high:a",
+        "compile",
+    ]
+
+    firsts = []
+    for _ in range(10):
+        firsts.append(order.order(names)[0])
+        order.served(firsts[-1])
+    lanes = [parse_queue_name(n)[1] for n in firsts]
+    assert lanes.count("high") == 6
+    assert lanes.count("normal") == 3
+    assert lanes.count("bulk") == 1
+    # Legacy queues always come last
+    assert order.order(names)[-1] == "compile"
+
+    order = FairQueueOrder()
+
+    def normal_tenants():
+        return [n for n in order.order(names) if n.startswith("compile:normal:")]
+
+    assert normal_tenants() == ["compile:normal:a", "compile:normal:b"]
+    order.served("compile:normal:a")
+    assert normal_tenants() == ["compile:normal:b", "compile:normal:a"]
+
+
+def test_idle_polls_do_not_advance_lane_weights():
+    order = FairQueueOrder()
+    names = ["compile:high:a", "compile:normal:a", "compile:bulk:a"]
+
+    # Leerlauf: Reihenfolge wird berechnet, aber nichts dequeued
+    assert {order.order(names)[0] for _ in range(7)} == {"compile:high:a"}
+
+    firsts = []
+    for _ in range(10):
+        firsts.append(order.order(names)[0])
+        order.served(firsts[-1])
+    assert [parse_queue_name(n)[1] for n in firsts].count("high") == 6
+
+
+def test_tenant_policy_uses_api_key_allowlist_and_cap():
+    policy = TenantPolicy.from_config("globex, initech,acme", "key-1==acme corp,key-2=umbrella", max_tenants=4)
+
+    assert policy.resolve("spoofed", api_key="key-1=") == "acme_corp"
+    assert policy.resolve("globex") == "globex"
+    assert policy.resolve("globex", api_key="unknown-key") == "globex"
+    # Nicht konfiguriert oder über dem Limit -> default
+    assert policy.resolve("random-1234") == "default"
+    assert policy.resolve("initech") == "default"
+    assert policy.resolve(None) == "default"
+    assert policy.tenants == {"acme_corp", "umbrella", "acme", "globex"}
+    assert TenantPolicy().resolve("anything") == "default"
+
+
+@pytest.fixture
+def redis_conn():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeStrictRedis()
+
+
+def test_prune_removes_only_empty_queues(redis_conn):
+    from rq import Queue
+
+    for name in ("compile:normal:a", "compile:normal:b"):
+        redis_conn.sadd(QUEUE_REGISTRY_KEY, name)
+    Queue("compile:normal:a", connection=redis_conn).enqueue("builtins.len", "x")
+    Queue("compile:normal:b", connection=redis_conn)
+
+    assert prune_empty_queues(redis_conn, ["compile:normal:a", "compile:normal:b"]) == ["compile:normal:b"]
+    assert redis_conn.smembers(QUEUE_REGISTRY_KEY) == {b"compile:normal:a"}
+    assert redis_conn.sismember("rq:queues", "rq:queue:compile:normal:a")
+    assert prune_empty_queues(redis_conn, []) == []
+
+
+def _fill(conn, jobs_per_queue, names):
+    from rq import Queue
+
+    for name in names:
+        conn.sadd(QUEUE_REGISTRY_KEY, name)
+        queue = Queue(name, connection=conn)
+        for _ in range(jobs_per_queue):
+            queue.enqueue("builtins.len", "x")
+
+
+def test_fair_worker_weights_lanes_rotates_tenants_and_prunes(redis_conn):
+    from apps.worker_scribus.fair_worker import FairWorker
+
+    worker = FairWorker(base_queue_names(), connection=redis_conn)
+    worker.registry_refresh_seconds = 0
+    # Leerlauf-Polls vor dem ersten Job verschieben die Gewichte nicht
+    assert worker.dequeue_job_and_maintain_ttl(None) is None
+    assert worker.dequeue_job_and_maintain_ttl(None) is None
+
+    _fill(redis_conn, 10, ["compile:high:a", "compile:high:b", "compile:normal:a", "compile:bulk:default"])
+    served = [worker.dequeue_job_and_maintain_ttl(None)[1].name for _ in range(10)]
+
+    lanes = [parse_queue_name(n)[1] for n in served]
+    assert (lanes.count("high"), lanes.count("normal"), lanes.count("bulk")) == (6, 3, 1)
+    high_tenants = [parse_queue_name(n)[2] for n in served if ":high:" in n]
+    assert high_tenants == ["a", "b", "a", "b", "a", "b"]
+    assert int(redis_conn.hget("sched:wait:compile:high", "count")) == 6
+
+    while worker.dequeue_job_and_maintain_ttl(None) is not None:
+        pass
+    worker._refresh_registry()
+    # Basis-Queues des Workers bleiben registriert, leere Tenant-Queues nicht
+    assert redis_conn.smembers(QUEUE_REGISTRY_KEY) == {b"compile:bulk:default"}
+    assert sorted(worker._known_names) == sorted(base_queue_names())
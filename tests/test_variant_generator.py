@@ -1,10 +1,16 @@
+import copy
 import json
+import random
 from pathlib import Path
 
+import pytest
+
 from packages.variant_generator import (
+    VariantTransform,
     apply_bleed,
     convert_layout_colors_to_grayscale,
     convert_layout_format,
+    transform_layout,
 )
 
 
@@ -65,3 +71,67 @@ def test_bleed_expands_doc_and_shifts_objects():
     assert b["document"]["width"] > layout["document"]["width"]
     assert b["pages"][0]["objects"][0]["bbox"]["x"] > layout["pages"][0]["objects"][0]["bbox"]["x"]
 
+
+def test_legacy_transforms_return_independent_copies():
+    layout = _sample_layout()
+    layout["meta"] = {"tags": ["a"]}
+    offset = (3.0 / 25.4) * 300
+
+    b = apply_bleed(layout, bleed_mm=3.0)
+    assert b["pages"][0]["objects"][0]["bbox"] == {"x": 10 + offset, "y": 20 + offset, "w": 100, "h": 30}
+    assert b["document"]["width"] == 1000 + 2 * offset
+
+    # Delegieren an VariantTransform, aber weiterhin tiefe Kopien wie zuvor
+    for out in (b, convert_layout_colors_to_grayscale(layout), convert_layout_format(layout, target_format="A4")):
+        out["meta"]["tags"].append("b")
+    assert layout["meta"] == {"tags": ["a"]}
+
+    with pytest.raises(ValueError, match="Unsupported format"):
+        convert_layout_format(layout, target_format="")
+
+
+def _random_layout(rnd: random.Random):
+    layout = _sample_layout()
+    layout["document"]["dpi"] = rnd.choice([0, 150, 300])
+    objs = layout["pages"][0]["objects"]
+    for k in range(20):
+        obj = copy.deepcopy(rnd.choice(objs[:2]))
+        obj["id"] = "o%d" % k
+        obj["bbox"] = {"x": rnd.choice([0, 7, 333]), "y": rnd.uniform(0, 1900), "w": rnd.choice([0.2, 50, 600]), "h": 12}
+        if rnd.random() < 0.2:
+            obj.pop("bbox")
+        if obj["type"] == "text":
+            obj["color"] = rnd.choice(["#123456", "#abc", "red", None])
+        objs.append(obj)
+    layout["pages"].append({"pageNumber": 2, "objects": []})
+    return layout
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("target_format", [None, "A4", "8x11.5"])
+@pytest.mark.parametrize("variant", ["color", "grayscale", "other"])
+def test_pipeline_matches_chained_transforms(seed, target_format, variant):
+    layout = _random_layout(random.Random(seed))
+    before = json.dumps(layout, sort_keys=True)
+
+    expected = convert_layout_format(layout, target_format=target_format) if target_format else layout
+    if variant == "color":
+        expected = apply_bleed(expected, bleed_mm=3.0)
+    elif variant == "grayscale":
+        expected = convert_layout_colors_to_grayscale(expected)
+
+    out = transform_layout(
+        layout,
+        target_format=target_format,
+        bleed_mm=3.0 if variant == "color" else None,
+        grayscale=variant == "grayscale",
+    )
+
+    assert json.dumps(out, ensure_ascii=False, indent=2) == json.dumps(expected, ensure_ascii=False, indent=2)
+    assert json.dumps(layout, sort_keys=True) == before  # Eingabe unverändert
+    assert out["pages"][0]["objects"][0] is not layout["pages"][0]["objects"][0]
+
+
+def test_pipeline_rejects_unknown_format():
+    with pytest.raises(ValueError, match="Unsupported format"):
+        VariantTransform(target_format="A3")
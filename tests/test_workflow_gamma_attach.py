@@ -1,7 +1,9 @@
+import json
 from pathlib import Path
 
 from packages.workflow.step_executor import StepExecutor
 from packages.workflow.progress_tracker import ProgressTracker
+from packages.workflow.variant_engine import VariantJob, run_variant_task
 
 
 def test_attach_gamma_crops_to_layout_rewrites_image_url():
@@ -55,3 +57,23 @@ def test_attach_gamma_crops_to_layout_rewrites_image_url():
     assert obj["gammaCrop"] is True
     assert out["variant"]["gamma_crops_attached"] is True
 
+
+def test_attach_gamma_crops_does_not_mutate_cached_base_variant(tmp_path: Path):
+    base = {
+        "version": "1.0.0",
+        "document": {"width": 1000, "height": 2000, "dpi": 300},
+        "pages": [{"pageNumber": 1, "objects": []}],
+        "variant": {"name": "base"},
+        "source": {"kind": "pptx_extract_json", "name": "sample"},
+    }
+    path = tmp_path / "base.json"
+    path.write_text(json.dumps(base), encoding="utf-8")
+    job = VariantJob(out_dir=tmp_path, attach_gamma_crops=True, gamma_report={"outputs": []})
+
+    cache: dict = {}
+    # Unbekannte Variante ohne Format: Pass-through, teilt das variant-Dict mit der Basis
+    bucket, entry, _ = run_variant_task(job, (str(path), "", "other"), cache)
+
+    assert bucket == "outputs"
+    assert json.loads(Path(entry["out"]).read_text(encoding="utf-8"))["variant"]["gamma_crops_attached"] is True
+    assert cache[str(path)][0]["variant"] == {"name": "base"}
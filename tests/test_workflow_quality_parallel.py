@@ -0,0 +1,65 @@
+import json
+import random
+from pathlib import Path
+
+from packages.workflow.progress_tracker import ProgressTracker
+from packages.workflow.step_executor import StepExecutor
+
+PROJECT_INIT = {"layout": {"layers": ["Text", "Images"]}, "amazon": {"enabled": "true", "safety_margin_mm": 3}}
+
+
+def _layout(rnd: random.Random) -> dict:
+    objects = []
+    for k in range(6):
+        kind = rnd.choice(["text", "image"])
+        obj = {
+            "id": rnd.choice(["o%d" % k, "dup"]),
+            "type": kind,
+            "bbox": {"x": rnd.choice([0, 40, 900]), "y": rnd.choice([0, 60, 1300]), "w": rnd.choice([80, 400]), "h": 30},
+            "layer": rnd.choice(["Text", "Images", "Overlay"]),
+        }
+        if kind == "text":
+            obj.update({"content": rnd.choice(["", "Kurz", "Langer Absatz. " * 20]), "fontFamily": "Inter", "fontSize": 11})
+        else:
+            obj["imageUrl"] = rnd.choice(["", "https://x/y.png"])
+        objects.append(obj)
+    return {"version": "1.0.0", "document": {"width": 1000, "height": 1400, "dpi": 300}, "pages": [{"pageNumber": 1, "objects": objects}]}
+
+
+def _write_layouts(tmp_path: Path) -> list[Path]:
+    """Gültige/fehlerhafte Layouts plus kaputtes JSON und ein Layout, das im Check eine Exception wirft."""
+    rnd = random.Random(3)
+    paths = []
+    for i in range(9):
+        p = tmp_path / ("layout_%02d.json" % i)
+        if i == 4:
+            p.write_text("{not json", encoding="utf-8")
+        elif i == 6:
+            broken = {"document": {"width": 100, "height": 100, "dpi": 72}, "pages": [{"pageNumber": 1, "objects": ["oops"]}]}
+            p.write_text(json.dumps(broken), encoding="utf-8")
+        else:
+            p.write_text(json.dumps(_layout(rnd)), encoding="utf-8")
+        paths.append(p)
+    paths.append(tmp_path / "missing.json")
+    return paths
+
+
+def test_parallel_quality_check_matches_serial_report(tmp_path: Path):
+    paths = _write_layouts(tmp_path)
+    init_path = tmp_path / "project_init.json"
+    init_path.write_text(json.dumps(PROJECT_INIT), encoding="utf-8")
+    ex = StepExecutor(tracker=ProgressTracker(publish_to_bus=False))
+    checks = ["preflight", "amazon", "heuristics"]
+
+    serial = ex.quality_check(layout_paths=paths, out_dir=tmp_path / "q", checks=checks, project_init=init_path, report_name="serial.json")
+    parallel = ex.quality_check(
+        layout_paths=paths, out_dir=tmp_path / "q", checks=checks, project_init=init_path, report_name="parallel.json", workers=3
+    )
+
+    assert [e["path"] for e in parallel["errors"]] == [str(paths[4]), str(paths[6]), str(paths[9])]
+    assert parallel["errors"][0]["error"].startswith("failed to read json:")
+    assert len(parallel["outputs"]) == 7
+    serial.pop("report_path")
+    parallel.pop("report_path")
+    assert parallel == serial
+    assert (tmp_path / "q" / "parallel.json").read_text(encoding="utf-8") == (tmp_path / "q" / "serial.json").read_text(encoding="utf-8")
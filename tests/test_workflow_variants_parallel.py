@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+from packages.workflow.progress_tracker import ProgressTracker
+from packages.workflow.step_executor import StepExecutor
+
+
+def _layout(name: str, n: int) -> dict:
+    objects = [
+        {
+            "id": "o%d" % k,
+            "type": "text" if k % 2 else "rectangle",
+            "bbox": {"x": 10 + k * 30, "y": 20 + k * 40, "w": 100, "h": 30},
+            "layer": "Text",
+            "content": "Grüße %d" % k,
+            "color": "#ff0000",
+            "fillColor": "#00ff00",
+        }
+        for k in range(n)
+    ]
+    return {
+        "version": "1.0.0",
+        "document": {"width": 1000, "height": 2000, "dpi": 300},
+        "pages": [{"pageNumber": 1, "objects": objects}],
+        "source": {"kind": "pptx_extract_json", "name": name},
+    }
+
+
+def _write_inputs(tmp_path: Path, fmt: str) -> tuple[list[Path], Path]:
+    base_dir = tmp_path / "base"
+    base_dir.mkdir()
+    paths = []
+    for i in range(5):
+        p = base_dir / ("chapter_%02d.json" % i)
+        p.write_text("{broken" if i == 2 else json.dumps(_layout("chapter_%02d" % i, 3 + i)), encoding="utf-8")
+        paths.append(p)
+    init = tmp_path / "project_init.json"
+    init.write_text(json.dumps({"variants": "both", "format": fmt, "bleed_mm": 3}), encoding="utf-8")
+    return paths, init
+
+
+def _run(paths, init, out_dir, **kwargs):
+    ex = StepExecutor(tracker=ProgressTracker(publish_to_bus=False))
+    return ex.generate_variants(layout_paths=paths, out_dir=out_dir, project_init=init, **kwargs)
+
+
+def test_parallel_variants_match_serial_and_write_compact_json(tmp_path: Path):
+    paths, init = _write_inputs(tmp_path, "both")
+
+    serial = _run(paths, init, tmp_path / "serial")
+    parallel = _run(paths, init, tmp_path / "parallel", workers=3)
+    pretty = _run(paths, init, tmp_path / "pretty", pretty=True)
+
+    assert len(serial["outputs"]) == 4 * 4
+    assert serial["errors"] == [{"path": str(paths[2]), "error": serial["errors"][0]["error"]}]
+
+    def _strip(report, out_dir):
+        return json.dumps(report).replace(str(out_dir), "<out>")
+
+    assert _strip(parallel, tmp_path / "parallel") == _strip(serial, tmp_path / "serial")
+    assert _strip(pretty, tmp_path / "pretty") == _strip(serial, tmp_path / "serial")
+
+    for entry in serial["outputs"]:
+        name = Path(entry["out"]).name
+        compact = (tmp_path / "serial" / name).read_text(encoding="utf-8")
+        assert "\n" not in compact
+        assert (tmp_path / "parallel" / name).read_text(encoding="utf-8") == compact
+        indented = (tmp_path / "pretty" / name).read_text(encoding="utf-8")
+        assert indented.startswith("{\n  ")
+        assert json.loads(indented) == json.loads(compact)
+
+
+def test_unknown_format_reported_once_per_base(tmp_path: Path):
+    paths, init = _write_inputs(tmp_path, "A3")
+
+    for workers in (1, 2):
+        report = _run(paths, init, tmp_path / ("out%d" % workers), workers=workers)
+        assert report["outputs"] == []
+        assert [(e["path"], e.get("format")) for e in report["errors"]] == [
+            (str(p), None if i == 2 else "A3") for i, p in enumerate(paths)
+        ]
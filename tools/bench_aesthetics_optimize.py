@@ -0,0 +1,90 @@
+"""
+Benchmark: ``AIAestheticsEngine.optimize_layout`` auf einem synthetischen Buch (lokaler Fokus-Provider).
+
+Erzeugt ``--images`` JPEGs und ein Layout mit ``--pages`` Seiten, je ``--per-page`` Bilder
+(Bilder wiederholen sich über Seiten, wie Kapitel-Icons oder wiederkehrende Motive) plus Text.
+Misst seriell (``page_workers=1``) und parallel und gibt die Stufen-Zeiten aus ``timings`` aus.
+
+Usage:
+    python tools/bench_aesthetics_optimize.py [--pages 300] [--per-page 3] [--images 200] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from packages.ai_aesthetics.integration import AIAestheticsEngine  # noqa: E402
+
+
+def build_images(out_dir: Path, n: int, size=(1600, 1200)) -> List[str]:
+    rnd = random.Random(3)
+    paths = []
+    for i in range(n):
+        img = Image.new("RGB", size, tuple(rnd.randint(80, 200) for _ in range(3)))
+        w, h = size
+        cx, cy, r = rnd.uniform(0.2, 0.8) * w, rnd.uniform(0.2, 0.8) * h, rnd.uniform(60, 200)
+        ImageDraw.Draw(img).ellipse([cx - r, cy - r, cx + r, cy + r], fill=tuple(rnd.randint(0, 255) for _ in range(3)))
+        path = out_dir / ("asset_%03d.jpg" % i)
+        img.save(path, "JPEG", quality=85)
+        paths.append(str(path))
+    return paths
+
+
+def build_layout(images: List[str], pages: int, per_page: int) -> Dict[str, Any]:
+    rnd = random.Random(5)
+    out: Dict[str, Any] = {"pages": []}
+    for p in range(pages):
+        elements: List[Dict[str, Any]] = [
+            {"type": "text", "id": "t%d" % p, "content": "Das Symbol zeigt die Geschichte. " * 20, "box": {"x_px": 120, "y_px": 200, "w_px": 1800, "h_px": 900}}
+        ]
+        for k in range(per_page):
+            elements.append({
+                "type": "image",
+                "id": "img_%d_%d" % (p, k),
+                "asset": {"uri": rnd.choice(images)},
+                "box": {"x_px": 150 + 700 * k, "y_px": 1300, "w_px": 640, "h_px": 480},
+                "metadata": {"keywords": ["symbol", "history"]},
+            })
+        out["pages"].append({"pageNumber": p + 1, "elements": elements})
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=300)
+    ap.add_argument("--per-page", type=int, default=3)
+    ap.add_argument("--images", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = build_images(Path(tmp), args.images)
+        layout = build_layout(images, args.pages, args.per_page)
+        print("%d pages x %d images (%d unique assets)" % (args.pages, args.per_page, args.images))
+        for workers in (1, args.workers):
+            engine = AIAestheticsEngine(focus_provider="local", text_provider="fallback", page_workers=workers)
+            t0 = time.perf_counter()
+            result = engine.optimize_layout(layout)
+            wall = time.perf_counter() - t0
+            t = result["timings"]
+            print(
+                "page_workers=%d  wall %.2f s | focus %.2f s  placement %.2f s  balance %.2f s | reads %d  decodes %d"
+                % (workers, wall, t["focus_s"], t["placement_s"], t["balance_s"], t["reads"], t["decodes"])
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
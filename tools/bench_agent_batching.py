@@ -0,0 +1,115 @@
+"""
+Benchmark: Agent-Aufrufe einzeln vs. gebündelt (``batch_size``) mit lokalem Stub-LLM.
+
+Der Stub simuliert Latenz = Grundlatenz pro Request + Zeit pro Prompt-Token (Token ~ Zeichen / 4)
+und antwortet je Agent mit gültigem JSON; im Batch-Modus mit einem JSON-Array. ``--invalid``
+macht jedes n-te Batch-Element ungültig, um die Einzel-Nachfragen mitzumessen.
+
+Gemessen werden LLM-Aufrufe, Prompt-Tokens (geschätzt) und Laufzeit für alle drei Agents.
+
+Usage:
+    python tools/bench_agent_batching.py [--layouts 40] [--batch-size 8] [--concurrency 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.dialog_engine.agent_runner import AgentRunner  # noqa: E402
+from packages.dialog_engine.agents import AGENT_REGISTRY, BATCH_INPUT_PREFIX, AgentExecutor  # noqa: E402
+from packages.dialog_engine.llm_integration import LLMClient, LLMRequest  # noqa: E402
+
+AGENTS = ["SemanticEnricher", "LayoutDesigner", "QualityCritic"]
+
+RESPONSES: Dict[str, Dict[str, Any]] = {
+    "SemanticEnricher": {"title": "Titel", "summary": "Kurzfassung", "keywords": ["a", "b"]},
+    "LayoutDesigner": {"template_id": "hero_left", "spacing_logic": "Hero links", "visual_weight": 0.6, "layout_intent": "balanced", "notes": []},
+    "QualityCritic": {"score": 8, "issues": [], "approved": True},
+}
+
+
+class StubLLM(LLMClient):
+    provider = "stub"
+    model = "stub"
+
+    def __init__(self, base_latency: float, per_token: float, invalid_every: int = 0):
+        self.base_latency = base_latency
+        self.per_token = per_token
+        self.invalid_every = invalid_every
+        self.calls = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def complete(self, request: LLMRequest) -> str:
+        tokens = (len(request.system) + len(request.user)) // 4
+        with self._lock:
+            self.calls += 1
+            self.tokens += tokens
+        time.sleep(self.base_latency + tokens * self.per_token)
+
+        agent_id = next(a for a in AGENTS if request.system.startswith(AGENT_REGISTRY[a].role))
+        line = next((ln for ln in request.user.splitlines() if ln.startswith(BATCH_INPUT_PREFIX)), None)
+        if line is None:
+            return json.dumps(RESPONSES[agent_id])
+        items = json.loads(line[len(BATCH_INPUT_PREFIX):])
+        out: List[Any] = []
+        for n in range(len(items)):
+            bad = self.invalid_every and (n + 1) % self.invalid_every == 0
+            out.append({"broken": True} if bad else RESPONSES[agent_id])
+        return json.dumps(out)
+
+
+def build_inputs(n: int) -> List[Dict[str, Any]]:
+    return [
+        {"headline": "Kapitel %d: Prophetie und Geschichte" % i, "body_chars": 1800 + 97 * i, "images": i % 3, "infoboxes": i % 2, "quotes": int(i % 5 == 0)}
+        for i in range(n)
+    ]
+
+
+def run(inputs: List[Dict[str, Any]], args: argparse.Namespace, batch_size: int, invalid_every: int = 0) -> Dict[str, Any]:
+    llm = StubLLM(args.latency, args.per_token, invalid_every=invalid_every)
+    runner = AgentRunner(AgentExecutor(llm=llm), max_concurrency=args.concurrency, batch_size=batch_size)
+    t0 = time.perf_counter()
+    results = runner.run(inputs, AGENTS)
+    elapsed = time.perf_counter() - t0
+    errors = sum(1 for r in results for v in r.values() if isinstance(v, BaseException))
+    return {"calls": llm.calls, "tokens": llm.tokens, "seconds": elapsed, "errors": errors, "fallbacks": runner.single_fallbacks}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--layouts", type=int, default=40)
+    ap.add_argument("--batch-size", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=1)
+    ap.add_argument("--latency", type=float, default=0.05, help="Grundlatenz pro Request in s")
+    ap.add_argument("--per-token", type=float, default=0.00002, help="Sekunden pro Prompt-Token")
+    ap.add_argument("--invalid", type=int, default=5, help="jedes n-te Batch-Element ungültig (0 = aus)")
+    args = ap.parse_args()
+
+    inputs = build_inputs(args.layouts)
+    rows = [
+        ("single", run(inputs, args, 1)),
+        ("batch %d" % args.batch_size, run(inputs, args, args.batch_size)),
+        ("batch %d, 1/%d invalid" % (args.batch_size, args.invalid), run(inputs, args, args.batch_size, args.invalid)),
+    ]
+    print("%d layouts x %d agents, concurrency %d" % (args.layouts, len(AGENTS), args.concurrency))
+    for name, r in rows:
+        print(
+            "%-24s %4d calls  %7d prompt tokens  %6.2f s  %3d fallbacks  %d errors"
+            % (name, r["calls"], r["tokens"], r["seconds"], r["fallbacks"], r["errors"])
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
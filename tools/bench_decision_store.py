@@ -0,0 +1,80 @@
+"""
+Benchmark: ``DecisionStore`` Latenz bei wachsender History.
+
+Schreibt ``--updates`` Änderungen (``set``) in eine temporäre Datei und misst alle
+``--every`` Updates die mittlere Latenz von ``set`` und ``get``. Zum Vergleich läuft
+dasselbe gegen die frühere Variante (jeder Aufruf liest/parst die Datei, jedes Update
+schreibt das ganze Dokument inkl. History neu).
+
+Usage:
+    python tools/bench_decision_store.py [--updates 2000] [--every 500] [--keys 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.dialog_engine import DecisionStore  # noqa: E402
+
+
+class RewriteStore:
+    """Frühere Variante: kein Cache, jedes Update schreibt Dokument + komplette History."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _raw(self) -> Dict[str, Any]:
+        return json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+
+    def get(self, key: str) -> Any:
+        return self._raw().get("decisions", {}).get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        raw = self._raw()
+        decisions = dict(raw.get("decisions", {}), **{key: value})
+        history = raw.get("history", []) + [{"ts": time.time(), "source": "bench", "keys": sorted(decisions)}]
+        doc = {"decisions": decisions, "meta": {}, "history": history}
+        self.path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def run(store, updates: int, every: int, keys: int) -> None:
+    t_set = t_get = 0.0
+    for i in range(1, updates + 1):
+        t0 = time.perf_counter()
+        store.set(f"key_{i % keys}", i)
+        t1 = time.perf_counter()
+        store.get(f"key_{(i * 7) % keys}")
+        t_get += time.perf_counter() - t1
+        t_set += t1 - t0
+        if i % every == 0:
+            print("  %6d updates: set %7.3f ms  get %7.3f ms" % (i, t_set / every * 1000, t_get / every * 1000))
+            t_set = t_get = 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--updates", type=int, default=2000)
+    ap.add_argument("--every", type=int, default=500)
+    ap.add_argument("--keys", type=int, default=40)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("DecisionStore (Journal + Cache)")
+        run(DecisionStore(Path(tmp) / "journaled.json"), args.updates, args.every, args.keys)
+        print("Rewrite (vorher)")
+        run(RewriteStore(Path(tmp) / "rewrite.json"), args.updates, args.every, args.keys)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
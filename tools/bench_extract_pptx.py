@@ -0,0 +1,184 @@
+"""
+Benchmark: extract_pptx_assets auf einem synthetischen, medienlastigen Deck.
+
+Erzeugt ein PPTX mit (default) 500 Slides / 2.000 Medien und misst:
+
+1. Member-Lookups wie im Slide-Loop: ``x in zf.namelist()`` (alt) vs. Set-Index (neu)
+2. Log-Sink: open/append/close pro Zeile (alt) vs. gepufferter ``log()`` (neu)
+3. End-to-End ``extract_from_pptx`` mit dem aktuellen Code
+
+Usage:
+    python tools/bench_extract_pptx.py [--slides 500] [--media 2000] [--pics-per-slide 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_NS_DECL = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+_REL_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+
+def _load_extractor():
+    path = REPO_ROOT / "tools" / "extract_pptx_assets.py"
+    spec = importlib.util.spec_from_file_location("extract_pptx_assets", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_synthetic_deck(path: Path, slides: int, media: int, pics_per_slide: int, seed: int = 0) -> None:
+    """Schreibt ein minimales, aber vom Extraktor vollständig verarbeitbares PPTX."""
+    rnd = random.Random(seed)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr(
+            "ppt/presentation.xml",
+            '<p:presentation %s><p:sldSz cx="12192000" cy="6858000"/></p:presentation>' % _NS_DECL,
+        )
+        for m in range(media):
+            zf.writestr("ppt/media/image%d.png" % m, b"\x89PNG" + m.to_bytes(4, "big") * 16)
+        for s in range(1, slides + 1):
+            rels = []
+            pics = []
+            for k in range(pics_per_slide):
+                r_id = "rId%d" % (k + 1)
+                rels.append(
+                    '<Relationship Id="%s" Type="%s" Target="../media/image%d.png"/>'
+                    % (r_id, _REL_IMAGE, rnd.randrange(media))
+                )
+                x, y = rnd.randrange(0, 8000000), rnd.randrange(0, 4000000)
+                w, h = rnd.randrange(900000, 4000000), rnd.randrange(700000, 2800000)
+                pics.append(
+                    '<p:pic><p:blipFill><a:blip r:embed="%s"/></p:blipFill>'
+                    '<p:spPr><a:xfrm><a:off x="%d" y="%d"/><a:ext cx="%d" cy="%d"/></a:xfrm></p:spPr></p:pic>'
+                    % (r_id, x, y, w, h)
+                )
+            title = (
+                '<p:sp><p:spPr><a:xfrm><a:off x="200000" y="200000"/><a:ext cx="6000000" cy="800000"/></a:xfrm>'
+                "</p:spPr><p:txBody><a:p><a:r><a:t>Slide %d</a:t></a:r></a:p></p:txBody></p:sp>" % s
+            )
+            zf.writestr(
+                "ppt/slides/_rels/slide%d.xml.rels" % s,
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">%s</Relationships>'
+                % "".join(rels),
+            )
+            zf.writestr(
+                "ppt/slides/slide%d.xml" % s,
+                "<p:sld %s><p:cSld><p:spTree>%s%s</p:spTree></p:cSld></p:sld>" % (_NS_DECL, title, "".join(pics)),
+            )
+
+
+def _lookup_sequence(zf: zipfile.ZipFile, extractor) -> list[str]:
+    """Die Member-Namen, die der Slide-Loop nachschlägt (rels + Medien-Kandidaten)."""
+    names = []
+    slide_files = sorted(
+        n for n in zf.namelist() if n.startswith(extractor.SLIDE_DIR + "/slide") and n.endswith(".xml")
+    )
+    for slide_file in slide_files:
+        idx = int(os.path.basename(slide_file)[5:-4])
+        names.append("%s/%s" % (extractor.RELS_DIR, extractor.rels_name(idx)))
+        rels = extractor.parse_rels(zf.read("%s/%s" % (extractor.RELS_DIR, extractor.rels_name(idx))))
+        for target in list(rels.values())[: extractor.INFO_MAX_MERGED_PER_SLIDE]:
+            target_path = target.replace("..", "").lstrip("/")
+            names.append(os.path.normpath(os.path.join(extractor.SLIDE_DIR, target_path)).replace("\\", "/"))
+            names.append(os.path.normpath(os.path.join("ppt", target_path)).replace("\\", "/"))
+    return names
+
+
+def bench_member_lookup(deck: Path, extractor) -> tuple[float, float, int]:
+    with zipfile.ZipFile(deck, "r") as zf:
+        names = _lookup_sequence(zf, extractor)
+
+        t0 = time.perf_counter()
+        hits_old = sum(1 for n in names if n in zf.namelist())
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        members = set(zf.namelist())
+        hits_new = sum(1 for n in names if n in members)
+        t_new = time.perf_counter() - t0
+
+    assert hits_old == hits_new
+    return t_old, t_new, len(names)
+
+
+def bench_log_sink(extractor, lines: int) -> tuple[float, float]:
+    payload = "slide 1: t=0.001s img_total=4 kept=2 skip_small=0 skip_bg_fill=0 skip_bg_cont=0"
+
+    t0 = time.perf_counter()
+    for _ in range(lines):
+        with open(extractor.LOG_PATH, "a", encoding="utf-8") as handle:
+            handle.write("[%s] %s\n" % (extractor._now_ts(), payload))
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(lines):
+        extractor.log(payload)
+    extractor.flush_log()
+    t_new = time.perf_counter() - t0
+    return t_old, t_new
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--slides", type=int, default=500)
+    ap.add_argument("--media", type=int, default=2000)
+    ap.add_argument("--pics-per-slide", type=int, default=4)
+    args = ap.parse_args()
+
+    extractor = _load_extractor()
+    with tempfile.TemporaryDirectory(prefix="bench_pptx_") as tmp:
+        tmp_path = Path(tmp)
+        extractor.OUT_DIR = str(tmp_path / "out")
+        extractor.IMG_DIR = os.path.join(extractor.OUT_DIR, "images")
+        extractor.JSON_DIR = os.path.join(extractor.OUT_DIR, "json")
+        extractor.LOG_PATH = os.path.join(extractor.OUT_DIR, "extract.log")
+        extractor.ensure_dir(extractor.IMG_DIR)
+
+        deck = tmp_path / "synthetic.pptx"
+        t0 = time.perf_counter()
+        build_synthetic_deck(deck, args.slides, args.media, args.pics_per_slide)
+        print("deck: slides=%d media=%d build=%.2fs" % (args.slides, args.media, time.perf_counter() - t0))
+
+        t_old, t_new, lookups = bench_member_lookup(deck, extractor)
+        print(
+            "member lookup (%d): namelist=%.3fs index=%.4fs speedup=%.0fx"
+            % (lookups, t_old, t_new, t_old / max(t_new, 1e-9))
+        )
+
+        log_lines = args.slides + 4
+        t_old, t_new = bench_log_sink(extractor, log_lines)
+        print(
+            "log sink (%d lines): per-line open=%.3fs buffered=%.4fs speedup=%.0fx"
+            % (log_lines, t_old, t_new, t_old / max(t_new, 1e-9))
+        )
+
+        t0 = time.perf_counter()
+        data = extractor.extract_from_pptx(str(deck))
+        extractor.flush_log()
+        dt = time.perf_counter() - t0
+        if not data:
+            print("extract_from_pptx failed, see %s" % extractor.LOG_PATH, file=sys.stderr)
+            return 1
+        print(
+            "extract_from_pptx: %.2fs slides=%d images=%d" % (dt, len(data["slides"]), len(data["images"]))
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Microbenchmark: Layout-Schema-Validierung (Validierungen/Sekunde).
+
+Vergleicht auf dem Beispiel-Layout und einem synthetischen 5.000-Objekt-Layout:
+
+- ``uncached``: Schema pro Aufruf lesen + neuen Draft7Validator bauen (früheres Verhalten)
+- ``validate_layout``: gecachter Validator, Fehler nur bei ungültigen Layouts
+- ``is_layout_valid``: reine Ja/Nein-Prüfung
+
+Usage:
+    python tools/bench_layout_validation.py [--objects 5000] [--seconds 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import jsonschema
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.layout_schema import SCHEMA_PATH, is_layout_valid, validate_layout  # noqa: E402
+
+EXAMPLE_PATH = REPO_ROOT / "packages" / "layout_schema" / "example_layout_mvp.json"
+
+
+def _validate_uncached(layout_json: Dict[str, Any]) -> tuple[bool, list[str]]:
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    errors = [str(e) for e in jsonschema.Draft7Validator(schema).iter_errors(layout_json)]
+    return len(errors) == 0, errors
+
+
+def build_large_layout(example: Dict[str, Any], objects: int, per_page: int = 50) -> Dict[str, Any]:
+    """Vervielfacht die Objekte des Beispiel-Layouts auf ``objects`` Stück."""
+    template = example["pages"][0]["objects"]
+    layout = copy.deepcopy(example)
+    layout["pages"] = []
+    for n in range(objects):
+        if n % per_page == 0:
+            layout["pages"].append({"pageNumber": len(layout["pages"]) + 1, "objects": []})
+        obj = copy.deepcopy(template[n % len(template)])
+        obj["id"] = "%s_%05d" % (obj["id"], n)
+        layout["pages"][-1]["objects"].append(obj)
+    return layout
+
+
+def _rate(fn: Callable[[Dict[str, Any]], Any], layout: Dict[str, Any], seconds: float) -> float:
+    fn(layout)  # Warmup (füllt Caches)
+    count = 0
+    t0 = time.perf_counter()
+    while True:
+        fn(layout)
+        count += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--objects", type=int, default=5000)
+    ap.add_argument("--seconds", type=float, default=2.0, help="Messdauer pro Variante")
+    args = ap.parse_args()
+
+    example = json.loads(EXAMPLE_PATH.read_text(encoding="utf-8"))
+    large = build_large_layout(example, args.objects)
+    if not is_layout_valid(large):
+        print("synthetic layout is not schema-valid", file=sys.stderr)
+        return 1
+
+    variants = [
+        ("uncached", _validate_uncached),
+        ("validate_layout", validate_layout),
+        ("is_layout_valid", is_layout_valid),
+    ]
+    for label, layout in (("example", example), ("%d objects" % args.objects, large)):
+        # Das Beispiel ist derzeit schema-ungültig (masterPage: null) -> misst auch den Fehlerpfad
+        print("%s: %s" % (label, "valid" if is_layout_valid(layout) else "invalid"))
+        baseline = None
+        for name, fn in variants:
+            rate = _rate(fn, layout, args.seconds)
+            baseline = baseline or rate
+            print("%-14s %-16s %10.1f validations/s  (x%.1f)" % (label, name, rate, rate / baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
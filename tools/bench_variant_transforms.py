@@ -0,0 +1,129 @@
+"""
+Microbenchmark: Varianten-Transformation pro Variante (Zeit + Speicher).
+
+Vergleicht auf einem synthetischen Layout (Default 2.000 Objekte):
+
+- ``chained``: ``convert_layout_format`` -> ``apply_bleed`` / ``convert_layout_colors_to_grayscale``
+  (je eine ``deepcopy``, früheres Verhalten in ``generate_variants``)
+- ``pipeline``: ``VariantTransform`` (ein Durchlauf, nur Gerüst kopiert)
+
+Speicher = Spitzenwert laut ``tracemalloc`` während einer Transformation (ohne JSON-Serialisierung).
+
+Zusätzlich: alle vier Varianten inkl. KDP-Bounds-Check, einmal pro Objekt gerechnet und einmal
+über eine gemeinsame ``LayoutGeometry`` der Basis (wie im Varianten-Fan-out, benötigt NumPy).
+
+Usage:
+    python tools/bench_variant_transforms.py [--objects 2000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.common.geometry import HAS_NUMPY, LayoutGeometry  # noqa: E402
+from packages.variant_generator import (  # noqa: E402
+    VariantTransform,
+    apply_bleed,
+    convert_layout_colors_to_grayscale,
+    convert_layout_format,
+    validate_kdp_layout,
+)
+
+
+def build_layout(objects: int, per_page: int = 40, seed: int = 1) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    layout: Dict[str, Any] = {"version": "1.0.0", "document": {"width": 2480, "height": 3508, "dpi": 300}, "pages": []}
+    for n in range(objects):
+        if n % per_page == 0:
+            layout["pages"].append({"pageNumber": len(layout["pages"]) + 1, "objects": []})
+        bbox = {"x": rnd.uniform(0, 2000), "y": rnd.uniform(0, 3000), "w": rnd.uniform(50, 400), "h": rnd.uniform(20, 300)}
+        kind = rnd.choice(["text", "image", "rectangle"])
+        obj: Dict[str, Any] = {"id": "o%05d" % n, "type": kind, "bbox": bbox, "layer": "Text"}
+        if kind == "text":
+            obj.update({"content": "Lorem ipsum dolor sit amet. " * 8, "color": "#%06x" % rnd.randrange(1 << 24), "fontSize": 11})
+        elif kind == "image":
+            obj.update({"imageUrl": "media_pool/images/%064x.png" % n, "sourceSlide": n // 10, "sourceIndex": n % 10})
+        else:
+            obj.update({"fillColor": "#%06x" % rnd.randrange(1 << 24), "strokeColor": "#000000", "strokeWidth": 1})
+        layout["pages"][-1]["objects"].append(obj)
+    return layout
+
+
+def _chained(fmt: str, variant: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    def run(layout: Dict[str, Any]) -> Dict[str, Any]:
+        out = convert_layout_format(layout, target_format=fmt)
+        if variant == "color":
+            return apply_bleed(out, bleed_mm=3.0)
+        return convert_layout_colors_to_grayscale(out)
+
+    return run
+
+
+def _pipeline_transform(fmt: str, variant: str) -> VariantTransform:
+    return VariantTransform(target_format=fmt, bleed_mm=3.0 if variant == "color" else None, grayscale=variant == "grayscale")
+
+
+def _pipeline(fmt: str, variant: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    return _pipeline_transform(fmt, variant).apply
+
+
+def _all_variants(geometry: bool) -> Callable[[Dict[str, Any]], None]:
+    transforms = [_pipeline_transform(fmt, variant) for fmt in ("A4", "8x11.5") for variant in ("color", "grayscale")]
+
+    def run(layout: Dict[str, Any]) -> None:
+        base_geo = LayoutGeometry.from_layout(layout) if geometry else None
+        for t in transforms:
+            geo = t.apply_geometry(layout, base_geo) if base_geo is not None else None
+            validate_kdp_layout(t.apply(layout, geometry=geo), geometry=geo)
+
+    return run
+
+
+def _measure(fn: Callable[[Dict[str, Any]], Any], layout: Dict[str, Any], repeat: int) -> tuple[float, float]:
+    fn(layout)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(layout)
+    elapsed_ms = (time.perf_counter() - t0) / repeat * 1000.0
+
+    tracemalloc.start()
+    out = fn(layout)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del out
+    return elapsed_ms, peak / (1024 * 1024)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--objects", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    layout = build_layout(args.objects)
+    print("%d objects, %d pages" % (args.objects, len(layout["pages"])))
+    for fmt in ("A4", "8x11.5"):
+        for variant in ("color", "grayscale"):
+            for name, factory in (("chained", _chained), ("pipeline", _pipeline)):
+                ms, mib = _measure(factory(fmt, variant), layout, args.repeat)
+                print("%-7s %-10s %-9s %8.2f ms/variant  %7.2f MiB peak" % (fmt, variant, name, ms, mib))
+
+    if HAS_NUMPY:
+        for name, geometry in (("objects", False), ("geometry", True)):
+            ms, _ = _measure(_all_variants(geometry), layout, args.repeat)
+            print("4 variants + KDP check  %-9s %8.2f ms" % (name, ms))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
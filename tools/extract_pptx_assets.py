@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
+import atexit
+import hashlib
+import heapq
 import json
 import os
 import re
 import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
@@ -25,7 +29,10 @@ IMG_DIR = os.path.join(OUT_DIR, "images")
 JSON_DIR = os.path.join(OUT_DIR, "json")
 MANIFEST_PATH = os.path.join(OUT_DIR, "manifest.json")
 LOG_PATH = os.path.join(OUT_DIR, "extract.log")
+CACHE_PATH = os.path.join(OUT_DIR, "extract_cache.json")
 LOG_RESET = True
+# Log-Zeilen werden gesammelt und blockweise geschrieben statt pro Zeile open/close
+LOG_FLUSH_LINES = 256
 
 PPTX_ONLY = []
 ENV_ONLY = os.environ.get("ZC_PPTX_ONLY", "").strip()
@@ -36,6 +43,24 @@ try:
 except ValueError:
     PPTX_LIMIT = 0
 
+# Parallel-Modus: ZC_PPTX_WORKERS=N (N>1) bzw. "auto" = Anzahl CPU-Kerne; 1 = seriell
+ENV_WORKERS = os.environ.get("ZC_PPTX_WORKERS", "1").strip().lower()
+if ENV_WORKERS == "auto":
+    PPTX_WORKERS = os.cpu_count() or 1
+else:
+    try:
+        PPTX_WORKERS = max(1, int(ENV_WORKERS or 1))
+    except ValueError:
+        PPTX_WORKERS = 1
+
+# Inkrementeller Modus: unveränderte Decks (gleicher Inhalt + gleiche Heuristik) werden
+# übersprungen und ihr bisheriges JSON wiederverwendet. ZC_PPTX_CACHE=0 erzwingt Voll-Lauf.
+CACHE_ENABLED = os.environ.get("ZC_PPTX_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+# Bei Änderungen an der Extraktionslogik erhöhen - und bei jeder Einstellung, die das
+# Ergebnis beeinflusst, aber weder INFO_/INFOBOX_/TEXT_IMAGE_ heißt noch in
+# FINGERPRINT_SETTINGS steht (sonst liefert extract_cache.json veraltete Decks)
+EXTRACTOR_VERSION = 2
+
 SLIDE_DIR = "ppt/slides"
 RELS_DIR = "ppt/slides/_rels"
 MEDIA_DIR = "ppt/media"
@@ -97,6 +122,7 @@ def _now_ts():
 
 def init_logging():
     if LOG_RESET:
+        _LOG_PENDING.clear()
         try:
             ensure_dir(OUT_DIR)
             with open(LOG_PATH, "w", encoding="utf-8") as handle:
@@ -106,13 +132,33 @@ def init_logging():
     log("extract_log_init")
 
 
+# In Worker-Prozessen gesetzt: Log-Zeilen werden pro Deck gepuffert und vom
+# Hauptprozess in Manifest-Reihenfolge nach extract.log geschrieben.
+_LOG_BUFFER = None
+# Schreibpuffer des Hauptprozesses (siehe flush_log)
+_LOG_PENDING = []
+
+
 def log(msg):
     line = "[%s] %s" % (_now_ts(), msg)
-    try:
-        with open(LOG_PATH, "a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
-    except Exception:
-        pass
+    if _LOG_BUFFER is not None:
+        _LOG_BUFFER.append(line)
+        return
+    _LOG_PENDING.append(line)
+    if len(_LOG_PENDING) >= LOG_FLUSH_LINES:
+        flush_log()
+
+
+def flush_log():
+    """Schreibt gepufferte Log-Zeilen nach extract.log."""
+    if not _LOG_PENDING:
+        return
+    lines = list(_LOG_PENDING)
+    _LOG_PENDING.clear()
+    write_log_lines(lines)
+
+
+atexit.register(flush_log)
 
 
 def list_pptx(ppt_dir):
@@ -235,26 +281,31 @@ def looks_like_infobox_text(text, rel_bbox):
     return True
 
 
-def write_image(blob, out_dir, base_name):
+def write_media(blob, out_dir, media_path):
+    """
+    Legt ein Medien-Blob content-addressed ab (``<sha256><ext>``).
+
+    Identische Bilder aus verschiedenen Decks/Läufen landen in derselben Datei;
+    existiert sie bereits, wird nicht erneut geschrieben. Schreiben über eine
+    Temp-Datei + os.replace, damit parallele Worker sich nicht in die Quere kommen.
+    """
     ensure_dir(out_dir)
-    name = safe_filename(base_name)
-    path = os.path.join(out_dir, name)
+    ext = os.path.splitext(media_path)[1].lower()
+    ext = ext if re.fullmatch(r"\.[a-z0-9]{1,8}", ext or "") else ".bin"
+    path = os.path.join(out_dir, hashlib.sha256(blob).hexdigest() + ext)
     if os.path.exists(path):
-        root, ext = os.path.splitext(name)
-        counter = 1
-        while True:
-            candidate = os.path.join(out_dir, "%s_%d%s" % (root, counter, ext))
-            if not os.path.exists(candidate):
-                path = candidate
-                break
-            counter += 1
-    with open(path, "wb") as handle:
+        return path
+    tmp_path = "%s.%d.part" % (path, os.getpid())
+    with open(tmp_path, "wb") as handle:
         handle.write(blob)
+    os.replace(tmp_path, path)
     return path
 
 
-def slide_size_from_presentation(zf):
-    if PRESENTATION_XML not in zf.namelist():
+def slide_size_from_presentation(zf, members=None):
+    if members is None:
+        members = set(zf.namelist())
+    if PRESENTATION_XML not in members:
         return None
     try:
         root = ET.fromstring(zf.read(PRESENTATION_XML))
@@ -381,15 +432,73 @@ def looks_like_background_fill(rel_bbox):
     return False
 
 
-def looks_like_background_container(candidate_bbox, all_boxes_rel_bboxes):
+# Zuschlag auf Such-Ränder im Grid: Kandidaten sind eine Obermenge, die exakten
+# Prädikate (bbox_iou/bbox_gap/bbox_contains) entscheiden wie bisher.
+_GRID_EPS = 1e-9
+
+
+class BoxGrid:
+    """
+    Uniformes Grid über dem relativen Slide-Raum [0, 1]² für rel_bboxes.
+
+    ``query`` liefert alle Keys, deren Box die (um ``margin`` erweiterte) Suchbox
+    berühren könnte - eine Obermenge, die Aufrufer mit dem exakten Prädikat filtern.
+    Boxen dürfen nur wachsen (``insert`` erneut aufrufen), entfernt wird nie.
+    """
+
+    def __init__(self, cells=16):
+        self.cells = cells
+        self._grid = {}
+
+    def _span(self, lo, hi):
+        if hi < lo:
+            lo, hi = hi, lo
+        n = self.cells
+        return max(0, min(n - 1, int(lo * n))), max(0, min(n - 1, int(hi * n)))
+
+    def _cells(self, bbox, margin=0.0):
+        x0, y0, x1, y1 = bbox
+        cx0, cx1 = self._span(min(x0, x1) - margin, max(x0, x1) + margin)
+        cy0, cy1 = self._span(min(y0, y1) - margin, max(y0, y1) + margin)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def insert(self, key, bbox):
+        for cell in self._cells(bbox):
+            self._grid.setdefault(cell, set()).add(key)
+
+    def query(self, bbox, margin=0.0):
+        found = set()
+        for cell in self._cells(bbox, margin):
+            keys = self._grid.get(cell)
+            if keys:
+                found |= keys
+        return found
+
+    @classmethod
+    def from_boxes(cls, bboxes, cells=16):
+        grid = cls(cells)
+        for key, bbox in enumerate(bboxes):
+            grid.insert(key, bbox)
+        return grid
+
+
+def looks_like_background_container(candidate_bbox, all_boxes_rel_bboxes, index=None):
     if not INFO_BG_CONTAIN_ENABLED:
         return False
     area = bbox_area(candidate_bbox)
     if area < INFO_BG_CONTAIN_MIN_AREA:
         return False
+    if index is not None:
+        # Nur Boxen in Reichweite prüfen; Reihenfolge wie in der Liste (gleiche Float-Summe)
+        keys = sorted(index.query(candidate_bbox, INFO_BG_CONTAIN_EPS + _GRID_EPS))
+        candidates = [all_boxes_rel_bboxes[k] for k in keys]
+    else:
+        candidates = all_boxes_rel_bboxes
     count = 0
     sum_area = 0.0
-    for bb in all_boxes_rel_bboxes:
+    for bb in candidates:
         if bb == candidate_bbox:
             continue
         if bbox_contains(candidate_bbox, bb):
@@ -400,7 +509,81 @@ def looks_like_background_container(candidate_bbox, all_boxes_rel_bboxes):
     return False
 
 
+def boxes_should_merge(a, b):
+    return bbox_iou(a, b) >= INFO_IOU_MERGE_TH or bbox_gap(a, b) <= INFO_GAP_MERGE_TH
+
+
+def merge_search_margin():
+    """Suchradius im Grid, in dem ``boxes_should_merge`` wahr werden kann."""
+    if INFO_IOU_MERGE_TH <= 0.0:
+        return 2.0  # IoU >= 0 gilt immer -> jedes Paar ist Kandidat
+    # IoU > 0 setzt Überlappung voraus (gap == 0), also reicht der Gap-Radius
+    return max(0.0, INFO_GAP_MERGE_TH) + _GRID_EPS
+
+
+def _cluster_image_boxes(boxes, margin):
+    # Erste Zuordnung: jede Box zum ersten (kleinster Index) passenden Cluster
+    clusters = []
+    grid = BoxGrid()
+    for box in boxes:
+        b = box["rel_bbox"]
+        for ci in sorted(grid.query(b, margin)):
+            cl = clusters[ci]
+            if boxes_should_merge(b, cl["bbox"]):
+                cl["items"].append(box)
+                cl["bbox"] = merge_bbox(cl["bbox"], b)
+                grid.insert(ci, cl["bbox"])
+                break
+        else:
+            grid.insert(len(clusters), b)
+            clusters.append({"bbox": b, "items": [box]})
+    return clusters
+
+
+def _merge_cluster_pass(clusters, margin):
+    """
+    Ein Durchlauf "Basis i schluckt j > i der Reihe nach".
+
+    Statt alle j zu testen, kommen nur Grid-Kandidaten in einen Min-Heap; wächst die
+    Basis, werden neue Kandidaten jenseits der aktuellen Position nachgelegt. Damit
+    entspricht die Reihenfolge der Merges (und der Items) exakt dem paarweisen Lauf.
+    """
+    grid = BoxGrid.from_boxes([cl["bbox"] for cl in clusters])
+    used = [False] * len(clusters)
+    out = []
+    merged = False
+    for i, base in enumerate(clusters):
+        if used[i]:
+            continue
+        heap = [j for j in grid.query(base["bbox"], margin) if j > i and not used[j]]
+        heapq.heapify(heap)
+        seen = set(heap)
+        while heap:
+            j = heapq.heappop(heap)
+            other = clusters[j]
+            if not boxes_should_merge(base["bbox"], other["bbox"]):
+                continue
+            base["bbox"] = merge_bbox(base["bbox"], other["bbox"])
+            base["items"].extend(other["items"])
+            used[j] = True
+            merged = True
+            for k in grid.query(base["bbox"], margin):
+                if k > j and k not in seen and not used[k]:
+                    seen.add(k)
+                    heapq.heappush(heap, k)
+        used[i] = True
+        out.append(base)
+    return out, merged
+
+
 def merge_image_boxes(boxes):
+    """
+    Fasst überlappende/nahe Infografik-Kandidaten zu Clustern zusammen.
+
+    Nachbarschaftssuche über ``BoxGrid``; Cluster-Reihenfolge, Item-Reihenfolge und
+    damit der Repräsentant (größte Box, bei Gleichstand die erste) sind identisch
+    zum früheren paarweisen O(n²)-Vergleich.
+    """
     if not boxes or not INFO_MERGE_ENABLED:
         out = []
         for b in boxes or []:
@@ -409,42 +592,12 @@ def merge_image_boxes(boxes):
                 out.append(b)
         return out
 
-    clusters = []
-    for box in boxes:
-        b = box["rel_bbox"]
-        placed = False
-        for cl in clusters:
-            if bbox_iou(b, cl["bbox"]) >= INFO_IOU_MERGE_TH or bbox_gap(b, cl["bbox"]) <= INFO_GAP_MERGE_TH:
-                cl["items"].append(box)
-                cl["bbox"] = merge_bbox(cl["bbox"], b)
-                placed = True
-                break
-        if not placed:
-            clusters.append({"bbox": b, "items": [box]})
+    margin = merge_search_margin()
+    clusters = _cluster_image_boxes(boxes, margin)
 
     merged = True
     while merged and len(clusters) > 1:
-        merged = False
-        out = []
-        used = [False] * len(clusters)
-        for i in range(len(clusters)):
-            if used[i]:
-                continue
-            base = clusters[i]
-            for j in range(i + 1, len(clusters)):
-                if used[j]:
-                    continue
-                other = clusters[j]
-                if bbox_iou(base["bbox"], other["bbox"]) >= INFO_IOU_MERGE_TH or bbox_gap(
-                    base["bbox"], other["bbox"]
-                ) <= INFO_GAP_MERGE_TH:
-                    base["bbox"] = merge_bbox(base["bbox"], other["bbox"])
-                    base["items"].extend(other["items"])
-                    used[j] = True
-                    merged = True
-            used[i] = True
-            out.append(base)
-        clusters = out
+        clusters, merged = _merge_cluster_pass(clusters, margin)
 
     merged_boxes = []
     for cl in clusters:
@@ -458,9 +611,17 @@ def merge_image_boxes(boxes):
     return merged_boxes
 
 
-def overlaps_image_mask(text_bbox, image_masks):
+# Ab so vielen Masken lohnt sich ein Grid (Standard: höchstens INFO_MAX_MERGED_PER_SLIDE)
+MASK_INDEX_MIN = 16
+
+
+def overlaps_image_mask(text_bbox, image_masks, index=None):
     if not image_masks:
         return False
+    if index is not None:
+        # IoU > 0 setzt Überlappung voraus -> nur Masken in denselben Zellen prüfen
+        if TEXT_IMAGE_OVERLAP_TH > 0.0:
+            image_masks = [image_masks[k] for k in sorted(index.query(text_bbox, _GRID_EPS))]
     for ib in image_masks:
         if bbox_iou(text_bbox, ib) >= TEXT_IMAGE_OVERLAP_TH:
             return True
@@ -547,6 +708,18 @@ def parse_image_boxes(xml_bytes, rels, slide_size):
     return boxes
 
 
+def resolve_media_path(target, members):
+    """Löst ein Relationship-Target gegen den Member-Index auf (None = nicht im Archiv)."""
+    target_path = target.replace("..", "").lstrip("/")
+    media_path = os.path.normpath(os.path.join(SLIDE_DIR, target_path)).replace("\\", "/")
+    if media_path in members:
+        return media_path
+    media_path = os.path.normpath(os.path.join("ppt", target_path)).replace("\\", "/")
+    if media_path in members:
+        return media_path
+    return None
+
+
 def extract_from_pptx(path):
     base = os.path.splitext(os.path.basename(path))[0]
     slides = []
@@ -557,10 +730,14 @@ def extract_from_pptx(path):
     log("pptx_start %s" % base)
     try:
         with zipfile.ZipFile(path, "r") as zf:
-            slide_size = slide_size_from_presentation(zf)
+            # Einmaliger Index der Archiv-Member: zf.namelist() baut bei jedem Aufruf
+            # eine neue Liste, "in" darauf ist O(n) - bei medienlastigen Decks quadratisch.
+            members = set(zf.namelist())
+            slide_size = slide_size_from_presentation(zf, members)
             extracted_media = {}
+            media_paths = {}  # target -> aufgelöster Member-Pfad (oder None)
             slide_files = sorted(
-                [name for name in zf.namelist() if name.startswith(SLIDE_DIR + "/slide") and name.endswith(".xml")]
+                [name for name in members if name.startswith(SLIDE_DIR + "/slide") and name.endswith(".xml")]
             )
             for slide_file in slide_files:
                 slide_t0 = time.perf_counter()
@@ -572,7 +749,7 @@ def extract_from_pptx(path):
                 rels_file = "%s/%s" % (RELS_DIR, rels_name(idx))
                 rels = {}
                 try:
-                    if rels_file in zf.namelist():
+                    if rels_file in members:
                         rels = parse_rels(zf.read(rels_file))
                 except KeyError:
                     rels = {}
@@ -584,6 +761,7 @@ def extract_from_pptx(path):
 
                 image_boxes_all = parse_image_boxes(xml_bytes, rels, slide_size)
                 all_rel_bboxes = [clamp_bbox(b.get("rel_bbox", [0.0, 0.0, 1.0, 1.0])) for b in image_boxes_all]
+                all_rel_index = BoxGrid.from_boxes(all_rel_bboxes)
 
                 raw_images = []
                 skip_small = 0
@@ -602,7 +780,7 @@ def extract_from_pptx(path):
                         if looks_like_background_fill(rel_bbox):
                             skip_bg_fill += 1
                             continue
-                        if looks_like_background_container(rel_bbox, all_rel_bboxes):
+                        if looks_like_background_container(rel_bbox, all_rel_bboxes, all_rel_index):
                             skip_bg_cont += 1
                             continue
 
@@ -622,17 +800,15 @@ def extract_from_pptx(path):
                     target = entry.get("target")
                     if not target:
                         continue
-                    target_path = target.replace("..", "").lstrip("/")
-                    media_path = os.path.normpath(os.path.join(SLIDE_DIR, target_path)).replace("\\", "/")
-                    if media_path not in zf.namelist():
-                        media_path = os.path.normpath(os.path.join("ppt", target_path)).replace("\\", "/")
-                    if media_path not in zf.namelist():
+                    if target not in media_paths:
+                        media_paths[target] = resolve_media_path(target, members)
+                    media_path = media_paths[target]
+                    if media_path is None:
                         continue
 
                     if media_path not in extracted_media:
                         blob = zf.read(media_path)
-                        out_name = "%s_s%03d_%s" % (base, idx, os.path.basename(media_path))
-                        out_path = write_image(blob, IMG_DIR, out_name)
+                        out_path = write_media(blob, IMG_DIR, media_path)
                         extracted_media[media_path] = os.path.relpath(out_path, OUT_DIR)
 
                     rel_out = extracted_media[media_path]
@@ -642,6 +818,7 @@ def extract_from_pptx(path):
                     image_masks.append(entry.get("rel_bbox"))
 
                 text_boxes_all = parse_text_boxes(xml_bytes, slide_size)
+                mask_index = BoxGrid.from_boxes(image_masks) if len(image_masks) >= MASK_INDEX_MIN else None
                 text_boxes_out = []
                 ignored_overlap = 0
                 ignored_infobox = 0
@@ -652,7 +829,7 @@ def extract_from_pptx(path):
 
                     role = "body"
                     ignore = False
-                    if overlaps_image_mask(rel_bbox, image_masks):
+                    if overlaps_image_mask(rel_bbox, image_masks, mask_index):
                         role = "image_overlap"
                         ignore = True
                         ignored_overlap += 1
@@ -749,6 +926,132 @@ def extract_from_pptx(path):
     }
 
 
+# Weitere Einstellungen, die das extrahierte JSON verändern (Teil des Fingerprints)
+FINGERPRINT_SETTINGS = ("QUOTE_CHARS", "NS", "SLIDE_DIR", "RELS_DIR", "MEDIA_DIR", "PRESENTATION_XML", "IMG_DIR")
+
+
+def heuristics_fingerprint():
+    """Hash über Extraktor-Version, alle Heuristik-Schwellwerte und FINGERPRINT_SETTINGS (Teil des Cache-Keys)."""
+    params = {
+        name: value
+        for name, value in globals().items()
+        if name.startswith(("INFO_", "INFOBOX_", "TEXT_IMAGE_"))
+    }
+    params.update((name, globals()[name]) for name in FINGERPRINT_SETTINGS)
+    params["EXTRACTOR_VERSION"] = EXTRACTOR_VERSION
+    raw = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_extract_cache():
+    """Cache-Datei lesen: {"decks": {name: {"sha256", "heuristics", "entry"}}}."""
+    if not CACHE_ENABLED or not os.path.exists(CACHE_PATH):
+        return {"decks": {}}
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as handle:
+            cache = json.load(handle)
+    except Exception as exc:
+        log("cache_unreadable %s %s" % (CACHE_PATH, exc))
+        return {"decks": {}}
+    if not isinstance(cache.get("decks"), dict):
+        return {"decks": {}}
+    return cache
+
+
+def save_extract_cache(cache):
+    if not CACHE_ENABLED:
+        return
+    tmp_path = CACHE_PATH + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(cache, handle, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def cached_manifest_entry(cache, pptx, deck_hash, heuristics):
+    """Manifest-Eintrag aus dem Cache, falls Deck und Heuristik unverändert sind und das JSON noch existiert."""
+    if not CACHE_ENABLED:
+        return None
+    name = os.path.splitext(os.path.basename(pptx))[0]
+    hit = cache["decks"].get(name)
+    if not hit or hit.get("sha256") != deck_hash or hit.get("heuristics") != heuristics:
+        return None
+    entry = hit.get("entry") or {}
+    json_path = entry.get("json")
+    if not json_path or not os.path.exists(os.path.join(OUT_DIR, json_path)):
+        return None
+    return dict(entry, source=pptx)
+
+
+def write_log_lines(lines):
+    if not lines:
+        return
+    try:
+        with open(LOG_PATH, "a", encoding="utf-8") as handle:
+            handle.write("".join(line + "\n" for line in lines))
+    except Exception:
+        pass
+
+
+def process_pptx(pptx):
+    """Extrahiert ein Deck, schreibt dessen JSON und liefert den Manifest-Eintrag (oder None)."""
+    log("pptx_file %s" % os.path.basename(pptx))
+    data = extract_from_pptx(pptx)
+    if not data:
+        return None
+    out_path = os.path.join(JSON_DIR, "%s.json" % data["name"])
+    with open(out_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, indent=2)
+    return {
+        "name": data["name"],
+        "source": data["source"],
+        "json": os.path.relpath(out_path, OUT_DIR),
+        "slides": len(data["slides"]),
+        "images": len(data["images"]),
+        "quotes": len(data["quotes"]),
+        "char_count": data["char_count"],
+        "quote_char_count": data["quote_char_count"],
+    }
+
+
+def _process_pptx_worker(pptx):
+    """Worker-Einstieg: Logs des Decks puffern statt gemeinsam in extract.log zu schreiben."""
+    global _LOG_BUFFER
+    _LOG_BUFFER = []
+    try:
+        try:
+            entry = process_pptx(pptx)
+        except Exception as exc:
+            log("extract_error %s %s" % (pptx, exc))
+            entry = None
+        return entry, _LOG_BUFFER
+    finally:
+        _LOG_BUFFER = None
+
+
+def iter_manifest_entries(pptx_files, workers=1):
+    """Manifest-Einträge in der Reihenfolge von ``pptx_files`` (seriell oder per Prozess-Pool)."""
+    if workers <= 1 or len(pptx_files) <= 1:
+        for pptx in pptx_files:
+            yield process_pptx(pptx)
+        return
+
+    flush_log()  # Worker sollen keine ungeschriebenen Zeilen des Hauptprozesses erben
+    with ProcessPoolExecutor(max_workers=min(workers, len(pptx_files))) as pool:
+        # map() liefert in Eingabereihenfolge -> deterministisches Manifest und Log
+        for entry, lines in pool.map(_process_pptx_worker, pptx_files):
+            _LOG_PENDING.extend(lines)
+            flush_log()
+            yield entry
+
+
 def main():
     ensure_dir(OUT_DIR)
     ensure_dir(IMG_DIR)
@@ -758,6 +1061,7 @@ def main():
     pptx_files = list_pptx(PPT_DIR)
     if not pptx_files:
         log("no_pptx_files %s" % PPT_DIR)
+        flush_log()
         raise SystemExit("No PPTX files found in %s" % PPT_DIR)
 
     if PPTX_ONLY:
@@ -765,34 +1069,45 @@ def main():
     if PPTX_LIMIT:
         log("pptx_limit %d" % PPTX_LIMIT)
     log("pptx_files %d" % len(pptx_files))
+    if PPTX_WORKERS > 1:
+        log("pptx_workers %d" % PPTX_WORKERS)
 
     manifest = {"source_dir": PPT_DIR, "files": []}
 
-    for pptx in pptx_files:
-        log("pptx_file %s" % os.path.basename(pptx))
-        data = extract_from_pptx(pptx)
-        if not data:
-            continue
-        out_path = os.path.join(JSON_DIR, "%s.json" % data["name"])
-        with open(out_path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, ensure_ascii=False, indent=2)
-        manifest["files"].append(
-            {
-                "name": data["name"],
-                "source": data["source"],
-                "json": os.path.relpath(out_path, OUT_DIR),
-                "slides": len(data["slides"]),
-                "images": len(data["images"]),
-                "quotes": len(data["quotes"]),
-                "char_count": data["char_count"],
-                "quote_char_count": data["quote_char_count"],
+    cache = load_extract_cache()
+    heuristics = heuristics_fingerprint()
+    entries = [None] * len(pptx_files)
+    deck_hashes = {}
+    todo = []
+    for i, pptx in enumerate(pptx_files):
+        deck_hashes[pptx] = file_sha256(pptx)
+        entry = cached_manifest_entry(cache, pptx, deck_hashes[pptx], heuristics)
+        if entry:
+            entries[i] = entry
+            log("pptx_cached %s" % os.path.basename(pptx))
+        else:
+            todo.append(i)
+    if CACHE_ENABLED:
+        log("cache hits=%d extract=%d heuristics=%s" % (len(pptx_files) - len(todo), len(todo), heuristics))
+
+    todo_files = [pptx_files[i] for i in todo]
+    for i, entry in zip(todo, iter_manifest_entries(todo_files, workers=PPTX_WORKERS)):
+        entries[i] = entry
+        if entry:
+            cache["decks"][entry["name"]] = {
+                "sha256": deck_hashes[pptx_files[i]],
+                "heuristics": heuristics,
+                "entry": entry,
             }
-        )
+    save_extract_cache(cache)
+
+    manifest["files"] = [entry for entry in entries if entry]
 
     with open(MANIFEST_PATH, "w", encoding="utf-8") as handle:
         json.dump(manifest, handle, ensure_ascii=False, indent=2)
 
     log("manifest_written %s files=%d" % (MANIFEST_PATH, len(manifest["files"])))
+    flush_log()
     print("Extracted %d PPTX files" % len(manifest["files"]))
     print("Manifest:", MANIFEST_PATH)
 